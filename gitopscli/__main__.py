@@ -4,12 +4,15 @@ import sys
 from gitopscli.cliparser import parse_args
 from gitopscli.commands import CommandFactory
 from gitopscli.gitops_exception import GitOpsException
+from gitopscli.timings import enable_timings, write_timings_report
 
 
 def main() -> None:
     logging.basicConfig(level=logging.INFO, format="%(levelname)-2s %(funcName)s: %(message)s")
-    verbose, args = parse_args(sys.argv[1:])
+    verbose, timings_file, args = parse_args(sys.argv[1:])
     command = CommandFactory.create(args)
+    if timings_file:
+        enable_timings()
     try:
         command.execute()
     except GitOpsException as ex:
@@ -19,6 +22,9 @@ def main() -> None:
             logging.error(ex)
             logging.error("Provide verbose flag '-v' for more error details...")
         sys.exit(1)
+    finally:
+        if timings_file:
+            write_timings_report(timings_file)
 
 
 if __name__ == "__main__":
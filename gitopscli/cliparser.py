@@ -1,11 +1,13 @@
 from argparse import ArgumentParser, ArgumentTypeError
 import os
 import sys
-from typing import List, Tuple, Dict, Any, NoReturn, Callable
+from typing import List, Optional, Tuple, Dict, Any, NoReturn, Callable
 from gitopscli.commands import (
     CommandArgs,
     DeployCommand,
+    DeployBatchCommand,
     SyncAppsCommand,
+    SyncAppsBatchCommand,
     AddPrCommentCommand,
     CreatePreviewCommand,
     CreatePrPreviewCommand,
@@ -17,7 +19,7 @@ from gitopscli.git_api import GitProvider
 from gitopscli.io_api.yaml_util import yaml_load, YAMLException
 
 
-def parse_args(raw_args: List[str]) -> Tuple[bool, CommandArgs]:
+def parse_args(raw_args: List[str]) -> Tuple[bool, Optional[str], CommandArgs]:
     parser = __create_parser()
 
     if len(raw_args) == 0:
@@ -27,9 +29,10 @@ def parse_args(raw_args: List[str]) -> Tuple[bool, CommandArgs]:
     args = __deduce_empty_git_provider_from_git_provider_url(args, parser.error)
 
     verbose = args.pop("verbose", False)
+    timings_file = args.pop("timings", None)
     command_args = __create_command_args(args)
 
-    return verbose, command_args
+    return verbose, timings_file, command_args
 
 
 def __create_parser() -> ArgumentParser:
@@ -38,11 +41,21 @@ def __create_parser() -> ArgumentParser:
     subparsers.add_parser(
         "deploy", help="Trigger a new deployment by changing YAML values", parents=[__create_deploy_parser()]
     )
+    subparsers.add_parser(
+        "deploy-batch",
+        help="Trigger deployments in multiple repositories concurrently",
+        parents=[__create_deploy_batch_parser()],
+    )
     subparsers.add_parser(
         "sync-apps",
         help="Synchronize applications (= every directory) from apps config repository to apps root config",
         parents=[__create_sync_apps_parser()],
     )
+    subparsers.add_parser(
+        "sync-apps-batch",
+        help="Synchronize applications of multiple apps config repositories to apps root config at once",
+        parents=[__create_sync_apps_batch_parser()],
+    )
     subparsers.add_parser(
         "add-pr-comment", help="Create a comment on the pull request", parents=[__create_add_pr_comment_parser()]
     )
@@ -88,6 +101,7 @@ def __create_deploy_parser() -> ArgumentParser:
     __add_git_commit_user_args(parser)
     __add_git_org_and_repo_args(parser)
     __add_git_provider_args(parser)
+    __add_git_clone_args(parser)
     parser.add_argument(
         "--create-pr", help="Creates a Pull Request", type=__parse_bool, nargs="?", const=True, default=False
     )
@@ -105,6 +119,20 @@ def __create_deploy_parser() -> ArgumentParser:
         type=str,
         default="merge",
     )
+    parser.add_argument(
+        "--api-commit",
+        help="Commit via the git provider API instead of cloning the repository (falls back to cloning if needed)",
+        type=__parse_bool,
+        nargs="?",
+        const=True,
+        default=False,
+    )
+    parser.add_argument(
+        "--spool-dir",
+        help="Queue the deployment in this directory, concurrent deployments to the same repository are pushed "
+        "together (alternative: GITOPSCLI_SPOOL_DIR env variable)",
+        default=os.environ.get("GITOPSCLI_SPOOL_DIR"),
+    )
     parser.add_argument(
         "--json",
         help="Print a JSON object containing deployment information",
@@ -113,6 +141,52 @@ def __create_deploy_parser() -> ArgumentParser:
         default=False,
     )
     __add_verbose_arg(parser)
+    __add_timings_arg(parser)
+    return parser
+
+
+def __create_deploy_batch_parser() -> ArgumentParser:
+    parser = ArgumentParser(add_help=False)
+    parser.add_argument(
+        "--manifest", help="YAML file listing the deployments (organisation, repository, file, values)", required=True
+    )
+    parser.add_argument(
+        "--max-workers",
+        help="Maximum number of concurrent deployments (default: 4)",
+        type=__parse_positive_int,
+        default=4,
+    )
+    parser.add_argument(
+        "--single-commit",
+        help="Create only single commit for all updates of a deployment",
+        type=__parse_bool,
+        nargs="?",
+        const=True,
+        default=False,
+    )
+    __add_git_credentials_args(parser)
+    __add_git_commit_user_args(parser)
+    __add_git_provider_args(parser)
+    __add_git_clone_args(parser)
+    parser.add_argument(
+        "--create-pr", help="Creates a Pull Request", type=__parse_bool, nargs="?", const=True, default=False
+    )
+    parser.add_argument(
+        "--auto-merge",
+        help="Automatically merge the created PR (only valid with --create-pr)",
+        type=__parse_bool,
+        nargs="?",
+        const=True,
+        default=False,
+    )
+    parser.add_argument(
+        "--merge-method",
+        help="Merge Method (e.g., 'squash', 'rebase', 'merge') (default: merge)",
+        type=str,
+        default="merge",
+    )
+    __add_verbose_arg(parser)
+    __add_timings_arg(parser)
     return parser
 
 
@@ -122,9 +196,53 @@ def __create_sync_apps_parser() -> ArgumentParser:
     __add_git_commit_user_args(parser)
     __add_git_org_and_repo_args(parser)
     __add_git_provider_args(parser)
+    __add_git_clone_args(parser)
     __add_verbose_arg(parser)
+    __add_timings_arg(parser)
     parser.add_argument("--root-organisation", help="Root config repository organisation", required=True)
     parser.add_argument("--root-repository-name", help="Root config repository name", required=True)
+    parser.add_argument(
+        "--apps-index-dir",
+        help="Persist the application index of the root repository in this directory, later runs only parse "
+        "changed apps/*.yaml files (alternative: GITOPSCLI_APPS_INDEX_DIR env variable)",
+        default=os.environ.get("GITOPSCLI_APPS_INDEX_DIR"),
+    )
+    return parser
+
+
+def __create_sync_apps_batch_parser() -> ArgumentParser:
+    parser = ArgumentParser(add_help=False)
+    parser.add_argument(
+        "--manifest", help="YAML file listing the apps config repositories (organisation, repository)", required=True
+    )
+    parser.add_argument(
+        "--max-workers",
+        help="Maximum number of apps config repositories which are listed concurrently (default: 4)",
+        type=__parse_positive_int,
+        default=4,
+    )
+    parser.add_argument(
+        "--single-commit",
+        help="Create only single commit for the updates of all apps config repositories",
+        type=__parse_bool,
+        nargs="?",
+        const=True,
+        default=False,
+    )
+    __add_git_credentials_args(parser)
+    __add_git_commit_user_args(parser)
+    __add_git_provider_args(parser)
+    __add_git_clone_args(parser)
+    __add_verbose_arg(parser)
+    __add_timings_arg(parser)
+    parser.add_argument("--root-organisation", help="Root config repository organisation", required=True)
+    parser.add_argument("--root-repository-name", help="Root config repository name", required=True)
+    parser.add_argument(
+        "--apps-index-dir",
+        help="Persist the application index of the root repository in this directory, later runs only parse "
+        "changed apps/*.yaml files (alternative: GITOPSCLI_APPS_INDEX_DIR env variable)",
+        default=os.environ.get("GITOPSCLI_APPS_INDEX_DIR"),
+    )
     return parser
 
 
@@ -136,6 +254,7 @@ def __create_add_pr_comment_parser() -> ArgumentParser:
     __add_pr_id_arg(parser)
     __add_parent_id_arg(parser)
     __add_verbose_arg(parser)
+    __add_timings_arg(parser)
     parser.add_argument("--text", help="the text of the comment", required=True)
     return parser
 
@@ -146,9 +265,11 @@ def __create_create_preview_parser() -> ArgumentParser:
     __add_git_commit_user_args(parser)
     __add_git_org_and_repo_args(parser)
     __add_git_provider_args(parser)
+    __add_git_clone_args(parser)
     parser.add_argument("--git-hash", help="the git hash which should be deployed", type=str, required=True)
     __add_preview_id_arg(parser)
     __add_verbose_arg(parser)
+    __add_timings_arg(parser)
     return parser
 
 
@@ -158,9 +279,11 @@ def __create_create_pr_preview_parser() -> ArgumentParser:
     __add_git_commit_user_args(parser)
     __add_git_org_and_repo_args(parser)
     __add_git_provider_args(parser)
+    __add_git_clone_args(parser)
     __add_pr_id_arg(parser)
     __add_parent_id_arg(parser)
     __add_verbose_arg(parser)
+    __add_timings_arg(parser)
     return parser
 
 
@@ -170,9 +293,11 @@ def __create_delete_preview_parser() -> ArgumentParser:
     __add_git_commit_user_args(parser)
     __add_git_org_and_repo_args(parser)
     __add_git_provider_args(parser)
+    __add_git_clone_args(parser)
     __add_preview_id_arg(parser)
     __add_expect_preview_exists_arg(parser)
     __add_verbose_arg(parser)
+    __add_timings_arg(parser)
     return parser
 
 
@@ -182,9 +307,11 @@ def __create_delete_pr_preview_parser() -> ArgumentParser:
     __add_git_commit_user_args(parser)
     __add_git_org_and_repo_args(parser)
     __add_git_provider_args(parser)
+    __add_git_clone_args(parser)
     parser.add_argument("--branch", help="The branch for which the preview was created for", required=True)
     __add_expect_preview_exists_arg(parser)
     __add_verbose_arg(parser)
+    __add_timings_arg(parser)
     return parser
 
 
@@ -222,6 +349,58 @@ def __add_git_provider_args(deploy_p: ArgumentParser) -> None:
     deploy_p.add_argument("--git-provider-url", help="Git provider base API URL (e.g. https://bitbucket.example.tld)")
 
 
+def __add_git_clone_args(deploy_p: ArgumentParser) -> None:
+    deploy_p.add_argument(
+        "--clone-depth",
+        help="Create shallow clones with a history truncated to the specified number of commits",
+        type=__parse_positive_int,
+        default=None,
+    )
+    deploy_p.add_argument(
+        "--clone-single-branch",
+        help="Clone only the history of the checked out branch",
+        type=__parse_bool,
+        nargs="?",
+        const=True,
+        default=False,
+    )
+    deploy_p.add_argument(
+        "--clone-filter", help="Partial clone filter (e.g. blob:none, requires server support)", default=None
+    )
+    deploy_p.add_argument(
+        "--clone-sparse",
+        help="Only check out the directories a command needs (sparse checkout, requires git 2.35 or newer)",
+        type=__parse_bool,
+        nargs="?",
+        const=True,
+        default=False,
+    )
+    deploy_p.add_argument(
+        "--clone-cache-dir",
+        help="Directory for a persistent mirror cache of cloned repositories "
+        "(alternative: GITOPSCLI_CLONE_CACHE_DIR env variable)",
+        default=os.environ.get("GITOPSCLI_CLONE_CACHE_DIR"),
+    )
+    deploy_p.add_argument(
+        "--clone-cache-max-size-mb",
+        help="Evict least recently used mirrors when the cache exceeds this size (default: 2048)",
+        type=__parse_positive_int,
+        default=2048,
+    )
+    deploy_p.add_argument(
+        "--clone-cache-max-age-days",
+        help="Evict mirrors which have not been used for this number of days (default: 7)",
+        type=__parse_positive_int,
+        default=7,
+    )
+    deploy_p.add_argument(
+        "--push-retries",
+        help="Rebase and retry a push which was rejected because the remote branch has changed (default: 3)",
+        type=__parse_non_negative_int,
+        default=3,
+    )
+
+
 def __add_pr_id_arg(parser: ArgumentParser) -> None:
     parser.add_argument("--pr-id", help="the id of the pull request", type=int, required=True)
 
@@ -251,6 +430,15 @@ def __add_verbose_arg(parser: ArgumentParser) -> None:
     )
 
 
+def __add_timings_arg(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--timings",
+        help="Write a JSON report with the duration of each phase to this file "
+        "(alternative: GITOPSCLI_TIMINGS env variable)",
+        default=os.environ.get("GITOPSCLI_TIMINGS"),
+    )
+
+
 def __parse_bool(value: str) -> bool:
     lowercase_value = value.lower()
     if lowercase_value in ("yes", "true", "t", "y", "1"):
@@ -260,6 +448,26 @@ def __parse_bool(value: str) -> bool:
     raise ArgumentTypeError(f"invalid bool value: '{value}'")
 
 
+def __parse_positive_int(value: str) -> int:
+    try:
+        int_value = int(value)
+    except ValueError as ex:
+        raise ArgumentTypeError(f"invalid int value: '{value}'") from ex
+    if int_value < 1:
+        raise ArgumentTypeError(f"invalid positive int value: '{value}'")
+    return int_value
+
+
+def __parse_non_negative_int(value: str) -> int:
+    try:
+        int_value = int(value)
+    except ValueError as ex:
+        raise ArgumentTypeError(f"invalid int value: '{value}'") from ex
+    if int_value < 0:
+        raise ArgumentTypeError(f"invalid non-negative int value: '{value}'")
+    return int_value
+
+
 def __parse_yaml(value: str) -> Any:
     try:
         return yaml_load(value)
@@ -308,8 +516,12 @@ def __create_command_args(args: Dict[str, Any]) -> CommandArgs:
     command_args: CommandArgs
     if command == "deploy":
         command_args = DeployCommand.Args(**args)
+    elif command == "deploy-batch":
+        command_args = DeployBatchCommand.Args(**args)
     elif command == "sync-apps":
         command_args = SyncAppsCommand.Args(**args)
+    elif command == "sync-apps-batch":
+        command_args = SyncAppsBatchCommand.Args(**args)
     elif command == "add-pr-comment":
         command_args = AddPrCommentCommand.Args(**args)
     elif command == "create-preview":
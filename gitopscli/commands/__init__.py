@@ -7,5 +7,7 @@ from .create_pr_preview import CreatePrPreviewCommand
 from .delete_preview import DeletePreviewCommand
 from .delete_pr_preview import DeletePrPreviewCommand
 from .deploy import DeployCommand
+from .deploy_batch import DeployBatchCommand
 from .sync_apps import SyncAppsCommand
+from .sync_apps_batch import SyncAppsBatchCommand
 from .version import VersionCommand
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from typing import Optional
 from gitopscli.git_api import GitApiConfig, GitRepoApiFactory
+from gitopscli.timings import timed
 from .command import Command
 
 
@@ -17,6 +18,7 @@ class AddPrCommentCommand(Command):
     def __init__(self, args: Args) -> None:
         self.__args = args
 
+    @timed("AddPrCommentCommand.execute")
     def execute(self) -> None:
         args = self.__args
         git_repo_api = GitRepoApiFactory.create(args, args.organisation, args.repository_name)
@@ -6,18 +6,21 @@ from .create_pr_preview import CreatePrPreviewCommand
 from .delete_preview import DeletePreviewCommand
 from .delete_pr_preview import DeletePrPreviewCommand
 from .deploy import DeployCommand
+from .deploy_batch import DeployBatchCommand
 from .sync_apps import SyncAppsCommand
+from .sync_apps_batch import SyncAppsBatchCommand
 from .version import VersionCommand
 
 CommandArgs = Union[
     DeployCommand.Args,
-    DeployCommand.Args,
+    DeployBatchCommand.Args,
     AddPrCommentCommand.Args,
     CreatePreviewCommand.Args,
     CreatePrPreviewCommand.Args,
     DeletePreviewCommand.Args,
     DeletePrPreviewCommand.Args,
     SyncAppsCommand.Args,
+    SyncAppsBatchCommand.Args,
     VersionCommand.Args,
 ]
 
@@ -28,8 +31,12 @@ class CommandFactory:
         command: Optional[Command]
         if isinstance(args, DeployCommand.Args):
             command = DeployCommand(args)
+        elif isinstance(args, DeployBatchCommand.Args):
+            command = DeployBatchCommand(args)
         elif isinstance(args, SyncAppsCommand.Args):
             command = SyncAppsCommand(args)
+        elif isinstance(args, SyncAppsBatchCommand.Args):
+            command = SyncAppsBatchCommand(args)
         elif isinstance(args, AddPrCommentCommand.Args):
             command = AddPrCommentCommand(args)
         elif isinstance(args, CreatePreviewCommand.Args):
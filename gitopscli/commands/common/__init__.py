@@ -1 +1,3 @@
 from .gitops_config_loader import load_gitops_config
+from .deploy_spool import DeploySpool
+from .apps_index import AppsIndex
@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+APPS_INDEX_VERSION = 1
+
+
+class AppsIndex:
+    # which applications each apps/<name>.yaml of a root repository defines, keyed by the blob hash of the file
+    @dataclass(frozen=True)
+    class Entry:
+        blob: str
+        repository: Any
+        applications: List[str]
+        config: bool  # the file defines its applications below 'config'
+
+    def __init__(self, index_dir: Optional[str], key: str) -> None:
+        self.__path = None
+        if index_dir:
+            self.__path = os.path.join(index_dir, f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json")
+        self.__commit: Optional[str] = None
+        self.__entries: Dict[str, AppsIndex.Entry] = {}
+        self.__load()
+
+    def is_enabled(self) -> bool:
+        return self.__path is not None
+
+    def get_commit(self) -> Optional[str]:
+        return self.__commit
+
+    def get_entries(self) -> Dict[str, Entry]:
+        return dict(self.__entries)
+
+    def get_entry(self, file_name: str, blob: Optional[str]) -> Optional[Entry]:
+        entry = self.__entries.get(file_name)
+        if entry is None or blob is None or entry.blob != blob:
+            return None
+        return entry
+
+    def update(self, commit: str, entries: Dict[str, Entry]) -> None:
+        self.__commit = commit
+        self.__entries = dict(entries)
+        if not self.__path:
+            return
+        os.makedirs(os.path.dirname(self.__path), exist_ok=True)
+        tmp_path = f"{self.__path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as stream:
+            json.dump(
+                {
+                    "version": APPS_INDEX_VERSION,
+                    "commit": commit,
+                    "files": {file_name: asdict(entry) for file_name, entry in entries.items()},
+                },
+                stream,
+            )
+        os.replace(tmp_path, self.__path)  # concurrent runs never see partially written files
+
+    def __load(self) -> None:
+        if not self.__path or not os.path.exists(self.__path):
+            return
+        try:
+            with open(self.__path, "r", encoding="utf-8") as stream:
+                index = json.load(stream)
+            if index["version"] != APPS_INDEX_VERSION:
+                return
+            entries = {file_name: self.Entry(**entry) for file_name, entry in index["files"].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return  # broken index, it is rebuilt by this run
+        self.__commit = index["commit"]
+        self.__entries = entries
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, List, Optional
+from gitopscli.io_api.file_lock import FileLock
+
+# requests and results older than this are dropped, their caller gave up or was killed long ago
+MAX_AGE_SECONDS = 30 * 60
+
+
+class DeploySpool:
+    @dataclass(frozen=True)
+    class Request:
+        request_id: str
+        file: str
+        values: Any
+        single_commit: bool
+        commit_message: Optional[str]
+        git_user: str
+        git_email: str
+        host: str = field(default_factory=socket.gethostname)
+        pid: int = field(default_factory=os.getpid)
+
+    @dataclass(frozen=True)
+    class Result:
+        commits: List[str] = field(default_factory=list)
+        error: Optional[str] = None
+
+    def __init__(self, spool_dir: str, key: str) -> None:
+        self.__dir = os.path.join(spool_dir, hashlib.sha256(key.encode("utf-8")).hexdigest())
+        self.__requests_dir = os.path.join(self.__dir, "requests")
+        self.__results_dir = os.path.join(self.__dir, "results")
+        os.makedirs(self.__requests_dir, exist_ok=True)
+        os.makedirs(self.__results_dir, exist_ok=True)
+
+    @staticmethod
+    def create_request_id() -> str:
+        # sortable by enqueue time, requests are deployed in this order
+        return f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+
+    def enqueue(self, request: Request) -> None:
+        self.__write_json(os.path.join(self.__requests_dir, f"{request.request_id}.json"), asdict(request))
+
+    def lock(self) -> FileLock:
+        # the process holding the lock drains the queue, all others wait for it
+        return FileLock(os.path.join(self.__dir, "leader.lock"))
+
+    def get_requests(self) -> List[Request]:
+        self.__remove_expired_results()
+        requests = []
+        for name in sorted(os.listdir(self.__requests_dir)):
+            if not name.endswith(".json"):
+                continue
+            request = self.Request(**self.__read_json(os.path.join(self.__requests_dir, name)))
+            if not self.__is_caller_alive(request):
+                logging.warning(
+                    "Dropping deployment request %s of terminated process %s", request.request_id, request.pid
+                )
+                os.remove(os.path.join(self.__requests_dir, name))
+            elif self.__get_age_seconds(request) > MAX_AGE_SECONDS:
+                logging.warning("Dropping expired deployment request %s", request.request_id)
+                self.complete(request.request_id, self.Result(error="Deployment request expired."))
+            else:
+                requests.append(request)
+        return requests
+
+    def complete(self, request_id: str, result: Result) -> None:
+        self.__write_json(os.path.join(self.__results_dir, f"{request_id}.json"), asdict(result))
+        os.remove(os.path.join(self.__requests_dir, f"{request_id}.json"))
+
+    def pop_result(self, request_id: str) -> Optional[Result]:
+        result_path = os.path.join(self.__results_dir, f"{request_id}.json")
+        if not os.path.exists(result_path):
+            return None
+        result = self.Result(**self.__read_json(result_path))
+        os.remove(result_path)
+        return result
+
+    def __remove_expired_results(self) -> None:
+        for name in os.listdir(self.__results_dir):
+            result_path = os.path.join(self.__results_dir, name)
+            if time.time() - os.path.getmtime(result_path) > MAX_AGE_SECONDS:
+                os.remove(result_path)
+
+    @staticmethod
+    def __get_age_seconds(request: Request) -> float:
+        enqueue_time_ns = int(request.request_id.split("-", 1)[0])
+        return (time.time_ns() - enqueue_time_ns) / 1e9
+
+    @staticmethod
+    def __is_caller_alive(request: Request) -> bool:
+        if request.host != socket.gethostname():
+            return True  # processes of other hosts can't be checked, only their age expires the request
+        try:
+            os.kill(request.pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass  # process of another user
+        return True
+
+    @staticmethod
+    def __write_json(path: str, content: Any) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as stream:
+            json.dump(content, stream)
+        os.replace(tmp_path, path)  # readers never see partially written files
+
+    @staticmethod
+    def __read_json(path: str) -> Any:
+        with open(path, "r", encoding="utf-8") as stream:
+            return json.load(stream)
@@ -1,16 +1,43 @@
+import logging
+from typing import Any, Optional
 from gitopscli.git_api import GitApiConfig, GitRepo, GitRepoApiFactory
 from gitopscli.gitops_config import GitOpsConfig
 from gitopscli.gitops_exception import GitOpsException
-from gitopscli.io_api.yaml_util import yaml_file_load
+from gitopscli.io_api.yaml_util import yaml_file_load, yaml_load, YAMLException
+from gitopscli.timings import timed
 
+GITOPS_CONFIG_FILE = ".gitops.config.yaml"
 
-def load_gitops_config(git_api_config: GitApiConfig, organisation: str, repository_name: str) -> GitOpsConfig:
+
+@timed("load_gitops_config")
+def load_gitops_config(
+    git_api_config: GitApiConfig, organisation: str, repository_name: str, git_repo: Optional[GitRepo] = None
+) -> GitOpsConfig:
+    # if the config can't be loaded via API the repository is cloned into `git_repo` (if any), so callers can reuse it
     git_repo_api = GitRepoApiFactory.create(git_api_config, organisation, repository_name)
-    with GitRepo(git_repo_api) as git_repo:
-        git_repo.clone()
-        gitops_config_file_path = git_repo.get_full_file_path(".gitops.config.yaml")
+    try:
+        gitops_config_content = git_repo_api.get_file_content(GITOPS_CONFIG_FILE)
+    except GitOpsException as ex:
+        logging.warning("Cannot load %s via API, cloning repository instead: %s", GITOPS_CONFIG_FILE, ex)
+        if git_repo:
+            gitops_config_yaml = __load_gitops_config_yaml_from_clone(git_repo)
+        else:
+            with GitRepo(git_repo_api, git_api_config) as tmp_git_repo:
+                gitops_config_yaml = __load_gitops_config_yaml_from_clone(tmp_git_repo)
+    else:
+        if gitops_config_content is None:
+            raise GitOpsException(f"No such file: {GITOPS_CONFIG_FILE}")
         try:
-            gitops_config_yaml = yaml_file_load(gitops_config_file_path)
-        except FileNotFoundError as ex:
-            raise GitOpsException("No such file: .gitops.config.yaml") from ex
+            gitops_config_yaml = yaml_load(gitops_config_content)
+        except YAMLException as ex:
+            raise GitOpsException(f"Error loading file: {GITOPS_CONFIG_FILE}") from ex
     return GitOpsConfig.from_yaml(gitops_config_yaml)
+
+
+def __load_gitops_config_yaml_from_clone(git_repo: GitRepo) -> Any:
+    git_repo.clone(sparse_paths=[])  # the config file is in the top-level directory
+    gitops_config_file_path = git_repo.get_full_file_path(GITOPS_CONFIG_FILE)
+    try:
+        return yaml_file_load(gitops_config_file_path)
+    except FileNotFoundError as ex:
+        raise GitOpsException(f"No such file: {GITOPS_CONFIG_FILE}") from ex
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from typing import Callable, Optional
 from gitopscli.git_api import GitApiConfig, GitRepoApiFactory
+from gitopscli.timings import timed
 from .create_preview import CreatePreviewCommand
 from .command import Command
 
@@ -20,6 +21,7 @@ class CreatePrPreviewCommand(Command):
     def __init__(self, args: Args) -> None:
         self.__args = args
 
+    @timed("CreatePrPreviewCommand.execute")
     def execute(self) -> None:
         args = self.__args
         git_repo_api = GitRepoApiFactory.create(args, args.organisation, args.repository_name)
@@ -41,6 +43,14 @@ class CreatePrPreviewCommand(Command):
                 repository_name=args.repository_name,
                 git_provider=args.git_provider,
                 git_provider_url=args.git_provider_url,
+                clone_depth=args.clone_depth,
+                clone_single_branch=args.clone_single_branch,
+                clone_filter=args.clone_filter,
+                clone_cache_dir=args.clone_cache_dir,
+                clone_cache_max_size_mb=args.clone_cache_max_size_mb,
+                clone_cache_max_age_days=args.clone_cache_max_age_days,
+                push_retries=args.push_retries,
+                clone_sparse=args.clone_sparse,
                 git_hash=git_hash,
                 preview_id=pr_branch,  # use pr_branch as preview id
             ),
@@ -4,9 +4,11 @@ import shutil
 from dataclasses import dataclass
 from typing import Any, Callable
 from gitopscli.git_api import GitApiConfig, GitRepo, GitRepoApi, GitRepoApiFactory
-from gitopscli.io_api.yaml_util import update_yaml_file, YAMLException, yaml_file_dump
+from gitopscli.io_api.reflink import reflink_tree
+from gitopscli.io_api.yaml_util import update_yaml_value, YAMLException, yaml_file_dump, yaml_file_load
 from gitopscli.gitops_config import GitOpsConfig
 from gitopscli.gitops_exception import GitOpsException
+from gitopscli.timings import timed
 from .common import load_gitops_config
 from .command import Command
 
@@ -39,54 +41,89 @@ class CreatePreviewCommand(Command):
         self.__deployment_updated_callback = deployment_updated_callback
         self.__deployment_created_callback = deployment_created_callback
 
+    @timed("CreatePreviewCommand.execute")
     def execute(self) -> None:
-        gitops_config = self.__get_gitops_config()
-        self.__create_preview_info_file(gitops_config)
-
-        preview_target_git_repo_api = self.__create_preview_target_git_repo_api(gitops_config)
-        with GitRepo(preview_target_git_repo_api) as preview_target_git_repo:
-            preview_target_git_repo.clone(gitops_config.preview_target_branch)
+        with GitRepo(self.__create_app_git_repo_api(), self.__args) as app_git_repo:
+            gitops_config = self.__get_gitops_config(app_git_repo)
+            self.__create_preview_info_file(gitops_config)
 
+            preview_namespace = gitops_config.get_preview_namespace(self.__args.preview_id)
+            preview_target_paths = [preview_namespace]
             if gitops_config.is_preview_template_equal_target():
-                preview_template_repo = preview_target_git_repo
+                preview_target_paths.append(gitops_config.preview_template_path)
+
+            if self.__is_app_git_repo_reusable_as_target(app_git_repo, gitops_config):
+                logging.info("Reusing the clone of the app repository as preview target")
+                app_git_repo.add_sparse_paths(preview_target_paths)
+                self.__create_or_update_preview(app_git_repo, gitops_config)
+                return
+
+        preview_target_git_repo_api = self.__create_preview_target_git_repo_api(gitops_config)
+        with GitRepo(preview_target_git_repo_api, self.__args) as preview_target_git_repo:
+            preview_target_git_repo.clone(gitops_config.preview_target_branch, sparse_paths=preview_target_paths)
+            self.__create_or_update_preview(preview_target_git_repo, gitops_config)
+
+    def __create_or_update_preview(self, preview_target_git_repo: GitRepo, gitops_config: GitOpsConfig) -> None:
+        if gitops_config.is_preview_template_equal_target():
+            preview_template_repo = preview_target_git_repo
+            created_new_preview = self.__create_preview_from_template_if_not_existing(
+                preview_template_repo, preview_target_git_repo, gitops_config
+            )
+        elif gitops_config.is_preview_template_repository_equal_target():
+            # only the branch differs, no need to clone the same repository twice
+            with preview_target_git_repo.create_worktree(
+                gitops_config.preview_template_branch, sparse_paths=[gitops_config.preview_template_path]
+            ) as preview_template_repo:
+                created_new_preview = self.__create_preview_from_template_if_not_existing(
+                    preview_template_repo, preview_target_git_repo, gitops_config
+                )
+        else:
+            preview_template_git_repo_api = self.__create_preview_template_git_repo_api(gitops_config)
+            with GitRepo(preview_template_git_repo_api, self.__args) as preview_template_repo:
+                preview_template_repo.clone(
+                    gitops_config.preview_template_branch, sparse_paths=[gitops_config.preview_template_path]
+                )
                 created_new_preview = self.__create_preview_from_template_if_not_existing(
                     preview_template_repo, preview_target_git_repo, gitops_config
                 )
-            else:
-                preview_template_git_repo_api = self.__create_preview_template_git_repo_api(gitops_config)
-                with GitRepo(preview_template_git_repo_api) as preview_template_repo:
-                    preview_template_repo.clone(gitops_config.preview_template_branch)
-                    created_new_preview = self.__create_preview_from_template_if_not_existing(
-                        preview_template_repo, preview_target_git_repo, gitops_config
-                    )
 
-            any_values_replaced = self.__replace_values(preview_target_git_repo, gitops_config)
-            context = GitOpsConfig.Replacement.PreviewContext(
-                gitops_config, self.__args.preview_id, self.__args.git_hash
-            )
+        any_values_replaced = self.__replace_values(preview_target_git_repo, gitops_config)
+        context = GitOpsConfig.Replacement.PreviewContext(gitops_config, self.__args.preview_id, self.__args.git_hash)
 
-            if not created_new_preview and not any_values_replaced:
-                self.__deployment_already_up_to_date_callback(gitops_config.get_uptodate_message(context))
-                logging.info("The preview is already up-to-date. I'm done here.")
-                return
+        if not created_new_preview and not any_values_replaced:
+            self.__deployment_already_up_to_date_callback(gitops_config.get_uptodate_message(context))
+            logging.info("The preview is already up-to-date. I'm done here.")
+            return
 
-            self.__commit_and_push(
-                preview_target_git_repo,
-                f"{'Create new' if created_new_preview else 'Update'} preview environment for "
-                f"'{gitops_config.application_name}' and git hash '{self.__args.git_hash}'.",
-            )
+        self.__commit_and_push(
+            preview_target_git_repo,
+            f"{'Create new' if created_new_preview else 'Update'} preview environment for "
+            f"'{gitops_config.application_name}' and git hash '{self.__args.git_hash}'.",
+        )
 
-            if created_new_preview:
-                self.__deployment_created_callback(gitops_config.get_created_message(context))
-            else:
-                self.__deployment_updated_callback(gitops_config.get_updated_message(context))
+        if created_new_preview:
+            self.__deployment_created_callback(gitops_config.get_created_message(context))
+        else:
+            self.__deployment_updated_callback(gitops_config.get_updated_message(context))
+
+    def __is_app_git_repo_reusable_as_target(self, app_git_repo: GitRepo, gitops_config: GitOpsConfig) -> bool:
+        # the app repository is only cloned (default branch) if the gitops config can't be loaded via API
+        return (
+            app_git_repo.is_cloned()
+            and gitops_config.preview_target_organisation == self.__args.organisation
+            and gitops_config.preview_target_repository == self.__args.repository_name
+            and gitops_config.preview_target_branch is None
+        )
 
     def __commit_and_push(self, git_repo: GitRepo, message: str) -> None:
         git_repo.commit(self.__args.git_user, self.__args.git_email, message)
         git_repo.push()
 
-    def __get_gitops_config(self) -> GitOpsConfig:
-        return load_gitops_config(self.__args, self.__args.organisation, self.__args.repository_name)
+    def __get_gitops_config(self, app_git_repo: GitRepo) -> GitOpsConfig:
+        return load_gitops_config(self.__args, self.__args.organisation, self.__args.repository_name, app_git_repo)
+
+    def __create_app_git_repo_api(self) -> GitRepoApi:
+        return GitRepoApiFactory.create(self.__args, self.__args.organisation, self.__args.repository_name)
 
     def __create_preview_template_git_repo_api(self, gitops_config: GitOpsConfig) -> GitRepoApi:
         return GitRepoApiFactory.create(
@@ -98,6 +135,7 @@ class CreatePreviewCommand(Command):
             self.__args, gitops_config.preview_target_organisation, gitops_config.preview_target_repository
         )
 
+    @timed("CreatePreviewCommand.copy_template")
     def __create_preview_from_template_if_not_existing(
         self, template_git_repo: GitRepo, target_git_repo: GitRepo, gitops_config: GitOpsConfig
     ) -> bool:
@@ -112,49 +150,68 @@ class CreatePreviewCommand(Command):
         if not os.path.isdir(full_preview_template_folder_path):
             raise GitOpsException(f"The preview template folder does not exist: {gitops_config.preview_template_path}")
         logging.info("Using the preview template folder: %s", gitops_config.preview_template_path)
+        # templates may contain large files: share their data blocks or write them straight from the git objects
+        if reflink_tree(full_preview_template_folder_path, full_preview_folder_path):
+            return True
+        if gitops_config.is_preview_template_repository_equal_target() and target_git_repo.checkout_tree_from(
+            template_git_repo, gitops_config.preview_template_path, preview_namespace
+        ):
+            return True
         shutil.copytree(full_preview_template_folder_path, full_preview_folder_path)
         return True
 
+    @timed("CreatePreviewCommand.replace_values")
     def __replace_values(self, git_repo: GitRepo, gitops_config: GitOpsConfig) -> bool:
         preview_id = self.__args.preview_id
         preview_folder_name = gitops_config.get_preview_namespace(self.__args.preview_id)
         context = GitOpsConfig.Replacement.PreviewContext(gitops_config, preview_id, self.__args.git_hash)
         any_value_replaced = False
         for file, replacements in gitops_config.replacements.items():
+            if not replacements:
+                continue  # nothing to replace, the file doesn't need to be loaded
+            file_path = f"{preview_folder_name}/{file}"
+            full_file_path = git_repo.get_full_file_path(file_path)
+            yaml = self.__load_yaml_file(full_file_path, file_path)
+            any_value_replaced_in_file = False
             for replacement in replacements:
                 replacement_value = replacement.get_value(context)
-                value_replaced = self.__update_yaml_file(
-                    git_repo, f"{preview_folder_name}/{file}", replacement.path, replacement_value
-                )
+                value_replaced = self.__update_yaml_value(yaml, file_path, replacement.path, replacement_value)
                 if value_replaced:
-                    any_value_replaced = True
+                    any_value_replaced_in_file = True
                     logging.info(
                         "Replaced property '%s' in '%s' with value: %s", replacement.path, file, replacement_value
                     )
                 else:
                     logging.info("Keep property '%s' in '%s' value: %s", replacement.path, file, replacement_value)
+            if any_value_replaced_in_file:
+                yaml_file_dump(yaml, full_file_path)
+                any_value_replaced = True
         return any_value_replaced
 
     def __create_preview_info_file(self, gitops_config: GitOpsConfig) -> None:
-        preview_id = self.__args.preview_id
+        preview_identity = gitops_config.get_preview_identity(self.__args.preview_id)
         yaml_file_dump(
             {
-                "previewId": preview_id,
-                "previewIdHash": gitops_config.create_preview_id_hash(preview_id),
-                "routeHost": gitops_config.get_preview_host(preview_id),
-                "namespace": gitops_config.get_preview_namespace(preview_id),
+                "previewId": preview_identity.preview_id,
+                "previewIdHash": preview_identity.preview_id_hash,
+                "routeHost": preview_identity.host,
+                "namespace": preview_identity.namespace,
             },
             "/tmp/gitopscli-preview-info.yaml",
         )
 
     @staticmethod
-    def __update_yaml_file(git_repo: GitRepo, file_path: str, key: str, value: Any) -> bool:
-        full_file_path = git_repo.get_full_file_path(file_path)
+    def __load_yaml_file(full_file_path: str, file_path: str) -> Any:
         try:
-            return update_yaml_file(full_file_path, key, value)
+            return yaml_file_load(full_file_path)
         except (FileNotFoundError, IsADirectoryError) as ex:
             raise GitOpsException(f"No such file: {file_path}") from ex
         except YAMLException as ex:
             raise GitOpsException(f"Error loading file: {file_path}") from ex
+
+    @staticmethod
+    def __update_yaml_value(yaml: Any, file_path: str, key: str, value: Any) -> bool:
+        try:
+            return update_yaml_value(yaml, key, value)
         except KeyError as ex:
             raise GitOpsException(f"Key '{key}' not found in file: {file_path}") from ex
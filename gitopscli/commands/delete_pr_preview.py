@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from gitopscli.git_api import GitApiConfig
+from gitopscli.timings import timed
 from .delete_preview import DeletePreviewCommand
 from .command import Command
 
@@ -19,6 +20,7 @@ class DeletePrPreviewCommand(Command):
     def __init__(self, args: Args) -> None:
         self.__args = args
 
+    @timed("DeletePrPreviewCommand.execute")
     def execute(self) -> None:
         args = self.__args
         DeletePreviewCommand(
@@ -31,6 +33,14 @@ class DeletePrPreviewCommand(Command):
                 repository_name=args.repository_name,
                 git_provider=args.git_provider,
                 git_provider_url=args.git_provider_url,
+                clone_depth=args.clone_depth,
+                clone_single_branch=args.clone_single_branch,
+                clone_filter=args.clone_filter,
+                clone_cache_dir=args.clone_cache_dir,
+                clone_cache_max_size_mb=args.clone_cache_max_size_mb,
+                clone_cache_max_age_days=args.clone_cache_max_age_days,
+                push_retries=args.push_retries,
+                clone_sparse=args.clone_sparse,
                 preview_id=args.branch,  # use branch as preview id
                 expect_preview_exists=args.expect_preview_exists,
             )
@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from gitopscli.git_api import GitApiConfig, GitRepo, GitRepoApiFactory, GitRepoApi
 from gitopscli.gitops_config import GitOpsConfig
 from gitopscli.gitops_exception import GitOpsException
+from gitopscli.timings import timed
 from .common import load_gitops_config
 from .command import Command
 
@@ -24,15 +25,16 @@ class DeletePreviewCommand(Command):
     def __init__(self, args: Args) -> None:
         self.__args = args
 
+    @timed("DeletePreviewCommand.execute")
     def execute(self) -> None:
         gitops_config = self.__get_gitops_config()
         preview_id = self.__args.preview_id
 
         preview_target_git_repo_api = self.__create_preview_target_git_repo_api(gitops_config)
-        with GitRepo(preview_target_git_repo_api) as preview_target_git_repo:
-            preview_target_git_repo.clone(gitops_config.preview_target_branch)
-
+        with GitRepo(preview_target_git_repo_api, self.__args) as preview_target_git_repo:
             preview_namespace = gitops_config.get_preview_namespace(preview_id)
+            preview_target_git_repo.clone(gitops_config.preview_target_branch, sparse_paths=[preview_namespace])
+
             logging.info("Preview folder name: %s", preview_namespace)
 
             preview_folder_exists = self.__delete_folder_if_exists(preview_target_git_repo, preview_namespace)
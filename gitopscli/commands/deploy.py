@@ -1,17 +1,26 @@
 import json
 import logging
+import os
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Any, Dict, Optional, Tuple, Literal, List
-from gitopscli.git_api import GitApiConfig, GitRepo, GitRepoApi, GitRepoApiFactory
-from gitopscli.io_api.yaml_util import update_yaml_file, yaml_dump, YAMLException
+from gitopscli.git_api import GitApiConfig, GitProvider, GitRepo, GitRepoApi, GitRepoApiFactory
+from gitopscli.io_api.yaml_util import (
+    update_yaml_file_values,
+    update_yaml_value,
+    yaml_dump,
+    yaml_load,
+    YAMLException,
+)
 from gitopscli.gitops_exception import GitOpsException
+from gitopscli.timings import timed
+from .common import DeploySpool
 from .command import Command
 
 
 class DeployCommand(Command):
     @dataclass(frozen=True)
-    class Args(GitApiConfig):
+    class Args(GitApiConfig):  # pylint: disable=too-many-instance-attributes
         git_user: str
         git_email: str
 
@@ -29,53 +38,224 @@ class DeployCommand(Command):
         json: bool
 
         merge_method: Literal["squash", "rebase", "merge"] = "merge"
+        api_commit: bool = False
+        spool_dir: Optional[str] = None
 
     def __init__(self, args: Args) -> None:
         self.__args = args
         self.__commit_hashes: List[str] = []
+        self.__pr_branch: Optional[str] = None
 
+    @timed("DeployCommand.execute")
     def execute(self) -> None:
-        git_repo_api = self.__create_git_repo_api()
-        with GitRepo(git_repo_api) as git_repo:
-            git_repo.clone()
+        updated = self.__deploy_via_spool(self.__args.spool_dir) if self.__args.spool_dir else self.__deploy()
+        if not updated:
+            logging.info("All values already up-to-date. I'm done here.")
+            return
 
-            if self.__args.create_pr:
-                pr_branch = f"gitopscli-deploy-{str(uuid.uuid4())[:8]}"
-                git_repo.new_branch(pr_branch)
+        if self.__args.json:
+            print(json.dumps({"commits": [{"hash": h} for h in self.__commit_hashes]}, indent=4))
 
-            updated_values = self.__update_values(git_repo)
-            if not updated_values:
-                logging.info("All values already up-to-date. I'm done here.")
-                return
+    def get_commit_hashes(self) -> List[str]:
+        return list(self.__commit_hashes)
 
-            git_repo.push()
+    def __deploy(self) -> bool:
+        git_repo_api = self.__create_git_repo_api()
+        updated_values = self.__commit_via_api(git_repo_api) if self.__args.api_commit else None
+        if updated_values is None:
+            updated_values = self.__commit_via_clone(git_repo_api)
+        if not updated_values:
+            return False
 
-        if self.__args.create_pr:
+        pr_branch = self.__pr_branch
+        if pr_branch:
             title, description = self.__create_pull_request_title_and_description(updated_values)
             pr_id = git_repo_api.create_pull_request_to_default_branch(pr_branch, title, description).pr_id
 
             if self.__args.auto_merge:
                 git_repo_api.merge_pull_request(pr_id, self.__args.merge_method)
                 git_repo_api.delete_branch(pr_branch)
+        return True
 
-        if self.__args.json:
-            print(json.dumps({"commits": [{"hash": h} for h in self.__commit_hashes]}, indent=4))
+    def __deploy_via_spool(self, spool_dir: str) -> bool:
+        args = self.__args
+        if args.create_pr:
+            raise GitOpsException("Deployments via spool directory can't create pull requests.")
+        spool = DeploySpool(
+            spool_dir, f"{args.git_provider}|{args.git_provider_url}|{args.organisation}/{args.repository_name}"
+        )
+        request = DeploySpool.Request(
+            request_id=DeploySpool.create_request_id(),
+            file=args.file,
+            values=args.values,
+            single_commit=args.single_commit,
+            commit_message=args.commit_message,
+            git_user=args.git_user,
+            git_email=args.git_email,
+        )
+        spool.enqueue(request)
+        with spool.lock():
+            result = spool.pop_result(request.request_id)
+            if result is None:
+                # no other process deployed our request in the meantime, so we deploy the whole queue
+                self.__drain_spool(spool)
+                result = spool.pop_result(request.request_id)
+        if result is None:
+            raise GitOpsException("Deployment request was not processed.")
+        if result.error:
+            raise GitOpsException(result.error)
+        self.__commit_hashes.extend(result.commits)
+        return bool(result.commits)
+
+    def __drain_spool(self, spool: DeploySpool) -> None:
+        args = self.__args
+        requests = spool.get_requests()
+        logging.info("Deploying %s queued request(s) to %s/%s", len(requests), args.organisation, args.repository_name)
+        results: Dict[str, DeploySpool.Result] = {}
+        try:
+            with GitRepo(self.__create_git_repo_api(), args) as git_repo:
+                git_repo.clone(sparse_paths=[os.path.dirname(request.file) for request in requests])
+
+                def deploy_requests() -> None:
+                    for request in requests:
+                        results[request.request_id] = self.__deploy_spooled_request(git_repo, request)
+
+                deploy_requests()
+                if any(result.commits for result in results.values()):
+                    git_repo.push(recommit=deploy_requests)
+        except GitOpsException as ex:
+            results = {request.request_id: DeploySpool.Result(error=str(ex)) for request in requests}
+        for request_id, result in results.items():
+            spool.complete(request_id, result)
+
+    def __deploy_spooled_request(self, git_repo: GitRepo, request: DeploySpool.Request) -> DeploySpool.Result:
+        command = DeployCommand(
+            replace(
+                self.__args,
+                file=request.file,
+                values=request.values,
+                single_commit=request.single_commit,
+                commit_message=request.commit_message,
+                git_user=request.git_user,
+                git_email=request.git_email,
+            )
+        )
+        try:
+            command.update_values(git_repo)
+        except GitOpsException as ex:
+            # drop the commits of the failed request, the other requests are deployed anyway
+            git_repo.reset_hard(f"HEAD~{len(command.get_commit_hashes())}")
+            logging.error("Deployment of %s failed: %s", request.file, ex)
+            return DeploySpool.Result(error=str(ex))
+        return DeploySpool.Result(commits=command.get_commit_hashes())
 
     def __create_git_repo_api(self) -> GitRepoApi:
         return GitRepoApiFactory.create(self.__args, self.__args.organisation, self.__args.repository_name)
 
-    def __update_values(self, git_repo: GitRepo) -> Dict[str, Any]:
+    def __commit_via_clone(self, git_repo_api: GitRepoApi) -> Dict[str, Any]:
+        with GitRepo(git_repo_api, self.__args) as git_repo:
+            git_repo.clone(sparse_paths=[os.path.dirname(self.__args.file)])
+
+            if self.__args.create_pr:
+                self.__pr_branch = self.__create_pr_branch_name()
+                git_repo.new_branch(self.__pr_branch)
+
+            updated_values = self.update_values(git_repo)
+            if updated_values:
+                git_repo.push(recommit=lambda: self.__recommit_values(git_repo))
+        return updated_values
+
+    def __commit_via_api(self, git_repo_api: GitRepoApi) -> Optional[Dict[str, Any]]:
+        # returns None if the deployment has to fall back to cloning the repository
+        args = self.__args
+        if args.git_provider is GitProvider.BITBUCKET:
+            # checked upfront, the file would be read in vain (see BitbucketGitRepoApiAdapter.commit_file)
+            logging.info("Committing files via API is not supported by Bitbucket Server, falling back to clone")
+            return None
+        try:
+            default_branch = git_repo_api.get_default_branch()
+            parent_hash = git_repo_api.get_branch_head_hash(default_branch)
+            content = git_repo_api.get_file_content(args.file, parent_hash)
+        except GitOpsException as ex:
+            logging.warning("Reading %s via API failed, falling back to clone: %s", args.file, ex)
+            return None
+        if content is None:
+            raise GitOpsException(f"No such file: {args.file}")
+        try:
+            yaml = yaml_load(content)
+        except YAMLException as ex:
+            raise GitOpsException(f"Error loading file: {args.file}") from ex
+
+        updated_values = self.__update_yaml_values(yaml)
+        if not updated_values:
+            return updated_values
+        if len(updated_values) > 1 and not (args.single_commit or args.commit_message):
+            # one commit per value, the API would need a roundtrip for each of them
+            logging.info("Multiple commits required, falling back to clone")
+            return None
+
+        pr_branch = self.__create_pr_branch_name() if args.create_pr else None
+        try:
+            commit_hash = git_repo_api.commit_file(
+                branch=pr_branch or default_branch,
+                source_branch=default_branch,
+                parent_hash=parent_hash,
+                path=args.file,
+                content=f"{yaml_dump(yaml)}\n",
+                message=self.__create_commit_message(updated_values),
+                git_user=args.git_user,
+                git_email=args.git_email,
+            )
+        except GitOpsException as ex:
+            logging.warning("Committing %s via API failed, falling back to clone: %s", args.file, ex)
+            return None
+        self.__commit_hashes.append(commit_hash)
+        self.__pr_branch = pr_branch
+        return updated_values
+
+    def update_values(self, git_repo: GitRepo) -> Dict[str, Any]:
+        # commits the values to the already cloned repository, the caller pushes the commits
         args = self.__args
         single_commit = args.single_commit or args.commit_message
         full_file_path = git_repo.get_full_file_path(args.file)
-        updated_values = {}
+
+        def commit_value(key: str, value: Any) -> None:
+            logging.info("Updated yaml property %s to %s", key, value)
+            self.__commit(git_repo, f"changed '{key}' to '{value}' in {args.file}")
+
+        try:
+            updated_keys = update_yaml_file_values(
+                full_file_path, list(args.values.items()), on_value_updated=None if single_commit else commit_value
+            )
+        except (FileNotFoundError, IsADirectoryError) as ex:
+            raise GitOpsException(f"No such file: {args.file}") from ex
+        except YAMLException as ex:
+            raise GitOpsException(f"Error loading file: {args.file}") from ex
+        except KeyError as ex:
+            raise GitOpsException(str(ex)) from ex
+
+        updated_values = {key: value for key, value in args.values.items() if key in updated_keys}
         for key, value in args.values.items():
+            if key not in updated_keys:
+                logging.info("Yaml property %s already up-to-date", key)
+            elif single_commit:
+                logging.info("Updated yaml property %s to %s", key, value)
+
+        if single_commit and updated_values:
+            self.__commit(git_repo, self.__create_commit_message(updated_values))
+
+        return updated_values
+
+    def __recommit_values(self, git_repo: GitRepo) -> None:
+        # the push was rejected, the values are updated again on top of the new head of the branch
+        self.__commit_hashes.clear()
+        self.update_values(git_repo)
+
+    def __update_yaml_values(self, yaml: Any) -> Dict[str, Any]:
+        updated_values = {}
+        for key, value in self.__args.values.items():
             try:
-                updated_value = update_yaml_file(full_file_path, key, value)
-            except (FileNotFoundError, IsADirectoryError) as ex:
-                raise GitOpsException(f"No such file: {args.file}") from ex
-            except YAMLException as ex:
-                raise GitOpsException(f"Error loading file: {args.file}") from ex
+                updated_value = update_yaml_value(yaml, key, value)
             except KeyError as ex:
                 raise GitOpsException(str(ex)) from ex
 
@@ -85,23 +265,23 @@ class DeployCommand(Command):
 
             logging.info("Updated yaml property %s to %s", key, value)
             updated_values[key] = value
+        return updated_values
 
-            if not single_commit:
-                self.__commit(git_repo, f"changed '{key}' to '{value}' in {args.file}")
-
-        if single_commit and updated_values:
-            if args.commit_message:
-                message = args.commit_message
-            elif len(updated_values) == 1:
-                key, value = list(updated_values.items())[0]
-                message = f"changed '{key}' to '{value}' in {args.file}"
-            else:
-                updates_count = len(updated_values)
-                message = f"updated {updates_count} value{'s' if updates_count > 1 else ''} in {args.file}"
-                message += f"\n\n{yaml_dump(updated_values)}"
-            self.__commit(git_repo, message)
+    def __create_commit_message(self, updated_values: Dict[str, Any]) -> str:
+        args = self.__args
+        if args.commit_message:
+            return args.commit_message
+        if len(updated_values) == 1:
+            key, value = list(updated_values.items())[0]
+            return f"changed '{key}' to '{value}' in {args.file}"
+        updates_count = len(updated_values)
+        message = f"updated {updates_count} value{'s' if updates_count > 1 else ''} in {args.file}"
+        message += f"\n\n{yaml_dump(updated_values)}"
+        return message
 
-        return updated_values
+    @staticmethod
+    def __create_pr_branch_name() -> str:
+        return f"gitopscli-deploy-{str(uuid.uuid4())[:8]}"
 
     def __create_pull_request_title_and_description(self, updated_values: Dict[str, Any]) -> Tuple[str, str]:
         updated_file_name = self.__args.file
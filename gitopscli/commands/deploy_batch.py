@@ -0,0 +1,165 @@
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Literal, Optional, Tuple
+from gitopscli.git_api import GitApiConfig
+from gitopscli.io_api.yaml_util import yaml_file_load, YAMLException
+from gitopscli.gitops_exception import GitOpsException
+from gitopscli.timings import timed
+from .deploy import DeployCommand
+from .command import Command
+
+
+class DeployBatchCommand(Command):
+    @dataclass(frozen=True)
+    class Args(GitApiConfig):
+        git_user: str
+        git_email: str
+
+        manifest: str
+        max_workers: int
+
+        single_commit: bool
+        create_pr: bool
+        auto_merge: bool
+
+        merge_method: Literal["squash", "rebase", "merge"] = "merge"
+
+    @dataclass(frozen=True)
+    class Entry:
+        organisation: str
+        repository_name: str
+        file: str
+        values: Any
+        commit_message: Optional[str] = None
+
+    @dataclass
+    class Result:
+        organisation: str
+        repository_name: str
+        file: str
+        status: Literal["updated", "unchanged", "failed"] = "unchanged"
+        commits: List[str] = field(default_factory=list)
+        error: Optional[str] = None
+
+    def __init__(self, args: Args) -> None:
+        self.__args = args
+
+    @timed("DeployBatchCommand.execute")
+    def execute(self) -> None:
+        entries = self.__load_manifest()
+        results: Dict[int, DeployBatchCommand.Result] = {}
+
+        # entries targeting the same repository run sequentially in one worker to avoid conflicting pushes
+        repo_groups: Dict[Tuple[str, str], List[Tuple[int, DeployBatchCommand.Entry]]] = {}
+        for index, entry in enumerate(entries):
+            repo_groups.setdefault((entry.organisation, entry.repository_name), []).append((index, entry))
+
+        with ThreadPoolExecutor(max_workers=self.__args.max_workers) as executor:
+            futures = [executor.submit(self.__deploy_group, group) for group in repo_groups.values()]
+            for future in futures:
+                results.update(future.result())
+
+        ordered_results = [results[index] for index in range(len(entries))]
+        print(json.dumps({"results": [self.__result_to_json(r) for r in ordered_results]}, indent=4))
+
+        failed_count = sum(1 for r in ordered_results if r.status == "failed")
+        if failed_count:
+            raise GitOpsException(f"{failed_count} of {len(ordered_results)} deployments failed")
+
+    def __deploy_group(self, group: List[Tuple[int, Entry]]) -> Dict[int, Result]:
+        return {index: self.__deploy(entry) for index, entry in group}
+
+    def __deploy(self, entry: Entry) -> Result:
+        args = self.__args
+        result = self.Result(organisation=entry.organisation, repository_name=entry.repository_name, file=entry.file)
+        deploy_command = DeployCommand(
+            DeployCommand.Args(
+                username=args.username,
+                password=args.password,
+                git_user=args.git_user,
+                git_email=args.git_email,
+                organisation=entry.organisation,
+                repository_name=entry.repository_name,
+                git_provider=args.git_provider,
+                git_provider_url=args.git_provider_url,
+                clone_depth=args.clone_depth,
+                clone_single_branch=args.clone_single_branch,
+                clone_filter=args.clone_filter,
+                clone_cache_dir=args.clone_cache_dir,
+                clone_cache_max_size_mb=args.clone_cache_max_size_mb,
+                clone_cache_max_age_days=args.clone_cache_max_age_days,
+                push_retries=args.push_retries,
+                clone_sparse=args.clone_sparse,
+                file=entry.file,
+                values=entry.values,
+                single_commit=args.single_commit,
+                commit_message=entry.commit_message,
+                create_pr=args.create_pr,
+                auto_merge=args.auto_merge,
+                merge_method=args.merge_method,
+                json=False,
+            )
+        )
+        try:
+            deploy_command.execute()
+        except GitOpsException as ex:
+            logging.error("Deployment to %s/%s failed: %s", entry.organisation, entry.repository_name, ex)
+            result.status = "failed"
+            result.error = str(ex)
+        except Exception as ex:  # pylint: disable=broad-except
+            # an unexpected error must not abort the other deployments of the batch and their summary
+            logging.exception("Deployment to %s/%s failed", entry.organisation, entry.repository_name)
+            result.status = "failed"
+            result.error = f"{type(ex).__name__}: {ex}"
+        result.commits = deploy_command.get_commit_hashes()
+        if result.status != "failed" and result.commits:
+            result.status = "updated"
+        return result
+
+    def __load_manifest(self) -> List[Entry]:
+        try:
+            manifest = yaml_file_load(self.__args.manifest)
+        except (FileNotFoundError, IsADirectoryError) as ex:
+            raise GitOpsException(f"No such file: {self.__args.manifest}") from ex
+        except YAMLException as ex:
+            raise GitOpsException(f"Error loading file: {self.__args.manifest}") from ex
+
+        deployments = manifest.get("deployments") if isinstance(manifest, dict) else None
+        if not isinstance(deployments, list):
+            raise GitOpsException(f"Item 'deployments' should be a list in manifest: {self.__args.manifest}")
+        return [self.__parse_entry(index, item) for index, item in enumerate(deployments)]
+
+    @staticmethod
+    def __parse_entry(index: int, item: Any) -> Entry:
+        if not isinstance(item, dict):
+            raise GitOpsException(f"Item 'deployments.[{index}]' should be an object in manifest!")
+        for key in ("organisation", "repository", "file"):
+            if not isinstance(item.get(key), str):
+                raise GitOpsException(f"Item 'deployments.[{index}].{key}' should be a string in manifest!")
+        if not isinstance(item.get("values"), dict):
+            raise GitOpsException(f"Item 'deployments.[{index}].values' should be an object in manifest!")
+        commit_message = item.get("commitMessage")
+        if commit_message is not None and not isinstance(commit_message, str):
+            raise GitOpsException(f"Item 'deployments.[{index}].commitMessage' should be a string in manifest!")
+        return DeployBatchCommand.Entry(
+            organisation=item["organisation"],
+            repository_name=item["repository"],
+            file=item["file"],
+            values=item["values"],
+            commit_message=commit_message,
+        )
+
+    @staticmethod
+    def __result_to_json(result: Result) -> Dict[str, Any]:
+        result_json: Dict[str, Any] = {
+            "organisation": result.organisation,
+            "repository": result.repository_name,
+            "file": result.file,
+            "status": result.status,
+            "commits": [{"hash": h} for h in result.commits],
+        }
+        if result.error is not None:
+            result_json["error"] = result.error
+        return result_json
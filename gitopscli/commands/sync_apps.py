@@ -1,10 +1,11 @@
 import logging
-import os
 from dataclasses import dataclass
-from typing import Any, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 from gitopscli.git_api import GitApiConfig, GitRepo, GitRepoApiFactory
-from gitopscli.io_api.yaml_util import merge_yaml_element, yaml_file_load
+from gitopscli.io_api.yaml_util import merge_yaml_element, yaml_file_load_safe, yaml_files_load_safe
 from gitopscli.gitops_exception import GitOpsException
+from gitopscli.timings import timed
+from .common import AppsIndex
 from .command import Command
 
 
@@ -20,9 +21,12 @@ class SyncAppsCommand(Command):
         root_organisation: str
         root_repository_name: str
 
+        apps_index_dir: Optional[str] = None
+
     def __init__(self, args: Args) -> None:
         self.__args = args
 
+    @timed("SyncAppsCommand.execute")
     def execute(self) -> None:
         _sync_apps_command(self.__args)
 
@@ -30,16 +34,16 @@ class SyncAppsCommand(Command):
 def _sync_apps_command(args: SyncAppsCommand.Args) -> None:
     team_config_git_repo_api = GitRepoApiFactory.create(args, args.organisation, args.repository_name)
     root_config_git_repo_api = GitRepoApiFactory.create(args, args.root_organisation, args.root_repository_name)
-    with GitRepo(team_config_git_repo_api) as team_config_git_repo:
-        with GitRepo(root_config_git_repo_api) as root_config_git_repo:
-            __sync_apps(team_config_git_repo, root_config_git_repo, args.git_user, args.git_email)
+    with GitRepo(team_config_git_repo_api, args) as team_config_git_repo:
+        with GitRepo(root_config_git_repo_api, args) as root_config_git_repo:
+            __sync_apps(team_config_git_repo, root_config_git_repo, args)
 
 
-def __sync_apps(team_config_git_repo: GitRepo, root_config_git_repo: GitRepo, git_user: str, git_email: str) -> None:
+def __sync_apps(team_config_git_repo: GitRepo, root_config_git_repo: GitRepo, args: SyncAppsCommand.Args) -> None:
     logging.info("Team config repository: %s", team_config_git_repo.get_clone_url())
     logging.info("Root config repository: %s", root_config_git_repo.get_clone_url())
 
-    repo_apps = __get_repo_apps(team_config_git_repo)
+    repo_apps = get_repo_apps(team_config_git_repo)
     logging.info("Found %s app(s) in apps repository: %s", len(repo_apps), ", ".join(repo_apps))
 
     logging.info("Searching apps repository in root repository's 'apps/' directory...")
@@ -49,7 +53,7 @@ def __sync_apps(team_config_git_repo: GitRepo, root_config_git_repo: GitRepo, gi
         current_repo_apps,
         apps_from_other_repos,
         found_apps_path,
-    ) = __find_apps_config_from_repo(team_config_git_repo, root_config_git_repo)
+    ) = __find_apps_config_from_repo(team_config_git_repo, root_config_git_repo, args.apps_index_dir)
 
     if current_repo_apps == repo_apps:
         logging.info("Root repository already up-to-date. I'm done here.")
@@ -58,42 +62,29 @@ def __sync_apps(team_config_git_repo: GitRepo, root_config_git_repo: GitRepo, gi
     __check_if_app_already_exists(repo_apps, apps_from_other_repos)
 
     logging.info("Sync applications in root repository's %s.", apps_config_file_name)
-    merge_yaml_element(apps_config_file, found_apps_path, {repo_app: {} for repo_app in repo_apps})
-    __commit_and_push(team_config_git_repo, root_config_git_repo, git_user, git_email, apps_config_file_name)
+    if not merge_yaml_element(apps_config_file, found_apps_path, {repo_app: {} for repo_app in repo_apps}):
+        logging.info("Root repository already up-to-date. I'm done here.")
+        return
+    __commit_and_push(team_config_git_repo, root_config_git_repo, args.git_user, args.git_email, apps_config_file_name)
 
 
 def __find_apps_config_from_repo(
-    team_config_git_repo: GitRepo, root_config_git_repo: GitRepo
+    team_config_git_repo: GitRepo, root_config_git_repo: GitRepo, apps_index_dir: Optional[str]
 ) -> Tuple[str, str, Set[str], Set[str], str]:
     apps_from_other_repos: Set[str] = set()  # Set for all entries in .applications from each config repository
     found_app_config_file = None
     found_app_config_file_name = None
-    found_apps_path = "applications"
     found_app_config_apps: Set[str] = set()
-    bootstrap_entries = __get_bootstrap_entries(root_config_git_repo)
+    apps_configs = load_apps_configs(root_config_git_repo, apps_index_dir)
     team_config_git_repo_clone_url = team_config_git_repo.get_clone_url()
-    for bootstrap_entry in bootstrap_entries:
-        if "name" not in bootstrap_entry:
-            raise GitOpsException("Every bootstrap entry must have a 'name' property.")
-        app_file_name = "apps/" + bootstrap_entry["name"] + ".yaml"
-        logging.info("Analyzing %s in root repository", app_file_name)
-        app_config_file = root_config_git_repo.get_full_file_path(app_file_name)
-        try:
-            app_config_content = yaml_file_load(app_config_file)
-        except FileNotFoundError as ex:
-            raise GitOpsException(f"File '{app_file_name}' not found in root repository.") from ex
-        if "config" in app_config_content:
-            app_config_content = app_config_content["config"]
-            found_apps_path = "config.applications"
-        if "repository" not in app_config_content:
-            raise GitOpsException(f"Cannot find key 'repository' in '{app_file_name}'")
-        if app_config_content["repository"] == team_config_git_repo_clone_url:
+    for app_file_name, apps_config in apps_configs.items():
+        if apps_config.repository == team_config_git_repo_clone_url:
             logging.info("Found apps repository in %s", app_file_name)
-            found_app_config_file = app_config_file
+            found_app_config_file = root_config_git_repo.get_full_file_path(app_file_name)
             found_app_config_file_name = app_file_name
-            found_app_config_apps = __get_applications_from_app_config(app_config_content)
+            found_app_config_apps = set(apps_config.applications)
         else:
-            apps_from_other_repos.update(__get_applications_from_app_config(app_config_content))
+            apps_from_other_repos.update(apps_config.applications)
 
     if found_app_config_file is None or found_app_config_file_name is None:
         raise GitOpsException("Couldn't find config file for apps repository in root repository's 'apps/' directory")
@@ -103,7 +94,77 @@ def __find_apps_config_from_repo(
         found_app_config_file_name,
         found_app_config_apps,
         apps_from_other_repos,
-        found_apps_path,
+        get_apps_path(apps_configs),
+    )
+
+
+def load_apps_configs(root_config_git_repo: GitRepo, apps_index_dir: Optional[str]) -> Dict[str, AppsIndex.Entry]:
+    # clones the root repository and returns the repository and applications of each apps/*.yaml file (bootstrap order)
+    bootstrap_entries = __get_bootstrap_entries(root_config_git_repo)
+    app_file_names = [
+        "apps/" + bootstrap_entry["name"] + ".yaml" if "name" in bootstrap_entry else None
+        for bootstrap_entry in bootstrap_entries
+    ]
+
+    # only the files which changed since the last run are parsed (in parallel), errors are raised in entry order
+    apps_index = AppsIndex(apps_index_dir, root_config_git_repo.get_clone_url())
+    commit, blobs = __get_app_file_blobs(root_config_git_repo, apps_index, app_file_names)
+    changed_app_config_files = [
+        root_config_git_repo.get_full_file_path(app_file_name)
+        for app_file_name in app_file_names
+        if app_file_name is not None and apps_index.get_entry(app_file_name, blobs.get(app_file_name)) is None
+    ]
+    changed_app_config_contents = yaml_files_load_safe(changed_app_config_files)
+    apps_configs: Dict[str, AppsIndex.Entry] = {}
+
+    for app_file_name in app_file_names:
+        if app_file_name is None:
+            raise GitOpsException("Every bootstrap entry must have a 'name' property.")
+        logging.info("Analyzing %s in root repository", app_file_name)
+        apps_config = apps_index.get_entry(app_file_name, blobs.get(app_file_name))
+        if apps_config is None:
+            try:
+                app_config_content = next(changed_app_config_contents)
+            except FileNotFoundError as ex:
+                raise GitOpsException(f"File '{app_file_name}' not found in root repository.") from ex
+            apps_config = __create_apps_index_entry(app_file_name, blobs.get(app_file_name, ""), app_config_content)
+        apps_configs[app_file_name] = apps_config
+
+    if commit is not None:
+        apps_index.update(commit, apps_configs)
+    return apps_configs
+
+
+def get_apps_path(apps_configs: Dict[str, AppsIndex.Entry]) -> str:
+    # the applications are defined below 'config' as soon as one of the files uses this layout
+    if any(apps_config.config for apps_config in apps_configs.values()):
+        return "config.applications"
+    return "applications"
+
+
+def __get_app_file_blobs(
+    root_config_git_repo: GitRepo, apps_index: AppsIndex, app_file_names: List[Optional[str]]
+) -> Tuple[Optional[str], Dict[str, str]]:
+    if not apps_index.is_enabled():
+        return None, {}
+    commit = root_config_git_repo.get_commit_hash()
+    index_entries = apps_index.get_entries()
+    if commit == apps_index.get_commit() and all(name in index_entries for name in app_file_names if name):
+        return commit, {name: entry.blob for name, entry in index_entries.items()}  # nothing changed
+    return commit, root_config_git_repo.get_blob_hashes("apps")
+
+
+def __create_apps_index_entry(app_file_name: str, blob: str, app_config_content: Any) -> AppsIndex.Entry:
+    config = "config" in app_config_content
+    if config:
+        app_config_content = app_config_content["config"]
+    if "repository" not in app_config_content:
+        raise GitOpsException(f"Cannot find key 'repository' in '{app_file_name}'")
+    return AppsIndex.Entry(
+        blob=blob,
+        repository=app_config_content["repository"],
+        applications=sorted(__get_applications_from_app_config(app_config_content), key=str),
+        config=config,
     )
 
 
@@ -126,7 +187,7 @@ def __get_bootstrap_entries(root_config_git_repo: GitRepo) -> Any:
     root_config_git_repo.clone()
     bootstrap_values_file = root_config_git_repo.get_full_file_path("bootstrap/values.yaml")
     try:
-        bootstrap_yaml = yaml_file_load(bootstrap_values_file)
+        bootstrap_yaml = yaml_file_load_safe(bootstrap_values_file)
     except FileNotFoundError as ex:
         raise GitOpsException("File 'bootstrap/values.yaml' not found in root repository.") from ex
     if "bootstrap" in bootstrap_yaml:
@@ -136,13 +197,13 @@ def __get_bootstrap_entries(root_config_git_repo: GitRepo) -> Any:
     raise GitOpsException("Cannot find key 'bootstrap' or 'config.bootstrap' in 'bootstrap/values.yaml'")
 
 
-def __get_repo_apps(team_config_git_repo: GitRepo) -> Set[str]:
-    team_config_git_repo.clone()
-    repo_dir = team_config_git_repo.get_full_file_path(".")
+def get_repo_apps(team_config_git_repo: GitRepo) -> Set[str]:
+    # only the directory names are needed, so the file contents are not transferred
+    team_config_git_repo.clone(metadata_only=True)
     return {
         name
-        for name in os.listdir(repo_dir)
-        if os.path.isdir(os.path.join(repo_dir, name)) and not name.startswith(".")
+        for name, object_type in team_config_git_repo.list_directory(".").items()
+        if object_type in ("tree", "commit") and not name.startswith(".")
     }
 
 
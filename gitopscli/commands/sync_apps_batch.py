@@ -0,0 +1,279 @@
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Literal, Optional, Set, Tuple
+from gitopscli.git_api import GitApiConfig, GitRepo, GitRepoApiFactory
+from gitopscli.io_api.yaml_util import merge_yaml_element, yaml_file_load, YAMLException
+from gitopscli.gitops_exception import GitOpsException
+from gitopscli.timings import timed
+from .common import AppsIndex
+from .sync_apps import get_apps_path, get_repo_apps, load_apps_configs
+from .command import Command
+
+
+class SyncAppsBatchCommand(Command):
+    @dataclass(frozen=True)
+    class Args(GitApiConfig):
+        git_user: str
+        git_email: str
+
+        manifest: str
+        max_workers: int
+
+        root_organisation: str
+        root_repository_name: str
+
+        single_commit: bool
+        apps_index_dir: Optional[str] = None
+
+    @dataclass(frozen=True)
+    class Entry:
+        organisation: str
+        repository_name: str
+
+    @dataclass(frozen=True)
+    class TeamApps:
+        clone_url: str
+        apps: Set[str]
+        author: str
+
+    @dataclass
+    class Result:
+        organisation: str
+        repository_name: str
+        file: Optional[str] = None
+        status: Literal["updated", "unchanged", "failed"] = "unchanged"
+        commits: List[str] = field(default_factory=list)
+        error: Optional[str] = None
+
+    def __init__(self, args: Args) -> None:
+        self.__args = args
+
+    @timed("SyncAppsBatchCommand.execute")
+    def execute(self) -> None:
+        args = self.__args
+        entries = self.__load_manifest()
+        results = [self.Result(organisation=e.organisation, repository_name=e.repository_name) for e in entries]
+
+        root_config_git_repo_api = GitRepoApiFactory.create(args, args.root_organisation, args.root_repository_name)
+        with GitRepo(root_config_git_repo_api, args) as root_config_git_repo:
+            logging.info("Root config repository: %s", root_config_git_repo.get_clone_url())
+            apps_configs = load_apps_configs(root_config_git_repo, args.apps_index_dir)
+
+            # the root repository is cloned only once, the team repositories are listed concurrently
+            with ThreadPoolExecutor(max_workers=args.max_workers) as executor:
+                team_apps_list = list(executor.map(self.__get_team_apps, entries, results))
+
+            self.__sync_apps(root_config_git_repo, apps_configs, team_apps_list, results)
+
+        print(json.dumps({"results": [self.__result_to_json(r) for r in results]}, indent=4))
+
+        failed_count = sum(1 for r in results if r.status == "failed")
+        if failed_count:
+            raise GitOpsException(f"{failed_count} of {len(results)} team repositories failed to sync")
+
+    def __get_team_apps(self, entry: Entry, result: Result) -> Optional[TeamApps]:
+        try:
+            team_config_git_repo_api = GitRepoApiFactory.create(self.__args, entry.organisation, entry.repository_name)
+            with GitRepo(team_config_git_repo_api, self.__args) as team_config_git_repo:
+                apps = get_repo_apps(team_config_git_repo)
+                logging.info(
+                    "Found %s app(s) in apps repository %s/%s", len(apps), entry.organisation, entry.repository_name
+                )
+                return self.TeamApps(
+                    clone_url=team_config_git_repo.get_clone_url(),
+                    apps=apps,
+                    author=team_config_git_repo.get_author_from_last_commit(),
+                )
+        except Exception as ex:  # pylint: disable=broad-except
+            # an unexpected error must not abort the other team repositories of the batch and their summary
+            self.__fail(result, ex)
+            return None
+
+    def __resolve_changes(
+        self,
+        apps_configs: Dict[str, AppsIndex.Entry],
+        team_apps_list: List[Optional[TeamApps]],
+        results: List[Result],
+    ) -> List[Tuple[int, str, TeamApps]]:
+        apps_by_file = {file_name: set(apps_config.applications) for file_name, apps_config in apps_configs.items()}
+        changes: List[Tuple[int, str, SyncAppsBatchCommand.TeamApps]] = []
+        synced_app_file_names: Set[str] = set()
+        for index, team_apps in enumerate(team_apps_list):
+            if team_apps is None:
+                continue
+            app_file_name = self.__find_app_file_name(apps_configs, team_apps.clone_url)
+            results[index].file = app_file_name
+            if app_file_name is None:
+                self.__fail(
+                    results[index],
+                    GitOpsException(
+                        "Couldn't find config file for apps repository in root repository's 'apps/' directory"
+                    ),
+                )
+            elif app_file_name in synced_app_file_names:
+                self.__fail(results[index], GitOpsException("Apps repository is listed more than once in manifest"))
+            else:
+                synced_app_file_names.add(app_file_name)
+                if team_apps.apps != apps_by_file[app_file_name]:
+                    changes.append((index, app_file_name, team_apps))
+
+        return self.__reject_duplicate_apps(apps_by_file, changes, results)
+
+    def __reject_duplicate_apps(
+        self,
+        apps_by_file: Dict[str, Set[str]],
+        changes: List[Tuple[int, str, TeamApps]],
+        results: List[Result],
+    ) -> List[Tuple[int, str, TeamApps]]:
+        # duplicates are detected in the target state of all apps/*.yaml files after the sync. A rejected change leaves
+        # its file as it is, which can turn other changes into duplicates, so this repeats until none is rejected.
+        while True:
+            target_apps_by_file = dict(apps_by_file)
+            for _, app_file_name, team_apps in changes:
+                target_apps_by_file[app_file_name] = team_apps.apps
+            app_file_names_by_app: Dict[str, Set[str]] = {}
+            for file_name, apps in target_apps_by_file.items():
+                for app in apps:
+                    app_file_names_by_app.setdefault(app, set()).add(file_name)
+
+            valid_changes = []
+            for index, app_file_name, team_apps in changes:
+                duplicate_apps = sorted(app for app in team_apps.apps if len(app_file_names_by_app[app]) > 1)
+                if duplicate_apps:
+                    self.__fail(
+                        results[index],
+                        GitOpsException(f"Application '{duplicate_apps[0]}' already exists in a different repository"),
+                    )
+                else:
+                    valid_changes.append((index, app_file_name, team_apps))
+            if len(valid_changes) == len(changes):
+                return valid_changes
+            changes = valid_changes
+
+    def __sync_apps(
+        self,
+        root_config_git_repo: GitRepo,
+        apps_configs: Dict[str, AppsIndex.Entry],
+        team_apps_list: List[Optional[TeamApps]],
+        results: List[Result],
+    ) -> None:
+        changes: List[Tuple[int, str, SyncAppsBatchCommand.TeamApps]] = []
+
+        def commit_apps(apps_configs: Dict[str, AppsIndex.Entry]) -> None:
+            for index, team_apps in enumerate(team_apps_list):
+                if team_apps is not None:  # teams which failed to list keep their result
+                    results[index] = self.Result(results[index].organisation, results[index].repository_name)
+            changes[:] = self.__resolve_changes(apps_configs, team_apps_list, results)
+            self.__commit_apps(root_config_git_repo, get_apps_path(apps_configs), changes, results)
+
+        def recommit_apps() -> None:
+            # the push was rejected, the changes are validated and committed again against the new head
+            commit_apps(load_apps_configs(root_config_git_repo, self.__args.apps_index_dir))
+
+        try:
+            commit_apps(apps_configs)
+            if any(results[index].status == "updated" for index, _, _ in changes):
+                # a rejected push is retried with commits created again on the new head, the results get their hashes
+                root_config_git_repo.push(recommit=recommit_apps)
+        except Exception as ex:  # pylint: disable=broad-except
+            # the changes are pushed together, so none of their teams is synced
+            failed_indexes = [index for index, _, _ in changes] or [
+                index for index, team_apps in enumerate(team_apps_list) if team_apps is not None
+            ]
+            for index in failed_indexes:
+                results[index].commits.clear()
+                self.__fail(results[index], ex)
+
+    def __commit_apps(
+        self,
+        root_config_git_repo: GitRepo,
+        apps_path: str,
+        changes: List[Tuple[int, str, TeamApps]],
+        results: List[Result],
+    ) -> None:
+        args = self.__args
+        commit_messages = []
+        updated_indexes = []
+        for index, app_file_name, team_apps in changes:
+            logging.info("Sync applications in root repository's %s.", app_file_name)
+            if not merge_yaml_element(
+                root_config_git_repo.get_full_file_path(app_file_name),
+                apps_path,
+                {app: {} for app in sorted(team_apps.apps)},
+            ):
+                continue  # already up-to-date, nothing to commit
+            updated_indexes.append(index)
+            commit_message = f"{team_apps.author} updated {app_file_name}"
+            if args.single_commit:
+                commit_messages.append(commit_message)
+            else:
+                self.__add_commit(
+                    results[index], root_config_git_repo.commit(args.git_user, args.git_email, commit_message)
+                )
+
+        if args.single_commit and updated_indexes:
+            commit_message = f"Sync apps of {len(updated_indexes)} team repositories\n\n" + "\n".join(commit_messages)
+            commit_hash = root_config_git_repo.commit(args.git_user, args.git_email, commit_message)
+            for index in updated_indexes:
+                self.__add_commit(results[index], commit_hash)
+
+    def __load_manifest(self) -> List[Entry]:
+        try:
+            manifest = yaml_file_load(self.__args.manifest)
+        except (FileNotFoundError, IsADirectoryError) as ex:
+            raise GitOpsException(f"No such file: {self.__args.manifest}") from ex
+        except YAMLException as ex:
+            raise GitOpsException(f"Error loading file: {self.__args.manifest}") from ex
+
+        teams = manifest.get("teams") if isinstance(manifest, dict) else None
+        if not isinstance(teams, list):
+            raise GitOpsException(f"Item 'teams' should be a list in manifest: {self.__args.manifest}")
+        return [self.__parse_entry(index, item) for index, item in enumerate(teams)]
+
+    @staticmethod
+    def __parse_entry(index: int, item: Any) -> Entry:
+        if not isinstance(item, dict):
+            raise GitOpsException(f"Item 'teams.[{index}]' should be an object in manifest!")
+        for key in ("organisation", "repository"):
+            if not isinstance(item.get(key), str):
+                raise GitOpsException(f"Item 'teams.[{index}].{key}' should be a string in manifest!")
+        return SyncAppsBatchCommand.Entry(organisation=item["organisation"], repository_name=item["repository"])
+
+    @staticmethod
+    def __find_app_file_name(apps_configs: Dict[str, AppsIndex.Entry], clone_url: str) -> Optional[str]:
+        app_file_name = None
+        for file_name, apps_config in apps_configs.items():
+            if apps_config.repository == clone_url:
+                app_file_name = file_name  # the last matching file wins, like in sync-apps
+        return app_file_name
+
+    @staticmethod
+    def __add_commit(result: Result, commit_hash: Optional[str]) -> None:
+        if commit_hash:
+            result.commits.append(commit_hash)
+            result.status = "updated"
+
+    @staticmethod
+    def __fail(result: Result, ex: Exception) -> None:
+        result.status = "failed"
+        if isinstance(ex, GitOpsException):
+            logging.error("Sync of %s/%s failed: %s", result.organisation, result.repository_name, ex)
+            result.error = str(ex)
+        else:
+            logging.exception("Sync of %s/%s failed", result.organisation, result.repository_name)
+            result.error = f"{type(ex).__name__}: {ex}"
+
+    @staticmethod
+    def __result_to_json(result: Result) -> Dict[str, Any]:
+        result_json: Dict[str, Any] = {
+            "organisation": result.organisation,
+            "repository": result.repository_name,
+            "file": result.file,
+            "status": result.status,
+            "commits": [{"hash": h} for h in result.commits],
+        }
+        if result.error is not None:
+            result_json["error"] = result.error
+        return result_json
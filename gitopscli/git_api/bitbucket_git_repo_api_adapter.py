@@ -27,6 +27,9 @@ class BitbucketGitRepoApiAdapter(GitRepoApi):
     def get_password(self) -> Optional[str]:
         return str(self.__bitbucket.password)
 
+    def invalidate_cache(self) -> None:
+        pass  # nothing is cached, every call asks the server
+
     def get_clone_url(self) -> str:
         try:
             repo = self.__bitbucket.get_repo(self.__organisation, self.__repository_name)
@@ -54,7 +57,7 @@ class BitbucketGitRepoApiAdapter(GitRepoApi):
     def create_pull_request_to_default_branch(
         self, from_branch: str, title: str, description: str
     ) -> GitRepoApi.PullRequestIdAndUrl:
-        to_branch = self.__get_default_branch()
+        to_branch = self.get_default_branch()
         return self.create_pull_request(from_branch, to_branch, title, description)
 
     def create_pull_request(
@@ -93,6 +96,10 @@ class BitbucketGitRepoApiAdapter(GitRepoApi):
         if result and "errors" in result:
             raise GitOpsException(result["errors"][0]["message"])
 
+    def get_default_branch(self) -> str:
+        default_branch = self.__bitbucket.get_default_branch(self.__organisation, self.__repository_name)
+        return str(default_branch["id"])
+
     def get_branch_head_hash(self, branch: str) -> str:
         branches = self.__bitbucket.get_branches(self.__organisation, self.__repository_name, filter=branch, limit=1)
         if not branches:
@@ -105,6 +112,30 @@ class BitbucketGitRepoApiAdapter(GitRepoApi):
             raise GitOpsException(pull_request["errors"][0]["message"])
         return str(pull_request["fromRef"]["displayId"])
 
-    def __get_default_branch(self) -> str:
-        default_branch = self.__bitbucket.get_default_branch(self.__organisation, self.__repository_name)
-        return str(default_branch["id"])
+    def get_file_content(self, path: str, ref: Optional[str] = None) -> Optional[str]:
+        url = f"rest/api/1.0/projects/{self.__organisation}/repos/{self.__repository_name}/raw/{path}"
+        try:
+            response = self.__bitbucket.request("GET", path=url, params={"at": ref} if ref else None)
+        except requests.exceptions.ConnectionError as ex:
+            raise GitOpsException(f"Error connecting to '{self.__git_provider_url}''") from ex
+        except requests.exceptions.RequestException as ex:
+            raise GitOpsException(f"Error getting file '{path}': {ex}") from ex
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            raise GitOpsException(f"Error getting file '{path}': HTTP {response.status_code}")
+        return str(response.text)
+
+    def commit_file(
+        self,
+        branch: str,
+        source_branch: str,
+        parent_hash: str,
+        path: str,
+        content: str,
+        message: str,
+        git_user: str,
+        git_email: str,
+    ) -> str:
+        # the file edit endpoint always commits as the authenticated user, the commit author can't be set
+        raise GitOpsException("Committing files via API is not supported by Bitbucket Server.")
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 from .git_provider import GitProvider
 
@@ -9,3 +9,12 @@ class GitApiConfig:
     password: str
     git_provider: GitProvider
     git_provider_url: Optional[str]
+
+    clone_depth: Optional[int] = field(default=None, kw_only=True)
+    clone_single_branch: bool = field(default=False, kw_only=True)
+    clone_filter: Optional[str] = field(default=None, kw_only=True)
+    clone_sparse: bool = field(default=False, kw_only=True)
+    clone_cache_dir: Optional[str] = field(default=None, kw_only=True)
+    clone_cache_max_size_mb: int = field(default=2048, kw_only=True)
+    clone_cache_max_age_days: int = field(default=7, kw_only=True)
+    push_retries: int = field(default=3, kw_only=True)
@@ -0,0 +1,132 @@
+import hashlib
+import logging
+import os
+import shutil
+import time
+from types import TracebackType
+from typing import List, Optional, Tuple, Type
+from git import Git, GitError, Repo
+from gitopscli.io_api.file_lock import FileLock
+
+_MEGABYTE = 1024 * 1024
+_SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class GitMirrorCache:
+    def __init__(self, cache_dir: str, max_size_mb: int, max_age_days: int) -> None:
+        self.__cache_dir = cache_dir
+        self.__max_size = max_size_mb * _MEGABYTE
+        self.__max_age = max_age_days * _SECONDS_PER_DAY
+
+    def mirror(self, url: str, credentials_file: Optional[str] = None) -> "_Mirror":
+        os.makedirs(self.__cache_dir, exist_ok=True)
+        return _Mirror(self, url, self.__get_mirror_dir(url), credentials_file)
+
+    def evict(self) -> None:
+        now = time.time()
+        entries = sorted(self.__get_entries())  # least recently used first
+        total_size = sum(size for _, size, _ in entries)
+        for last_used, size, mirror_dir in entries:
+            expired = now - last_used > self.__max_age
+            if not expired and total_size <= self.__max_size:
+                break
+            with FileLock(_get_lock_file_path(mirror_dir), blocking=False) as locked:
+                if not locked:
+                    continue  # in use by another process
+                logging.info("Evicting mirror from cache: %s", mirror_dir)
+                shutil.rmtree(mirror_dir, ignore_errors=True)
+                total_size -= size
+
+    def __get_mirror_dir(self, url: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.__cache_dir, f"{key}.git")
+
+    def __get_entries(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        for name in os.listdir(self.__cache_dir):
+            mirror_dir = os.path.join(self.__cache_dir, name)
+            if name.endswith(".git") and os.path.isdir(mirror_dir):
+                try:
+                    last_used = os.path.getmtime(_get_lock_file_path(mirror_dir))
+                except OSError:
+                    continue  # evicted by another process in the meantime
+                entries.append((last_used, self.__get_size(mirror_dir), mirror_dir))
+        return entries
+
+    @staticmethod
+    def __get_size(directory: str) -> int:
+        size = 0
+        for root, _, files in os.walk(directory):
+            for file in files:
+                try:
+                    size += os.path.getsize(os.path.join(root, file))
+                except OSError:
+                    pass  # removed by another process (e.g. git gc or eviction)
+        return size
+
+
+class _Mirror:
+    # holds the lock of an up-to-date mirror while it is used, the cache is evicted afterwards
+    def __init__(self, cache: GitMirrorCache, url: str, mirror_dir: str, credentials_file: Optional[str]) -> None:
+        self.__cache = cache
+        self.__url = url
+        self.__mirror_dir = mirror_dir
+        self.__credentials_file = credentials_file
+        self.__lock = FileLock(_get_lock_file_path(mirror_dir))
+
+    def __enter__(self) -> str:
+        self.__lock.__enter__()
+        try:
+            os.utime(_get_lock_file_path(self.__mirror_dir))  # lock file mtime tracks last usage
+            _update_mirror(self.__url, self.__mirror_dir, self.__credentials_file)
+        except BaseException:
+            self.__lock.__exit__(None, None, None)
+            raise
+        return self.__mirror_dir
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.__lock.__exit__(exc_type, exc_val, exc_tb)
+        if exc_type is None:
+            try:
+                self.__cache.evict()
+            except OSError as ex:
+                # the mirror has already been used successfully, a failed cleanup must not fail the clone
+                logging.warning("Evicting mirrors from cache failed: %s", ex)
+
+
+def _get_lock_file_path(mirror_dir: str) -> str:
+    return f"{mirror_dir}.lock"
+
+
+def _update_mirror(url: str, mirror_dir: str, credentials_file: Optional[str]) -> None:
+    git_options = {"c": f"credential.helper={credentials_file}"} if credentials_file else {}
+    if not os.path.isdir(mirror_dir):
+        logging.info("Creating cached mirror: %s", mirror_dir)
+        try:
+            Git()(**git_options).clone("--mirror", url, mirror_dir)
+        except GitError:
+            shutil.rmtree(mirror_dir, ignore_errors=True)  # never keep a partial mirror
+            raise
+        return
+    logging.info("Fetching into cached mirror: %s", mirror_dir)
+    try:
+        Repo(mirror_dir).git(**git_options).fetch("--prune", "origin")
+    except GitError:
+        # a failed fetch (e.g. a network error) leaves the mirror as it was, only a corrupt mirror is discarded
+        if _is_corrupt(mirror_dir):
+            logging.warning("Discarding corrupt cached mirror: %s", mirror_dir)
+            shutil.rmtree(mirror_dir, ignore_errors=True)
+        raise
+
+
+def _is_corrupt(mirror_dir: str) -> bool:
+    try:
+        Repo(mirror_dir).git.fsck("--connectivity-only", "--no-dangling")
+    except GitError:
+        return True
+    return False
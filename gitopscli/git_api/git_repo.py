@@ -1,18 +1,35 @@
 import os
 import logging
+import random
+import time
 from types import TracebackType
-from typing import Optional, Type, Literal
+from typing import Callable, Dict, List, Optional, Sequence, Type, Literal
 from git import Repo, GitError, GitCommandError
 from gitopscli.gitops_exception import GitOpsException
 from gitopscli.io_api.tmp_dir import create_tmp_dir, delete_tmp_dir
+from gitopscli.timings import timed
 from .git_repo_api import GitRepoApi
+from .git_api_config import GitApiConfig
+from .git_mirror_cache import GitMirrorCache
+
+PUSH_RETRY_BASE_DELAY_SECONDS = 1.0
+PUSH_RETRY_MAX_DELAY_SECONDS = 16.0
 
 
 class GitRepo:
-    def __init__(self, git_repo_api: GitRepoApi) -> None:
+    def __init__(
+        self,
+        git_repo_api: GitRepoApi,
+        git_api_config: Optional[GitApiConfig] = None,
+        tmp_dir: Optional[str] = None,
+        sparse: bool = False,
+    ) -> None:
+        # with `tmp_dir` the instance takes over an existing checkout in its "repo" subdirectory (e.g. a worktree)
         self.__api = git_repo_api
-        self.__repo: Optional[Repo] = None
-        self.__tmp_dir: Optional[str] = None
+        self.__config = git_api_config
+        self.__repo: Optional[Repo] = Repo(f"{tmp_dir}/repo") if tmp_dir else None
+        self.__tmp_dir = tmp_dir
+        self.__sparse = sparse
 
     def __enter__(self) -> "GitRepo":
         return self
@@ -36,7 +53,14 @@ class GitRepo:
     def get_clone_url(self) -> str:
         return self.__api.get_clone_url()
 
-    def clone(self, branch: Optional[str] = None) -> None:
+    def is_cloned(self) -> bool:
+        return self.__repo is not None
+
+    @timed("GitRepo.clone")
+    def clone(
+        self, branch: Optional[str] = None, sparse_paths: Optional[Sequence[str]] = None, metadata_only: bool = False
+    ) -> None:
+        # metadata only clones contain the commits and directory trees but no file contents and no working tree
         self.__delete_tmp_dir()
         self.__tmp_dir = create_tmp_dir()
         git_options = []
@@ -47,18 +71,93 @@ class GitRepo:
             logging.info("Cloning repository: %s", url)
         username = self.__api.get_username()
         password = self.__api.get_password()
+        credentials_file = None
         try:
             if username is not None and password is not None:
                 credentials_file = self.__create_credentials_file(username, password)
                 git_options.append(f"--config credential.helper={credentials_file}")
             if branch:
                 git_options.append(f"--branch {branch}")
-            self.__repo = Repo.clone_from(url=url, to_path=f"{self.__tmp_dir}/repo", multi_options=git_options)
+            sparse_directories = None if metadata_only else self.__get_sparse_directories(sparse_paths)
+            if sparse_directories is not None:
+                git_options.append("--sparse")
+            if metadata_only:
+                git_options.append("--no-checkout")
+            mirror_cache = self.__get_mirror_cache()
+            if mirror_cache:
+                self.__repo = self.__clone_from_mirror_cache(mirror_cache, url, git_options, credentials_file)
+            else:
+                git_options += self.__get_shallow_clone_options(sparse_directories is not None, metadata_only)
+                self.__repo = Repo.clone_from(url=url, to_path=f"{self.__tmp_dir}/repo", multi_options=git_options)
+            self.__sparse = sparse_directories is not None
+            if sparse_directories is not None:
+                logging.info("Sparse checkout of: %s", ", ".join(sparse_directories) or "<top-level files>")
+                self.__repo.git.sparse_checkout("set", "--cone", *sparse_directories)
         except GitError as ex:
             if branch:
                 raise GitOpsException(f"Error cloning branch '{branch}' of '{url}'") from ex
             raise GitOpsException(f"Error cloning '{url}'") from ex
 
+    def add_sparse_paths(self, sparse_paths: Sequence[str]) -> None:
+        repo = self.__get_repo()
+        sparse_directories = self.__get_sparse_directories(sparse_paths)
+        if not self.__sparse or not sparse_directories:
+            return  # everything needed is already checked out
+        logging.info("Sparse checkout of: %s", ", ".join(sparse_directories))
+        try:
+            repo.git.sparse_checkout("add", *sparse_directories)
+        except GitError as ex:
+            raise GitOpsException(f"Error checking out '{', '.join(sparse_directories)}'.") from ex
+
+    @timed("GitRepo.create_worktree")
+    def create_worktree(self, branch: Optional[str] = None, sparse_paths: Optional[Sequence[str]] = None) -> "GitRepo":
+        # checks out another branch of the same repository without cloning it again
+        repo = self.__get_repo()
+        if branch:
+            logging.info("Checking out branch of existing clone: %s", branch)
+        else:
+            logging.info("Checking out default branch of existing clone")
+        tmp_dir = create_tmp_dir()
+        worktree_dir = f"{tmp_dir}/repo"
+        try:
+            fetch_options = (
+                [f"--depth={self.__config.clone_depth}"] if self.__config and self.__config.clone_depth else []
+            )
+            repo.git.fetch(*fetch_options, "origin", branch or "HEAD")
+            repo.git.worktree("add", "--detach", "--no-checkout", worktree_dir, "FETCH_HEAD")
+            worktree_repo = Repo(worktree_dir)
+            sparse_directories = self.__get_sparse_directories(sparse_paths)
+            if sparse_directories is not None:
+                logging.info("Sparse checkout of: %s", ", ".join(sparse_directories) or "<top-level files>")
+                worktree_repo.git.sparse_checkout("set", "--cone", *sparse_directories)
+            worktree_repo.git.reset("--hard")
+        except GitError as ex:
+            delete_tmp_dir(tmp_dir)
+            if branch:
+                raise GitOpsException(f"Error checking out branch '{branch}' of existing clone.") from ex
+            raise GitOpsException("Error checking out default branch of existing clone.") from ex
+        return GitRepo(self.__api, self.__config, tmp_dir=tmp_dir, sparse=sparse_directories is not None)
+
+    @timed("GitRepo.checkout_tree_from")
+    def checkout_tree_from(self, source_git_repo: "GitRepo", source_path: str, target_path: str) -> bool:
+        # writes the files straight from the git objects, only possible if both repos share the object store
+        repo = self.__get_repo()
+        source_repo = source_git_repo.__get_repo()  # pylint: disable=protected-access
+        source_path = os.path.normpath(source_path)
+        target_path = os.path.normpath(target_path)
+        try:
+            tree = source_repo.git.rev_parse("--verify", "--quiet", f"HEAD:{source_path}")
+            if repo.git.cat_file("-t", tree) != "tree":
+                return False
+        except GitCommandError:
+            return False  # not committed or objects not available
+        try:
+            repo.git.read_tree(f"--prefix={target_path}/", tree)
+            repo.git.checkout("--", target_path)
+        except GitError as ex:
+            raise GitOpsException(f"Error checking out '{source_path}' as '{target_path}'.") from ex
+        return True
+
     def new_branch(self, branch: str) -> None:
         logging.info("Creating new branch: %s", branch)
         repo = self.__get_repo()
@@ -67,6 +166,7 @@ class GitRepo:
         except GitError as ex:
             raise GitOpsException(f"Error creating new branch '{branch}'.") from ex
 
+    @timed("GitRepo.commit")
     def commit(self, git_user: str, git_email: str, message: str) -> Optional[str]:
         repo = self.__get_repo()
         try:
@@ -81,23 +181,158 @@ class GitRepo:
             raise GitOpsException("Error creating commit.") from ex
         return None
 
-    def push(self, branch: Optional[str] = None) -> None:
+    @timed("GitRepo.push")
+    def push(self, branch: Optional[str] = None, recommit: Optional[Callable[[], None]] = None) -> None:
+        # a push rejected because another process pushed in the meantime is retried on top of the new head: with
+        # `recommit` our commits are dropped and created again by it (so the caller knows their final hashes),
+        # otherwise they are rebased
+        repo = self.__get_repo()
+        branch_name = branch or str(repo.git.branch("--show-current"))
+        logging.info("Pushing branch: %s", branch_name)
+        max_retries = self.__config.push_retries if self.__config else 0
+        attempt = 0
+        while True:
+            try:
+                repo.git.push("--set-upstream", "origin", branch_name)
+                return
+            except GitCommandError as ex:
+                if attempt >= max_retries or not self.__is_rejected_as_non_fast_forward(ex):
+                    raise GitOpsException(f"Error pushing branch '{branch_name}' to origin: {ex.stderr}") from ex
+            except GitError as ex:
+                raise GitOpsException(f"Error pushing branch '{branch_name}' to origin.") from ex
+            attempt += 1
+            delay = random.uniform(0.5, 1.0) * min(
+                PUSH_RETRY_MAX_DELAY_SECONDS, PUSH_RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1)
+            )
+            logging.warning(
+                "Push of branch '%s' rejected, retrying in %.1fs. Attempts: (%s/%s)",
+                branch_name,
+                delay,
+                attempt,
+                max_retries,
+            )
+            time.sleep(delay)
+            if recommit is None:
+                self.__rebase_onto_origin(repo, branch_name)
+            elif not self.__recommit_onto_origin(repo, branch_name, recommit):
+                logging.info("Branch '%s' is already up-to-date on origin", branch_name)
+                return
+
+    def reset_hard(self, ref: str) -> None:
         repo = self.__get_repo()
-        if not branch:
-            branch = repo.git.branch("--show-current")
-        logging.info("Pushing branch: %s", branch)
         try:
-            repo.git.push("--set-upstream", "origin", branch)
-        except GitCommandError as ex:
-            raise GitOpsException(f"Error pushing branch '{branch}' to origin: {ex.stderr}") from ex
+            repo.git.reset("--hard", ref)
         except GitError as ex:
-            raise GitOpsException(f"Error pushing branch '{branch}' to origin.") from ex
+            raise GitOpsException(f"Error resetting to '{ref}'.") from ex
+
+    def get_commit_hash(self) -> str:
+        repo = self.__get_repo()
+        return str(repo.head.commit.hexsha)
+
+    def get_blob_hashes(self, directory: str) -> Dict[str, str]:
+        # committed files below the directory (relative to the repository root) and the hashes of their content
+        repo = self.__get_repo()
+        try:
+            output = repo.git.ls_tree("-r", "-z", "HEAD", "--", os.path.normpath(directory))
+        except GitError as ex:
+            raise GitOpsException(f"Error listing files of '{directory}'.") from ex
+        blob_hashes = {}
+        for line in output.split("\0"):
+            if line:
+                info, path = line.split("\t", 1)
+                _, object_type, object_hash = info.split(" ")
+                if object_type == "blob":
+                    blob_hashes[path] = object_hash
+        return blob_hashes
+
+    def list_directory(self, path: str = ".", ref: str = "HEAD") -> Dict[str, str]:
+        # committed entries of the directory (relative to the repository root) and their object types
+        # ("tree", "blob" or "commit"), works without the file contents, e.g. on metadata only clones
+        repo = self.__get_repo()
+        directory = os.path.normpath(path)
+        try:
+            output = repo.git.ls_tree("-z", f"{ref}:{'' if directory == '.' else directory}")
+        except GitError as ex:
+            raise GitOpsException(f"Error listing directory '{path}'.") from ex
+        entries = {}
+        for line in output.split("\0"):
+            if line:
+                info, name = line.split("\t", 1)
+                _, object_type, _ = info.split(" ")
+                entries[name] = object_type
+        return entries
 
     def get_author_from_last_commit(self) -> str:
         repo = self.__get_repo()
         last_commit = repo.head.commit
         return str(repo.git.show("-s", "--format=%an <%ae>", last_commit.hexsha))
 
+    @staticmethod
+    def __is_rejected_as_non_fast_forward(ex: GitCommandError) -> bool:
+        stderr = str(ex.stderr)
+        return "[rejected]" in stderr and ("non-fast-forward" in stderr or "fetch first" in stderr)
+
+    @staticmethod
+    def __rebase_onto_origin(repo: Repo, branch: str) -> None:
+        logging.info("Rebasing branch '%s' onto origin", branch)
+        try:
+            repo.git.fetch("origin", branch)
+            repo.git.rebase("FETCH_HEAD")
+        except GitCommandError as ex:
+            if any(os.path.isdir(os.path.join(repo.git_dir, d)) for d in ("rebase-merge", "rebase-apply")):
+                repo.git.rebase("--abort")  # conflicting changes
+            raise GitOpsException(f"Error rebasing branch '{branch}' onto origin: {ex.stderr}") from ex
+
+    @staticmethod
+    def __recommit_onto_origin(repo: Repo, branch: str, recommit: Callable[[], None]) -> bool:
+        # returns False if there is nothing left to push
+        logging.info("Resetting branch '%s' to origin and committing again", branch)
+        try:
+            repo.git.fetch("origin", branch)
+            repo.git.reset("--hard", "FETCH_HEAD")
+        except GitError as ex:
+            raise GitOpsException(f"Error resetting branch '{branch}' to origin.") from ex
+        recommit()
+        return str(repo.head.commit.hexsha) != str(repo.git.rev_parse("FETCH_HEAD"))
+
+    def __get_mirror_cache(self) -> Optional[GitMirrorCache]:
+        if not self.__config or not self.__config.clone_cache_dir:
+            return None
+        return GitMirrorCache(
+            self.__config.clone_cache_dir, self.__config.clone_cache_max_size_mb, self.__config.clone_cache_max_age_days
+        )
+
+    def __clone_from_mirror_cache(
+        self, mirror_cache: GitMirrorCache, url: str, git_options: List[str], credentials_file: Optional[str]
+    ) -> Repo:
+        with mirror_cache.mirror(url, credentials_file) as mirror_dir:
+            # local clones hardlink the object files, so the working copy stays valid after eviction
+            repo = Repo.clone_from(url=mirror_dir, to_path=f"{self.__tmp_dir}/repo", multi_options=git_options)
+        repo.git.remote("set-url", "origin", url)
+        return repo
+
+    def __get_shallow_clone_options(self, sparse: bool, metadata_only: bool) -> List[str]:
+        config = self.__config
+        git_options = []
+        if config and config.clone_depth:
+            git_options.append(f"--depth {config.clone_depth}")
+        elif metadata_only:
+            git_options.append("--depth 1")  # only the last commit is needed
+        if config and config.clone_single_branch:
+            git_options.append("--single-branch")
+        if config and config.clone_filter:
+            git_options.append(f"--filter={config.clone_filter}")
+        elif sparse or metadata_only:
+            git_options.append("--filter=blob:none")  # only download the files which are checked out
+        return git_options
+
+    def __get_sparse_directories(self, sparse_paths: Optional[Sequence[str]]) -> Optional[List[str]]:
+        # None means full checkout, an empty list only checks out the files in the top-level directory
+        if sparse_paths is None or not self.__config or not self.__config.clone_sparse:
+            return None
+        directories = {os.path.normpath(path).strip("/") for path in sparse_paths}
+        return sorted(directory for directory in directories if directory not in ("", "."))
+
     def __delete_tmp_dir(self) -> None:
         if self.__tmp_dir:
             delete_tmp_dir(self.__tmp_dir)
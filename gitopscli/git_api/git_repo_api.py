@@ -15,6 +15,10 @@ class GitRepoApi(metaclass=ABCMeta):
     def get_password(self) -> Optional[str]:
         ...
 
+    @abstractmethod
+    def invalidate_cache(self) -> None:
+        ...
+
     @abstractmethod
     def get_clone_url(self) -> str:
         ...
@@ -43,6 +47,10 @@ class GitRepoApi(metaclass=ABCMeta):
     def delete_branch(self, branch: str) -> None:
         ...
 
+    @abstractmethod
+    def get_default_branch(self) -> str:
+        ...
+
     @abstractmethod
     def get_branch_head_hash(self, branch: str) -> str:
         ...
@@ -50,3 +58,21 @@ class GitRepoApi(metaclass=ABCMeta):
     @abstractmethod
     def get_pull_request_branch(self, pr_id: int) -> str:
         ...
+
+    @abstractmethod
+    def get_file_content(self, path: str, ref: Optional[str] = None) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def commit_file(
+        self,
+        branch: str,
+        source_branch: str,
+        parent_hash: str,
+        path: str,
+        content: str,
+        message: str,
+        git_user: str,
+        git_email: str,
+    ) -> str:
+        ...
@@ -1,19 +1,21 @@
 from typing import Optional
 from gitopscli.gitops_exception import GitOpsException
+from gitopscli.timings import timed
 from .git_repo_api import GitRepoApi
-from .github_git_repo_api_adapter import GithubGitRepoApiAdapter
-from .bitbucket_git_repo_api_adapter import BitbucketGitRepoApiAdapter
-from .gitlab_git_repo_api_adapter import GitlabGitRepoApiAdapter
 from .git_repo_api_logging_proxy import GitRepoApiLoggingProxy
 from .git_api_config import GitApiConfig
 from .git_provider import GitProvider
 
 
 class GitRepoApiFactory:
+    # The provider adapters (and their SDKs) are imported lazily so that only the selected provider is loaded.
     @staticmethod
+    @timed("GitRepoApiFactory.create")
     def create(config: GitApiConfig, organisation: str, repository_name: str) -> GitRepoApi:
         git_repo_api: Optional[GitRepoApi]
         if config.git_provider is GitProvider.GITHUB:
+            from .github_git_repo_api_adapter import GithubGitRepoApiAdapter  # pylint: disable=import-outside-toplevel
+
             git_repo_api = GithubGitRepoApiAdapter(
                 username=config.username,
                 password=config.password,
@@ -23,6 +25,10 @@ class GitRepoApiFactory:
         elif config.git_provider is GitProvider.BITBUCKET:
             if not config.git_provider_url:
                 raise GitOpsException("Please provide url for Bitbucket!")
+            from .bitbucket_git_repo_api_adapter import (  # pylint: disable=import-outside-toplevel
+                BitbucketGitRepoApiAdapter,
+            )
+
             git_repo_api = BitbucketGitRepoApiAdapter(
                 git_provider_url=config.git_provider_url,
                 username=config.username,
@@ -34,6 +40,8 @@ class GitRepoApiFactory:
             provider_url = config.git_provider_url
             if not provider_url:
                 provider_url = "https://www.gitlab.com"
+            from .gitlab_git_repo_api_adapter import GitlabGitRepoApiAdapter  # pylint: disable=import-outside-toplevel
+
             git_repo_api = GitlabGitRepoApiAdapter(
                 git_provider_url=provider_url,
                 username=config.username,
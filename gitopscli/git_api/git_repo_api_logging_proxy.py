@@ -1,5 +1,6 @@
 import logging
 from typing import Optional, Literal
+from gitopscli.timings import timed
 from .git_repo_api import GitRepoApi
 
 
@@ -13,25 +14,33 @@ class GitRepoApiLoggingProxy(GitRepoApi):
     def get_password(self) -> Optional[str]:
         return self.__api.get_password()
 
+    def invalidate_cache(self) -> None:
+        self.__api.invalidate_cache()
+
+    @timed("GitRepoApi.get_clone_url")
     def get_clone_url(self) -> str:
         return self.__api.get_clone_url()
 
+    @timed("GitRepoApi.create_pull_request_to_default_branch")
     def create_pull_request_to_default_branch(
         self, from_branch: str, title: str, description: str
     ) -> GitRepoApi.PullRequestIdAndUrl:
         logging.info("Creating pull request from '%s' to default branch with title: %s", from_branch, title)
         return self.__api.create_pull_request_to_default_branch(from_branch, title, description)
 
+    @timed("GitRepoApi.create_pull_request")
     def create_pull_request(
         self, from_branch: str, to_branch: str, title: str, description: str
     ) -> GitRepoApi.PullRequestIdAndUrl:
         logging.info("Creating pull request from '%s' to '%s' with title: %s", from_branch, to_branch, title)
         return self.__api.create_pull_request(from_branch, to_branch, title, description)
 
+    @timed("GitRepoApi.merge_pull_request")
     def merge_pull_request(self, pr_id: int, merge_method: Literal["squash", "rebase", "merge"] = "merge") -> None:
         logging.info("Merging pull request %s", pr_id)
         self.__api.merge_pull_request(pr_id, merge_method=merge_method)
 
+    @timed("GitRepoApi.add_pull_request_comment")
     def add_pull_request_comment(self, pr_id: int, text: str, parent_id: Optional[int] = None) -> None:
         if parent_id:
             logging.info(
@@ -41,12 +50,38 @@ class GitRepoApiLoggingProxy(GitRepoApi):
             logging.info("Creating comment for pull request %s with content: %s", pr_id, text)
         self.__api.add_pull_request_comment(pr_id, text, parent_id)
 
+    @timed("GitRepoApi.delete_branch")
     def delete_branch(self, branch: str) -> None:
         logging.info("Deleting branch '%s'", branch)
         self.__api.delete_branch(branch)
 
+    @timed("GitRepoApi.get_default_branch")
+    def get_default_branch(self) -> str:
+        return self.__api.get_default_branch()
+
+    @timed("GitRepoApi.get_branch_head_hash")
     def get_branch_head_hash(self, branch: str) -> str:
         return self.__api.get_branch_head_hash(branch)
 
+    @timed("GitRepoApi.get_pull_request_branch")
     def get_pull_request_branch(self, pr_id: int) -> str:
         return self.__api.get_pull_request_branch(pr_id)
+
+    @timed("GitRepoApi.get_file_content")
+    def get_file_content(self, path: str, ref: Optional[str] = None) -> Optional[str]:
+        return self.__api.get_file_content(path, ref)
+
+    @timed("GitRepoApi.commit_file")
+    def commit_file(
+        self,
+        branch: str,
+        source_branch: str,
+        parent_hash: str,
+        path: str,
+        content: str,
+        message: str,
+        git_user: str,
+        git_email: str,
+    ) -> str:
+        logging.info("Committing file '%s' to branch '%s' via API", path, branch)
+        return self.__api.commit_file(branch, source_branch, parent_hash, path, content, message, git_user, git_email)
@@ -1,9 +1,13 @@
+import base64
 from typing import Optional, Literal
 
 from github import (
     Github,
+    GithubException,
     UnknownObjectException,
     BadCredentialsException,
+    InputGitAuthor,
+    InputGitTreeElement,
     GitRef,
     PullRequest,
     Repository,
@@ -22,6 +26,9 @@ class GithubGitRepoApiAdapter(GitRepoApi):
         self.__password = password
         self.__organisation = organisation
         self.__repository_name = repository_name
+        self.__repo: Optional[Repository.Repository] = None
+        self.__default_branch: Optional[str] = None
+        self.__clone_url: Optional[str] = None
 
     def get_username(self) -> Optional[str]:
         return self.__username
@@ -29,13 +36,20 @@ class GithubGitRepoApiAdapter(GitRepoApi):
     def get_password(self) -> Optional[str]:
         return self.__password
 
+    def invalidate_cache(self) -> None:
+        self.__repo = None
+        self.__default_branch = None
+        self.__clone_url = None
+
     def get_clone_url(self) -> str:
-        return self.__get_repo().clone_url
+        if self.__clone_url is None:
+            self.__clone_url = self.__get_repo().clone_url
+        return self.__clone_url
 
     def create_pull_request_to_default_branch(
         self, from_branch: str, title: str, description: str
     ) -> GitRepoApi.PullRequestIdAndUrl:
-        to_branch = self.__get_repo().default_branch
+        to_branch = self.get_default_branch()
         return self.create_pull_request(from_branch, to_branch, title, description)
 
     def create_pull_request(
@@ -57,6 +71,11 @@ class GithubGitRepoApiAdapter(GitRepoApi):
         git_ref = self.__get_branch_ref(branch)
         git_ref.delete()
 
+    def get_default_branch(self) -> str:
+        if self.__default_branch is None:
+            self.__default_branch = self.__get_repo().default_branch
+        return self.__default_branch
+
     def get_branch_head_hash(self, branch: str) -> str:
         git_ref = self.__get_branch_ref(branch)
         return git_ref.object.sha
@@ -65,12 +84,59 @@ class GithubGitRepoApiAdapter(GitRepoApi):
         pull_request = self.__get_pull_request(pr_id)
         return pull_request.head.ref
 
+    def get_file_content(self, path: str, ref: Optional[str] = None) -> Optional[str]:
+        repo = self.__get_repo()
+        try:
+            content_file = repo.get_contents(path, ref=ref) if ref else repo.get_contents(path)
+            if isinstance(content_file, list):
+                raise GitOpsException(f"Path '{path}' is a directory.")
+            if content_file.encoding == "base64":
+                content = content_file.decoded_content
+            else:
+                # the contents API doesn't return files larger than 1 MB, the git blob API does
+                content = base64.b64decode(repo.get_git_blob(content_file.sha).content)
+        except UnknownObjectException:
+            return None
+        except GithubException as ex:
+            raise GitOpsException(f"Error getting file '{path}': HTTP {ex.status}") from ex
+        try:
+            return str(content.decode("utf-8"))
+        except UnicodeDecodeError as ex:
+            raise GitOpsException(f"File '{path}' is not UTF-8 encoded.") from ex
+
+    def commit_file(
+        self,
+        branch: str,
+        source_branch: str,
+        parent_hash: str,
+        path: str,
+        content: str,
+        message: str,
+        git_user: str,
+        git_email: str,
+    ) -> str:
+        repo = self.__get_repo()
+        try:
+            parent = repo.get_git_commit(parent_hash)
+            tree = repo.create_git_tree([InputGitTreeElement(path, "100644", "blob", content=content)], parent.tree)
+            commit = repo.create_git_commit(message, tree, [parent], author=InputGitAuthor(git_user, git_email))
+            if branch == source_branch:
+                # no force update, the ref is only moved if the branch is still at the parent commit
+                self.__get_branch_ref(branch).edit(commit.sha, force=False)
+            else:
+                repo.create_git_ref(f"refs/heads/{branch}", commit.sha)
+        except GithubException as ex:
+            raise GitOpsException(f"Error committing file '{path}': HTTP {ex.status}") from ex
+        return commit.sha
+
     def __get_branch_ref(self, branch: str) -> GitRef.GitRef:
         repo = self.__get_repo()
         try:
             return repo.get_git_ref(f"heads/{branch}")
         except UnknownObjectException as ex:
             raise GitOpsException(f"Branch '{branch}' does not exist.") from ex
+        except GithubException as ex:
+            raise GitOpsException(f"Error getting branch '{branch}': HTTP {ex.status}") from ex
 
     def __get_pull_request(self, pr_id: int) -> PullRequest.PullRequest:
         repo = self.__get_repo()
@@ -80,6 +146,11 @@ class GithubGitRepoApiAdapter(GitRepoApi):
             raise GitOpsException(f"Pull request with ID '{pr_id}' does not exist.") from ex
 
     def __get_repo(self) -> Repository.Repository:
+        if self.__repo is None:
+            self.__repo = self.__fetch_repo()
+        return self.__repo
+
+    def __fetch_repo(self) -> Repository.Repository:
         try:
             return self.__github.get_repo(f"{self.__organisation}/{self.__repository_name}")
         except BadCredentialsException as ex:
@@ -1,4 +1,4 @@
-from typing import Optional, Literal
+from typing import Any, Dict, Optional, Literal
 import logging
 import time
 import requests
@@ -35,6 +35,8 @@ class GitlabGitRepoApiAdapter(GitRepoApi):
         self.__token_name = username
         self.__access_token = password
         self.__project = project
+        self.__default_branch: Optional[str] = None
+        self.__project_outdated = False
 
     def get_username(self) -> Optional[str]:
         return self.__token_name
@@ -42,13 +44,18 @@ class GitlabGitRepoApiAdapter(GitRepoApi):
     def get_password(self) -> Optional[str]:
         return self.__access_token
 
+    def invalidate_cache(self) -> None:
+        # the project is reloaded when the default branch is needed again
+        self.__default_branch = None
+        self.__project_outdated = True
+
     def get_clone_url(self) -> str:
         return str(self.__project.http_url_to_repo)
 
     def create_pull_request_to_default_branch(
         self, from_branch: str, title: str, description: str
     ) -> GitRepoApi.PullRequestIdAndUrl:
-        to_branch = self.__get_default_branch()
+        to_branch = self.get_default_branch()
         return self.create_pull_request(from_branch, to_branch, title, description)
 
     def create_pull_request(
@@ -88,6 +95,14 @@ class GitlabGitRepoApiAdapter(GitRepoApi):
     def delete_branch(self, branch: str) -> None:
         self.__project.branches.delete(branch)
 
+    def get_default_branch(self) -> str:
+        if self.__default_branch is None:
+            if self.__project_outdated:
+                self.__project.refresh()
+                self.__project_outdated = False
+            self.__default_branch = self.__resolve_default_branch()
+        return self.__default_branch
+
     def get_branch_head_hash(self, branch: str) -> str:
         branch_instance = self.__project.branches.get(branch)
         return str(branch_instance.commit["id"])
@@ -96,8 +111,58 @@ class GitlabGitRepoApiAdapter(GitRepoApi):
         merge_request = self.__project.mergerequests.get(pr_id)
         return str(merge_request.source_branch)
 
-    def __get_default_branch(self) -> str:
-        branches = self.__project.branches.list()
+    def get_file_content(self, path: str, ref: Optional[str] = None) -> Optional[str]:
+        try:
+            content = self.__project.files.raw(file_path=path, ref=ref or self.get_default_branch())
+        except gitlab.exceptions.GitlabError as ex:
+            if ex.response_code == 404:
+                return None
+            raise GitOpsException(f"Error getting file '{path}': '{ex.error_message}'") from ex
+        except requests.exceptions.RequestException as ex:
+            raise GitOpsException(f"Error getting file '{path}': {ex}") from ex
+        try:
+            return str(content.decode("utf-8"))
+        except UnicodeDecodeError as ex:
+            raise GitOpsException(f"File '{path}' is not UTF-8 encoded.") from ex
+
+    def commit_file(
+        self,
+        branch: str,
+        source_branch: str,
+        parent_hash: str,
+        path: str,
+        content: str,
+        message: str,
+        git_user: str,
+        git_email: str,
+    ) -> str:
+        try:
+            # the commit is rejected if the file changed after the parent commit
+            last_commit_id = self.__project.files.get(file_path=path, ref=parent_hash).last_commit_id
+            data: Dict[str, Any] = {
+                "branch": branch,
+                "commit_message": message,
+                "author_name": git_user,
+                "author_email": git_email,
+                "actions": [
+                    {"action": "update", "file_path": path, "content": content, "last_commit_id": last_commit_id}
+                ],
+            }
+            if branch != source_branch:
+                data["start_sha"] = parent_hash
+            commit = self.__project.commits.create(data)
+        except gitlab.exceptions.GitlabGetError as ex:
+            raise GitOpsException(f"Error getting file '{path}': '{ex.error_message}'") from ex
+        except gitlab.exceptions.GitlabCreateError as ex:
+            raise GitOpsException(f"Error committing file '{path}': '{ex.error_message}'") from ex
+        return str(commit.id)
+
+    def __resolve_default_branch(self) -> str:
+        default_branch_name = getattr(self.__project, "default_branch", None)
+        if default_branch_name:
+            return str(default_branch_name)
+        # older servers do not return the default branch with the project
+        branches = self.__project.branches.list(as_list=False)
         default_branch = next(filter(lambda x: x.default, branches), None)
         if default_branch is None:
             raise GitOpsException("Default branch does not exist")
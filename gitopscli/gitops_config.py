@@ -1,6 +1,6 @@
 import re
 import hashlib
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Any, Optional, Dict, Callable, Set
 from string import Template
 
@@ -18,14 +18,18 @@ class GitOpsConfig:  # pylint: disable=too-many-instance-attributes
             preview_id: str
             git_hash: str
 
+            @property
+            def preview_identity(self) -> "GitOpsConfig.PreviewIdentity":
+                return self.gitops_config.get_preview_identity(self.preview_id)
+
         __VARIABLE_MAPPERS: Dict[str, Callable[["GitOpsConfig.Replacement.PreviewContext"], str]] = {
             "GIT_HASH": lambda context: context.git_hash,
-            "PREVIEW_HOST": lambda context: context.gitops_config.get_preview_host(context.preview_id),
-            "PREVIEW_NAMESPACE": lambda context: context.gitops_config.get_preview_namespace(context.preview_id),
+            "PREVIEW_HOST": lambda context: context.preview_identity.host,
+            "PREVIEW_NAMESPACE": lambda context: context.preview_identity.namespace,
             "APPLICATION_NAME": lambda context: context.gitops_config.application_name,
             "PREVIEW_ID": lambda context: context.preview_id,
-            "PREVIEW_ID_HASH": lambda context: GitOpsConfig.create_preview_id_hash(context.preview_id),
-            "PREVIEW_ID_HASH_SHORT": lambda context: GitOpsConfig.create_preview_id_hash_short(context.preview_id),
+            "PREVIEW_ID_HASH": lambda context: context.preview_identity.preview_id_hash,
+            "PREVIEW_ID_HASH_SHORT": lambda context: context.preview_identity.preview_id_hash_short,
         }
 
         def __init__(self, path: str, value_template: str):
@@ -45,9 +49,19 @@ class GitOpsConfig:  # pylint: disable=too-many-instance-attributes
         def get_value(self, context: PreviewContext) -> str:
             val = self.value_template
             for variable, value_func in self.__VARIABLE_MAPPERS.items():
-                val = val.replace(f"${{{variable}}}", value_func(context))
+                if f"${{{variable}}}" in val:
+                    val = val.replace(f"${{{variable}}}", value_func(context))
             return val
 
+    @dataclass(frozen=True)
+    class PreviewIdentity:
+        preview_id: str
+        preview_id_hash: str
+        preview_id_hash_short: str
+        sanitized_preview_id: str
+        namespace: str
+        host: str
+
     api_version: int
     application_name: str
 
@@ -70,6 +84,11 @@ class GitOpsConfig:  # pylint: disable=too-many-instance-attributes
 
     replacements: Dict[str, List[Replacement]]
 
+    # hashing and sanitizing is done once per preview id, all templates are filled from the cached identity
+    __preview_identities: Dict[str, PreviewIdentity] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
     @property
     def preview_template_path(self) -> str:
         return self.preview_template_path_template.replace("${APPLICATION_NAME}", self.application_name)
@@ -109,21 +128,47 @@ class GitOpsConfig:  # pylint: disable=too-many-instance-attributes
                 assert isinstance(replacement, self.Replacement), f"replacement[{file}][{index}] of wrong type!"
 
     def get_preview_host(self, preview_id: str) -> str:
-        preview_host = self.preview_host_template
-        preview_host = preview_host.replace("${APPLICATION_NAME}", self.application_name)
-        preview_host = preview_host.replace("${PREVIEW_ID_HASH}", self.create_preview_id_hash(preview_id))
-        preview_host = preview_host.replace("${PREVIEW_ID_HASH_SHORT}", self.create_preview_id_hash_short(preview_id))
-        preview_host = preview_host.replace("${PREVIEW_ID}", self.__sanitize(preview_id))
-        preview_host = preview_host.replace("${PREVIEW_NAMESPACE}", self.get_preview_namespace(preview_id))
-        return preview_host
+        return self.get_preview_identity(preview_id).host
 
     def get_preview_namespace(self, preview_id: str) -> str:
+        return self.get_preview_identity(preview_id).namespace
+
+    def get_preview_identity(self, preview_id: str) -> PreviewIdentity:
+        preview_identity = self.__preview_identities.get(preview_id)
+        if preview_identity is None:
+            preview_identity = self.__create_preview_identity(preview_id)
+            self.__preview_identities[preview_id] = preview_identity
+        return preview_identity
+
+    def __create_preview_identity(self, preview_id: str) -> PreviewIdentity:
+        preview_id_hash = self.create_preview_id_hash(preview_id)
+        preview_id_hash_short = preview_id_hash[:3]
+        sanitized_preview_id = self.__sanitize(preview_id)
+        namespace = self.__create_preview_namespace(sanitized_preview_id, preview_id_hash, preview_id_hash_short)
+
+        host = self.preview_host_template
+        host = host.replace("${APPLICATION_NAME}", self.application_name)
+        host = host.replace("${PREVIEW_ID_HASH}", preview_id_hash)
+        host = host.replace("${PREVIEW_ID_HASH_SHORT}", preview_id_hash_short)
+        host = host.replace("${PREVIEW_ID}", sanitized_preview_id)
+        host = host.replace("${PREVIEW_NAMESPACE}", namespace)
+
+        return self.PreviewIdentity(
+            preview_id=preview_id,
+            preview_id_hash=preview_id_hash,
+            preview_id_hash_short=preview_id_hash_short,
+            sanitized_preview_id=sanitized_preview_id,
+            namespace=namespace,
+            host=host,
+        )
+
+    def __create_preview_namespace(
+        self, sanitized_preview_id: str, preview_id_hash: str, preview_id_hash_short: str
+    ) -> str:
         preview_namespace = self.preview_target_namespace_template
         preview_namespace = preview_namespace.replace("${APPLICATION_NAME}", self.application_name)
-        preview_namespace = preview_namespace.replace("${PREVIEW_ID_HASH}", self.create_preview_id_hash(preview_id))
-        preview_namespace = preview_namespace.replace(
-            "${PREVIEW_ID_HASH_SHORT}", self.create_preview_id_hash_short(preview_id)
-        )
+        preview_namespace = preview_namespace.replace("${PREVIEW_ID_HASH}", preview_id_hash)
+        preview_namespace = preview_namespace.replace("${PREVIEW_ID_HASH_SHORT}", preview_id_hash_short)
 
         current_length = len(preview_namespace) - len("${PREVIEW_ID}")
         remaining_length = self.preview_target_max_namespace_length - current_length
@@ -135,9 +180,10 @@ class GitOpsConfig:  # pylint: disable=too-many-instance-attributes
                 f"{preview_namespace} ({len(preview_namespace)} chars)"
             )
 
-        sanitized_preview_id = self.__sanitize(preview_id, remaining_length)
+        # cutting the sanitized id is the same as sanitizing the id with a max length
+        truncated_preview_id = sanitized_preview_id[0:remaining_length].rstrip("-")
 
-        preview_namespace = preview_namespace.replace("${PREVIEW_ID}", sanitized_preview_id)
+        preview_namespace = preview_namespace.replace("${PREVIEW_ID}", truncated_preview_id)
         preview_namespace = preview_namespace.lower()
 
         invalid_character = re.search(r"[^a-z0-9-]", preview_namespace)
@@ -155,13 +201,14 @@ class GitOpsConfig:  # pylint: disable=too-many-instance-attributes
         return self.fill_template(self.messages_uptodate_template, context)
 
     def fill_template(self, template: str, context: Replacement.PreviewContext) -> str:
+        preview_identity = context.preview_identity
         return Template(template).substitute(
             APPLICATION_NAME=self.application_name,
-            PREVIEW_ID_HASH=self.create_preview_id_hash(context.preview_id),
-            PREVIEW_ID_HASH_SHORT=self.create_preview_id_hash_short(context.preview_id),
-            PREVIEW_ID=self.__sanitize(context.preview_id),
-            PREVIEW_NAMESPACE=self.get_preview_namespace(context.preview_id),
-            PREVIEW_HOST=self.get_preview_host(context.preview_id),
+            PREVIEW_ID_HASH=preview_identity.preview_id_hash,
+            PREVIEW_ID_HASH_SHORT=preview_identity.preview_id_hash_short,
+            PREVIEW_ID=preview_identity.sanitized_preview_id,
+            PREVIEW_NAMESPACE=preview_identity.namespace,
+            PREVIEW_HOST=preview_identity.host,
             GIT_HASH=context.git_hash,
         )
 
@@ -172,20 +219,22 @@ class GitOpsConfig:  # pylint: disable=too-many-instance-attributes
                 raise GitOpsException(f"GitOps config template '{template}' contains invalid variable: {var}")
 
     @staticmethod
-    def __sanitize(preview_id: str, max_length: Optional[int] = None) -> str:
+    def __sanitize(preview_id: str) -> str:
         sanitized_preview_id = preview_id.lower()
         sanitized_preview_id = re.sub(r"[^a-z0-9-]", "-", sanitized_preview_id)
         sanitized_preview_id = re.sub(r"-+", "-", sanitized_preview_id)
-        if max_length is not None:
-            sanitized_preview_id = sanitized_preview_id[0:max_length]
         sanitized_preview_id = re.sub(r"-$", "", sanitized_preview_id)
         return sanitized_preview_id
 
     def is_preview_template_equal_target(self) -> bool:
+        return self.is_preview_template_repository_equal_target() and (
+            self.preview_template_branch == self.preview_target_branch
+        )
+
+    def is_preview_template_repository_equal_target(self) -> bool:
         return (
             self.preview_template_organisation == self.preview_target_organisation
             and self.preview_template_repository == self.preview_target_repository
-            and self.preview_template_branch == self.preview_target_branch
         )
 
     @staticmethod
@@ -0,0 +1,32 @@
+import fcntl
+from types import TracebackType
+from typing import IO, Optional, Type
+
+
+class FileLock:
+    # exclusive advisory lock on a file, shared by all processes which lock the same path
+    def __init__(self, path: str, blocking: bool = True) -> None:
+        self.__path = path
+        self.__blocking = blocking
+        self.__file: Optional[IO[str]] = None
+
+    def __enter__(self) -> bool:
+        lock_file = open(self.__path, "a", encoding="utf-8")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if self.__blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        self.__file = lock_file
+        return True
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        if self.__file is not None:
+            fcntl.flock(self.__file, fcntl.LOCK_UN)
+            self.__file.close()
+            self.__file = None
@@ -0,0 +1,34 @@
+import errno
+import fcntl
+import shutil
+
+FICLONE = 0x40049409  # _IOW(0x94, 9, int) from linux/fs.h
+
+# the file system (or the combination of source and target) doesn't support reflinks
+REFLINK_NOT_SUPPORTED_ERRNOS = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS}
+
+
+class ReflinkNotSupportedError(Exception):
+    pass
+
+
+def reflink_tree(src: str, dst: str) -> bool:
+    # copy-on-write copy of a directory, the files share their data blocks until one of them is changed
+    try:
+        shutil.copytree(src, dst, copy_function=reflink_file)
+    except ReflinkNotSupportedError:
+        shutil.rmtree(dst, ignore_errors=True)
+        return False
+    return True
+
+
+def reflink_file(src: str, dst: str) -> str:
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        try:
+            fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+        except OSError as ex:
+            if ex.errno in REFLINK_NOT_SUPPORTED_ERRNOS:
+                raise ReflinkNotSupportedError(f"Reflinks not supported: {src} -> {dst}") from ex
+            raise
+    shutil.copystat(src, dst)
+    return dst
@@ -1,85 +1,220 @@
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, reduce
 from io import StringIO
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 from ruamel.yaml import YAML, YAMLError
+from jsonpath_ng import JSONPath, Child, Fields
 from jsonpath_ng.exceptions import JSONPathError
 from jsonpath_ng.ext import parse
+from gitopscli.timings import timed
 
-YAML_INSTANCE = YAML()
-YAML_INSTANCE.preserve_quotes = True  # type: ignore
+# ruamel's YAML instances keep the state of the current load/dump, so every thread gets its own ones
+_YAML_INSTANCES = threading.local()
+
+# below this number of files starting a process pool takes longer than parsing them
+PARALLEL_LOAD_MIN_FILES = 32
+
+JSONPATH_CACHE_SIZE = 1024
+
+# keys like 'image.tag' don't need the (slow) JSONPath parser, but segments which the
+# JSONPath lexer treats as keyword or boolean must still go through it to keep its behavior
+_PLAIN_KEY_SEGMENT_REGEX = re.compile(r"^(?!where$|true|false)[a-zA-Z_][a-zA-Z0-9_\-]*$")
+
+
+class JsonPathCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
 
 
 class YAMLException(Exception):
     pass
 
 
+def _yaml_instance() -> YAML:
+    yaml = getattr(_YAML_INSTANCES, "round_trip", None)
+    if yaml is None:
+        yaml = YAML()
+        yaml.preserve_quotes = True  # type: ignore
+        _YAML_INSTANCES.round_trip = yaml
+    return yaml
+
+
+def _yaml_safe_instance() -> YAML:
+    # loads plain dicts and lists (no comments, quotes or formatting), only for files which are never written back
+    yaml = getattr(_YAML_INSTANCES, "safe", None)
+    if yaml is None:
+        yaml = YAML(typ="safe")
+        _YAML_INSTANCES.safe = yaml
+    return yaml
+
+
+@timed("yaml_util.yaml_file_load")
 def yaml_file_load(file_path: str) -> Any:
     with open(file_path, "r") as stream:
         try:
-            return YAML_INSTANCE.load(stream)
+            return _yaml_instance().load(stream)
+        except YAMLError as ex:
+            raise YAMLException(f"Error parsing YAML file: {file_path}") from ex
+
+
+@timed("yaml_util.yaml_file_load_safe")
+def yaml_file_load_safe(file_path: str) -> Any:
+    with open(file_path, "r") as stream:
+        try:
+            return _yaml_safe_instance().load(stream)
         except YAMLError as ex:
             raise YAMLException(f"Error parsing YAML file: {file_path}") from ex
 
 
+def yaml_files_load_safe(file_paths: Sequence[str]) -> Iterator[Any]:
+    # parsing is CPU-bound, many files are parsed in a process pool
+    # the contents are yielded in order, an error is raised when the content of its file is reached
+    cpu_count = os.cpu_count() or 1
+    if len(file_paths) < PARALLEL_LOAD_MIN_FILES or cpu_count < 2:
+        yield from map(yaml_file_load_safe, file_paths)
+        return
+    # "spawn" because forking copies the locks held by other threads of the caller (e.g. sync-apps-batch) as locked
+    with ProcessPoolExecutor(max_workers=cpu_count, mp_context=multiprocessing.get_context("spawn")) as executor:
+        chunksize = max(1, len(file_paths) // (cpu_count * 4))
+        # errors are returned instead of raised, a raised error would replace the contents of its whole chunk
+        for content, error in executor.map(_yaml_file_load_safe_or_error, file_paths, chunksize=chunksize):
+            if error is not None:
+                raise error
+            yield content
+
+
+def _yaml_file_load_safe_or_error(file_path: str) -> Tuple[Any, Optional[Exception]]:
+    try:
+        return yaml_file_load_safe(file_path), None
+    except (OSError, YAMLException) as ex:
+        return None, ex
+
+
+@timed("yaml_util.yaml_file_dump")
 def yaml_file_dump(yaml: Any, file_path: str) -> None:
     with open(file_path, "w+") as stream:
-        YAML_INSTANCE.dump(yaml, stream)
+        _yaml_instance().dump(yaml, stream)
 
 
 def yaml_load(yaml_str: str) -> Any:
     try:
-        return YAML_INSTANCE.load(yaml_str)
+        return _yaml_instance().load(yaml_str)
     except YAMLError as ex:
         raise YAMLException(f"Error parsing YAML string '{yaml_str}'") from ex
 
 
 def yaml_dump(yaml: Any) -> str:
     stream = StringIO()
-    YAML_INSTANCE.dump(yaml, stream)
+    _yaml_instance().dump(yaml, stream)
     return stream.getvalue().rstrip()
 
 
 def update_yaml_file(file_path: str, key: str, value: Any) -> bool:
+    return key in update_yaml_file_values(file_path, [(key, value)])
+
+
+def update_yaml_file_values(
+    file_path: str,
+    updates: Iterable[Tuple[str, Any]],
+    on_value_updated: Optional[Callable[[str, Any], None]] = None,
+) -> List[str]:
+    # the file is parsed once and written once, unless `on_value_updated` is given: then the file is written after
+    # every updated value before the callback is called (e.g. for one commit per value)
+    updates = list(updates)
+    for key, _ in updates:
+        if not key:
+            raise KeyError("Empty key!")
+    content = yaml_file_load(file_path)
+    updated_keys = []
+    for key, value in updates:
+        if not update_yaml_value(content, key, value):
+            continue
+        updated_keys.append(key)
+        if on_value_updated:
+            yaml_file_dump(content, file_path)
+            on_value_updated(key, value)
+    if updated_keys and not on_value_updated:
+        yaml_file_dump(content, file_path)
+    return updated_keys
+
+
+def update_yaml_value(yaml: Any, key: str, value: Any) -> bool:
     if not key:
         raise KeyError("Empty key!")
-    content = yaml_file_load(file_path)
     try:
-        jsonpath_expr = parse(key)
+        jsonpath_expr = _compile_jsonpath(key)
     except JSONPathError as ex:
         raise KeyError(f"Key '{key}' is invalid JSONPath expression: {ex}!") from ex
-    matches = jsonpath_expr.find(content)
+    matches = jsonpath_expr.find(yaml)
     if not matches:
         raise KeyError(f"Key '{key}' not found in YAML!")
     if all(match.value == value for match in matches):
         return False  # nothing to update
     try:
-        jsonpath_expr.update(content, value)
+        jsonpath_expr.update(yaml, value)
     except TypeError as ex:
         raise KeyError(f"Key '{key}' cannot be updated: {ex}!") from ex
-    yaml_file_dump(content, file_path)
     return True
 
 
-def merge_yaml_element(file_path: str, element_path: str, desired_value: Any) -> None:
+def get_jsonpath_cache_info() -> JsonPathCacheInfo:
+    cache_info = _compile_jsonpath.cache_info()
+    return JsonPathCacheInfo(hits=cache_info.hits, misses=cache_info.misses, size=cache_info.currsize)
+
+
+def clear_jsonpath_cache() -> None:
+    _compile_jsonpath.cache_clear()
+
+
+def _parse_jsonpath(key: str) -> JSONPath:
+    segments = key.split(".")
+    if all(_PLAIN_KEY_SEGMENT_REGEX.match(segment) for segment in segments):
+        return reduce(Child, [Fields(segment) for segment in segments])
+    return parse(key)
+
+
+# not applied as decorator, so the cache functions stay reachable when the parser function gets wrapped (e.g. typeguard)
+_compile_jsonpath = lru_cache(maxsize=JSONPATH_CACHE_SIZE)(_parse_jsonpath)
+
+
+def merge_yaml_element(file_path: str, element_path: str, desired_value: Any) -> bool:
     yaml_file_content = yaml_file_load(file_path)
     work_path = yaml_file_content
+    updated = False
 
     if element_path != ".":
         path_list = element_path.split(".")
         for key in path_list:
             if work_path[key] is None:
                 work_path[key] = {}
+                updated = True
             work_path = work_path[key]
 
+    # only the differences are applied in place, the untouched entries keep their comments and order
+    for key in [key for key in work_path if key not in desired_value]:
+        del work_path[key]
+        updated = True
+
     for key, value in desired_value.items():
-        if key in work_path:
-            if work_path[key] is not None:
-                value = {**work_path[key], **value}
-        work_path[key] = value
-
-    # delete missing key:
-    current = work_path.copy().items()
-    for key, value in current:
-        if key not in desired_value:
-            del work_path[key]
-
-    yaml_file_dump(yaml_file_content, file_path)
+        if key not in work_path:
+            work_path[key] = value
+            updated = True
+        elif isinstance(value, dict) and (work_path[key] is None or isinstance(work_path[key], dict)):
+            if work_path[key] is None and value:
+                work_path[key] = {}  # an empty entry stays as it is if there is nothing to merge
+            for sub_key, sub_value in value.items():
+                if sub_key not in work_path[key] or work_path[key][sub_key] != sub_value:
+                    work_path[key][sub_key] = sub_value
+                    updated = True
+        elif work_path[key] != value:
+            work_path[key] = value
+            updated = True
+
+    if updated:
+        yaml_file_dump(yaml_file_content, file_path)
+    return updated
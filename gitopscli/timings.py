@@ -0,0 +1,117 @@
+import json
+import threading
+import time
+from contextlib import ContextDecorator
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Dict, List, Optional, Type
+
+TIMINGS_REPORT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    path: str
+    thread: str
+    start: float
+    duration: float
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.enabled = False
+        self.origin = 0.0
+        self.spans: List[Span] = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def stack(self) -> List[str]:
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack  # type: ignore
+
+
+_RECORDER = _Recorder()
+
+
+class _Timer(ContextDecorator):
+    def __init__(self, name: str) -> None:
+        self.__name = name
+        self.__local = threading.local()
+
+    def __enter__(self) -> None:
+        if not _RECORDER.enabled:
+            return
+        stack = _RECORDER.stack()
+        stack.append(self.__name)
+        if not hasattr(self.__local, "starts"):
+            self.__local.starts = []
+        self.__local.starts.append(time.perf_counter())
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        starts = getattr(self.__local, "starts", None)
+        if not starts:
+            return
+        end = time.perf_counter()
+        start = starts.pop()
+        stack = _RECORDER.stack()
+        span = Span(
+            name=self.__name,
+            path="/".join(stack),
+            thread=threading.current_thread().name,
+            start=start - _RECORDER.origin,
+            duration=end - start,
+        )
+        stack.pop()
+        with _RECORDER.lock:
+            if _RECORDER.enabled:
+                _RECORDER.spans.append(span)
+
+
+def timed(name: str) -> _Timer:
+    # usable as context manager or as function decorator
+    return _Timer(name)
+
+
+def enable_timings() -> None:
+    with _RECORDER.lock:
+        _RECORDER.enabled = True
+        _RECORDER.origin = time.perf_counter()
+        _RECORDER.spans = []
+
+
+def disable_timings() -> None:
+    with _RECORDER.lock:
+        _RECORDER.enabled = False
+        _RECORDER.spans = []
+
+
+def get_timings_report() -> Dict[str, Any]:
+    with _RECORDER.lock:
+        spans = sorted(_RECORDER.spans, key=lambda s: s.start)
+    summary: Dict[str, Dict[str, Any]] = {}
+    for span in spans:
+        phase = summary.setdefault(span.name, {"count": 0, "total": 0.0, "max": 0.0})
+        phase["count"] += 1
+        phase["total"] += span.duration
+        phase["max"] = max(phase["max"], span.duration)
+    return {
+        "version": TIMINGS_REPORT_VERSION,
+        "total": max((s.start + s.duration for s in spans), default=0.0),
+        "phases": summary,
+        "spans": [
+            {"name": s.name, "path": s.path, "thread": s.thread, "start": s.start, "duration": s.duration}
+            for s in spans
+        ],
+    }
+
+
+def write_timings_report(file_path: str) -> None:
+    with open(file_path, "w", encoding="utf-8") as stream:
+        json.dump(get_timings_report(), stream, indent=4)
@@ -0,0 +1,76 @@
+import json
+import logging
+import sys
+from argparse import ArgumentParser
+from typing import Any, Dict, List
+
+from .command_benchmarks import run_command_benchmarks
+from .fixtures import FixtureConfig
+from .micro_benchmarks import DEFAULT_SIZES_KB, compare_with_baseline, run_micro_benchmarks
+
+
+def main(raw_args: List[str]) -> None:
+    parser = ArgumentParser(prog="python -m tests.benchmarks", description="GitOps CLI benchmarks")
+    subparsers = parser.add_subparsers(title="suites", dest="suite", required=True)
+
+    commands_parser = subparsers.add_parser(
+        "commands", help="Run commands end to end against generated local bare repositories"
+    )
+    commands_parser.add_argument("--history-depth", help="Number of commits per repository", type=int, default=100)
+    commands_parser.add_argument("--apps", help="Number of apps in the team repository", type=int, default=10)
+    commands_parser.add_argument("--values-size-kb", help="Size of every values.yaml", type=int, default=16)
+    commands_parser.add_argument("--iterations", help="Runs per command", type=int, default=5)
+    commands_parser.add_argument("--output", help="Write the results as JSON to this file", default=None)
+
+    micro_parser = subparsers.add_parser("micro", help="Run micro-benchmarks of yaml_util and GitOpsConfig")
+    micro_parser.add_argument(
+        "--max-size-kb",
+        help=f"Largest generated YAML document (sizes: {DEFAULT_SIZES_KB}, default: 1024)",
+        type=int,
+        default=1024,
+    )
+    micro_parser.add_argument("--replacements", help="Number of replacement templates", type=int, default=5000)
+    micro_parser.add_argument("--apps", help="Number of apps in the merged apps file", type=int, default=5000)
+    micro_parser.add_argument("--repeat", help="Maximum number of runs per benchmark", type=int, default=5)
+    micro_parser.add_argument("--output", help="Write the results as JSON to this file", default=None)
+    micro_parser.add_argument("--baseline", help="Compare the results with this JSON baseline", default=None)
+    micro_parser.add_argument(
+        "--max-ratio", help="Fail if a benchmark is slower than the baseline by this factor", type=float, default=1.5
+    )
+    args = parser.parse_args(raw_args)
+
+    logging.basicConfig(level=logging.WARNING)
+    results: Dict[str, Any]
+    if args.suite == "commands":
+        config = FixtureConfig(history_depth=args.history_depth, apps=args.apps, values_size_kb=args.values_size_kb)
+        results = {
+            "suite": "commands",
+            "config": vars(config),
+            "results": run_command_benchmarks(config, args.iterations),
+        }
+    else:
+        sizes_kb = [size for size in DEFAULT_SIZES_KB if size <= args.max_size_kb]
+        results = {
+            "suite": "micro",
+            "python": sys.version.split()[0],
+            "results": run_micro_benchmarks(sizes_kb, args.replacements, args.apps, args.repeat),
+        }
+
+    output = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, "w") as stream:
+            stream.write(output + "\n")
+    print(output)
+
+    if args.suite == "micro" and args.baseline:
+        with open(args.baseline, "r") as stream:
+            baseline = json.load(stream)["results"]
+        regressions = compare_with_baseline(results["results"], baseline, args.max_ratio)
+        for name, ratio in regressions.items():
+            print(f"Regression: {name} is {ratio:.2f}x slower than the baseline", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
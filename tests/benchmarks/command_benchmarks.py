@@ -0,0 +1,154 @@
+import statistics
+import subprocess
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+from unittest.mock import patch
+
+from gitopscli.commands import CreatePreviewCommand, DeletePreviewCommand, DeployCommand, SyncAppsCommand
+from gitopscli.git_api import GitApiConfig, GitProvider, GitRepoApi, GitRepoApiFactory
+from .fixtures import (
+    DEPLOYMENT_ORGANISATION,
+    DEPLOYMENT_REPOSITORY,
+    ROOT_ORGANISATION,
+    ROOT_REPOSITORY,
+    TEAM_ORGANISATION,
+    TEAM_REPOSITORY,
+    Fixture,
+    FixtureConfig,
+    app_name,
+    create_fixture,
+)
+from .stub_git_repo_api import StubGitRepoApi
+
+GIT_USER = "Benchmark"
+GIT_EMAIL = "benchmark@example.tld"
+
+
+def summarize(durations: List[float]) -> Dict[str, float]:
+    return {
+        "iterations": len(durations),
+        "min": min(durations),
+        "median": statistics.median(durations),
+        "mean": statistics.mean(durations),
+        "max": max(durations),
+    }
+
+
+class CommandBenchmarks:
+    def __init__(self, fixture: Fixture) -> None:
+        self.__fixture = fixture
+        self.__initial_heads = {path: self.__git(path, "rev-parse", "HEAD") for path in fixture.repos.values()}
+        self.__iteration = 0
+
+    def run(self, iterations: int) -> Dict[str, Dict[str, float]]:
+        benchmarks: Dict[str, Callable[[], Optional[float]]] = {
+            "deploy": self.deploy,
+            "deploy-api-commit": self.deploy_api_commit,
+            "create-preview": self.create_preview,
+            "delete-preview": self.delete_preview,
+            "sync-apps": self.sync_apps,
+        }
+        with patch.object(GitRepoApiFactory, "create", side_effect=self.__create_git_repo_api):
+            return {name: summarize(self.__measure(benchmark, iterations)) for name, benchmark in benchmarks.items()}
+
+    def deploy(self, api_commit: bool = False) -> None:
+        DeployCommand(
+            DeployCommand.Args(
+                **self.__git_api_args(),
+                git_user=GIT_USER,
+                git_email=GIT_EMAIL,
+                organisation=DEPLOYMENT_ORGANISATION,
+                repository_name=DEPLOYMENT_REPOSITORY,
+                file=f"{app_name(0)}-production/values.yaml",
+                values={"image.tag": f"1.0.{self.__iteration}"},
+                single_commit=False,
+                commit_message=None,
+                create_pr=False,
+                auto_merge=False,
+                json=False,
+                api_commit=api_commit,
+            )
+        ).execute()
+
+    def deploy_api_commit(self) -> None:
+        self.deploy(api_commit=True)
+
+    def create_preview(self) -> None:
+        CreatePreviewCommand(
+            CreatePreviewCommand.Args(
+                **self.__git_api_args(),
+                git_user=GIT_USER,
+                git_email=GIT_EMAIL,
+                organisation=TEAM_ORGANISATION,
+                repository_name=TEAM_REPOSITORY,
+                git_hash=f"{self.__iteration:040x}",
+                preview_id=f"preview-{self.__iteration}",
+            )
+        ).execute()
+
+    def delete_preview(self) -> float:
+        self.create_preview()  # not measured
+        start = time.perf_counter()
+        DeletePreviewCommand(
+            DeletePreviewCommand.Args(
+                **self.__git_api_args(),
+                git_user=GIT_USER,
+                git_email=GIT_EMAIL,
+                organisation=TEAM_ORGANISATION,
+                repository_name=TEAM_REPOSITORY,
+                preview_id=f"preview-{self.__iteration}",
+                expect_preview_exists=True,
+            )
+        ).execute()
+        return time.perf_counter() - start
+
+    def sync_apps(self) -> None:
+        SyncAppsCommand(
+            SyncAppsCommand.Args(
+                **self.__git_api_args(),
+                git_user=GIT_USER,
+                git_email=GIT_EMAIL,
+                organisation=TEAM_ORGANISATION,
+                repository_name=TEAM_REPOSITORY,
+                root_organisation=ROOT_ORGANISATION,
+                root_repository_name=ROOT_REPOSITORY,
+            )
+        ).execute()
+
+    def __measure(self, benchmark: Callable[[], Optional[float]], iterations: int) -> List[float]:
+        durations = []
+        for _ in range(iterations):
+            self.__reset_repos()
+            self.__iteration += 1
+            start = time.perf_counter()
+            duration = benchmark()
+            durations.append(duration if duration is not None else time.perf_counter() - start)
+        return durations
+
+    def __reset_repos(self) -> None:
+        # every iteration starts from the generated history so the amount of work stays the same
+        for path, head in self.__initial_heads.items():
+            self.__git(path, "update-ref", "HEAD", head)
+
+    def __create_git_repo_api(self, config: GitApiConfig, organisation: str, repository_name: str) -> GitRepoApi:
+        return StubGitRepoApi(self.__fixture.get_repo_path(organisation, repository_name))
+
+    @staticmethod
+    def __git_api_args() -> Dict[str, object]:
+        return {
+            "username": "USERNAME",
+            "password": "PASSWORD",
+            "git_provider": GitProvider.GITHUB,
+            "git_provider_url": None,
+        }
+
+    @staticmethod
+    def __git(path: str, *args: str) -> str:
+        return subprocess.run(["git", *args], cwd=path, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def run_command_benchmarks(config: FixtureConfig, iterations: int) -> Dict[str, Dict[str, float]]:
+    with tempfile.TemporaryDirectory(prefix="gitopscli-benchmark-") as base_dir:
+        fixture = create_fixture(base_dir, config)
+        return CommandBenchmarks(fixture).run(iterations)
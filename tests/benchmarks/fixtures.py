@@ -0,0 +1,138 @@
+import os
+import subprocess
+import time
+from dataclasses import dataclass
+from typing import Dict
+
+from gitopscli.io_api.yaml_util import yaml_dump
+
+BRANCH = "master"
+TEAM_ORGANISATION = "team"
+TEAM_REPOSITORY = "team-apps"
+DEPLOYMENT_ORGANISATION = "deployment"
+DEPLOYMENT_REPOSITORY = "team-deployment"
+ROOT_ORGANISATION = "root"
+ROOT_REPOSITORY = "root-config"
+
+
+@dataclass(frozen=True)
+class FixtureConfig:
+    history_depth: int = 100
+    apps: int = 10
+    values_size_kb: int = 16
+
+
+@dataclass(frozen=True)
+class Fixture:
+    config: FixtureConfig
+    repos: Dict[str, str]  # "organisation/repository" -> bare repository path
+
+    def get_repo_path(self, organisation: str, repository: str) -> str:
+        return self.repos[f"{organisation}/{repository}"]
+
+    def get_clone_url(self, organisation: str, repository: str) -> str:
+        return f"file://{self.get_repo_path(organisation, repository)}"
+
+
+def app_name(index: int) -> str:
+    return f"app-{index}"
+
+
+def generate_values_yaml(size_kb: int) -> str:
+    # generated as text, dumping large documents with ruamel would take minutes
+    chunks = ["image:\n  repository: registry.example.tld/app\n  tag: 0.0.0\nsettings:\n"]
+    size = len(chunks[0])
+    index = 0
+    while size < size_kb * 1024:
+        chunk = f"  setting-{index}:\n    value: value-{index}\n"
+        chunks.append(chunk)
+        size += len(chunk)
+        index += 1
+    return "".join(chunks)
+
+
+def create_bare_repo(path: str, files: Dict[str, str], history_depth: int) -> str:
+    os.makedirs(path)
+    subprocess.run(["git", "init", "--bare", "--quiet", path], check=True)
+    subprocess.run(["git", "symbolic-ref", "HEAD", f"refs/heads/{BRANCH}"], cwd=path, check=True)
+    subprocess.run(
+        ["git", "fast-import", "--quiet"], cwd=path, input=__fast_import_stream(files, history_depth), check=True
+    )
+    return path
+
+
+def create_fixture(base_dir: str, config: FixtureConfig) -> Fixture:
+    values_yaml = generate_values_yaml(config.values_size_kb)
+    app_names = [app_name(i) for i in range(config.apps)]
+
+    # the preview benchmarks use the first app as the application of the team repository
+    team_files = {".gitops.config.yaml": __gitops_config_yaml(app_names[0])}
+    for name in app_names:
+        team_files[f"{name}/values.yaml"] = values_yaml
+
+    deployment_files = {}
+    for name in app_names:
+        deployment_files[f".preview-templates/{name}/Chart.yaml"] = f"name: {name}\nversion: 1.0.0\n"
+        deployment_files[f".preview-templates/{name}/values.yaml"] = values_yaml
+        deployment_files[f"{name}-production/values.yaml"] = values_yaml
+
+    repos = {
+        f"{TEAM_ORGANISATION}/{TEAM_REPOSITORY}": os.path.join(base_dir, f"{TEAM_REPOSITORY}.git"),
+        f"{DEPLOYMENT_ORGANISATION}/{DEPLOYMENT_REPOSITORY}": os.path.join(base_dir, f"{DEPLOYMENT_REPOSITORY}.git"),
+        f"{ROOT_ORGANISATION}/{ROOT_REPOSITORY}": os.path.join(base_dir, f"{ROOT_REPOSITORY}.git"),
+    }
+    team_clone_url = f"file://{repos[f'{TEAM_ORGANISATION}/{TEAM_REPOSITORY}']}"
+    root_files = {
+        "bootstrap/values.yaml": yaml_dump({"bootstrap": [{"name": "other-team"}, {"name": "team"}]}) + "\n",
+        "apps/other-team.yaml": yaml_dump({"repository": "file:///nonexistent", "applications": {"other-app": {}}})
+        + "\n",
+        "apps/team.yaml": yaml_dump({"repository": team_clone_url, "applications": {app_names[0]: {}}}) + "\n",
+    }
+
+    create_bare_repo(repos[f"{TEAM_ORGANISATION}/{TEAM_REPOSITORY}"], team_files, config.history_depth)
+    create_bare_repo(
+        repos[f"{DEPLOYMENT_ORGANISATION}/{DEPLOYMENT_REPOSITORY}"], deployment_files, config.history_depth
+    )
+    create_bare_repo(repos[f"{ROOT_ORGANISATION}/{ROOT_REPOSITORY}"], root_files, config.history_depth)
+    return Fixture(config, repos)
+
+
+def __gitops_config_yaml(name: str) -> str:
+    return (
+        yaml_dump(
+            {
+                "apiVersion": "v2",
+                "applicationName": name,
+                "previewConfig": {
+                    "host": "${PREVIEW_NAMESPACE}.example.tld",
+                    "template": {"organisation": DEPLOYMENT_ORGANISATION, "repository": DEPLOYMENT_REPOSITORY},
+                    "target": {"organisation": DEPLOYMENT_ORGANISATION, "repository": DEPLOYMENT_REPOSITORY},
+                    "replace": {
+                        "Chart.yaml": [{"path": "name", "value": "${PREVIEW_NAMESPACE}"}],
+                        "values.yaml": [{"path": "image.tag", "value": "${GIT_HASH}"}],
+                    },
+                },
+            }
+        )
+        + "\n"
+    )
+
+
+def __fast_import_stream(files: Dict[str, str], history_depth: int) -> bytes:
+    timestamp = int(time.time()) - history_depth
+    chunks = []
+
+    def commit(index: int, commit_files: Dict[str, str]) -> None:
+        message = f"commit {index}".encode()
+        chunks.append(f"commit refs/heads/{BRANCH}\n".encode())
+        chunks.append(f"committer Benchmark <benchmark@example.tld> {timestamp + index} +0000\n".encode())
+        chunks.append(b"data %d\n%s\n" % (len(message), message))
+        for file_path, content in commit_files.items():
+            data = content.encode()
+            chunks.append(f"M 644 inline {file_path}\n".encode())
+            chunks.append(b"data %d\n%s\n" % (len(data), data))
+
+    commit(0, files)
+    for index in range(1, history_depth):
+        commit(index, {"history.txt": f"{index}\n"})
+    return b"".join(chunks)
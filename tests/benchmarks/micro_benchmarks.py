@@ -0,0 +1,151 @@
+import os
+import tempfile
+import time
+from dataclasses import replace
+from typing import Any, Callable, Dict, List
+
+from gitopscli.gitops_config import GitOpsConfig
+from gitopscli.io_api.yaml_util import merge_yaml_element, update_yaml_file, yaml_dump, yaml_load
+from .fixtures import generate_values_yaml
+
+DEFAULT_SIZES_KB = [1, 10, 100, 1024, 10 * 1024, 50 * 1024]
+
+# a benchmark is repeated until it ran this long (or max_repeat times), large documents therefore run only once
+MIN_BENCHMARK_SECONDS = 1.0
+
+
+def measure(func: Callable[[], Any], max_repeat: int) -> Dict[str, float]:
+    durations: List[float] = []
+    while len(durations) < max_repeat and sum(durations) < MIN_BENCHMARK_SECONDS:
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return {"repeat": len(durations), "min": min(durations)}
+
+
+def run_yaml_benchmarks(size_kb: int, max_repeat: int) -> Dict[str, Dict[str, float]]:
+    content = generate_values_yaml(size_kb)
+    setting_names = [f"setting-{i}" for i in range(content.count("  setting-"))]
+    yaml = yaml_load(content)
+    tags = iter(range(1_000_000_000))
+
+    with tempfile.TemporaryDirectory(prefix="gitopscli-benchmark-") as tmp_dir:
+        file_path = os.path.join(tmp_dir, "values.yaml")
+
+        def write_file() -> None:
+            with open(file_path, "w") as stream:
+                stream.write(content)
+
+        def update_file() -> None:
+            update_yaml_file(file_path, "image.tag", f"1.0.{next(tags)}")
+
+        def merge_unchanged() -> None:
+            merge_yaml_element(file_path, "settings", {name: {} for name in setting_names})
+
+        write_file()
+        results = {
+            "yaml_load": measure(lambda: yaml_load(content), max_repeat),
+            "yaml_dump": measure(lambda: yaml_dump(yaml), max_repeat),
+            "update_yaml_file": measure(update_file, max_repeat),
+        }
+        write_file()
+        results["merge_yaml_element"] = measure(merge_unchanged, max_repeat)
+    return results
+
+
+def run_apps_merge_benchmarks(apps: int, max_repeat: int) -> Dict[str, Dict[str, float]]:
+    # an apps/<team>.yaml file of the root repository as it is synchronized by sync-apps
+    app_names = [f"app-{i}" for i in range(apps)]
+    content = "repository: https://team.config.repo.git\napplications:\n" + "".join(
+        f"  {name}: # owned by team\n" for name in app_names
+    )
+    desired_apps = {name: {} for name in app_names}
+    changed_desired_apps = [{**desired_apps, "new-app": {}}, desired_apps]  # the runs alternately add and remove
+    runs = iter(range(1_000_000_000))
+
+    with tempfile.TemporaryDirectory(prefix="gitopscli-benchmark-") as tmp_dir:
+        file_path = os.path.join(tmp_dir, "team.yaml")
+        with open(file_path, "w") as stream:
+            stream.write(content)
+
+        def merge_unchanged() -> None:
+            merge_yaml_element(file_path, "applications", desired_apps)
+
+        def merge_changed() -> None:
+            merge_yaml_element(file_path, "applications", changed_desired_apps[next(runs) % 2])
+
+        return {
+            "merge_apps_unchanged": measure(merge_unchanged, max_repeat),
+            "merge_apps_changed": measure(merge_changed, max_repeat),
+        }
+
+
+def create_gitops_config(replacements: int) -> GitOpsConfig:
+    return GitOpsConfig.from_yaml(
+        {
+            "apiVersion": "v2",
+            "applicationName": "my-app",
+            "previewConfig": {
+                "host": "${PREVIEW_NAMESPACE}.${APPLICATION_NAME}.example.tld",
+                "target": {"organisation": "deployment", "repository": "deployment"},
+                "replace": {
+                    "values.yaml": [
+                        {"path": f"settings.setting-{i}.value", "value": f"${{PREVIEW_HOST}}/{i}/${{GIT_HASH}}"}
+                        for i in range(replacements)
+                    ]
+                },
+            },
+        }
+    )
+
+
+def run_gitops_config_benchmarks(replacements: int, max_repeat: int) -> Dict[str, Dict[str, float]]:
+    gitops_config = create_gitops_config(replacements)
+    preview_ids = [f"feature/JIRA-{i}-some-branch-name" for i in range(replacements)]
+    context = GitOpsConfig.Replacement.PreviewContext(gitops_config, "feature/JIRA-1-some-branch-name", "0" * 40)
+    templates = gitops_config.replacements["values.yaml"]
+
+    # preview identities are cached per config instance, a fresh copy measures their computation
+    def get_preview_namespaces() -> None:
+        config = replace(gitops_config)
+        for preview_id in preview_ids:
+            config.get_preview_namespace(preview_id)
+
+    def get_preview_hosts() -> None:
+        config = replace(gitops_config)
+        for preview_id in preview_ids:
+            config.get_preview_host(preview_id)
+
+    def get_replacement_values() -> None:
+        for replacement in templates:
+            replacement.get_value(context)
+
+    return {
+        "get_preview_namespace": measure(get_preview_namespaces, max_repeat),
+        "get_preview_host": measure(get_preview_hosts, max_repeat),
+        "Replacement.get_value": measure(get_replacement_values, max_repeat),
+    }
+
+
+def run_micro_benchmarks(
+    sizes_kb: List[int], replacements: int, apps: int, max_repeat: int
+) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for size_kb in sizes_kb:
+        for name, result in run_yaml_benchmarks(size_kb, max_repeat).items():
+            results[f"{name}[{size_kb}kb]"] = result
+    for name, result in run_apps_merge_benchmarks(apps, max_repeat).items():
+        results[f"{name}[{apps}x]"] = result
+    for name, result in run_gitops_config_benchmarks(replacements, max_repeat).items():
+        results[f"{name}[{replacements}x]"] = result
+    return results
+
+
+def compare_with_baseline(
+    results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], max_ratio: float
+) -> Dict[str, float]:
+    regressions = {}
+    for name, result in results.items():
+        if name in baseline and result["min"] / baseline[name]["min"] > max_ratio:
+            regressions[name] = result["min"] / baseline[name]["min"]
+    return regressions
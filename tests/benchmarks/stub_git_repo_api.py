@@ -0,0 +1,94 @@
+import os
+import subprocess
+import tempfile
+from typing import Dict, Literal, Optional
+
+from gitopscli.git_api import GitRepoApi
+
+
+# serves a local bare repository, pull request operations are no-ops
+class StubGitRepoApi(GitRepoApi):
+    def __init__(self, repo_path: str) -> None:
+        self.__repo_path = repo_path
+        self.__pr_count = 0
+
+    def get_username(self) -> Optional[str]:
+        return None
+
+    def get_password(self) -> Optional[str]:
+        return None
+
+    def invalidate_cache(self) -> None:
+        pass
+
+    def get_clone_url(self) -> str:
+        return f"file://{self.__repo_path}"
+
+    def create_pull_request_to_default_branch(
+        self, from_branch: str, title: str, description: str
+    ) -> GitRepoApi.PullRequestIdAndUrl:
+        return self.create_pull_request(from_branch, "master", title, description)
+
+    def create_pull_request(
+        self, from_branch: str, to_branch: str, title: str, description: str
+    ) -> GitRepoApi.PullRequestIdAndUrl:
+        self.__pr_count += 1
+        return GitRepoApi.PullRequestIdAndUrl(pr_id=self.__pr_count, url=f"{self.get_clone_url()}/pr/{self.__pr_count}")
+
+    def merge_pull_request(self, pr_id: int, merge_method: Literal["squash", "rebase", "merge"] = "merge") -> None:
+        pass
+
+    def add_pull_request_comment(self, pr_id: int, text: str, parent_id: Optional[int] = None) -> None:
+        pass
+
+    def delete_branch(self, branch: str) -> None:
+        self.__git("branch", "-D", branch)
+
+    def get_default_branch(self) -> str:
+        return "master"
+
+    def get_branch_head_hash(self, branch: str) -> str:
+        return self.__git("rev-parse", f"refs/heads/{branch}").strip()
+
+    def get_pull_request_branch(self, pr_id: int) -> str:
+        return "master"
+
+    def get_file_content(self, path: str, ref: Optional[str] = None) -> Optional[str]:
+        try:
+            return self.__git("show", f"{ref or 'HEAD'}:{path}")
+        except subprocess.CalledProcessError:
+            return None
+
+    def commit_file(
+        self,
+        branch: str,
+        source_branch: str,
+        parent_hash: str,
+        path: str,
+        content: str,
+        message: str,
+        git_user: str,
+        git_email: str,
+    ) -> str:
+        # builds the commit with plumbing commands on a temporary index, like a provider does on the server side
+        with tempfile.TemporaryDirectory(prefix="gitopscli-benchmark-") as tmp_dir:
+            env = {**os.environ, "GIT_INDEX_FILE": os.path.join(tmp_dir, "index")}
+            author = {
+                "GIT_AUTHOR_NAME": git_user,
+                "GIT_AUTHOR_EMAIL": git_email,
+                "GIT_COMMITTER_NAME": git_user,
+                "GIT_COMMITTER_EMAIL": git_email,
+            }
+            blob = self.__git("hash-object", "-w", "--stdin", stdin=content).strip()
+            self.__git("read-tree", parent_hash, env=env)
+            self.__git("update-index", "--cacheinfo", f"100644,{blob},{path}", env=env)
+            tree = self.__git("write-tree", env=env).strip()
+            commit = self.__git("commit-tree", tree, "-p", parent_hash, "-m", message, env={**env, **author}).strip()
+        old_value = parent_hash if branch == source_branch else ""
+        self.__git("update-ref", f"refs/heads/{branch}", commit, old_value)
+        return commit
+
+    def __git(self, *args: str, stdin: Optional[str] = None, env: Optional[Dict[str, str]] = None) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=self.__repo_path, input=stdin, env=env, check=True, capture_output=True, text=True
+        ).stdout
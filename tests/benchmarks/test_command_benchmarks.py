@@ -0,0 +1,16 @@
+import unittest
+
+from .command_benchmarks import run_command_benchmarks
+from .fixtures import FixtureConfig
+
+
+class CommandBenchmarksTest(unittest.TestCase):
+    def test_smoke(self):
+        results = run_command_benchmarks(FixtureConfig(history_depth=3, apps=2, values_size_kb=1), iterations=1)
+
+        self.assertEqual(
+            set(results.keys()), {"deploy", "deploy-api-commit", "create-preview", "delete-preview", "sync-apps"}
+        )
+        for result in results.values():
+            self.assertEqual(result["iterations"], 1)
+            self.assertGreater(result["min"], 0)
@@ -0,0 +1,32 @@
+import unittest
+
+from .micro_benchmarks import compare_with_baseline, run_micro_benchmarks
+
+
+class MicroBenchmarksTest(unittest.TestCase):
+    def test_smoke(self):
+        results = run_micro_benchmarks(sizes_kb=[1], replacements=10, apps=10, max_repeat=1)
+
+        self.assertEqual(
+            set(results.keys()),
+            {
+                "yaml_load[1kb]",
+                "yaml_dump[1kb]",
+                "update_yaml_file[1kb]",
+                "merge_yaml_element[1kb]",
+                "merge_apps_unchanged[10x]",
+                "merge_apps_changed[10x]",
+                "get_preview_namespace[10x]",
+                "get_preview_host[10x]",
+                "Replacement.get_value[10x]",
+            },
+        )
+        for result in results.values():
+            self.assertEqual(result["repeat"], 1)
+            self.assertGreater(result["min"], 0)
+
+    def test_compare_with_baseline(self):
+        results = {"a": {"min": 2.0}, "b": {"min": 1.0}, "new": {"min": 1.0}}
+        baseline = {"a": {"min": 1.0}, "b": {"min": 1.0}}
+
+        self.assertEqual(compare_with_baseline(results, baseline, max_ratio=1.5), {"a": 2.0})
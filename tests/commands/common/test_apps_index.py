@@ -0,0 +1,46 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from gitopscli.commands.common import AppsIndex
+
+ENTRY = AppsIndex.Entry(blob="BLOB", repository="https://team.config.repo.git", applications=["my-app"], config=False)
+
+
+class AppsIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index_dir = tempfile.mkdtemp(prefix="gitopscli-test-")
+        self.addCleanup(shutil.rmtree, self.index_dir)
+
+    def test_update_and_load(self):
+        AppsIndex(self.index_dir, "ROOT_REPO").update("COMMIT", {"apps/team.yaml": ENTRY})
+
+        apps_index = AppsIndex(self.index_dir, "ROOT_REPO")
+        self.assertTrue(apps_index.is_enabled())
+        self.assertEqual(apps_index.get_commit(), "COMMIT")
+        self.assertEqual(apps_index.get_entries(), {"apps/team.yaml": ENTRY})
+        self.assertEqual(apps_index.get_entry("apps/team.yaml", "BLOB"), ENTRY)
+        self.assertIsNone(apps_index.get_entry("apps/team.yaml", "CHANGED_BLOB"))
+        self.assertIsNone(apps_index.get_entry("apps/team.yaml", None))
+        self.assertIsNone(apps_index.get_entry("apps/other-team.yaml", "BLOB"))
+
+        self.assertIsNone(AppsIndex(self.index_dir, "OTHER_ROOT_REPO").get_commit())
+
+    def test_broken_index_is_ignored(self):
+        AppsIndex(self.index_dir, "ROOT_REPO").update("COMMIT", {"apps/team.yaml": ENTRY})
+        for file_name in os.listdir(self.index_dir):
+            with open(os.path.join(self.index_dir, file_name), "w") as stream:
+                stream.write("{ broken")
+
+        apps_index = AppsIndex(self.index_dir, "ROOT_REPO")
+        self.assertIsNone(apps_index.get_commit())
+        self.assertEqual(apps_index.get_entries(), {})
+
+    def test_disabled(self):
+        apps_index = AppsIndex(None, "ROOT_REPO")
+        apps_index.update("COMMIT", {"apps/team.yaml": ENTRY})
+
+        self.assertFalse(apps_index.is_enabled())
+        self.assertEqual(apps_index.get_entry("apps/team.yaml", "BLOB"), ENTRY)
+        self.assertEqual(os.listdir(self.index_dir), [])
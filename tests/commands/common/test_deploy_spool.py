@@ -0,0 +1,113 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+
+from gitopscli.commands.common import DeploySpool
+
+
+class DeploySpoolTest(unittest.TestCase):
+    def setUp(self):
+        self.spool_dir = tempfile.mkdtemp(prefix="gitopscli-test-")
+        self.addCleanup(shutil.rmtree, self.spool_dir)
+
+    def __create_request(self, file="values.yaml", **kwargs):
+        return DeploySpool.Request(
+            request_id=kwargs.pop("request_id", DeploySpool.create_request_id()),
+            file=file,
+            values={"image.tag": "1.0.0"},
+            single_commit=False,
+            commit_message=None,
+            git_user="GIT_USER",
+            git_email="GIT_EMAIL",
+            **kwargs,
+        )
+
+    def test_requests_in_enqueue_order(self):
+        spool = DeploySpool(self.spool_dir, "ORG/REPO")
+        requests = [self.__create_request(f"app-{i}/values.yaml") for i in range(3)]
+        for request in requests:
+            spool.enqueue(request)
+
+        self.assertEqual(DeploySpool(self.spool_dir, "ORG/REPO").get_requests(), requests)
+        self.assertEqual(DeploySpool(self.spool_dir, "ORG/OTHER-REPO").get_requests(), [])
+
+    def test_complete_and_pop_result(self):
+        spool = DeploySpool(self.spool_dir, "ORG/REPO")
+        request = self.__create_request()
+        spool.enqueue(request)
+        self.assertIsNone(spool.pop_result(request.request_id))
+
+        spool.complete(request.request_id, DeploySpool.Result(commits=["HASH"]))
+
+        self.assertEqual(spool.get_requests(), [])
+        self.assertEqual(spool.pop_result(request.request_id), DeploySpool.Result(commits=["HASH"]))
+        self.assertIsNone(spool.pop_result(request.request_id))
+
+    def test_lock_is_exclusive(self):
+        spool = DeploySpool(self.spool_dir, "ORG/REPO")
+        events = []
+
+        def hold_lock(name):
+            with DeploySpool(self.spool_dir, "ORG/REPO").lock():
+                events.append(f"{name} acquired")
+                time.sleep(0.1)
+                events.append(f"{name} released")
+
+        with spool.lock():
+            thread = threading.Thread(target=hold_lock, args=["other"])
+            thread.start()
+            time.sleep(0.1)
+            events.append("first released")
+        thread.join()
+
+        self.assertEqual(events, ["first released", "other acquired", "other released"])
+
+    def test_requests_of_terminated_callers_are_dropped(self):
+        spool = DeploySpool(self.spool_dir, "ORG/REPO")
+        with subprocess.Popen(["true"]) as process:
+            process.wait()
+        request = self.__create_request(pid=process.pid)
+        spool.enqueue(request)
+
+        self.assertEqual(spool.get_requests(), [])
+        self.assertIsNone(spool.pop_result(request.request_id))
+
+    def test_requests_of_other_hosts_are_kept(self):
+        spool = DeploySpool(self.spool_dir, "ORG/REPO")
+        with subprocess.Popen(["true"]) as process:
+            process.wait()
+        request = self.__create_request(host="OTHER_HOST", pid=process.pid)
+        spool.enqueue(request)
+
+        self.assertEqual(spool.get_requests(), [request])
+
+    def test_expired_requests_are_completed_with_error(self):
+        spool = DeploySpool(self.spool_dir, "ORG/REPO")
+        expired_request = self.__create_request(request_id=f"{time.time_ns() - 31 * 60 * 10**9:020d}-00000000")
+        request = self.__create_request()
+        spool.enqueue(expired_request)
+        spool.enqueue(request)
+
+        self.assertEqual(spool.get_requests(), [request])
+        self.assertEqual(
+            spool.pop_result(expired_request.request_id), DeploySpool.Result(error="Deployment request expired.")
+        )
+
+    def test_expired_results_are_removed(self):
+        spool = DeploySpool(self.spool_dir, "ORG/REPO")
+        request = self.__create_request()
+        spool.enqueue(request)
+        spool.complete(request.request_id, DeploySpool.Result(commits=["HASH"]))
+        result_path = os.path.join(
+            self.spool_dir, os.listdir(self.spool_dir)[0], "results", f"{request.request_id}.json"
+        )
+        expired_time = time.time() - 31 * 60
+        os.utime(result_path, (expired_time, expired_time))
+
+        spool.get_requests()
+
+        self.assertIsNone(spool.pop_result(request.request_id))
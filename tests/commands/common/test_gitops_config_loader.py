@@ -1,9 +1,10 @@
+import logging
 import unittest
 from unittest.mock import call
 import pytest
 from gitopscli.gitops_exception import GitOpsException
 from gitopscli.gitops_config import GitOpsConfig
-from gitopscli.io_api.yaml_util import yaml_file_load
+from gitopscli.io_api.yaml_util import yaml_file_load, yaml_load
 from gitopscli.git_api import GitApiConfig, GitProvider, GitRepo, GitRepoApi, GitRepoApiFactory
 from gitopscli.commands.common.gitops_config_loader import load_gitops_config
 from tests.commands.mock_mixin import MockMixin
@@ -23,7 +24,14 @@ class GitOpsConfigLoaderTest(MockMixin, unittest.TestCase):
         self.yaml_file_load_mock = self.monkey_patch(yaml_file_load)
         self.yaml_file_load_mock.return_value = {"dummy": "gitopsconfig"}
 
+        self.yaml_load_mock = self.monkey_patch(yaml_load)
+        self.yaml_load_mock.return_value = {"dummy": "gitopsconfig"}
+
+        self.logging_mock = self.monkey_patch(logging)
+        self.logging_mock.warning.return_value = None
+
         self.git_repo_api_mock = self.create_mock(GitRepoApi)
+        self.git_repo_api_mock.get_file_content.return_value = "dummy: gitopsconfig"
 
         self.git_repo_api_factory_mock = self.monkey_patch(GitRepoApiFactory)
         self.git_repo_api_factory_mock.create.return_value = self.git_repo_api_mock
@@ -46,14 +54,50 @@ class GitOpsConfigLoaderTest(MockMixin, unittest.TestCase):
 
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(self.git_api_config, "ORGA", "REPO"),
-            call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepoApi.get_file_content(".gitops.config.yaml"),
+            call.yaml_load("dummy: gitopsconfig"),
+            call.GitOpsConfig.from_yaml({"dummy": "gitopsconfig"}),
+        ]
+
+    def test_file_not_found(self):
+        self.git_repo_api_mock.get_file_content.return_value = None
+
+        with pytest.raises(GitOpsException) as ex:
+            load_gitops_config(git_api_config=self.git_api_config, organisation="ORGA", repository_name="REPO")
+
+        self.assertEqual(str(ex.value), "No such file: .gitops.config.yaml")
+
+        assert self.mock_manager.method_calls == [
+            call.GitRepoApiFactory.create(self.git_api_config, "ORGA", "REPO"),
+            call.GitRepoApi.get_file_content(".gitops.config.yaml"),
+        ]
+
+    def test_fallback_to_clone(self):
+        api_error = GitOpsException("API error")
+        self.git_repo_api_mock.get_file_content.side_effect = api_error
+
+        gitops_config = load_gitops_config(
+            git_api_config=self.git_api_config, organisation="ORGA", repository_name="REPO"
+        )
+
+        assert gitops_config == self.gitops_config_mock
+
+        assert self.mock_manager.method_calls == [
+            call.GitRepoApiFactory.create(self.git_api_config, "ORGA", "REPO"),
+            call.GitRepoApi.get_file_content(".gitops.config.yaml"),
+            call.logging.warning(
+                "Cannot load %s via API, cloning repository instead: %s", ".gitops.config.yaml", api_error
+            ),
+            call.GitRepo(self.git_repo_api_mock, self.git_api_config),
+            call.GitRepo.clone(sparse_paths=[]),
             call.GitRepo.get_full_file_path(".gitops.config.yaml"),
             call.yaml_file_load("/repo-dir/.gitops.config.yaml"),
             call.GitOpsConfig.from_yaml({"dummy": "gitopsconfig"}),
         ]
 
-    def test_file_not_found(self):
+    def test_fallback_to_clone_file_not_found(self):
+        api_error = GitOpsException("API error")
+        self.git_repo_api_mock.get_file_content.side_effect = api_error
         self.yaml_file_load_mock.side_effect = FileNotFoundError("file not found")
 
         with pytest.raises(GitOpsException) as ex:
@@ -63,8 +107,37 @@ class GitOpsConfigLoaderTest(MockMixin, unittest.TestCase):
 
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(self.git_api_config, "ORGA", "REPO"),
-            call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepoApi.get_file_content(".gitops.config.yaml"),
+            call.logging.warning(
+                "Cannot load %s via API, cloning repository instead: %s", ".gitops.config.yaml", api_error
+            ),
+            call.GitRepo(self.git_repo_api_mock, self.git_api_config),
+            call.GitRepo.clone(sparse_paths=[]),
             call.GitRepo.get_full_file_path(".gitops.config.yaml"),
             call.yaml_file_load("/repo-dir/.gitops.config.yaml"),
         ]
+
+    def test_fallback_to_clone_into_given_git_repo(self):
+        api_error = GitOpsException("API error")
+        self.git_repo_api_mock.get_file_content.side_effect = api_error
+
+        gitops_config = load_gitops_config(
+            git_api_config=self.git_api_config,
+            organisation="ORGA",
+            repository_name="REPO",
+            git_repo=self.git_repo_mock,
+        )
+
+        assert gitops_config == self.gitops_config_mock
+
+        assert self.mock_manager.method_calls == [
+            call.GitRepoApiFactory.create(self.git_api_config, "ORGA", "REPO"),
+            call.GitRepoApi.get_file_content(".gitops.config.yaml"),
+            call.logging.warning(
+                "Cannot load %s via API, cloning repository instead: %s", ".gitops.config.yaml", api_error
+            ),
+            call.GitRepo.clone(sparse_paths=[]),
+            call.GitRepo.get_full_file_path(".gitops.config.yaml"),
+            call.yaml_file_load("/repo-dir/.gitops.config.yaml"),
+            call.GitOpsConfig.from_yaml({"dummy": "gitopsconfig"}),
+        ]
@@ -7,7 +7,9 @@ from gitopscli.commands.create_pr_preview import CreatePrPreviewCommand
 from gitopscli.commands.delete_preview import DeletePreviewCommand
 from gitopscli.commands.delete_pr_preview import DeletePrPreviewCommand
 from gitopscli.commands.deploy import DeployCommand
+from gitopscli.commands.deploy_batch import DeployBatchCommand
 from gitopscli.commands.sync_apps import SyncAppsCommand
+from gitopscli.commands.sync_apps_batch import SyncAppsBatchCommand
 from gitopscli.commands.version import VersionCommand
 
 
@@ -17,11 +19,21 @@ class CommandFactoryTest(unittest.TestCase):
         command = CommandFactory.create(args)
         self.assertEqual(DeployCommand, type(command))
 
+    def test_create_deploy_batch_command(self):
+        args = Mock(spec=DeployBatchCommand.Args)
+        command = CommandFactory.create(args)
+        self.assertEqual(DeployBatchCommand, type(command))
+
     def test_create_sync_apps_command(self):
         args = Mock(spec=SyncAppsCommand.Args)
         command = CommandFactory.create(args)
         self.assertEqual(SyncAppsCommand, type(command))
 
+    def test_create_sync_apps_batch_command(self):
+        args = Mock(spec=SyncAppsBatchCommand.Args)
+        command = CommandFactory.create(args)
+        self.assertEqual(SyncAppsBatchCommand, type(command))
+
     def test_create_create_preview_command(self):
         args = Mock(spec=CreatePreviewCommand.Args)
         command = CommandFactory.create(args)
@@ -2,8 +2,10 @@ import os
 import unittest
 import shutil
 import logging
+from dataclasses import replace
 from unittest.mock import call, Mock
-from gitopscli.io_api.yaml_util import update_yaml_file, YAMLException, yaml_file_dump
+from gitopscli.io_api.reflink import reflink_tree
+from gitopscli.io_api.yaml_util import update_yaml_value, YAMLException, yaml_file_dump, yaml_file_load
 from gitopscli.git_api import GitRepo, GitRepoApi, GitRepoApiFactory, GitProvider, GitApiConfig
 from gitopscli.gitops_config import GitOpsConfig
 from gitopscli.gitops_exception import GitOpsException
@@ -25,6 +27,8 @@ ARGS = CreatePreviewCommand.Args(
     git_hash=DUMMY_GIT_HASH,
 )
 
+YAML_CONTENT = {"yaml": "content"}
+
 INFO_YAML = {
     "previewId": "PREVIEW_ID",
     "previewIdHash": "685912d3",
@@ -43,11 +47,17 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
         self.shutil_mock = self.monkey_patch(shutil)
         self.shutil_mock.copytree.return_value = None
 
+        self.reflink_tree_mock = self.monkey_patch(reflink_tree)
+        self.reflink_tree_mock.return_value = False
+
         self.logging_mock = self.monkey_patch(logging)
         self.logging_mock.info.return_value = None
 
-        self.update_yaml_file_mock = self.monkey_patch(update_yaml_file)
-        self.update_yaml_file_mock.return_value = True
+        self.yaml_file_load_mock = self.monkey_patch(yaml_file_load)
+        self.yaml_file_load_mock.return_value = YAML_CONTENT
+
+        self.update_yaml_value_mock = self.monkey_patch(update_yaml_value)
+        self.update_yaml_value_mock.return_value = True
 
         self.yaml_file_dump_mock = self.monkey_patch(yaml_file_dump)
         self.yaml_file_dump_mock.return_value = None
@@ -78,6 +88,7 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             },
         )
 
+        self.app_git_repo_api_mock = self.create_mock(GitRepoApi)
         self.template_git_repo_api_mock = self.create_mock(GitRepoApi)
         self.target_git_repo_api_mock = self.create_mock(GitRepoApi)
 
@@ -88,10 +99,21 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
                 return self.template_git_repo_api_mock
             if "TARGET" in organisation and "TARGET" in repository_name:
                 return self.target_git_repo_api_mock
+            if organisation == "ORGA" and repository_name == "REPO":
+                return self.app_git_repo_api_mock
             raise Exception(f"no mock for {organisation}/{repository_name}")
 
         self.git_repo_api_factory_mock.create.side_effect = git_repo_api_factory_create_mock
 
+        self.app_git_repo_mock = self.create_mock(GitRepo)
+        self.app_git_repo_mock.__enter__.return_value = self.app_git_repo_mock
+        self.app_git_repo_mock.__exit__.return_value = False
+        self.app_git_repo_mock.is_cloned.return_value = False
+        self.app_git_repo_mock.get_full_file_path.side_effect = lambda x: f"/tmp/app-repo/{x}"
+        self.app_git_repo_mock.add_sparse_paths.return_value = None
+        self.app_git_repo_mock.commit.return_value = None
+        self.app_git_repo_mock.push.return_value = None
+
         self.template_git_repo_mock = self.create_mock(GitRepo)
         self.template_git_repo_mock.__enter__.return_value = self.template_git_repo_mock
         self.template_git_repo_mock.__exit__.return_value = False
@@ -105,12 +127,16 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
         self.target_git_repo_mock.__exit__.return_value = False
         self.target_git_repo_mock.get_full_file_path.side_effect = lambda x: f"/tmp/target-repo/{x}"
         self.target_git_repo_mock.clone.return_value = None
+        self.target_git_repo_mock.create_worktree.return_value = self.template_git_repo_mock
+        self.target_git_repo_mock.checkout_tree_from.return_value = False
 
-        def git_repo_constructor_mock(git_repo_api: GitRepoApi) -> GitRepo:
+        def git_repo_constructor_mock(git_repo_api: GitRepoApi, git_api_config: GitApiConfig) -> GitRepo:
             if git_repo_api == self.template_git_repo_api_mock:
                 return self.template_git_repo_mock
             if git_repo_api == self.target_git_repo_api_mock:
                 return self.target_git_repo_mock
+            if git_repo_api == self.app_git_repo_api_mock:
+                return self.app_git_repo_mock
             raise Exception(f"no mock for {git_repo_api}")
 
         self.monkey_patch(GitRepo).side_effect = git_repo_constructor_mock
@@ -136,7 +162,9 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
         deployment_created_callback.assert_called_once_with("created template 685912d3")
 
         assert self.mock_manager.method_calls == [
-            call.load_gitops_config(ARGS, "ORGA", "REPO"),
+            call.GitRepoApiFactory.create(ARGS, "ORGA", "REPO"),
+            call.GitRepo(self.app_git_repo_api_mock, ARGS),
+            call.load_gitops_config(ARGS, "ORGA", "REPO", self.app_git_repo_mock),
             call.yaml_file_dump(
                 {
                     "previewId": "PREVIEW_ID",
@@ -146,50 +174,49 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
                 },
                 "/tmp/gitopscli-preview-info.yaml",
             ),
+            call.GitRepo.is_cloned(),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
-            call.GitRepo(self.target_git_repo_api_mock),
-            call.GitRepo.clone(None),
+            call.GitRepo(self.target_git_repo_api_mock, ARGS),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
-            call.GitRepo(self.template_git_repo_api_mock),
-            call.GitRepo.clone("template-branch"),
+            call.GitRepo(self.template_git_repo_api_mock, ARGS),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
             call.os.path.isdir("/tmp/target-repo/my-app-685912d3-preview"),
             call.logging.info("Create new folder for preview: %s", "my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path(".preview-templates/my-app"),
             call.os.path.isdir("/tmp/template-repo/.preview-templates/my-app"),
             call.logging.info("Using the preview template folder: %s", ".preview-templates/my-app"),
+            call.reflink_tree(
+                "/tmp/template-repo/.preview-templates/my-app", "/tmp/target-repo/my-app-685912d3-preview"
+            ),
             call.shutil.copytree(
                 "/tmp/template-repo/.preview-templates/my-app", "/tmp/target-repo/my-app-685912d3-preview"
             ),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", "name", "my-app-685912d3-preview"
-            ),
+            call.yaml_file_load("/tmp/target-repo/my-app-685912d3-preview/Chart.yaml"),
+            call.update_yaml_value(YAML_CONTENT, "name", "my-app-685912d3-preview"),
             call.logging.info(
                 "Replaced property '%s' in '%s' with value: %s", "name", "Chart.yaml", "my-app-685912d3-preview"
             ),
+            call.yaml_file_dump(YAML_CONTENT, "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/values.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/values.yaml",
-                "image.tag",
-                "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9",
-            ),
+            call.yaml_file_load("/tmp/target-repo/my-app-685912d3-preview/values.yaml"),
+            call.update_yaml_value(YAML_CONTENT, "image.tag", "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9"),
             call.logging.info(
                 "Replaced property '%s' in '%s' with value: %s",
                 "image.tag",
                 "values.yaml",
                 "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9",
             ),
-            call.GitRepo.get_full_file_path("my-app-685912d3-preview/values.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/values.yaml", "route.host", "app.xy-685912d3.example.tld"
-            ),
+            call.update_yaml_value(YAML_CONTENT, "route.host", "app.xy-685912d3.example.tld"),
             call.logging.info(
                 "Replaced property '%s' in '%s' with value: %s",
                 "route.host",
                 "values.yaml",
                 "app.xy-685912d3.example.tld",
             ),
+            call.yaml_file_dump(YAML_CONTENT, "/tmp/target-repo/my-app-685912d3-preview/values.yaml"),
             call.GitRepo.commit(
                 "GIT_USER",
                 "GIT_EMAIL",
@@ -223,6 +250,7 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             "/tmp/target-repo/my-app-685912d3-preview": False,  # doesn't exist yet -> expect create
             "/tmp/target-repo/.preview-templates/my-app": True,
         }[path]
+        self.target_git_repo_mock.checkout_tree_from.return_value = True
 
         deployment_created_callback = Mock(return_value=None)
 
@@ -237,7 +265,9 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
         deployment_created_callback.assert_called_once_with("created template 685912d3")
 
         assert self.mock_manager.method_calls == [
-            call.load_gitops_config(ARGS, "ORGA", "REPO"),
+            call.GitRepoApiFactory.create(ARGS, "ORGA", "REPO"),
+            call.GitRepo(self.app_git_repo_api_mock, ARGS),
+            call.load_gitops_config(ARGS, "ORGA", "REPO", self.app_git_repo_mock),
             call.yaml_file_dump(
                 {
                     "previewId": "PREVIEW_ID",
@@ -247,49 +277,114 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
                 },
                 "/tmp/gitopscli-preview-info.yaml",
             ),
+            call.GitRepo.is_cloned(),
             call.GitRepoApiFactory.create(
                 ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"
             ),  # only clone once for template and target
-            call.GitRepo(self.target_git_repo_api_mock),
-            call.GitRepo.clone(None),
+            call.GitRepo(self.target_git_repo_api_mock, ARGS),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview", ".preview-templates/my-app"]),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
             call.os.path.isdir("/tmp/target-repo/my-app-685912d3-preview"),
             call.logging.info("Create new folder for preview: %s", "my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path(".preview-templates/my-app"),
             call.os.path.isdir("/tmp/target-repo/.preview-templates/my-app"),
             call.logging.info("Using the preview template folder: %s", ".preview-templates/my-app"),
-            call.shutil.copytree(
-                "/tmp/target-repo/.preview-templates/my-app", "/tmp/target-repo/my-app-685912d3-preview"
-            ),
+            call.reflink_tree("/tmp/target-repo/.preview-templates/my-app", "/tmp/target-repo/my-app-685912d3-preview"),
+            call.GitRepo.checkout_tree_from(
+                self.target_git_repo_mock, ".preview-templates/my-app", "my-app-685912d3-preview"
+            ),  # no copy of the file contents
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", "name", "my-app-685912d3-preview"
-            ),
+            call.yaml_file_load("/tmp/target-repo/my-app-685912d3-preview/Chart.yaml"),
+            call.update_yaml_value(YAML_CONTENT, "name", "my-app-685912d3-preview"),
             call.logging.info(
                 "Replaced property '%s' in '%s' with value: %s", "name", "Chart.yaml", "my-app-685912d3-preview"
             ),
+            call.yaml_file_dump(YAML_CONTENT, "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/values.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/values.yaml",
-                "image.tag",
-                "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9",
-            ),
+            call.yaml_file_load("/tmp/target-repo/my-app-685912d3-preview/values.yaml"),
+            call.update_yaml_value(YAML_CONTENT, "image.tag", "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9"),
             call.logging.info(
                 "Replaced property '%s' in '%s' with value: %s",
                 "image.tag",
                 "values.yaml",
                 "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9",
             ),
-            call.GitRepo.get_full_file_path("my-app-685912d3-preview/values.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/values.yaml", "route.host", "app.xy-685912d3.example.tld"
-            ),
+            call.update_yaml_value(YAML_CONTENT, "route.host", "app.xy-685912d3.example.tld"),
             call.logging.info(
                 "Replaced property '%s' in '%s' with value: %s",
                 "route.host",
                 "values.yaml",
                 "app.xy-685912d3.example.tld",
             ),
+            call.yaml_file_dump(YAML_CONTENT, "/tmp/target-repo/my-app-685912d3-preview/values.yaml"),
+            call.GitRepo.commit(
+                "GIT_USER",
+                "GIT_EMAIL",
+                "Create new preview environment for 'my-app' and git hash '3361723dbd91fcfae7b5b8b8b7d462fbc14187a9'.",
+            ),
+            call.GitRepo.push(),
+        ]
+
+    def test_create_new_preview_from_other_branch_of_target_repo(self):
+        self.load_gitops_config_mock.return_value = replace(
+            self.load_gitops_config_mock.return_value,
+            preview_template_organisation="PREVIEW_TARGET_ORG",  # template repo = target repo
+            preview_template_repository="PREVIEW_TARGET_REPO",  # template repo = target repo
+            replacements={
+                "Chart.yaml": [GitOpsConfig.Replacement(path="name", value_template="${PREVIEW_NAMESPACE}")],
+            },
+        )
+        self.os_mock.path.isdir.side_effect = lambda path: {
+            "/tmp/target-repo/my-app-685912d3-preview": False,  # doesn't exist yet -> expect create
+            "/tmp/template-repo/.preview-templates/my-app": True,
+        }[path]
+
+        deployment_created_callback = Mock(return_value=None)
+
+        command = CreatePreviewCommand(ARGS)
+        command.register_callbacks(
+            deployment_already_up_to_date_callback=lambda route_host: self.fail("should not be called"),
+            deployment_updated_callback=lambda route_host: self.fail("should not be called"),
+            deployment_created_callback=deployment_created_callback,
+        )
+        command.execute()
+
+        deployment_created_callback.assert_called_once_with("created template 685912d3")
+
+        assert self.mock_manager.method_calls == [
+            call.GitRepoApiFactory.create(ARGS, "ORGA", "REPO"),
+            call.GitRepo(self.app_git_repo_api_mock, ARGS),
+            call.load_gitops_config(ARGS, "ORGA", "REPO", self.app_git_repo_mock),
+            call.yaml_file_dump(INFO_YAML, "/tmp/gitopscli-preview-info.yaml"),
+            call.GitRepo.is_cloned(),
+            call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
+            call.GitRepo(self.target_git_repo_api_mock, ARGS),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
+            call.GitRepo.create_worktree(
+                "template-branch", sparse_paths=[".preview-templates/my-app"]
+            ),  # no second clone of the same repository
+            call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
+            call.os.path.isdir("/tmp/target-repo/my-app-685912d3-preview"),
+            call.logging.info("Create new folder for preview: %s", "my-app-685912d3-preview"),
+            call.GitRepo.get_full_file_path(".preview-templates/my-app"),
+            call.os.path.isdir("/tmp/template-repo/.preview-templates/my-app"),
+            call.logging.info("Using the preview template folder: %s", ".preview-templates/my-app"),
+            call.reflink_tree(
+                "/tmp/template-repo/.preview-templates/my-app", "/tmp/target-repo/my-app-685912d3-preview"
+            ),
+            call.GitRepo.checkout_tree_from(
+                self.template_git_repo_mock, ".preview-templates/my-app", "my-app-685912d3-preview"
+            ),
+            call.shutil.copytree(
+                "/tmp/template-repo/.preview-templates/my-app", "/tmp/target-repo/my-app-685912d3-preview"
+            ),
+            call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
+            call.yaml_file_load("/tmp/target-repo/my-app-685912d3-preview/Chart.yaml"),
+            call.update_yaml_value(YAML_CONTENT, "name", "my-app-685912d3-preview"),
+            call.logging.info(
+                "Replaced property '%s' in '%s' with value: %s", "name", "Chart.yaml", "my-app-685912d3-preview"
+            ),
+            call.yaml_file_dump(YAML_CONTENT, "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml"),
             call.GitRepo.commit(
                 "GIT_USER",
                 "GIT_EMAIL",
@@ -298,6 +393,61 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             call.GitRepo.push(),
         ]
 
+    def test_update_existing_preview_in_cloned_app_repo(self):
+        self.load_gitops_config_mock.return_value = replace(
+            self.load_gitops_config_mock.return_value,
+            preview_target_organisation="ORGA",  # target repo = app repo
+            preview_target_repository="REPO",  # target repo = app repo
+            replacements={
+                "Chart.yaml": [GitOpsConfig.Replacement(path="name", value_template="${PREVIEW_NAMESPACE}")],
+            },
+        )
+        self.app_git_repo_mock.is_cloned.return_value = True  # config couldn't be loaded via API
+        self.os_mock.path.isdir.side_effect = lambda path: {
+            "/tmp/app-repo/my-app-685912d3-preview": True,  # already exists -> expect update
+        }[path]
+
+        deployment_updated_callback = Mock(return_value=None)
+
+        command = CreatePreviewCommand(ARGS)
+        command.register_callbacks(
+            deployment_already_up_to_date_callback=lambda route_host: self.fail("should not be called"),
+            deployment_updated_callback=deployment_updated_callback,
+            deployment_created_callback=lambda route_host: self.fail("should not be called"),
+        )
+        command.execute()
+
+        deployment_updated_callback.assert_called_once_with("updated template 685912d3")
+
+        assert self.mock_manager.method_calls == [
+            call.GitRepoApiFactory.create(ARGS, "ORGA", "REPO"),
+            call.GitRepo(self.app_git_repo_api_mock, ARGS),
+            call.load_gitops_config(ARGS, "ORGA", "REPO", self.app_git_repo_mock),
+            call.yaml_file_dump(INFO_YAML, "/tmp/gitopscli-preview-info.yaml"),
+            call.GitRepo.is_cloned(),
+            call.logging.info("Reusing the clone of the app repository as preview target"),
+            call.GitRepo.add_sparse_paths(["my-app-685912d3-preview"]),  # no second clone of the app repository
+            call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
+            call.GitRepo(self.template_git_repo_api_mock, ARGS),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
+            call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
+            call.os.path.isdir("/tmp/app-repo/my-app-685912d3-preview"),
+            call.logging.info("Use existing folder for preview: %s", "my-app-685912d3-preview"),
+            call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
+            call.yaml_file_load("/tmp/app-repo/my-app-685912d3-preview/Chart.yaml"),
+            call.update_yaml_value(YAML_CONTENT, "name", "my-app-685912d3-preview"),
+            call.logging.info(
+                "Replaced property '%s' in '%s' with value: %s", "name", "Chart.yaml", "my-app-685912d3-preview"
+            ),
+            call.yaml_file_dump(YAML_CONTENT, "/tmp/app-repo/my-app-685912d3-preview/Chart.yaml"),
+            call.GitRepo.commit(
+                "GIT_USER",
+                "GIT_EMAIL",
+                "Update preview environment for 'my-app' and git hash '3361723dbd91fcfae7b5b8b8b7d462fbc14187a9'.",
+            ),
+            call.GitRepo.push(),
+        ]
+
     def test_update_existing_preview(self):
         self.os_mock.path.isdir.side_effect = lambda path: {
             "/tmp/target-repo/my-app-685912d3-preview": True,  # already exists -> expect update
@@ -316,46 +466,44 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
         deployment_updated_callback.assert_called_once_with("updated template 685912d3")
 
         assert self.mock_manager.method_calls == [
-            call.load_gitops_config(ARGS, "ORGA", "REPO"),
+            call.GitRepoApiFactory.create(ARGS, "ORGA", "REPO"),
+            call.GitRepo(self.app_git_repo_api_mock, ARGS),
+            call.load_gitops_config(ARGS, "ORGA", "REPO", self.app_git_repo_mock),
             call.yaml_file_dump(INFO_YAML, "/tmp/gitopscli-preview-info.yaml"),
+            call.GitRepo.is_cloned(),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
-            call.GitRepo(self.target_git_repo_api_mock),
-            call.GitRepo.clone(None),
+            call.GitRepo(self.target_git_repo_api_mock, ARGS),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
-            call.GitRepo(self.template_git_repo_api_mock),
-            call.GitRepo.clone("template-branch"),
+            call.GitRepo(self.template_git_repo_api_mock, ARGS),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
             call.os.path.isdir("/tmp/target-repo/my-app-685912d3-preview"),
             call.logging.info("Use existing folder for preview: %s", "my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", "name", "my-app-685912d3-preview"
-            ),
+            call.yaml_file_load("/tmp/target-repo/my-app-685912d3-preview/Chart.yaml"),
+            call.update_yaml_value(YAML_CONTENT, "name", "my-app-685912d3-preview"),
             call.logging.info(
                 "Replaced property '%s' in '%s' with value: %s", "name", "Chart.yaml", "my-app-685912d3-preview"
             ),
+            call.yaml_file_dump(YAML_CONTENT, "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/values.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/values.yaml",
-                "image.tag",
-                "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9",
-            ),
+            call.yaml_file_load("/tmp/target-repo/my-app-685912d3-preview/values.yaml"),
+            call.update_yaml_value(YAML_CONTENT, "image.tag", "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9"),
             call.logging.info(
                 "Replaced property '%s' in '%s' with value: %s",
                 "image.tag",
                 "values.yaml",
                 "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9",
             ),
-            call.GitRepo.get_full_file_path("my-app-685912d3-preview/values.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/values.yaml", "route.host", "app.xy-685912d3.example.tld"
-            ),
+            call.update_yaml_value(YAML_CONTENT, "route.host", "app.xy-685912d3.example.tld"),
             call.logging.info(
                 "Replaced property '%s' in '%s' with value: %s",
                 "route.host",
                 "values.yaml",
                 "app.xy-685912d3.example.tld",
             ),
+            call.yaml_file_dump(YAML_CONTENT, "/tmp/target-repo/my-app-685912d3-preview/values.yaml"),
             call.GitRepo.commit(
                 "GIT_USER",
                 "GIT_EMAIL",
@@ -369,7 +517,7 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             "/tmp/target-repo/my-app-685912d3-preview": True,  # already exists -> expect update
         }[path]
 
-        self.update_yaml_file_mock.return_value = False  # nothing updated -> expect already up to date
+        self.update_yaml_value_mock.return_value = False  # nothing updated -> expect already up to date
 
         deployment_already_up_to_date_callback = Mock(return_value=None)
 
@@ -384,42 +532,149 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
         deployment_already_up_to_date_callback.assert_called_once_with("uptodate template 685912d3")
 
         assert self.mock_manager.method_calls == [
-            call.load_gitops_config(ARGS, "ORGA", "REPO"),
+            call.GitRepoApiFactory.create(ARGS, "ORGA", "REPO"),
+            call.GitRepo(self.app_git_repo_api_mock, ARGS),
+            call.load_gitops_config(ARGS, "ORGA", "REPO", self.app_git_repo_mock),
             call.yaml_file_dump(INFO_YAML, "/tmp/gitopscli-preview-info.yaml"),
+            call.GitRepo.is_cloned(),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
-            call.GitRepo(self.target_git_repo_api_mock),
-            call.GitRepo.clone(None),
+            call.GitRepo(self.target_git_repo_api_mock, ARGS),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
-            call.GitRepo(self.template_git_repo_api_mock),
-            call.GitRepo.clone("template-branch"),
+            call.GitRepo(self.template_git_repo_api_mock, ARGS),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
             call.os.path.isdir("/tmp/target-repo/my-app-685912d3-preview"),
             call.logging.info("Use existing folder for preview: %s", "my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", "name", "my-app-685912d3-preview"
-            ),
+            call.yaml_file_load("/tmp/target-repo/my-app-685912d3-preview/Chart.yaml"),
+            call.update_yaml_value(YAML_CONTENT, "name", "my-app-685912d3-preview"),
             call.logging.info("Keep property '%s' in '%s' value: %s", "name", "Chart.yaml", "my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/values.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/values.yaml",
-                "image.tag",
-                "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9",
-            ),
+            call.yaml_file_load("/tmp/target-repo/my-app-685912d3-preview/values.yaml"),
+            call.update_yaml_value(YAML_CONTENT, "image.tag", "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9"),
             call.logging.info(
                 "Keep property '%s' in '%s' value: %s",
                 "image.tag",
                 "values.yaml",
                 "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9",
             ),
+            call.update_yaml_value(YAML_CONTENT, "route.host", "app.xy-685912d3.example.tld"),
+            call.logging.info(
+                "Keep property '%s' in '%s' value: %s", "route.host", "values.yaml", "app.xy-685912d3.example.tld"
+            ),
+            call.logging.info("The preview is already up-to-date. I'm done here."),
+        ]
+
+    def test_update_existing_preview_only_writes_changed_files(self):
+        self.os_mock.path.isdir.side_effect = lambda path: {
+            "/tmp/target-repo/my-app-685912d3-preview": True,  # already exists -> expect update
+        }[path]
+
+        self.update_yaml_value_mock.side_effect = lambda yaml, key, value: key == "image.tag"  # only new git hash
+
+        deployment_updated_callback = Mock(return_value=None)
+
+        command = CreatePreviewCommand(ARGS)
+        command.register_callbacks(
+            deployment_already_up_to_date_callback=lambda route_host: self.fail("should not be called"),
+            deployment_updated_callback=deployment_updated_callback,
+            deployment_created_callback=lambda route_host: self.fail("should not be called"),
+        )
+        command.execute()
+
+        deployment_updated_callback.assert_called_once_with("updated template 685912d3")
+
+        assert self.mock_manager.method_calls == [
+            call.GitRepoApiFactory.create(ARGS, "ORGA", "REPO"),
+            call.GitRepo(self.app_git_repo_api_mock, ARGS),
+            call.load_gitops_config(ARGS, "ORGA", "REPO", self.app_git_repo_mock),
+            call.yaml_file_dump(INFO_YAML, "/tmp/gitopscli-preview-info.yaml"),
+            call.GitRepo.is_cloned(),
+            call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
+            call.GitRepo(self.target_git_repo_api_mock, ARGS),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
+            call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
+            call.GitRepo(self.template_git_repo_api_mock, ARGS),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
+            call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
+            call.os.path.isdir("/tmp/target-repo/my-app-685912d3-preview"),
+            call.logging.info("Use existing folder for preview: %s", "my-app-685912d3-preview"),
+            call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
+            call.yaml_file_load("/tmp/target-repo/my-app-685912d3-preview/Chart.yaml"),
+            call.update_yaml_value(YAML_CONTENT, "name", "my-app-685912d3-preview"),
+            call.logging.info("Keep property '%s' in '%s' value: %s", "name", "Chart.yaml", "my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/values.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/values.yaml", "route.host", "app.xy-685912d3.example.tld"
+            call.yaml_file_load("/tmp/target-repo/my-app-685912d3-preview/values.yaml"),
+            call.update_yaml_value(YAML_CONTENT, "image.tag", "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9"),
+            call.logging.info(
+                "Replaced property '%s' in '%s' with value: %s",
+                "image.tag",
+                "values.yaml",
+                "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9",
             ),
+            call.update_yaml_value(YAML_CONTENT, "route.host", "app.xy-685912d3.example.tld"),
             call.logging.info(
                 "Keep property '%s' in '%s' value: %s", "route.host", "values.yaml", "app.xy-685912d3.example.tld"
             ),
-            call.logging.info("The preview is already up-to-date. I'm done here."),
+            call.yaml_file_dump(YAML_CONTENT, "/tmp/target-repo/my-app-685912d3-preview/values.yaml"),
+            call.GitRepo.commit(
+                "GIT_USER",
+                "GIT_EMAIL",
+                "Update preview environment for 'my-app' and git hash '3361723dbd91fcfae7b5b8b8b7d462fbc14187a9'.",
+            ),
+            call.GitRepo.push(),
+        ]
+
+    def test_update_existing_preview_skips_files_without_replacements(self):
+        self.os_mock.path.isdir.side_effect = lambda path: {
+            "/tmp/target-repo/my-app-685912d3-preview": True,  # already exists -> expect update
+        }[path]
+        gitops_config = self.load_gitops_config_mock.return_value
+        self.load_gitops_config_mock.return_value = replace(
+            gitops_config, replacements={**gitops_config.replacements, "values.yaml": []}
+        )
+
+        deployment_updated_callback = Mock(return_value=None)
+
+        command = CreatePreviewCommand(ARGS)
+        command.register_callbacks(
+            deployment_already_up_to_date_callback=lambda route_host: self.fail("should not be called"),
+            deployment_updated_callback=deployment_updated_callback,
+            deployment_created_callback=lambda route_host: self.fail("should not be called"),
+        )
+        command.execute()
+
+        deployment_updated_callback.assert_called_once_with("updated template 685912d3")
+
+        assert self.mock_manager.method_calls == [
+            call.GitRepoApiFactory.create(ARGS, "ORGA", "REPO"),
+            call.GitRepo(self.app_git_repo_api_mock, ARGS),
+            call.load_gitops_config(ARGS, "ORGA", "REPO", self.app_git_repo_mock),
+            call.yaml_file_dump(INFO_YAML, "/tmp/gitopscli-preview-info.yaml"),
+            call.GitRepo.is_cloned(),
+            call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
+            call.GitRepo(self.target_git_repo_api_mock, ARGS),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
+            call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
+            call.GitRepo(self.template_git_repo_api_mock, ARGS),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
+            call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
+            call.os.path.isdir("/tmp/target-repo/my-app-685912d3-preview"),
+            call.logging.info("Use existing folder for preview: %s", "my-app-685912d3-preview"),
+            call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
+            call.yaml_file_load("/tmp/target-repo/my-app-685912d3-preview/Chart.yaml"),
+            call.update_yaml_value(YAML_CONTENT, "name", "my-app-685912d3-preview"),
+            call.logging.info(
+                "Replaced property '%s' in '%s' with value: %s", "name", "Chart.yaml", "my-app-685912d3-preview"
+            ),
+            call.yaml_file_dump(YAML_CONTENT, "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml"),
+            call.GitRepo.commit(
+                "GIT_USER",
+                "GIT_EMAIL",
+                "Update preview environment for 'my-app' and git hash '3361723dbd91fcfae7b5b8b8b7d462fbc14187a9'.",
+            ),
+            call.GitRepo.push(),
         ]
 
     def test_create_preview_for_unknown_template(self):
@@ -435,14 +690,17 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             self.assertEqual("The preview template folder does not exist: .preview-templates/my-app", str(ex))
 
         assert self.mock_manager.method_calls == [
-            call.load_gitops_config(ARGS, "ORGA", "REPO"),
+            call.GitRepoApiFactory.create(ARGS, "ORGA", "REPO"),
+            call.GitRepo(self.app_git_repo_api_mock, ARGS),
+            call.load_gitops_config(ARGS, "ORGA", "REPO", self.app_git_repo_mock),
             call.yaml_file_dump(INFO_YAML, "/tmp/gitopscli-preview-info.yaml"),
+            call.GitRepo.is_cloned(),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
-            call.GitRepo(self.target_git_repo_api_mock),
-            call.GitRepo.clone(None),
+            call.GitRepo(self.target_git_repo_api_mock, ARGS),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
-            call.GitRepo(self.template_git_repo_api_mock),
-            call.GitRepo.clone("template-branch"),
+            call.GitRepo(self.template_git_repo_api_mock, ARGS),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
             call.os.path.isdir("/tmp/target-repo/my-app-685912d3-preview"),
             call.logging.info("Create new folder for preview: %s", "my-app-685912d3-preview"),
@@ -451,7 +709,7 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
         ]
 
     def test_create_preview_values_yaml_not_found(self):
-        self.update_yaml_file_mock.side_effect = FileNotFoundError()
+        self.yaml_file_load_mock.side_effect = FileNotFoundError()
 
         try:
             CreatePreviewCommand(ARGS).execute()
@@ -460,25 +718,26 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             self.assertEqual("No such file: my-app-685912d3-preview/Chart.yaml", str(ex))
 
         assert self.mock_manager.method_calls == [
-            call.load_gitops_config(ARGS, "ORGA", "REPO"),
+            call.GitRepoApiFactory.create(ARGS, "ORGA", "REPO"),
+            call.GitRepo(self.app_git_repo_api_mock, ARGS),
+            call.load_gitops_config(ARGS, "ORGA", "REPO", self.app_git_repo_mock),
             call.yaml_file_dump(INFO_YAML, "/tmp/gitopscli-preview-info.yaml"),
+            call.GitRepo.is_cloned(),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
-            call.GitRepo(self.target_git_repo_api_mock),
-            call.GitRepo.clone(None),
+            call.GitRepo(self.target_git_repo_api_mock, ARGS),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
-            call.GitRepo(self.template_git_repo_api_mock),
-            call.GitRepo.clone("template-branch"),
+            call.GitRepo(self.template_git_repo_api_mock, ARGS),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
             call.os.path.isdir("/tmp/target-repo/my-app-685912d3-preview"),
             call.logging.info("Use existing folder for preview: %s", "my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", "name", "my-app-685912d3-preview"
-            ),
+            call.yaml_file_load("/tmp/target-repo/my-app-685912d3-preview/Chart.yaml"),
         ]
 
     def test_create_preview_values_yaml_parse_error(self):
-        self.update_yaml_file_mock.side_effect = YAMLException()
+        self.yaml_file_load_mock.side_effect = YAMLException()
 
         try:
             CreatePreviewCommand(ARGS).execute()
@@ -487,25 +746,26 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             self.assertEqual("Error loading file: my-app-685912d3-preview/Chart.yaml", str(ex))
 
         assert self.mock_manager.method_calls == [
-            call.load_gitops_config(ARGS, "ORGA", "REPO"),
+            call.GitRepoApiFactory.create(ARGS, "ORGA", "REPO"),
+            call.GitRepo(self.app_git_repo_api_mock, ARGS),
+            call.load_gitops_config(ARGS, "ORGA", "REPO", self.app_git_repo_mock),
             call.yaml_file_dump(INFO_YAML, "/tmp/gitopscli-preview-info.yaml"),
+            call.GitRepo.is_cloned(),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
-            call.GitRepo(self.target_git_repo_api_mock),
-            call.GitRepo.clone(None),
+            call.GitRepo(self.target_git_repo_api_mock, ARGS),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
-            call.GitRepo(self.template_git_repo_api_mock),
-            call.GitRepo.clone("template-branch"),
+            call.GitRepo(self.template_git_repo_api_mock, ARGS),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
             call.os.path.isdir("/tmp/target-repo/my-app-685912d3-preview"),
             call.logging.info("Use existing folder for preview: %s", "my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", "name", "my-app-685912d3-preview"
-            ),
+            call.yaml_file_load("/tmp/target-repo/my-app-685912d3-preview/Chart.yaml"),
         ]
 
     def test_create_preview_with_invalid_replacement_path(self):
-        self.update_yaml_file_mock.side_effect = KeyError()
+        self.update_yaml_value_mock.side_effect = KeyError()
 
         try:
             CreatePreviewCommand(ARGS).execute()
@@ -514,21 +774,23 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             self.assertEqual("Key 'name' not found in file: my-app-685912d3-preview/Chart.yaml", str(ex))
 
         assert self.mock_manager.method_calls == [
-            call.load_gitops_config(ARGS, "ORGA", "REPO"),
+            call.GitRepoApiFactory.create(ARGS, "ORGA", "REPO"),
+            call.GitRepo(self.app_git_repo_api_mock, ARGS),
+            call.load_gitops_config(ARGS, "ORGA", "REPO", self.app_git_repo_mock),
             call.yaml_file_dump(INFO_YAML, "/tmp/gitopscli-preview-info.yaml"),
+            call.GitRepo.is_cloned(),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
-            call.GitRepo(self.target_git_repo_api_mock),
-            call.GitRepo.clone(None),
+            call.GitRepo(self.target_git_repo_api_mock, ARGS),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
-            call.GitRepo(self.template_git_repo_api_mock),
-            call.GitRepo.clone("template-branch"),
+            call.GitRepo(self.template_git_repo_api_mock, ARGS),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
             call.os.path.isdir("/tmp/target-repo/my-app-685912d3-preview"),
             call.logging.info("Use existing folder for preview: %s", "my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", "name", "my-app-685912d3-preview"
-            ),
+            call.yaml_file_load("/tmp/target-repo/my-app-685912d3-preview/Chart.yaml"),
+            call.update_yaml_value(YAML_CONTENT, "name", "my-app-685912d3-preview"),
         ]
 
     def test_create_new_preview_invalid_chart_template(self):
@@ -537,7 +799,7 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             "/tmp/template-repo/.preview-templates/my-app": True,
         }[path]
 
-        self.update_yaml_file_mock.side_effect = KeyError()
+        self.update_yaml_value_mock.side_effect = KeyError()
 
         try:
             CreatePreviewCommand(ARGS).execute()
@@ -546,25 +808,30 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             self.assertEqual("Key 'name' not found in file: my-app-685912d3-preview/Chart.yaml", str(ex))
 
         assert self.mock_manager.method_calls == [
-            call.load_gitops_config(ARGS, "ORGA", "REPO"),
+            call.GitRepoApiFactory.create(ARGS, "ORGA", "REPO"),
+            call.GitRepo(self.app_git_repo_api_mock, ARGS),
+            call.load_gitops_config(ARGS, "ORGA", "REPO", self.app_git_repo_mock),
             call.yaml_file_dump(INFO_YAML, "/tmp/gitopscli-preview-info.yaml"),
+            call.GitRepo.is_cloned(),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
-            call.GitRepo(self.target_git_repo_api_mock),
-            call.GitRepo.clone(None),
+            call.GitRepo(self.target_git_repo_api_mock, ARGS),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
-            call.GitRepo(self.template_git_repo_api_mock),
-            call.GitRepo.clone("template-branch"),
+            call.GitRepo(self.template_git_repo_api_mock, ARGS),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
             call.os.path.isdir("/tmp/target-repo/my-app-685912d3-preview"),
             call.logging.info("Create new folder for preview: %s", "my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path(".preview-templates/my-app"),
             call.os.path.isdir("/tmp/template-repo/.preview-templates/my-app"),
             call.logging.info("Using the preview template folder: %s", ".preview-templates/my-app"),
+            call.reflink_tree(
+                "/tmp/template-repo/.preview-templates/my-app", "/tmp/target-repo/my-app-685912d3-preview"
+            ),
             call.shutil.copytree(
                 "/tmp/template-repo/.preview-templates/my-app", "/tmp/target-repo/my-app-685912d3-preview"
             ),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", "name", "my-app-685912d3-preview"
-            ),
+            call.yaml_file_load("/tmp/target-repo/my-app-685912d3-preview/Chart.yaml"),
+            call.update_yaml_value(YAML_CONTENT, "name", "my-app-685912d3-preview"),
         ]
@@ -80,8 +80,8 @@ class DeletePreviewCommandTest(MockMixin, unittest.TestCase):
         assert self.mock_manager.method_calls == [
             call.load_gitops_config(args, "ORGA", "REPO"),
             call.GitRepoApiFactory.create(args, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
-            call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone("target-branch"),
+            call.GitRepo(self.git_repo_api_mock, args),
+            call.GitRepo.clone("target-branch", sparse_paths=["app-685912d3-preview"]),
             call.logging.info("Preview folder name: %s", "app-685912d3-preview"),
             call.GitRepo.get_full_file_path("app-685912d3-preview"),
             call.os.path.exists("/tmp/created-tmp-dir/app-685912d3-preview"),
@@ -111,8 +111,8 @@ class DeletePreviewCommandTest(MockMixin, unittest.TestCase):
         assert self.mock_manager.method_calls == [
             call.load_gitops_config(args, "ORGA", "REPO"),
             call.GitRepoApiFactory.create(args, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
-            call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone("target-branch"),
+            call.GitRepo(self.git_repo_api_mock, args),
+            call.GitRepo.clone("target-branch", sparse_paths=["app-685912d3-preview"]),
             call.logging.info("Preview folder name: %s", "app-685912d3-preview"),
             call.GitRepo.get_full_file_path("app-685912d3-preview"),
             call.os.path.exists("/tmp/created-tmp-dir/app-685912d3-preview"),
@@ -143,8 +143,8 @@ class DeletePreviewCommandTest(MockMixin, unittest.TestCase):
         assert self.mock_manager.method_calls == [
             call.load_gitops_config(args, "ORGA", "REPO"),
             call.GitRepoApiFactory.create(args, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
-            call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone("target-branch"),
+            call.GitRepo(self.git_repo_api_mock, args),
+            call.GitRepo.clone("target-branch", sparse_paths=["app-685912d3-preview"]),
             call.logging.info("Preview folder name: %s", "app-685912d3-preview"),
             call.GitRepo.get_full_file_path("app-685912d3-preview"),
             call.os.path.exists("/tmp/created-tmp-dir/app-685912d3-preview"),
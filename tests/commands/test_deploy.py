@@ -1,28 +1,43 @@
 from io import StringIO
 import logging
+import shutil
+import tempfile
 from textwrap import dedent
 import uuid
 import unittest
 from unittest import mock
-from unittest.mock import call
+from unittest.mock import ANY, call
 from uuid import UUID
 import pytest
+from gitopscli.commands.common import DeploySpool
 from gitopscli.gitops_exception import GitOpsException
 from gitopscli.commands.deploy import DeployCommand
 from gitopscli.git_api import GitRepoApi, GitProvider, GitRepoApiFactory, GitRepo
-from gitopscli.io_api.yaml_util import update_yaml_file, YAMLException
+from gitopscli.io_api.yaml_util import update_yaml_file_values, update_yaml_value, yaml_load, YAMLException
 from .mock_mixin import MockMixin
 
+YAML_CONTENT = {"a": {"b": {"c": "old", "d": "old"}}}
+
 
 class DeployCommandTest(MockMixin, unittest.TestCase):
     def setUp(self):
         self.init_mock_manager(DeployCommand)
 
-        self.update_yaml_file_mock = self.monkey_patch(update_yaml_file)
-        self.update_yaml_file_mock.return_value = True
+        self.update_yaml_file_values_mock = self.monkey_patch(update_yaml_file_values)
+        self.update_yaml_file_values_mock.side_effect = self.__update_yaml_file_values
+        self.up_to_date_keys = set()
+        self.missing_keys = set()
+
+        self.update_yaml_value_mock = self.monkey_patch(update_yaml_value)
+        self.update_yaml_value_mock.return_value = True
+
+        self.yaml_load_mock = self.monkey_patch(yaml_load)
+        self.yaml_load_mock.return_value = YAML_CONTENT
 
         self.logging_mock = self.monkey_patch(logging)
         self.logging_mock.info.return_value = None
+        self.logging_mock.warning.return_value = None
+        self.logging_mock.error.return_value = None
 
         self.uuid_mock = self.monkey_patch(uuid)
         self.uuid_mock.uuid4.return_value = UUID("b973b5bb-64a6-4735-a840-3113d531b41c")
@@ -33,6 +48,11 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
         )
         self.git_repo_api_mock.merge_pull_request.return_value = None
         self.git_repo_api_mock.delete_branch.return_value = None
+        self.git_repo_api_mock.get_default_branch.return_value = "main"
+        self.git_repo_api_mock.get_branch_head_hash.return_value = "HEAD_HASH"
+        self.git_repo_api_mock.get_file_content.return_value = "<yaml content>"
+        self.api_commit_hash = "2c3d1e1fa9dd7e41ba2b7e5d2d7a4e0fbb6ff8d2"
+        self.git_repo_api_mock.commit_file.return_value = self.api_commit_hash
 
         self.git_repo_api_factory_mock = self.monkey_patch(GitRepoApiFactory)
         self.git_repo_api_factory_mock.create.return_value = self.git_repo_api_mock
@@ -46,10 +66,22 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
         self.example_commit_hash = "5f3a443e7ecb3723c1a71b9744e2993c0b6dfc00"
         self.git_repo_mock.commit.return_value = self.example_commit_hash
         self.git_repo_mock.push.return_value = None
+        self.git_repo_mock.reset_hard.return_value = None
         self.git_repo_mock.get_full_file_path.side_effect = lambda x: f"/tmp/created-tmp-dir/{x}"
 
         self.seal_mocks()
 
+    def __update_yaml_file_values(self, file_path, updates, on_value_updated=None):
+        updated_keys = []
+        for key, value in updates:
+            if key in self.missing_keys:
+                raise KeyError(f"Key '{key}' not found in YAML!")
+            if key not in self.up_to_date_keys:
+                updated_keys.append(key)
+                if on_value_updated:
+                    on_value_updated(key, value)
+        return updated_keys
+
     @mock.patch("sys.stdout", new_callable=StringIO)
     def test_happy_flow(self, mock_print):
         args = DeployCommand.Args(
@@ -73,16 +105,17 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
 
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
-            call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepo(self.git_repo_api_mock, args),
+            call.GitRepo.clone(sparse_paths=["test"]),
             call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.update_yaml_file_values(
+                "/tmp/created-tmp-dir/test/file.yml", [("a.b.c", "foo"), ("a.b.d", "bar")], on_value_updated=ANY
+            ),
             call.logging.info("Updated yaml property %s to %s", "a.b.c", "foo"),
             call.GitRepo.commit("GIT_USER", "GIT_EMAIL", "changed 'a.b.c' to 'foo' in test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.d", "bar"),
             call.logging.info("Updated yaml property %s to %s", "a.b.d", "bar"),
             call.GitRepo.commit("GIT_USER", "GIT_EMAIL", "changed 'a.b.d' to 'bar' in test/file.yml"),
-            call.GitRepo.push(),
+            call.GitRepo.push(recommit=ANY),
         ]
 
         no_output = ""
@@ -111,15 +144,17 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
 
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
-            call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepo(self.git_repo_api_mock, args),
+            call.GitRepo.clone(sparse_paths=["test"]),
             call.uuid.uuid4(),
             call.GitRepo.new_branch("gitopscli-deploy-b973b5bb"),
             call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.update_yaml_file_values(
+                "/tmp/created-tmp-dir/test/file.yml", [("a.b.c", "foo")], on_value_updated=ANY
+            ),
             call.logging.info("Updated yaml property %s to %s", "a.b.c", "foo"),
             call.GitRepo.commit("GIT_USER", "GIT_EMAIL", "changed 'a.b.c' to 'foo' in test/file.yml"),
-            call.GitRepo.push(),
+            call.GitRepo.push(recommit=ANY),
             call.GitRepoApi.create_pull_request_to_default_branch(
                 "gitopscli-deploy-b973b5bb",
                 "Updated value in test/file.yml",
@@ -161,18 +196,19 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
 
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
-            call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepo(self.git_repo_api_mock, args),
+            call.GitRepo.clone(sparse_paths=["test"]),
             call.uuid.uuid4(),
             call.GitRepo.new_branch("gitopscli-deploy-b973b5bb"),
             call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.update_yaml_file_values(
+                "/tmp/created-tmp-dir/test/file.yml", [("a.b.c", "foo"), ("a.b.d", "bar")], on_value_updated=ANY
+            ),
             call.logging.info("Updated yaml property %s to %s", "a.b.c", "foo"),
             call.GitRepo.commit("GIT_USER", "GIT_EMAIL", "changed 'a.b.c' to 'foo' in test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.d", "bar"),
             call.logging.info("Updated yaml property %s to %s", "a.b.d", "bar"),
             call.GitRepo.commit("GIT_USER", "GIT_EMAIL", "changed 'a.b.d' to 'bar' in test/file.yml"),
-            call.GitRepo.push(),
+            call.GitRepo.push(recommit=ANY),
             call.GitRepoApi.create_pull_request_to_default_branch(
                 "gitopscli-deploy-b973b5bb",
                 "Updated values in test/file.yml",
@@ -217,18 +253,19 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
 
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
-            call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepo(self.git_repo_api_mock, args),
+            call.GitRepo.clone(sparse_paths=["test"]),
             call.uuid.uuid4(),
             call.GitRepo.new_branch("gitopscli-deploy-b973b5bb"),
             call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.update_yaml_file_values(
+                "/tmp/created-tmp-dir/test/file.yml", [("a.b.c", "foo"), ("a.b.d", "bar")], on_value_updated=ANY
+            ),
             call.logging.info("Updated yaml property %s to %s", "a.b.c", "foo"),
             call.GitRepo.commit("GIT_USER", "GIT_EMAIL", "changed 'a.b.c' to 'foo' in test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.d", "bar"),
             call.logging.info("Updated yaml property %s to %s", "a.b.d", "bar"),
             call.GitRepo.commit("GIT_USER", "GIT_EMAIL", "changed 'a.b.d' to 'bar' in test/file.yml"),
-            call.GitRepo.push(),
+            call.GitRepo.push(recommit=ANY),
             call.GitRepoApi.create_pull_request_to_default_branch(
                 "gitopscli-deploy-b973b5bb",
                 "Updated values in test/file.yml",
@@ -264,19 +301,20 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
 
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
-            call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepo(self.git_repo_api_mock, args),
+            call.GitRepo.clone(sparse_paths=["test"]),
             call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.update_yaml_file_values(
+                "/tmp/created-tmp-dir/test/file.yml", [("a.b.c", "foo"), ("a.b.d", "bar")], on_value_updated=None
+            ),
             call.logging.info("Updated yaml property %s to %s", "a.b.c", "foo"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.d", "bar"),
             call.logging.info("Updated yaml property %s to %s", "a.b.d", "bar"),
             call.GitRepo.commit(
                 "GIT_USER",
                 "GIT_EMAIL",
                 "updated 2 values in test/file.yml\n\na.b.c: foo\na.b.d: bar",
             ),
-            call.GitRepo.push(),
+            call.GitRepo.push(recommit=ANY),
         ]
 
         no_output = ""
@@ -305,13 +343,15 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
 
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
-            call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepo(self.git_repo_api_mock, args),
+            call.GitRepo.clone(sparse_paths=["test"]),
             call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.update_yaml_file_values(
+                "/tmp/created-tmp-dir/test/file.yml", [("a.b.c", "foo")], on_value_updated=None
+            ),
             call.logging.info("Updated yaml property %s to %s", "a.b.c", "foo"),
             call.GitRepo.commit("GIT_USER", "GIT_EMAIL", "changed 'a.b.c' to 'foo' in test/file.yml"),
-            call.GitRepo.push(),
+            call.GitRepo.push(recommit=ANY),
         ]
 
         no_output = ""
@@ -340,15 +380,16 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
 
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
-            call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepo(self.git_repo_api_mock, args),
+            call.GitRepo.clone(sparse_paths=["test"]),
             call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.update_yaml_file_values(
+                "/tmp/created-tmp-dir/test/file.yml", [("a.b.c", "foo"), ("a.b.d", "bar")], on_value_updated=None
+            ),
             call.logging.info("Updated yaml property %s to %s", "a.b.c", "foo"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.d", "bar"),
             call.logging.info("Updated yaml property %s to %s", "a.b.d", "bar"),
             call.GitRepo.commit("GIT_USER", "GIT_EMAIL", "testcommit"),
-            call.GitRepo.push(),
+            call.GitRepo.push(recommit=ANY),
         ]
 
         no_output = ""
@@ -381,12 +422,12 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
 
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
-            call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepo(self.git_repo_api_mock, args),
+            call.GitRepo.clone(sparse_paths=["test"]),
         ]
 
     def test_file_not_found(self):
-        self.update_yaml_file_mock.side_effect = FileNotFoundError
+        self.update_yaml_file_values_mock.side_effect = FileNotFoundError
 
         args = DeployCommand.Args(
             file="test/file.yml",
@@ -411,14 +452,16 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
 
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
-            call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepo(self.git_repo_api_mock, args),
+            call.GitRepo.clone(sparse_paths=["test"]),
             call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.update_yaml_file_values(
+                "/tmp/created-tmp-dir/test/file.yml", [("a.b.c", "foo"), ("a.b.d", "bar")], on_value_updated=ANY
+            ),
         ]
 
     def test_file_parse_error(self):
-        self.update_yaml_file_mock.side_effect = YAMLException
+        self.update_yaml_file_values_mock.side_effect = YAMLException
 
         args = DeployCommand.Args(
             file="test/file.yml",
@@ -443,14 +486,16 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
 
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
-            call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepo(self.git_repo_api_mock, args),
+            call.GitRepo.clone(sparse_paths=["test"]),
             call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.update_yaml_file_values(
+                "/tmp/created-tmp-dir/test/file.yml", [("a.b.c", "foo"), ("a.b.d", "bar")], on_value_updated=ANY
+            ),
         ]
 
     def test_key_not_found(self):
-        self.update_yaml_file_mock.side_effect = KeyError("dummy key error")
+        self.missing_keys = {"a.b.c"}
 
         args = DeployCommand.Args(
             file="test/file.yml",
@@ -471,18 +516,20 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
         )
         with pytest.raises(GitOpsException) as ex:
             DeployCommand(args).execute()
-        self.assertEqual(str(ex.value), "'dummy key error'")
+        self.assertEqual(str(ex.value), "\"Key 'a.b.c' not found in YAML!\"")
 
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
-            call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepo(self.git_repo_api_mock, args),
+            call.GitRepo.clone(sparse_paths=["test"]),
             call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.update_yaml_file_values(
+                "/tmp/created-tmp-dir/test/file.yml", [("a.b.c", "foo"), ("a.b.d", "bar")], on_value_updated=ANY
+            ),
         ]
 
     def test_nothing_to_update(self):
-        self.update_yaml_file_mock.return_value = False
+        self.up_to_date_keys = {"a.b.c", "a.b.d"}
 
         args = DeployCommand.Args(
             file="test/file.yml",
@@ -505,12 +552,380 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
 
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
-            call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepo(self.git_repo_api_mock, args),
+            call.GitRepo.clone(sparse_paths=["test"]),
             call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.update_yaml_file_values(
+                "/tmp/created-tmp-dir/test/file.yml", [("a.b.c", "foo"), ("a.b.d", "bar")], on_value_updated=ANY
+            ),
             call.logging.info("Yaml property %s already up-to-date", "a.b.c"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.d", "bar"),
             call.logging.info("Yaml property %s already up-to-date", "a.b.d"),
             call.logging.info("All values already up-to-date. I'm done here."),
         ]
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_api_commit_happy_flow(self, mock_print):
+        args = DeployCommand.Args(
+            file="test/file.yml",
+            values={"a.b.c": "foo"},
+            username="USERNAME",
+            password="PASSWORD",
+            git_user="GIT_USER",
+            git_email="GIT_EMAIL",
+            create_pr=False,
+            auto_merge=False,
+            single_commit=False,
+            organisation="ORGA",
+            repository_name="REPO",
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            commit_message=None,
+            json=True,
+            api_commit=True,
+        )
+        DeployCommand(args).execute()
+
+        assert self.mock_manager.method_calls == [
+            call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
+            call.GitRepoApi.get_default_branch(),
+            call.GitRepoApi.get_branch_head_hash("main"),
+            call.GitRepoApi.get_file_content("test/file.yml", "HEAD_HASH"),
+            call.yaml_load("<yaml content>"),
+            call.update_yaml_value(YAML_CONTENT, "a.b.c", "foo"),
+            call.logging.info("Updated yaml property %s to %s", "a.b.c", "foo"),
+            call.GitRepoApi.commit_file(
+                branch="main",
+                source_branch="main",
+                parent_hash="HEAD_HASH",
+                path="test/file.yml",
+                content="a:\n  b:\n    c: old\n    d: old\n",
+                message="changed 'a.b.c' to 'foo' in test/file.yml",
+                git_user="GIT_USER",
+                git_email="GIT_EMAIL",
+            ),
+        ]
+
+        expected_output = (
+            f'{{\n    "commits": [\n        {{\n            "hash": "{self.api_commit_hash}"\n        }}\n    ]\n}}\n'
+        )
+        self.assertMultiLineEqual(mock_print.getvalue(), expected_output)
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_api_commit_create_pr_and_merge_happy_flow(self, mock_print):
+        args = DeployCommand.Args(
+            file="test/file.yml",
+            values={"a.b.c": "foo", "a.b.d": "bar"},
+            username="USERNAME",
+            password="PASSWORD",
+            git_user="GIT_USER",
+            git_email="GIT_EMAIL",
+            create_pr=True,
+            auto_merge=True,
+            single_commit=True,
+            organisation="ORGA",
+            repository_name="REPO",
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            commit_message=None,
+            json=False,
+            api_commit=True,
+        )
+        DeployCommand(args).execute()
+
+        assert self.mock_manager.method_calls == [
+            call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
+            call.GitRepoApi.get_default_branch(),
+            call.GitRepoApi.get_branch_head_hash("main"),
+            call.GitRepoApi.get_file_content("test/file.yml", "HEAD_HASH"),
+            call.yaml_load("<yaml content>"),
+            call.update_yaml_value(YAML_CONTENT, "a.b.c", "foo"),
+            call.logging.info("Updated yaml property %s to %s", "a.b.c", "foo"),
+            call.update_yaml_value(YAML_CONTENT, "a.b.d", "bar"),
+            call.logging.info("Updated yaml property %s to %s", "a.b.d", "bar"),
+            call.uuid.uuid4(),
+            call.GitRepoApi.commit_file(
+                branch="gitopscli-deploy-b973b5bb",
+                source_branch="main",
+                parent_hash="HEAD_HASH",
+                path="test/file.yml",
+                content="a:\n  b:\n    c: old\n    d: old\n",
+                message="updated 2 values in test/file.yml\n\na.b.c: foo\na.b.d: bar",
+                git_user="GIT_USER",
+                git_email="GIT_EMAIL",
+            ),
+            call.GitRepoApi.create_pull_request_to_default_branch(
+                "gitopscli-deploy-b973b5bb",
+                "Updated values in test/file.yml",
+                "Updated 2 values in `test/file.yml`:\n```yaml\na.b.c: foo\na.b.d: bar\n```\n",
+            ),
+            call.GitRepoApi.merge_pull_request(42, "merge"),
+            call.GitRepoApi.delete_branch("gitopscli-deploy-b973b5bb"),
+        ]
+
+    def test_api_commit_falls_back_to_clone_for_multiple_commits(self):
+        args = DeployCommand.Args(
+            file="test/file.yml",
+            values={"a.b.c": "foo", "a.b.d": "bar"},
+            username="USERNAME",
+            password="PASSWORD",
+            git_user="GIT_USER",
+            git_email="GIT_EMAIL",
+            create_pr=False,
+            auto_merge=False,
+            single_commit=False,
+            organisation="ORGA",
+            repository_name="REPO",
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            commit_message=None,
+            json=False,
+            api_commit=True,
+        )
+        DeployCommand(args).execute()
+
+        self.git_repo_api_mock.commit_file.assert_not_called()
+        self.logging_mock.info.assert_any_call("Multiple commits required, falling back to clone")
+        self.git_repo_mock.clone.assert_called_once_with(sparse_paths=["test"])
+        self.assertEqual(self.git_repo_mock.commit.call_count, 2)
+        self.git_repo_mock.push.assert_called_once_with(recommit=ANY)
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_rejected_push_reports_hashes_of_recommitted_values(self, mock_print):
+        self.git_repo_mock.commit.side_effect = ["HASH_BEFORE_RETRY", "HASH_AFTER_RETRY"]
+        self.git_repo_mock.push.side_effect = lambda recommit: recommit()  # rejected once, then pushed
+
+        args = DeployCommand.Args(
+            file="test/file.yml",
+            values={"a.b.c": "foo"},
+            username="USERNAME",
+            password="PASSWORD",
+            git_user="GIT_USER",
+            git_email="GIT_EMAIL",
+            create_pr=False,
+            auto_merge=False,
+            single_commit=False,
+            organisation="ORGA",
+            repository_name="REPO",
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            commit_message=None,
+            json=True,
+        )
+        deploy_command = DeployCommand(args)
+        deploy_command.execute()
+
+        self.assertEqual(self.update_yaml_file_values_mock.call_count, 2)  # values are updated again on the new head
+        self.assertEqual(deploy_command.get_commit_hashes(), ["HASH_AFTER_RETRY"])
+        self.assertEqual(
+            mock_print.getvalue(),
+            '{\n    "commits": [\n        {\n            "hash": "HASH_AFTER_RETRY"\n        }\n    ]\n}\n',
+        )
+
+    def test_api_commit_falls_back_to_clone_on_api_error(self):
+        self.git_repo_api_mock.commit_file.side_effect = GitOpsException("Error committing file 'test/file.yml'")
+
+        args = DeployCommand.Args(
+            file="test/file.yml",
+            values={"a.b.c": "foo"},
+            username="USERNAME",
+            password="PASSWORD",
+            git_user="GIT_USER",
+            git_email="GIT_EMAIL",
+            create_pr=False,
+            auto_merge=False,
+            single_commit=False,
+            organisation="ORGA",
+            repository_name="REPO",
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            commit_message=None,
+            json=False,
+            api_commit=True,
+        )
+        deploy_command = DeployCommand(args)
+        deploy_command.execute()
+
+        self.logging_mock.warning.assert_called_once_with(
+            "Committing %s via API failed, falling back to clone: %s", "test/file.yml", ANY
+        )
+        self.git_repo_mock.clone.assert_called_once_with(sparse_paths=["test"])
+        self.git_repo_mock.push.assert_called_once_with(recommit=ANY)
+        self.assertEqual(deploy_command.get_commit_hashes(), [self.example_commit_hash])
+
+    def test_api_commit_falls_back_to_clone_on_bitbucket(self):
+        args = DeployCommand.Args(
+            file="test/file.yml",
+            values={"a.b.c": "foo"},
+            username="USERNAME",
+            password="PASSWORD",
+            git_user="GIT_USER",
+            git_email="GIT_EMAIL",
+            create_pr=False,
+            auto_merge=False,
+            single_commit=False,
+            organisation="ORGA",
+            repository_name="REPO",
+            git_provider=GitProvider.BITBUCKET,
+            git_provider_url="https://bitbucket.example.tld",
+            commit_message=None,
+            json=False,
+            api_commit=True,
+        )
+        DeployCommand(args).execute()
+
+        self.logging_mock.info.assert_any_call(
+            "Committing files via API is not supported by Bitbucket Server, falling back to clone"
+        )
+        self.git_repo_api_mock.get_default_branch.assert_not_called()
+        self.git_repo_api_mock.get_file_content.assert_not_called()
+        self.git_repo_api_mock.commit_file.assert_not_called()
+        self.git_repo_mock.clone.assert_called_once_with(sparse_paths=["test"])
+        self.git_repo_mock.push.assert_called_once_with(recommit=ANY)
+
+    def test_api_commit_file_not_found(self):
+        self.git_repo_api_mock.get_file_content.return_value = None
+
+        args = DeployCommand.Args(
+            file="test/file.yml",
+            values={"a.b.c": "foo"},
+            username="USERNAME",
+            password="PASSWORD",
+            git_user="GIT_USER",
+            git_email="GIT_EMAIL",
+            create_pr=False,
+            auto_merge=False,
+            single_commit=False,
+            organisation="ORGA",
+            repository_name="REPO",
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            commit_message=None,
+            json=False,
+            api_commit=True,
+        )
+        with pytest.raises(GitOpsException) as ex:
+            DeployCommand(args).execute()
+        self.assertEqual(str(ex.value), "No such file: test/file.yml")
+        self.git_repo_mock.clone.assert_not_called()
+
+    def __create_spool(self):
+        spool_dir = tempfile.mkdtemp(prefix="gitopscli-test-")
+        self.addCleanup(shutil.rmtree, spool_dir)
+        return spool_dir, DeploySpool(spool_dir, f"{GitProvider.GITHUB}|None|ORGA/REPO")
+
+    def __enqueue_other_request(self, spool, values, single_commit=True):
+        request = DeploySpool.Request(
+            request_id=DeploySpool.create_request_id(),
+            file="other/file.yml",
+            values=values,
+            single_commit=single_commit,
+            commit_message=None,
+            git_user="OTHER_GIT_USER",
+            git_email="OTHER_GIT_EMAIL",
+        )
+        spool.enqueue(request)
+        return request
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_spool_deploys_queued_requests_with_single_push(self, mock_print):
+        spool_dir, spool = self.__create_spool()
+        other_request = self.__enqueue_other_request(spool, {"x.y": "bar"})
+
+        args = DeployCommand.Args(
+            file="test/file.yml",
+            values={"a.b.c": "foo"},
+            username="USERNAME",
+            password="PASSWORD",
+            git_user="GIT_USER",
+            git_email="GIT_EMAIL",
+            create_pr=False,
+            auto_merge=False,
+            single_commit=False,
+            organisation="ORGA",
+            repository_name="REPO",
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            commit_message=None,
+            json=True,
+            spool_dir=spool_dir,
+        )
+        DeployCommand(args).execute()
+
+        self.git_repo_api_factory_mock.create.assert_called_once_with(args, "ORGA", "REPO")
+        self.git_repo_mock.clone.assert_called_once_with(sparse_paths=["other", "test"])
+        self.assertEqual(
+            self.git_repo_mock.commit.call_args_list,
+            [
+                call("OTHER_GIT_USER", "OTHER_GIT_EMAIL", "changed 'x.y' to 'bar' in other/file.yml"),
+                call("GIT_USER", "GIT_EMAIL", "changed 'a.b.c' to 'foo' in test/file.yml"),
+            ],
+        )
+        self.git_repo_mock.push.assert_called_once_with(recommit=ANY)
+        self.logging_mock.info.assert_any_call("Deploying %s queued request(s) to %s/%s", 2, "ORGA", "REPO")
+
+        expected_output = f'{{\n    "commits": [\n        {{\n            "hash": "{self.example_commit_hash}"\n        }}\n    ]\n}}\n'
+        self.assertMultiLineEqual(mock_print.getvalue(), expected_output)
+        self.assertEqual(
+            spool.pop_result(other_request.request_id), DeploySpool.Result(commits=[self.example_commit_hash])
+        )
+        self.assertEqual(spool.get_requests(), [])
+
+    def test_spool_failed_request_does_not_affect_others(self):
+        spool_dir, spool = self.__create_spool()
+        other_request = self.__enqueue_other_request(spool, {"a.b.c": "foo", "x.y": "bar"}, single_commit=False)
+
+        self.missing_keys = {"x.y"}
+
+        args = DeployCommand.Args(
+            file="test/file.yml",
+            values={"a.b.c": "foo"},
+            username="USERNAME",
+            password="PASSWORD",
+            git_user="GIT_USER",
+            git_email="GIT_EMAIL",
+            create_pr=False,
+            auto_merge=False,
+            single_commit=False,
+            organisation="ORGA",
+            repository_name="REPO",
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            commit_message=None,
+            json=False,
+            spool_dir=spool_dir,
+        )
+        deploy_command = DeployCommand(args)
+        deploy_command.execute()
+
+        self.assertEqual(deploy_command.get_commit_hashes(), [self.example_commit_hash])
+        self.git_repo_mock.reset_hard.assert_called_once_with("HEAD~1")
+        self.git_repo_mock.push.assert_called_once_with(recommit=ANY)
+        self.assertEqual(
+            spool.pop_result(other_request.request_id),
+            DeploySpool.Result(error="\"Key 'x.y' not found in YAML!\""),
+        )
+
+    def test_spool_with_create_pr(self):
+        spool_dir, _ = self.__create_spool()
+        args = DeployCommand.Args(
+            file="test/file.yml",
+            values={"a.b.c": "foo"},
+            username="USERNAME",
+            password="PASSWORD",
+            git_user="GIT_USER",
+            git_email="GIT_EMAIL",
+            create_pr=True,
+            auto_merge=False,
+            single_commit=False,
+            organisation="ORGA",
+            repository_name="REPO",
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            commit_message=None,
+            json=False,
+            spool_dir=spool_dir,
+        )
+        with pytest.raises(GitOpsException) as ex:
+            DeployCommand(args).execute()
+        self.assertEqual(str(ex.value), "Deployments via spool directory can't create pull requests.")
+        self.git_repo_mock.clone.assert_not_called()
@@ -0,0 +1,265 @@
+from io import StringIO
+import json
+import logging
+import os
+import shutil
+import unittest
+import uuid
+from unittest import mock
+from unittest.mock import ANY, call
+import pytest
+from gitopscli.gitops_exception import GitOpsException
+from gitopscli.commands.deploy_batch import DeployBatchCommand, DeployCommand
+from gitopscli.git_api import GitProvider, GitRepo
+from gitopscli.io_api.yaml_util import yaml_file_dump, yaml_file_load, YAMLException
+from .mock_mixin import MockMixin
+
+MANIFEST = {
+    "deployments": [
+        {"organisation": "ORGA", "repository": "REPO_1", "file": "values.yaml", "values": {"a.b": "1.0.0"}},
+        {"organisation": "ORGA", "repository": "REPO_2", "file": "values.yaml", "values": {"a.b": "1.0.0"}},
+        {
+            "organisation": "ORGA",
+            "repository": "REPO_1",
+            "file": "other.yaml",
+            "values": {"c": "d"},
+            "commitMessage": "custom message",
+        },
+    ]
+}
+
+
+def create_deploy_args(repository_name, file, values, commit_message=None):
+    return DeployCommand.Args(
+        username="USERNAME",
+        password="PASSWORD",
+        git_user="GIT_USER",
+        git_email="GIT_EMAIL",
+        organisation="ORGA",
+        repository_name=repository_name,
+        git_provider=GitProvider.GITHUB,
+        git_provider_url=None,
+        file=file,
+        values=values,
+        single_commit=False,
+        commit_message=commit_message,
+        create_pr=False,
+        auto_merge=False,
+        json=False,
+    )
+
+
+class DeployBatchCommandTest(MockMixin, unittest.TestCase):
+    def setUp(self):
+        self.init_mock_manager(DeployBatchCommand)
+
+        self.yaml_file_load_mock = self.monkey_patch(yaml_file_load)
+        self.yaml_file_load_mock.return_value = MANIFEST
+
+        self.logging_mock = self.monkey_patch(logging)
+        self.logging_mock.error.return_value = None
+        self.logging_mock.exception.return_value = None
+
+        self.deploy_command_mock = self.monkey_patch(DeployCommand)
+        self.deploy_command_mock.Args = DeployCommand.Args
+        self.deploy_command_mock.return_value = self.deploy_command_mock
+        self.deploy_command_mock.execute.return_value = None
+        self.deploy_command_mock.get_commit_hashes.side_effect = [["hash1"], [], ["hash2"]]
+
+        self.seal_mocks()
+
+    def _create_args(self):
+        return DeployBatchCommand.Args(
+            username="USERNAME",
+            password="PASSWORD",
+            git_user="GIT_USER",
+            git_email="GIT_EMAIL",
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            manifest="manifest.yaml",
+            max_workers=1,
+            single_commit=False,
+            create_pr=False,
+            auto_merge=False,
+        )
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_happy_flow(self, mock_print):
+        DeployBatchCommand(self._create_args()).execute()
+
+        # entries of the same repository are deployed one after the other
+        assert self.mock_manager.method_calls == [
+            call.yaml_file_load("manifest.yaml"),
+            call.DeployCommand(create_deploy_args("REPO_1", "values.yaml", {"a.b": "1.0.0"})),
+            call.DeployCommand.execute(),
+            call.DeployCommand.get_commit_hashes(),
+            call.DeployCommand(create_deploy_args("REPO_1", "other.yaml", {"c": "d"}, "custom message")),
+            call.DeployCommand.execute(),
+            call.DeployCommand.get_commit_hashes(),
+            call.DeployCommand(create_deploy_args("REPO_2", "values.yaml", {"a.b": "1.0.0"})),
+            call.DeployCommand.execute(),
+            call.DeployCommand.get_commit_hashes(),
+        ]
+
+        self.assertEqual(
+            json.loads(mock_print.getvalue()),
+            {
+                "results": [
+                    {
+                        "organisation": "ORGA",
+                        "repository": "REPO_1",
+                        "file": "values.yaml",
+                        "status": "updated",
+                        "commits": [{"hash": "hash1"}],
+                    },
+                    {
+                        "organisation": "ORGA",
+                        "repository": "REPO_2",
+                        "file": "values.yaml",
+                        "status": "updated",
+                        "commits": [{"hash": "hash2"}],
+                    },
+                    {
+                        "organisation": "ORGA",
+                        "repository": "REPO_1",
+                        "file": "other.yaml",
+                        "status": "unchanged",
+                        "commits": [],
+                    },
+                ]
+            },
+        )
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_failed_deployment(self, mock_print):
+        self.deploy_command_mock.execute.side_effect = [GitOpsException("No such file: values.yaml"), None, None]
+
+        with pytest.raises(GitOpsException) as ex:
+            DeployBatchCommand(self._create_args()).execute()
+        self.assertEqual(str(ex.value), "1 of 3 deployments failed")
+
+        self.logging_mock.error.assert_called_once_with("Deployment to %s/%s failed: %s", "ORGA", "REPO_1", ANY)
+        results = json.loads(mock_print.getvalue())["results"]
+        self.assertEqual(results[0]["status"], "failed")
+        self.assertEqual(results[0]["error"], "No such file: values.yaml")
+        self.assertEqual(results[1]["status"], "updated")
+        self.assertEqual(results[2]["status"], "unchanged")
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_unexpected_error_is_recorded_as_failed(self, mock_print):
+        self.deploy_command_mock.execute.side_effect = [None, ValueError("unexpected"), None]
+
+        with pytest.raises(GitOpsException) as ex:
+            DeployBatchCommand(self._create_args()).execute()
+        self.assertEqual(str(ex.value), "1 of 3 deployments failed")
+
+        self.logging_mock.exception.assert_called_once_with("Deployment to %s/%s failed", "ORGA", "REPO_1")
+        results = json.loads(mock_print.getvalue())["results"]
+        self.assertEqual(results[0]["status"], "updated")
+        self.assertEqual(results[1]["status"], "updated")
+        self.assertEqual(results[2]["status"], "failed")
+        self.assertEqual(results[2]["error"], "ValueError: unexpected")
+
+    def test_manifest_not_found(self):
+        self.yaml_file_load_mock.side_effect = FileNotFoundError()
+
+        with pytest.raises(GitOpsException) as ex:
+            DeployBatchCommand(self._create_args()).execute()
+        self.assertEqual(str(ex.value), "No such file: manifest.yaml")
+
+    def test_manifest_invalid_yaml(self):
+        self.yaml_file_load_mock.side_effect = YAMLException()
+
+        with pytest.raises(GitOpsException) as ex:
+            DeployBatchCommand(self._create_args()).execute()
+        self.assertEqual(str(ex.value), "Error loading file: manifest.yaml")
+
+    def test_manifest_without_deployments(self):
+        self.yaml_file_load_mock.return_value = {"foo": "bar"}
+
+        with pytest.raises(GitOpsException) as ex:
+            DeployBatchCommand(self._create_args()).execute()
+        self.assertEqual(str(ex.value), "Item 'deployments' should be a list in manifest: manifest.yaml")
+
+    def test_manifest_entry_missing_file(self):
+        self.yaml_file_load_mock.return_value = {"deployments": [{"organisation": "ORGA", "repository": "REPO"}]}
+
+        with pytest.raises(GitOpsException) as ex:
+            DeployBatchCommand(self._create_args()).execute()
+        self.assertEqual(str(ex.value), "Item 'deployments.[0].file' should be a string in manifest!")
+
+
+class DeployBatchCommandConcurrencyTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = f"/tmp/gitopscli-test-{uuid.uuid4()}"
+        os.makedirs(self.tmp_dir)
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+
+        tmp_dir = self.tmp_dir
+
+        class GitRepoStub(GitRepo):
+            def __init__(self, git_repo_api, git_api_config):
+                self.repo_dir = f"{tmp_dir}/{git_api_config.repository_name}"
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, exc_type, exc_val, exc_tb):
+                return False
+
+            def clone(self, sparse_paths=None):
+                pass
+
+            def get_full_file_path(self, relative_path):
+                return f"{self.repo_dir}/{relative_path}"
+
+            def commit(self, git_user, git_email, message):
+                return f"hash of {message}"
+
+            def push(self, branch=None, recommit=None):
+                pass
+
+        for patcher in (
+            mock.patch("gitopscli.commands.deploy.GitRepo", GitRepoStub),
+            mock.patch("gitopscli.commands.deploy.GitRepoApiFactory"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_concurrent_deployments_with_real_yaml_files(self, mock_print):
+        repository_count = 24
+        deployments = []
+        for index in range(repository_count):
+            os.makedirs(f"{self.tmp_dir}/REPO_{index}")
+            values_yaml = "".join(f"app{i}:\n  image:\n    tag: '0.0.{i}'  # comment\n" for i in range(50))
+            with open(f"{self.tmp_dir}/REPO_{index}/values.yaml", "w", encoding="utf-8") as values_file:
+                values_file.write(values_yaml)
+            values = {f"app{i}.image.tag": f"1.0.{index}" for i in range(0, 50, 10)}
+            deployments.append(
+                {"organisation": "ORGA", "repository": f"REPO_{index}", "file": "values.yaml", "values": values}
+            )
+        manifest_path = f"{self.tmp_dir}/manifest.yaml"
+        yaml_file_dump({"deployments": deployments}, manifest_path)
+
+        args = DeployBatchCommand.Args(
+            username="USERNAME",
+            password="PASSWORD",
+            git_user="GIT_USER",
+            git_email="GIT_EMAIL",
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            manifest=manifest_path,
+            max_workers=8,
+            single_commit=True,
+            create_pr=False,
+            auto_merge=False,
+        )
+        DeployBatchCommand(args).execute()
+
+        results = json.loads(mock_print.getvalue())["results"]
+        self.assertEqual(["updated"] * repository_count, [result["status"] for result in results])
+        for index in range(repository_count):
+            values_yaml = yaml_file_load(f"{self.tmp_dir}/REPO_{index}/values.yaml")
+            self.assertEqual(f"1.0.{index}", values_yaml["app10"]["image"]["tag"])
+            self.assertEqual("0.0.11", values_yaml["app11"]["image"]["tag"])
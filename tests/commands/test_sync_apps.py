@@ -1,10 +1,12 @@
 import logging
-import os
+import shutil
+import tempfile
 import unittest
+from dataclasses import replace
 from unittest.mock import call
 from gitopscli.git_api import GitProvider, GitRepo, GitRepoApi, GitRepoApiFactory
 from gitopscli.commands.sync_apps import SyncAppsCommand
-from gitopscli.io_api.yaml_util import merge_yaml_element, yaml_file_load
+from gitopscli.io_api.yaml_util import merge_yaml_element, yaml_file_load_safe, yaml_files_load_safe
 from gitopscli.gitops_exception import GitOpsException
 from .mock_mixin import MockMixin
 
@@ -26,11 +28,6 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
     def setUp(self):
         self.init_mock_manager(SyncAppsCommand)
 
-        self.os_mock = self.monkey_patch(os)
-        self.os_mock.path.isdir.return_value = True
-        self.os_mock.path.join.side_effect = os.path.join
-        self.os_mock.listdir.return_value = ["my-app"]
-
         self.logging_mock = self.monkey_patch(logging)
         self.logging_mock.info.return_value = None
 
@@ -42,7 +39,11 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
         self.team_config_git_repo_mock.__exit__.return_value = False
         self.team_config_git_repo_mock.get_clone_url.return_value = "https://team.config.repo.git"
         self.team_config_git_repo_mock.clone.return_value = None
-        self.team_config_git_repo_mock.get_full_file_path.side_effect = lambda x: f"/tmp/team-config-repo/{x}"
+        self.team_config_git_repo_mock.list_directory.return_value = {
+            "my-app": "tree",
+            ".github": "tree",
+            "README.md": "blob",
+        }
         self.team_config_git_repo_mock.get_author_from_last_commit.return_value = "author"
 
         self.root_config_git_repo_mock = self.create_mock(GitRepo, "GitRepo_root")
@@ -53,6 +54,11 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
         self.root_config_git_repo_mock.clone.return_value = None
         self.root_config_git_repo_mock.commit.return_value = None
         self.root_config_git_repo_mock.push.return_value = None
+        self.root_config_git_repo_mock.get_commit_hash.return_value = "COMMIT_1"
+        self.root_config_git_repo_mock.get_blob_hashes.return_value = {
+            "apps/team-non-prod.yaml": "BLOB_1",
+            "apps/other-team-non-prod.yaml": "BLOB_2",
+        }
 
         self.git_repo_api_factory_mock = self.monkey_patch(GitRepoApiFactory)
         self.git_repo_api_factory_mock.create.side_effect = lambda config, org, repo: {
@@ -61,13 +67,16 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
         }[(org, repo)]
 
         self.git_repo_mock = self.monkey_patch(GitRepo)
-        self.git_repo_mock.side_effect = lambda api: {
+        self.git_repo_mock.side_effect = lambda api, config: {
             id(self.team_config_git_repo_api_mock): self.team_config_git_repo_mock,
             id(self.root_config_git_repo_api_mock): self.root_config_git_repo_mock,
         }[id(api)]
 
-        self.yaml_file_load_mock = self.monkey_patch(yaml_file_load)
-        self.yaml_file_load_mock.side_effect = lambda file_path: {
+        self.yaml_files_load_safe_mock = self.monkey_patch(yaml_files_load_safe)
+        self.yaml_files_load_safe_mock.side_effect = lambda file_paths: map(self.yaml_file_load_safe_mock, file_paths)
+
+        self.yaml_file_load_safe_mock = self.monkey_patch(yaml_file_load_safe)
+        self.yaml_file_load_safe_mock.side_effect = lambda file_path: {
             "/tmp/root-config-repo/bootstrap/values.yaml": {
                 "bootstrap": [{"name": "team-non-prod"}, {"name": "other-team-non-prod"}],
             },
@@ -81,7 +90,7 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
         }[file_path]
 
         self.merge_yaml_element_mock = self.monkey_patch(merge_yaml_element)
-        self.merge_yaml_element_mock.return_value = None
+        self.merge_yaml_element_mock.return_value = True
 
         self.seal_mocks()
 
@@ -90,30 +99,35 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(ARGS, "TEAM_ORGA", "TEAM_REPO"),
             call.GitRepoApiFactory.create(ARGS, "ROOT_ORGA", "ROOT_REPO"),
-            call.GitRepo(self.team_config_git_repo_api_mock),
-            call.GitRepo(self.root_config_git_repo_api_mock),
+            call.GitRepo(self.team_config_git_repo_api_mock, ARGS),
+            call.GitRepo(self.root_config_git_repo_api_mock, ARGS),
             call.GitRepo_team.get_clone_url(),
             call.logging.info("Team config repository: %s", "https://team.config.repo.git"),
             call.GitRepo_root.get_clone_url(),
             call.logging.info("Root config repository: %s", "https://root.config.repo.git"),
-            call.GitRepo_team.clone(),
-            call.GitRepo_team.get_full_file_path("."),
-            call.os.listdir("/tmp/team-config-repo/."),
-            call.os.path.join("/tmp/team-config-repo/.", "my-app"),
-            call.os.path.isdir("/tmp/team-config-repo/./my-app"),
+            call.GitRepo_team.clone(metadata_only=True),
+            call.GitRepo_team.list_directory("."),
             call.logging.info("Found %s app(s) in apps repository: %s", 1, "my-app"),
             call.logging.info("Searching apps repository in root repository's 'apps/' directory..."),
             call.GitRepo_root.clone(),
             call.GitRepo_root.get_full_file_path("bootstrap/values.yaml"),
-            call.yaml_file_load("/tmp/root-config-repo/bootstrap/values.yaml"),
-            call.GitRepo_team.get_clone_url(),
-            call.logging.info("Analyzing %s in root repository", "apps/team-non-prod.yaml"),
+            call.yaml_file_load_safe("/tmp/root-config-repo/bootstrap/values.yaml"),
+            call.GitRepo_root.get_clone_url(),
             call.GitRepo_root.get_full_file_path("apps/team-non-prod.yaml"),
-            call.yaml_file_load("/tmp/root-config-repo/apps/team-non-prod.yaml"),
-            call.logging.info("Found apps repository in %s", "apps/team-non-prod.yaml"),
-            call.logging.info("Analyzing %s in root repository", "apps/other-team-non-prod.yaml"),
             call.GitRepo_root.get_full_file_path("apps/other-team-non-prod.yaml"),
-            call.yaml_file_load("/tmp/root-config-repo/apps/other-team-non-prod.yaml"),
+            call.yaml_files_load_safe(
+                [
+                    "/tmp/root-config-repo/apps/team-non-prod.yaml",
+                    "/tmp/root-config-repo/apps/other-team-non-prod.yaml",
+                ]
+            ),
+            call.logging.info("Analyzing %s in root repository", "apps/team-non-prod.yaml"),
+            call.yaml_file_load_safe("/tmp/root-config-repo/apps/team-non-prod.yaml"),
+            call.logging.info("Analyzing %s in root repository", "apps/other-team-non-prod.yaml"),
+            call.yaml_file_load_safe("/tmp/root-config-repo/apps/other-team-non-prod.yaml"),
+            call.GitRepo_team.get_clone_url(),
+            call.logging.info("Found apps repository in %s", "apps/team-non-prod.yaml"),
+            call.GitRepo_root.get_full_file_path("apps/team-non-prod.yaml"),
             call.logging.info("Sync applications in root repository's %s.", "apps/team-non-prod.yaml"),
             call.merge_yaml_element(
                 "/tmp/root-config-repo/apps/team-non-prod.yaml", "config.applications", {"my-app": {}}
@@ -124,7 +138,7 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
         ]
 
     def test_sync_apps_already_up_to_date(self):
-        self.yaml_file_load_mock.side_effect = lambda file_path: {
+        self.yaml_file_load_safe_mock.side_effect = lambda file_path: {
             "/tmp/root-config-repo/bootstrap/values.yaml": {
                 "bootstrap": [{"name": "team-non-prod"}, {"name": "other-team-non-prod"}],
             },
@@ -142,35 +156,49 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(ARGS, "TEAM_ORGA", "TEAM_REPO"),
             call.GitRepoApiFactory.create(ARGS, "ROOT_ORGA", "ROOT_REPO"),
-            call.GitRepo(self.team_config_git_repo_api_mock),
-            call.GitRepo(self.root_config_git_repo_api_mock),
+            call.GitRepo(self.team_config_git_repo_api_mock, ARGS),
+            call.GitRepo(self.root_config_git_repo_api_mock, ARGS),
             call.GitRepo_team.get_clone_url(),
             call.logging.info("Team config repository: %s", "https://team.config.repo.git"),
             call.GitRepo_root.get_clone_url(),
             call.logging.info("Root config repository: %s", "https://root.config.repo.git"),
-            call.GitRepo_team.clone(),
-            call.GitRepo_team.get_full_file_path("."),
-            call.os.listdir("/tmp/team-config-repo/."),
-            call.os.path.join("/tmp/team-config-repo/.", "my-app"),
-            call.os.path.isdir("/tmp/team-config-repo/./my-app"),
+            call.GitRepo_team.clone(metadata_only=True),
+            call.GitRepo_team.list_directory("."),
             call.logging.info("Found %s app(s) in apps repository: %s", 1, "my-app"),
             call.logging.info("Searching apps repository in root repository's 'apps/' directory..."),
             call.GitRepo_root.clone(),
             call.GitRepo_root.get_full_file_path("bootstrap/values.yaml"),
-            call.yaml_file_load("/tmp/root-config-repo/bootstrap/values.yaml"),
-            call.GitRepo_team.get_clone_url(),
-            call.logging.info("Analyzing %s in root repository", "apps/team-non-prod.yaml"),
+            call.yaml_file_load_safe("/tmp/root-config-repo/bootstrap/values.yaml"),
+            call.GitRepo_root.get_clone_url(),
             call.GitRepo_root.get_full_file_path("apps/team-non-prod.yaml"),
-            call.yaml_file_load("/tmp/root-config-repo/apps/team-non-prod.yaml"),
-            call.logging.info("Found apps repository in %s", "apps/team-non-prod.yaml"),
-            call.logging.info("Analyzing %s in root repository", "apps/other-team-non-prod.yaml"),
             call.GitRepo_root.get_full_file_path("apps/other-team-non-prod.yaml"),
-            call.yaml_file_load("/tmp/root-config-repo/apps/other-team-non-prod.yaml"),
+            call.yaml_files_load_safe(
+                [
+                    "/tmp/root-config-repo/apps/team-non-prod.yaml",
+                    "/tmp/root-config-repo/apps/other-team-non-prod.yaml",
+                ]
+            ),
+            call.logging.info("Analyzing %s in root repository", "apps/team-non-prod.yaml"),
+            call.yaml_file_load_safe("/tmp/root-config-repo/apps/team-non-prod.yaml"),
+            call.logging.info("Analyzing %s in root repository", "apps/other-team-non-prod.yaml"),
+            call.yaml_file_load_safe("/tmp/root-config-repo/apps/other-team-non-prod.yaml"),
+            call.GitRepo_team.get_clone_url(),
+            call.logging.info("Found apps repository in %s", "apps/team-non-prod.yaml"),
+            call.GitRepo_root.get_full_file_path("apps/team-non-prod.yaml"),
             call.logging.info("Root repository already up-to-date. I'm done here."),
         ]
 
+    def test_sync_apps_nothing_merged(self):
+        self.merge_yaml_element_mock.return_value = False
+
+        SyncAppsCommand(ARGS).execute()
+
+        self.logging_mock.info.assert_called_with("Root repository already up-to-date. I'm done here.")
+        self.root_config_git_repo_mock.commit.assert_not_called()
+        self.root_config_git_repo_mock.push.assert_not_called()
+
     def test_sync_apps_bootstrap_chart(self):
-        self.yaml_file_load_mock.side_effect = lambda file_path: {
+        self.yaml_file_load_safe_mock.side_effect = lambda file_path: {
             "/tmp/root-config-repo/bootstrap/values.yaml": {
                 "config": {
                     "bootstrap": [{"name": "team-non-prod"}, {"name": "other-team-non-prod"}],
@@ -191,7 +219,7 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
             self.fail("'config.bootstrap' should be read correctly'")
 
     def test_sync_apps_bootstrap_yaml_not_found(self):
-        self.yaml_file_load_mock.side_effect = FileNotFoundError()
+        self.yaml_file_load_safe_mock.side_effect = FileNotFoundError()
 
         try:
             SyncAppsCommand(ARGS).execute()
@@ -200,7 +228,7 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
             self.assertEqual("File 'bootstrap/values.yaml' not found in root repository.", str(ex))
 
     def test_sync_apps_missing_bootstrap_element_in_bootstrap_yaml(self):
-        self.yaml_file_load_mock.side_effect = lambda file_path: {
+        self.yaml_file_load_safe_mock.side_effect = lambda file_path: {
             "/tmp/root-config-repo/bootstrap/values.yaml": {},  # empty bootstrap yaml
         }[file_path]
 
@@ -223,7 +251,7 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
             self.assertEqual("Cannot find key 'bootstrap' or 'config.bootstrap' in 'bootstrap/values.yaml'", str(ex))
 
     def test_sync_apps_invalid_bootstrap_entry_in_bootstrap_yaml(self):
-        self.yaml_file_load_mock.side_effect = lambda file_path: {
+        self.yaml_file_load_safe_mock.side_effect = lambda file_path: {
             "/tmp/root-config-repo/bootstrap/values.yaml": {
                 "bootstrap": [{"something": "invalid"}],  # bootstrap entry has no "name" property
             },
@@ -245,7 +273,25 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
                 raise FileNotFoundError()
             raise Exception("test should not reach this")
 
-        self.yaml_file_load_mock.side_effect = file_load_mock_side_effect
+        self.yaml_file_load_safe_mock.side_effect = file_load_mock_side_effect
+
+        try:
+            SyncAppsCommand(ARGS).execute()
+            self.fail()
+        except GitOpsException as ex:
+            self.assertEqual("File 'apps/team-non-prod.yaml' not found in root repository.", str(ex))
+
+    def test_sync_apps_errors_are_raised_in_bootstrap_order(self):
+        def file_load_mock_side_effect(file_path):
+            if file_path == "/tmp/root-config-repo/bootstrap/values.yaml":
+                return {
+                    "bootstrap": [{"name": "team-non-prod"}, {"something": "invalid"}],
+                }
+            if file_path == "/tmp/root-config-repo/apps/team-non-prod.yaml":
+                raise FileNotFoundError()
+            raise Exception("test should not reach this")
+
+        self.yaml_file_load_safe_mock.side_effect = file_load_mock_side_effect
 
         try:
             SyncAppsCommand(ARGS).execute()
@@ -254,7 +300,7 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
             self.assertEqual("File 'apps/team-non-prod.yaml' not found in root repository.", str(ex))
 
     def test_sync_apps_missing_repository_element_in_team_yaml(self):
-        self.yaml_file_load_mock.side_effect = lambda file_path: {
+        self.yaml_file_load_safe_mock.side_effect = lambda file_path: {
             "/tmp/root-config-repo/bootstrap/values.yaml": {"bootstrap": [{"name": "team-non-prod"}]},
             "/tmp/root-config-repo/apps/team-non-prod.yaml": {
                 # missing: "repository": "https://team.config.repo.git",
@@ -269,7 +315,7 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
             self.assertEqual("Cannot find key 'repository' in 'apps/team-non-prod.yaml'", str(ex))
 
     def test_sync_apps_undefined_team_repo(self):
-        self.yaml_file_load_mock.side_effect = lambda file_path: {
+        self.yaml_file_load_safe_mock.side_effect = lambda file_path: {
             "/tmp/root-config-repo/bootstrap/values.yaml": {"bootstrap": [{"name": "other-team-non-prod"}]},
             "/tmp/root-config-repo/apps/other-team-non-prod.yaml": {
                 "repository": "https://other-team.config.repo.git",  # there is no repo matching the command's team repo
@@ -286,7 +332,7 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
             )
 
     def test_sync_apps_app_name_collission(self):
-        self.yaml_file_load_mock.side_effect = lambda file_path: {
+        self.yaml_file_load_safe_mock.side_effect = lambda file_path: {
             "/tmp/root-config-repo/bootstrap/values.yaml": {
                 "bootstrap": [{"name": "team-non-prod"}, {"name": "other-team-non-prod"}],
             },
@@ -305,3 +351,37 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
             self.fail()
         except GitOpsException as ex:
             self.assertEqual("Application 'my-app' already exists in a different repository", str(ex))
+
+    def test_sync_apps_with_apps_index(self):
+        apps_index_dir = tempfile.mkdtemp(prefix="gitopscli-test-")
+        self.addCleanup(shutil.rmtree, apps_index_dir)
+        args = replace(ARGS, apps_index_dir=apps_index_dir)
+
+        SyncAppsCommand(args).execute()
+        SyncAppsCommand(args).execute()  # same commit: the index is used without listing the files
+
+        self.root_config_git_repo_mock.get_commit_hash.return_value = "COMMIT_2"
+        self.root_config_git_repo_mock.get_blob_hashes.return_value = {
+            "apps/team-non-prod.yaml": "BLOB_1",
+            "apps/other-team-non-prod.yaml": "CHANGED_BLOB_2",
+        }
+        SyncAppsCommand(args).execute()  # only the changed file is parsed
+
+        self.assertEqual(
+            [
+                call(
+                    [
+                        "/tmp/root-config-repo/apps/team-non-prod.yaml",
+                        "/tmp/root-config-repo/apps/other-team-non-prod.yaml",
+                    ]
+                ),
+                call([]),
+                call(["/tmp/root-config-repo/apps/other-team-non-prod.yaml"]),
+            ],
+            self.yaml_files_load_safe_mock.call_args_list,
+        )
+        self.assertEqual([call("apps"), call("apps")], self.root_config_git_repo_mock.get_blob_hashes.call_args_list)
+        self.assertEqual(
+            [call("/tmp/root-config-repo/apps/team-non-prod.yaml", "config.applications", {"my-app": {}})] * 3,
+            self.merge_yaml_element_mock.call_args_list,
+        )
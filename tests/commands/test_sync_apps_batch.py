@@ -0,0 +1,425 @@
+from dataclasses import replace
+from io import StringIO
+import json
+import logging
+import unittest
+from unittest import mock
+from unittest.mock import ANY, call
+import pytest
+from gitopscli.commands.common import AppsIndex
+from gitopscli.commands.sync_apps_batch import SyncAppsBatchCommand, get_repo_apps, load_apps_configs
+from gitopscli.git_api import GitProvider, GitRepo, GitRepoApi, GitRepoApiFactory
+from gitopscli.gitops_exception import GitOpsException
+from gitopscli.io_api.yaml_util import merge_yaml_element, yaml_file_load, YAMLException
+from .mock_mixin import MockMixin
+
+MANIFEST = {
+    "teams": [
+        {"organisation": "TEAM_ORGA", "repository": "TEAM_REPO_1"},
+        {"organisation": "TEAM_ORGA", "repository": "TEAM_REPO_2"},
+        {"organisation": "TEAM_ORGA", "repository": "TEAM_REPO_3"},
+    ]
+}
+
+ARGS = SyncAppsBatchCommand.Args(
+    username="USERNAME",
+    password="PASSWORD",
+    git_user="GIT_USER",
+    git_email="GIT_EMAIL",
+    git_provider=GitProvider.GITHUB,
+    git_provider_url=None,
+    manifest="manifest.yaml",
+    max_workers=1,
+    root_organisation="ROOT_ORGA",
+    root_repository_name="ROOT_REPO",
+    single_commit=False,
+)
+
+
+class SyncAppsBatchCommandTest(MockMixin, unittest.TestCase):
+    def setUp(self):
+        self.init_mock_manager(SyncAppsBatchCommand)
+
+        self.yaml_file_load_mock = self.monkey_patch(yaml_file_load)
+        self.yaml_file_load_mock.return_value = MANIFEST
+
+        self.logging_mock = self.monkey_patch(logging)
+        self.logging_mock.info.return_value = None
+        self.logging_mock.error.return_value = None
+        self.logging_mock.exception.return_value = None
+
+        self.root_config_git_repo_api_mock = self.create_mock(GitRepoApi, "GitRepoApi_root")
+        self.root_config_git_repo_mock = self.create_mock(GitRepo, "GitRepo_root")
+        self.root_config_git_repo_mock.__enter__.return_value = self.root_config_git_repo_mock
+        self.root_config_git_repo_mock.__exit__.return_value = False
+        self.root_config_git_repo_mock.get_clone_url.return_value = "https://root.config.repo.git"
+        self.root_config_git_repo_mock.get_full_file_path.side_effect = lambda x: f"/tmp/root-config-repo/{x}"
+        self.root_config_git_repo_mock.commit.side_effect = ["hash1", "hash2"]
+        self.root_config_git_repo_mock.push.return_value = None
+
+        git_repo_apis = {("ROOT_ORGA", "ROOT_REPO"): self.root_config_git_repo_api_mock}
+        git_repos = {id(self.root_config_git_repo_api_mock): self.root_config_git_repo_mock}
+        self.team_apps = {}
+        for i in (1, 2, 3):
+            team_config_git_repo_api_mock = self.create_mock(GitRepoApi, f"GitRepoApi_team_{i}")
+            team_config_git_repo_mock = self.create_mock(GitRepo, f"GitRepo_team_{i}")
+            team_config_git_repo_mock.__enter__.return_value = team_config_git_repo_mock
+            team_config_git_repo_mock.__exit__.return_value = False
+            team_config_git_repo_mock.get_clone_url.return_value = f"https://team-{i}.config.repo.git"
+            team_config_git_repo_mock.get_author_from_last_commit.return_value = f"author-{i}"
+            git_repo_apis[("TEAM_ORGA", f"TEAM_REPO_{i}")] = team_config_git_repo_api_mock
+            git_repos[id(team_config_git_repo_api_mock)] = team_config_git_repo_mock
+            self.team_apps[id(team_config_git_repo_mock)] = {f"app-{i}"}
+
+        self.git_repo_api_factory_mock = self.monkey_patch(GitRepoApiFactory)
+        self.git_repo_api_factory_mock.create.side_effect = lambda config, org, repo: git_repo_apis[(org, repo)]
+
+        self.git_repo_mock = self.monkey_patch(GitRepo)
+        self.git_repo_mock.side_effect = lambda api, config: git_repos[id(api)]
+
+        self.get_repo_apps_mock = self.monkey_patch(get_repo_apps)
+        self.get_repo_apps_mock.side_effect = lambda git_repo: self.team_apps[id(git_repo)]
+
+        self.load_apps_configs_mock = self.monkey_patch(load_apps_configs)
+        self.load_apps_configs_mock.return_value = {
+            f"apps/team-{i}.yaml": AppsIndex.Entry(
+                blob="", repository=f"https://team-{i}.config.repo.git", applications=[f"app-{i}"], config=False
+            )
+            for i in (1, 2, 3)
+        }
+
+        self.merge_yaml_element_mock = self.monkey_patch(merge_yaml_element)
+        self.merge_yaml_element_mock.return_value = True
+
+        self.seal_mocks()
+
+    def __set_team_apps(self, team, apps):
+        self.team_apps[id(getattr(self.mock_manager, f"GitRepo_team_{team}"))] = apps
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_happy_flow(self, mock_print):
+        self.__set_team_apps(1, {"app-1", "app-1b"})
+        self.__set_team_apps(3, {"app-3b"})
+
+        SyncAppsBatchCommand(ARGS).execute()
+
+        assert self.mock_manager.method_calls == [
+            call.yaml_file_load("manifest.yaml"),
+            call.GitRepoApiFactory.create(ARGS, "ROOT_ORGA", "ROOT_REPO"),
+            call.GitRepo(self.root_config_git_repo_api_mock, ARGS),
+            call.GitRepo_root.get_clone_url(),
+            call.logging.info("Root config repository: %s", "https://root.config.repo.git"),
+            call.load_apps_configs(self.root_config_git_repo_mock, None),
+            call.GitRepoApiFactory.create(ARGS, "TEAM_ORGA", "TEAM_REPO_1"),
+            call.GitRepo(self.mock_manager.GitRepoApi_team_1, ARGS),
+            call.get_repo_apps(self.mock_manager.GitRepo_team_1),
+            call.logging.info("Found %s app(s) in apps repository %s/%s", 2, "TEAM_ORGA", "TEAM_REPO_1"),
+            call.GitRepo_team_1.get_clone_url(),
+            call.GitRepo_team_1.get_author_from_last_commit(),
+            call.GitRepoApiFactory.create(ARGS, "TEAM_ORGA", "TEAM_REPO_2"),
+            call.GitRepo(self.mock_manager.GitRepoApi_team_2, ARGS),
+            call.get_repo_apps(self.mock_manager.GitRepo_team_2),
+            call.logging.info("Found %s app(s) in apps repository %s/%s", 1, "TEAM_ORGA", "TEAM_REPO_2"),
+            call.GitRepo_team_2.get_clone_url(),
+            call.GitRepo_team_2.get_author_from_last_commit(),
+            call.GitRepoApiFactory.create(ARGS, "TEAM_ORGA", "TEAM_REPO_3"),
+            call.GitRepo(self.mock_manager.GitRepoApi_team_3, ARGS),
+            call.get_repo_apps(self.mock_manager.GitRepo_team_3),
+            call.logging.info("Found %s app(s) in apps repository %s/%s", 1, "TEAM_ORGA", "TEAM_REPO_3"),
+            call.GitRepo_team_3.get_clone_url(),
+            call.GitRepo_team_3.get_author_from_last_commit(),
+            call.logging.info("Sync applications in root repository's %s.", "apps/team-1.yaml"),
+            call.GitRepo_root.get_full_file_path("apps/team-1.yaml"),
+            call.merge_yaml_element(
+                "/tmp/root-config-repo/apps/team-1.yaml", "applications", {"app-1": {}, "app-1b": {}}
+            ),
+            call.GitRepo_root.commit("GIT_USER", "GIT_EMAIL", "author-1 updated apps/team-1.yaml"),
+            call.logging.info("Sync applications in root repository's %s.", "apps/team-3.yaml"),
+            call.GitRepo_root.get_full_file_path("apps/team-3.yaml"),
+            call.merge_yaml_element("/tmp/root-config-repo/apps/team-3.yaml", "applications", {"app-3b": {}}),
+            call.GitRepo_root.commit("GIT_USER", "GIT_EMAIL", "author-3 updated apps/team-3.yaml"),
+            call.GitRepo_root.push(recommit=ANY),
+        ]
+
+        self.assertEqual(
+            json.loads(mock_print.getvalue()),
+            {
+                "results": [
+                    {
+                        "organisation": "TEAM_ORGA",
+                        "repository": "TEAM_REPO_1",
+                        "file": "apps/team-1.yaml",
+                        "status": "updated",
+                        "commits": [{"hash": "hash1"}],
+                    },
+                    {
+                        "organisation": "TEAM_ORGA",
+                        "repository": "TEAM_REPO_2",
+                        "file": "apps/team-2.yaml",
+                        "status": "unchanged",
+                        "commits": [],
+                    },
+                    {
+                        "organisation": "TEAM_ORGA",
+                        "repository": "TEAM_REPO_3",
+                        "file": "apps/team-3.yaml",
+                        "status": "updated",
+                        "commits": [{"hash": "hash2"}],
+                    },
+                ]
+            },
+        )
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_single_commit(self, mock_print):
+        self.__set_team_apps(1, {"app-1b"})
+        self.__set_team_apps(3, {"app-3b"})
+
+        SyncAppsBatchCommand(replace(ARGS, single_commit=True)).execute()
+
+        self.assertEqual(
+            [
+                call(
+                    "GIT_USER",
+                    "GIT_EMAIL",
+                    "Sync apps of 2 team repositories\n\n"
+                    "author-1 updated apps/team-1.yaml\n"
+                    "author-3 updated apps/team-3.yaml",
+                )
+            ],
+            self.root_config_git_repo_mock.commit.call_args_list,
+        )
+        self.root_config_git_repo_mock.push.assert_called_once_with(recommit=ANY)
+        results = json.loads(mock_print.getvalue())["results"]
+        self.assertEqual([r["commits"] for r in results], [[{"hash": "hash1"}], [], [{"hash": "hash1"}]])
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_rejected_push_reports_hashes_of_recommitted_apps(self, mock_print):
+        self.__set_team_apps(1, {"app-1b"})
+        self.root_config_git_repo_mock.push.side_effect = lambda recommit: recommit()  # rejected once, then pushed
+
+        SyncAppsBatchCommand(ARGS).execute()
+
+        self.assertEqual(self.merge_yaml_element_mock.call_count, 2)  # apps are merged again on the new head
+        results = json.loads(mock_print.getvalue())["results"]
+        self.assertEqual([r["status"] for r in results], ["updated", "unchanged", "unchanged"])
+        self.assertEqual([r["commits"] for r in results], [[{"hash": "hash2"}], [], []])
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_rejected_push_validates_apps_against_new_head(self, mock_print):
+        self.__set_team_apps(1, {"app-1", "app-1b"})
+        self.__set_team_apps(2, {"app-2", "app-1b"})  # synced by another run before our push
+        self.__set_team_apps(3, {"app-3", "app-3b"})
+        new_head_apps_configs = {
+            f"apps/team-{i}.yaml": AppsIndex.Entry(
+                blob="", repository=f"https://team-{i}.config.repo.git", applications=apps, config=False
+            )
+            for i, apps in ((1, ["app-1"]), (2, ["app-2", "app-1b"]), (3, ["app-3"]))
+        }
+
+        def push(recommit):
+            self.load_apps_configs_mock.return_value = new_head_apps_configs
+            recommit()
+
+        self.root_config_git_repo_mock.push.side_effect = push
+
+        with pytest.raises(GitOpsException) as ex:
+            SyncAppsBatchCommand(ARGS).execute()
+        self.assertEqual(str(ex.value), "1 of 3 team repositories failed to sync")
+
+        self.assertEqual(self.load_apps_configs_mock.call_count, 2)
+        results = json.loads(mock_print.getvalue())["results"]
+        self.assertEqual([r["status"] for r in results], ["failed", "unchanged", "updated"])
+        self.assertEqual(results[0]["error"], "Application 'app-1b' already exists in a different repository")
+        self.assertEqual([r["commits"] for r in results], [[], [], [{"hash": "hash2"}]])
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_nothing_to_sync(self, mock_print):
+        SyncAppsBatchCommand(ARGS).execute()
+
+        self.merge_yaml_element_mock.assert_not_called()
+        self.root_config_git_repo_mock.commit.assert_not_called()
+        self.root_config_git_repo_mock.push.assert_not_called()
+        results = json.loads(mock_print.getvalue())["results"]
+        self.assertEqual([r["status"] for r in results], ["unchanged", "unchanged", "unchanged"])
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_nothing_merged(self, mock_print):
+        self.__set_team_apps(1, {"app-1b"})
+        self.merge_yaml_element_mock.return_value = False
+
+        SyncAppsBatchCommand(ARGS).execute()
+
+        self.root_config_git_repo_mock.commit.assert_not_called()
+        self.root_config_git_repo_mock.push.assert_not_called()
+        results = json.loads(mock_print.getvalue())["results"]
+        self.assertEqual([r["status"] for r in results], ["unchanged", "unchanged", "unchanged"])
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_app_moved_between_teams(self, mock_print):
+        self.__set_team_apps(1, {"app-1", "app-2"})
+        self.__set_team_apps(2, set())
+
+        SyncAppsBatchCommand(ARGS).execute()
+
+        results = json.loads(mock_print.getvalue())["results"]
+        self.assertEqual([r["status"] for r in results], ["updated", "updated", "unchanged"])
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_duplicate_apps(self, mock_print):
+        self.__set_team_apps(1, {"app-1", "app-2"})  # app-2 still belongs to team 2
+        self.__set_team_apps(3, {"app-3", "app-3b"})
+
+        with pytest.raises(GitOpsException) as ex:
+            SyncAppsBatchCommand(ARGS).execute()
+        self.assertEqual(str(ex.value), "1 of 3 team repositories failed to sync")
+
+        self.logging_mock.error.assert_called_once_with("Sync of %s/%s failed: %s", "TEAM_ORGA", "TEAM_REPO_1", ANY)
+        self.merge_yaml_element_mock.assert_called_once_with(
+            "/tmp/root-config-repo/apps/team-3.yaml", "applications", {"app-3": {}, "app-3b": {}}
+        )
+        results = json.loads(mock_print.getvalue())["results"]
+        self.assertEqual(results[0]["status"], "failed")
+        self.assertEqual(results[0]["error"], "Application 'app-2' already exists in a different repository")
+        self.assertEqual(results[2]["status"], "updated")
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_same_app_added_by_two_teams(self, mock_print):
+        self.__set_team_apps(1, {"app-1", "new-app"})
+        self.__set_team_apps(3, {"app-3", "new-app"})
+
+        with pytest.raises(GitOpsException) as ex:
+            SyncAppsBatchCommand(ARGS).execute()
+        self.assertEqual(str(ex.value), "2 of 3 team repositories failed to sync")
+
+        self.root_config_git_repo_mock.push.assert_not_called()
+        results = json.loads(mock_print.getvalue())["results"]
+        self.assertEqual([r["status"] for r in results], ["failed", "unchanged", "failed"])
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_change_depending_on_rejected_change(self, mock_print):
+        self.__set_team_apps(1, {"app-3"})  # moves app-1 out, but app-3 still belongs to team 3
+        self.__set_team_apps(2, {"app-2", "app-1"})  # only valid if team 1 gives up app-1
+
+        with pytest.raises(GitOpsException) as ex:
+            SyncAppsBatchCommand(ARGS).execute()
+        self.assertEqual(str(ex.value), "2 of 3 team repositories failed to sync")
+
+        self.merge_yaml_element_mock.assert_not_called()
+        self.root_config_git_repo_mock.push.assert_not_called()
+        results = json.loads(mock_print.getvalue())["results"]
+        self.assertEqual([r["status"] for r in results], ["failed", "failed", "unchanged"])
+        self.assertEqual(results[0]["error"], "Application 'app-3' already exists in a different repository")
+        self.assertEqual(results[1]["error"], "Application 'app-1' already exists in a different repository")
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_failed_team_repository(self, mock_print):
+        self.__set_team_apps(3, {"app-3b"})
+        self.get_repo_apps_mock.side_effect = [{"app-1"}, GitOpsException("Error cloning"), {"app-3b"}]
+
+        with pytest.raises(GitOpsException) as ex:
+            SyncAppsBatchCommand(ARGS).execute()
+        self.assertEqual(str(ex.value), "1 of 3 team repositories failed to sync")
+
+        results = json.loads(mock_print.getvalue())["results"]
+        self.assertEqual(
+            results[1],
+            {
+                "organisation": "TEAM_ORGA",
+                "repository": "TEAM_REPO_2",
+                "file": None,
+                "status": "failed",
+                "commits": [],
+                "error": "Error cloning",
+            },
+        )
+        self.assertEqual(results[2]["status"], "updated")
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_unexpected_error_in_team_repository(self, mock_print):
+        self.get_repo_apps_mock.side_effect = [{"app-1"}, OSError("No space left on device"), {"app-3"}]
+
+        with pytest.raises(GitOpsException) as ex:
+            SyncAppsBatchCommand(ARGS).execute()
+        self.assertEqual(str(ex.value), "1 of 3 team repositories failed to sync")
+
+        results = json.loads(mock_print.getvalue())["results"]
+        self.assertEqual([r["status"] for r in results], ["unchanged", "failed", "unchanged"])
+        self.assertEqual(results[1]["error"], "OSError: No space left on device")
+        self.logging_mock.exception.assert_called_once_with("Sync of %s/%s failed", "TEAM_ORGA", "TEAM_REPO_2")
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_failed_push(self, mock_print):
+        self.__set_team_apps(1, {"app-1b"})
+        self.__set_team_apps(3, {"app-3b"})
+        self.root_config_git_repo_mock.push.side_effect = GitOpsException("Error pushing branch 'master' to origin.")
+
+        with pytest.raises(GitOpsException) as ex:
+            SyncAppsBatchCommand(ARGS).execute()
+        self.assertEqual(str(ex.value), "2 of 3 team repositories failed to sync")
+
+        results = json.loads(mock_print.getvalue())["results"]
+        self.assertEqual([r["status"] for r in results], ["failed", "unchanged", "failed"])
+        self.assertEqual([r["commits"] for r in results], [[], [], []])
+        self.assertEqual(results[0]["error"], "Error pushing branch 'master' to origin.")
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_team_repository_not_in_root_repository(self, mock_print):
+        self.load_apps_configs_mock.return_value = {
+            "apps/team-1.yaml": AppsIndex.Entry(
+                blob="", repository="https://team-1.config.repo.git", applications=["app-1"], config=False
+            )
+        }
+
+        with pytest.raises(GitOpsException) as ex:
+            SyncAppsBatchCommand(ARGS).execute()
+        self.assertEqual(str(ex.value), "2 of 3 team repositories failed to sync")
+
+        results = json.loads(mock_print.getvalue())["results"]
+        self.assertEqual(
+            results[1]["error"], "Couldn't find config file for apps repository in root repository's 'apps/' directory"
+        )
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_team_repository_listed_twice(self, mock_print):
+        self.yaml_file_load_mock.return_value = {
+            "teams": [
+                {"organisation": "TEAM_ORGA", "repository": "TEAM_REPO_1"},
+                {"organisation": "TEAM_ORGA", "repository": "TEAM_REPO_1"},
+            ]
+        }
+
+        with pytest.raises(GitOpsException) as ex:
+            SyncAppsBatchCommand(ARGS).execute()
+        self.assertEqual(str(ex.value), "1 of 2 team repositories failed to sync")
+
+        results = json.loads(mock_print.getvalue())["results"]
+        self.assertEqual(results[1]["error"], "Apps repository is listed more than once in manifest")
+
+    def test_manifest_not_found(self):
+        self.yaml_file_load_mock.side_effect = FileNotFoundError()
+
+        with pytest.raises(GitOpsException) as ex:
+            SyncAppsBatchCommand(ARGS).execute()
+        self.assertEqual(str(ex.value), "No such file: manifest.yaml")
+
+    def test_manifest_invalid_yaml(self):
+        self.yaml_file_load_mock.side_effect = YAMLException()
+
+        with pytest.raises(GitOpsException) as ex:
+            SyncAppsBatchCommand(ARGS).execute()
+        self.assertEqual(str(ex.value), "Error loading file: manifest.yaml")
+
+    def test_manifest_without_teams(self):
+        self.yaml_file_load_mock.return_value = {"foo": "bar"}
+
+        with pytest.raises(GitOpsException) as ex:
+            SyncAppsBatchCommand(ARGS).execute()
+        self.assertEqual(str(ex.value), "Item 'teams' should be a list in manifest: manifest.yaml")
+
+    def test_manifest_entry_missing_repository(self):
+        self.yaml_file_load_mock.return_value = {"teams": [{"organisation": "TEAM_ORGA"}]}
+
+        with pytest.raises(GitOpsException) as ex:
+            SyncAppsBatchCommand(ARGS).execute()
+        self.assertEqual(str(ex.value), "Item 'teams.[0].repository' should be a string in manifest!")
@@ -0,0 +1,59 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+import pytest
+import requests
+
+from gitopscli.gitops_exception import GitOpsException
+from gitopscli.git_api.bitbucket_git_repo_api_adapter import BitbucketGitRepoApiAdapter
+
+
+class BitbucketGitRepoApiAdapterTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("gitopscli.git_api.bitbucket_git_repo_api_adapter.Bitbucket")
+        self.addCleanup(patcher.stop)
+        self.bitbucket_mock = patcher.start().return_value
+
+        self.adapter = BitbucketGitRepoApiAdapter(
+            git_provider_url="https://bitbucket.example.tld",
+            username="USER",
+            password="PASS",
+            organisation="ORG",
+            repository_name="REPO",
+        )
+
+    def test_get_file_content(self):
+        response = MagicMock(status_code=200, text="a: 1\n")
+        self.bitbucket_mock.request.return_value = response
+
+        self.assertEqual(self.adapter.get_file_content("a/values.yaml", ref="main"), "a: 1\n")
+        self.bitbucket_mock.request.assert_called_once_with(
+            "GET", path="rest/api/1.0/projects/ORG/repos/REPO/raw/a/values.yaml", params={"at": "main"}
+        )
+
+    def test_get_file_content_not_found(self):
+        self.bitbucket_mock.request.return_value = MagicMock(status_code=404)
+
+        self.assertIsNone(self.adapter.get_file_content("a/values.yaml"))
+
+    def test_get_file_content_connection_error(self):
+        self.bitbucket_mock.request.side_effect = requests.exceptions.ConnectionError()
+
+        with pytest.raises(GitOpsException) as ex:
+            self.adapter.get_file_content("a/values.yaml")
+        self.assertEqual(str(ex.value), "Error connecting to 'https://bitbucket.example.tld''")
+
+    def test_get_file_content_http_error(self):
+        self.bitbucket_mock.request.side_effect = requests.exceptions.HTTPError("502 Server Error: Bad Gateway")
+
+        with pytest.raises(GitOpsException) as ex:
+            self.adapter.get_file_content("a/values.yaml")
+        self.assertEqual(str(ex.value), "Error getting file 'a/values.yaml': 502 Server Error: Bad Gateway")
+
+    def test_commit_file_is_not_supported(self):
+        with pytest.raises(GitOpsException) as ex:
+            self.adapter.commit_file(
+                "main", "main", "PARENT_HASH", "a/values.yaml", "a: 1\n", "MESSAGE", "GIT_USER", "GIT_EMAIL"
+            )
+        self.assertEqual(str(ex.value), "Committing files via API is not supported by Bitbucket Server.")
+        self.bitbucket_mock.request.assert_not_called()
@@ -0,0 +1,131 @@
+import os
+import shutil
+import time
+import unittest
+import uuid
+from os import path, makedirs
+from unittest.mock import patch
+from git import Repo, GitError
+import pytest
+
+from gitopscli.git_api.git_mirror_cache import GitMirrorCache
+
+
+class GitMirrorCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.__cache_dir = f"/tmp/gitopscli-test-{uuid.uuid4()}/cache"
+        self.__origin = self.__create_origin()
+
+    @staticmethod
+    def __create_origin():
+        repo_dir = f"/tmp/gitopscli-test-{uuid.uuid4()}"
+        makedirs(repo_dir)
+        repo = Repo.init(repo_dir)
+        repo.config_writer().set_value("user", "name", "unit tester").release()
+        repo.config_writer().set_value("user", "email", "unit@tester.com").release()
+        with open(f"{repo_dir}/README.md", "w") as readme:
+            readme.write("readme")
+        repo.git.add("--all")
+        repo.git.commit("-m", "initial commit")
+        return repo
+
+    def __add_commit(self, message):
+        with open(f"{self.__origin.working_dir}/README.md", "a") as readme:
+            readme.write(message)
+        self.__origin.git.add("--all")
+        self.__origin.git.commit("-m", message)
+
+    def test_mirror_is_created_and_reused(self):
+        testee = GitMirrorCache(self.__cache_dir, max_size_mb=100, max_age_days=1)
+        url = self.__origin.working_dir
+
+        with testee.mirror(url) as mirror_dir:
+            self.assertTrue(Repo(mirror_dir).bare)
+            self.assertEqual(self.__origin.head.commit.hexsha, Repo(mirror_dir).head.commit.hexsha)
+
+        self.__add_commit("second commit")
+
+        with testee.mirror(url) as same_mirror_dir:
+            self.assertEqual(mirror_dir, same_mirror_dir)
+            self.assertEqual(self.__origin.head.commit.hexsha, Repo(mirror_dir).head.commit.hexsha)
+
+    def test_mirror_of_unknown_url_is_not_kept(self):
+        testee = GitMirrorCache(self.__cache_dir, max_size_mb=100, max_age_days=1)
+
+        with pytest.raises(GitError):
+            with testee.mirror("/tmp/gitopscli-test-unknown-url"):
+                pass
+
+        self.assertEqual([], [name for name in os.listdir(self.__cache_dir) if name.endswith(".git")])
+
+    def test_evict_expired_mirror(self):
+        testee = GitMirrorCache(self.__cache_dir, max_size_mb=100, max_age_days=1)
+        with testee.mirror(self.__origin.working_dir) as mirror_dir:
+            pass
+        self.assertTrue(path.isdir(mirror_dir))
+
+        two_days_ago = time.time() - 2 * 24 * 60 * 60
+        os.utime(f"{mirror_dir}.lock", (two_days_ago, two_days_ago))
+        testee.evict()
+
+        self.assertFalse(path.exists(mirror_dir))
+
+    def test_evict_least_recently_used_mirror_if_cache_is_too_big(self):
+        testee = GitMirrorCache(self.__cache_dir, max_size_mb=0, max_age_days=1)
+        with testee.mirror(self.__origin.working_dir) as mirror_dir:
+            self.assertTrue(path.isdir(mirror_dir))  # not evicted while in use
+        self.assertFalse(path.exists(mirror_dir))
+
+    def test_evict_skips_mirror_in_use(self):
+        testee = GitMirrorCache(self.__cache_dir, max_size_mb=0, max_age_days=1)
+        testee_of_other_process = GitMirrorCache(self.__cache_dir, max_size_mb=100, max_age_days=1)
+        with testee_of_other_process.mirror(self.__origin.working_dir) as mirror_dir:
+            testee.evict()
+            self.assertTrue(path.isdir(mirror_dir))
+
+    def test_failed_fetch_keeps_mirror(self):
+        testee = GitMirrorCache(self.__cache_dir, max_size_mb=100, max_age_days=1)
+        url = self.__origin.working_dir
+        with testee.mirror(url) as mirror_dir:
+            pass
+        shutil.move(url, f"{url}-moved")  # origin temporarily unreachable
+        self.addCleanup(shutil.move, f"{url}-moved", url)
+
+        with pytest.raises(GitError):
+            with testee.mirror(url):
+                pass
+
+        self.assertTrue(path.isdir(mirror_dir))
+
+    def test_corrupt_mirror_is_discarded(self):
+        testee = GitMirrorCache(self.__cache_dir, max_size_mb=100, max_age_days=1)
+        url = self.__origin.working_dir
+        with testee.mirror(url) as mirror_dir:
+            pass
+        os.remove(f"{mirror_dir}/HEAD")
+
+        with pytest.raises(GitError):
+            with testee.mirror(url):
+                pass
+
+        self.assertFalse(path.exists(mirror_dir))
+
+    def test_evict_skips_vanished_mirrors_and_files(self):
+        testee = GitMirrorCache(self.__cache_dir, max_size_mb=100, max_age_days=1)
+        with testee.mirror(self.__origin.working_dir) as mirror_dir:
+            pass
+        makedirs(f"{self.__cache_dir}/vanished.git")  # its lock file is already gone
+
+        with patch("gitopscli.git_api.git_mirror_cache.os.path.getsize", side_effect=FileNotFoundError()):
+            testee.evict()
+
+        self.assertTrue(path.isdir(mirror_dir))
+
+    def test_failed_eviction_does_not_fail_mirror(self):
+        testee = GitMirrorCache(self.__cache_dir, max_size_mb=100, max_age_days=1)
+
+        with patch.object(GitMirrorCache, "evict", side_effect=FileNotFoundError()):
+            with testee.mirror(self.__origin.working_dir) as mirror_dir:
+                pass
+
+        self.assertTrue(path.isdir(mirror_dir))
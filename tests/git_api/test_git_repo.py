@@ -1,3 +1,4 @@
+import os
 from os import path, makedirs, chmod
 import stat
 import unittest
@@ -6,7 +7,7 @@ from unittest.mock import MagicMock, patch
 from git import Repo
 import pytest
 
-from gitopscli.git_api import GitRepo, GitRepoApi
+from gitopscli.git_api import GitApiConfig, GitProvider, GitRepo, GitRepoApi
 from gitopscli.gitops_exception import GitOpsException
 
 
@@ -111,6 +112,237 @@ class GitRepoTest(unittest.TestCase):
             "xyz",
         )
 
+    def test_clone_shallow(self):
+        self.__origin.git.config("uploadpack.allowFilter", "true")
+        self.__mock_repo_api.get_clone_url.return_value = f"file://{self.__origin.working_dir}"
+        git_api_config = GitApiConfig(
+            username=None,
+            password=None,
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            clone_depth=1,
+            clone_single_branch=True,
+            clone_filter="blob:none",
+        )
+        with GitRepo(self.__mock_repo_api, git_api_config) as testee:
+            testee.clone("xyz")
+
+            repo = Repo(testee.get_full_file_path("."))
+            self.assertEqual(1, len(list(repo.iter_commits("xyz"))))
+            self.assertEqual(["origin/xyz"], [str(ref) for ref in repo.remote().refs])
+            self.assertEqual("xyz branch readme", self.__read_file(testee.get_full_file_path("README.md")))
+
+            with open(testee.get_full_file_path("foo.md"), "w") as outfile:
+                outfile.write("new file")
+            commit_hash = testee.commit(git_user="john doe", git_email="john@doe.com", message="new commit")
+            testee.push()
+
+            self.assertEqual("john doe <john@doe.com>", testee.get_author_from_last_commit())
+
+        commits = list(self.__origin.iter_commits("xyz"))
+        self.assertEqual(3, len(commits))
+        self.assertEqual(commit_hash, commits[0].hexsha)
+
+    def test_clone_from_mirror_cache(self):
+        cache_dir = f"{self.__create_tmp_dir()}/cache"
+        git_api_config = GitApiConfig(
+            username=None,
+            password=None,
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            clone_cache_dir=cache_dir,
+        )
+        with GitRepo(self.__mock_repo_api, git_api_config) as testee:
+            testee.clone("xyz")
+            self.assertEqual("xyz branch readme", self.__read_file(testee.get_full_file_path("README.md")))
+
+        with GitRepo(self.__mock_repo_api, git_api_config) as testee:
+            testee.clone()
+            self.assertEqual("master branch readme", self.__read_file(testee.get_full_file_path("README.md")))
+
+            repo = Repo(testee.get_full_file_path("."))
+            self.assertEqual(self.__origin.working_dir, repo.remote().url)
+
+            with open(testee.get_full_file_path("foo.md"), "w") as outfile:
+                outfile.write("new file")
+            commit_hash = testee.commit(git_user="john doe", git_email="john@doe.com", message="new commit")
+            testee.push()
+
+        self.assertEqual(commit_hash, self.__origin.head.commit.hexsha)
+        self.assertEqual(1, len([name for name in os.listdir(cache_dir) if name.endswith(".git")]))
+
+    def test_clone_sparse(self):
+        for directory in ["app-1", "app-2"]:
+            makedirs(f"{self.__origin.working_dir}/{directory}")
+            with open(f"{self.__origin.working_dir}/{directory}/values.yaml", "w") as stream:
+                stream.write(f"{directory} values")
+        self.__origin.git.add("--all")
+        self.__origin.git.commit("-m", "add apps", "--author", "unit tester <unit@tester.com>")
+        git_api_config = GitApiConfig(
+            username=None,
+            password=None,
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            clone_sparse=True,
+        )
+        with GitRepo(self.__mock_repo_api, git_api_config) as testee:
+            testee.clone(sparse_paths=["./app-1/"])
+
+            self.assertEqual("master branch readme", self.__read_file(testee.get_full_file_path("README.md")))
+            self.assertEqual("app-1 values", self.__read_file(testee.get_full_file_path("app-1/values.yaml")))
+            self.assertFalse(path.exists(testee.get_full_file_path("app-2")))
+
+            with open(testee.get_full_file_path("app-1/values.yaml"), "w") as outfile:
+                outfile.write("new values")
+            testee.commit(git_user="john doe", git_email="john@doe.com", message="new commit")
+            testee.push()
+
+        self.__origin.git.reset("--hard")
+        self.assertEqual("new values", self.__read_file(f"{self.__origin.working_dir}/app-1/values.yaml"))
+        self.assertEqual("app-2 values", self.__read_file(f"{self.__origin.working_dir}/app-2/values.yaml"))
+
+    def test_clone_sparse_paths_without_clone_sparse(self):
+        makedirs(f"{self.__origin.working_dir}/app-1")
+        with open(f"{self.__origin.working_dir}/app-1/values.yaml", "w") as stream:
+            stream.write("app-1 values")
+        self.__origin.git.add("--all")
+        self.__origin.git.commit("-m", "add app", "--author", "unit tester <unit@tester.com>")
+
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone(sparse_paths=[])
+            self.assertEqual("app-1 values", self.__read_file(testee.get_full_file_path("app-1/values.yaml")))
+
+    def test_clone_metadata_only(self):
+        self.__origin.git.config("uploadpack.allowFilter", "true")
+        makedirs(f"{self.__origin.working_dir}/app-1")
+        with open(f"{self.__origin.working_dir}/app-1/values.yaml", "w") as stream:
+            stream.write("app-1 values")
+        self.__origin.git.add("--all")
+        self.__origin.git.commit("-m", "add app", "--author", "app author <app@author.com>")
+        self.__mock_repo_api.get_clone_url.return_value = f"file://{self.__origin.working_dir}"
+
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone(metadata_only=True)
+
+            repo = Repo(testee.get_full_file_path("."))
+            self.assertEqual(1, len(list(repo.iter_commits())))
+            self.assertFalse(path.exists(testee.get_full_file_path("README.md")))
+            self.assertFalse(path.exists(testee.get_full_file_path("app-1")))
+            self.assertEqual({"README.md": "blob", "app-1": "tree"}, testee.list_directory())
+            self.assertEqual({"values.yaml": "blob"}, testee.list_directory("./app-1/"))
+            self.assertEqual("app author <app@author.com>", testee.get_author_from_last_commit())
+
+    def test_list_directory(self):
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone()
+            self.assertEqual({"README.md": "blob"}, testee.list_directory("."))
+            self.assertEqual({"README.md": "blob"}, testee.list_directory(ref="origin/xyz"))
+
+            with pytest.raises(GitOpsException) as ex:
+                testee.list_directory("unknown")
+            self.assertEqual("Error listing directory 'unknown'.", str(ex.value))
+
+    def test_add_sparse_paths(self):
+        makedirs(f"{self.__origin.working_dir}/app-1")
+        with open(f"{self.__origin.working_dir}/app-1/values.yaml", "w") as stream:
+            stream.write("app-1 values")
+        self.__origin.git.add("--all")
+        self.__origin.git.commit("-m", "add app", "--author", "unit tester <unit@tester.com>")
+        git_api_config = GitApiConfig(
+            username=None,
+            password=None,
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            clone_sparse=True,
+        )
+        with GitRepo(self.__mock_repo_api, git_api_config) as testee:
+            testee.clone(sparse_paths=[])
+            self.assertFalse(path.exists(testee.get_full_file_path("app-1")))
+
+            testee.add_sparse_paths(["app-1"])
+            self.assertEqual("app-1 values", self.__read_file(testee.get_full_file_path("app-1/values.yaml")))
+
+    @patch("gitopscli.git_api.git_repo.logging")
+    def test_create_worktree(self, logging_mock):
+        with GitRepo(self.__mock_repo_api) as testee:
+            self.assertFalse(testee.is_cloned())
+            testee.clone()
+            self.assertTrue(testee.is_cloned())
+
+            with testee.create_worktree("xyz") as worktree:
+                self.assertEqual("xyz branch readme", self.__read_file(worktree.get_full_file_path("README.md")))
+                self.assertEqual("master branch readme", self.__read_file(testee.get_full_file_path("README.md")))
+                worktree_dir = worktree.get_full_file_path(".")
+
+            self.assertFalse(path.exists(worktree_dir))
+        logging_mock.info.assert_any_call("Checking out branch of existing clone: %s", "xyz")
+
+    def test_create_worktree_of_single_branch_sparse_clone(self):
+        self.__origin.git.checkout("xyz")
+        makedirs(f"{self.__origin.working_dir}/template")
+        with open(f"{self.__origin.working_dir}/template/values.yaml", "w") as stream:
+            stream.write("template values")
+        self.__origin.git.add("--all")
+        self.__origin.git.commit("-m", "add template", "--author", "unit tester <unit@tester.com>")
+        self.__origin.git.checkout("master")
+        self.__mock_repo_api.get_clone_url.return_value = f"file://{self.__origin.working_dir}"
+        git_api_config = GitApiConfig(
+            username=None,
+            password=None,
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            clone_depth=1,
+            clone_single_branch=True,
+            clone_sparse=True,
+        )
+        with GitRepo(self.__mock_repo_api, git_api_config) as testee:
+            testee.clone(sparse_paths=[])
+
+            with testee.create_worktree("xyz", sparse_paths=["template"]) as worktree:
+                self.assertEqual(
+                    "template values", self.__read_file(worktree.get_full_file_path("template/values.yaml"))
+                )
+                self.assertEqual("xyz branch readme", self.__read_file(worktree.get_full_file_path("README.md")))
+            self.assertFalse(path.exists(testee.get_full_file_path("template")))
+
+    def test_create_worktree_unknown_branch(self):
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone()
+            with pytest.raises(GitOpsException) as ex:
+                testee.create_worktree("unknown")
+            self.assertEqual("Error checking out branch 'unknown' of existing clone.", str(ex.value))
+
+    def test_checkout_tree_from(self):
+        makedirs(f"{self.__origin.working_dir}/template/sub")
+        with open(f"{self.__origin.working_dir}/template/sub/values.yaml", "w") as stream:
+            stream.write("template values")
+        self.__origin.git.add("--all")
+        self.__origin.git.commit("-m", "add template", "--author", "unit tester <unit@tester.com>")
+
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone()
+
+            self.assertTrue(testee.checkout_tree_from(testee, "template/", "preview"))
+            self.assertEqual("template values", self.__read_file(testee.get_full_file_path("preview/sub/values.yaml")))
+            self.assertFalse(testee.checkout_tree_from(testee, "unknown", "other-preview"))
+
+            testee.commit(git_user="john doe", git_email="john@doe.com", message="new commit")
+            testee.push()
+
+        self.__origin.git.reset("--hard")
+        self.assertEqual("template values", self.__read_file(f"{self.__origin.working_dir}/preview/sub/values.yaml"))
+
+    def test_checkout_tree_from_other_clone(self):
+        with GitRepo(self.__mock_repo_api) as testee, GitRepo(self.__mock_repo_api) as other:
+            testee.clone()
+            other.clone("xyz")
+            with open(other.get_full_file_path("new.md"), "w") as outfile:
+                outfile.write("new file")
+            other.commit(git_user="john doe", git_email="john@doe.com", message="new commit")
+
+            self.assertFalse(testee.checkout_tree_from(other, ".", "preview"))
+            self.assertFalse(path.exists(testee.get_full_file_path("preview")))
+
     @patch("gitopscli.git_api.git_repo.logging")
     def test_clone_unknown_branch(self, logging_mock):
         with GitRepo(self.__mock_repo_api) as testee:
@@ -315,6 +547,166 @@ echo password='Pass'
             assert "pre-receive" in str(ex.value) and "we reject this push" in str(ex.value)
         logging_mock.info.assert_called_once_with("Pushing branch: %s", "master")
 
+    def __commit_file(self, repo, filename, content, message):
+        with open(f"{repo.working_dir}/{filename}", "w") as stream:
+            stream.write(content)
+        repo.git.add("--all")
+        repo.config_writer().set_value("user", "email", "unit@tester.com").release()
+        repo.git.commit("-m", message)
+
+    def __create_push_retries_config(self, push_retries):
+        return GitApiConfig(
+            username=None,
+            password=None,
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            push_retries=push_retries,
+        )
+
+    @patch("gitopscli.git_api.git_repo.time")
+    @patch("gitopscli.git_api.git_repo.logging")
+    def test_push_rebases_and_retries_when_rejected(self, logging_mock, time_mock):
+        with GitRepo(self.__mock_repo_api, self.__create_push_retries_config(3)) as testee:
+            testee.clone()
+            self.__commit_file(Repo(testee.get_full_file_path(".")), "foo.md", "new file", "new commit")
+            self.__commit_file(self.__origin, "bar.md", "concurrent file", "concurrent commit")
+            logging_mock.reset_mock()
+
+            testee.push("master")
+
+            commits = list(self.__origin.iter_commits("master"))
+            self.assertEqual(["new commit\n", "concurrent commit\n", "initial commit\n"], [c.message for c in commits])
+        time_mock.sleep.assert_called_once()
+        self.assertTrue(0.5 <= time_mock.sleep.call_args.args[0] <= 1.0)
+        logging_mock.warning.assert_called_once_with(
+            "Push of branch '%s' rejected, retrying in %.1fs. Attempts: (%s/%s)",
+            "master",
+            time_mock.sleep.call_args.args[0],
+            1,
+            3,
+        )
+        logging_mock.info.assert_any_call("Rebasing branch '%s' onto origin", "master")
+
+    @patch("gitopscli.git_api.git_repo.time")
+    @patch("gitopscli.git_api.git_repo.logging")
+    def test_push_rejected_with_conflicting_changes(self, logging_mock, time_mock):
+        with GitRepo(self.__mock_repo_api, self.__create_push_retries_config(3)) as testee:
+            testee.clone()
+            util_repo = Repo(testee.get_full_file_path("."))
+            self.__commit_file(util_repo, "README.md", "our readme", "new commit")
+            self.__commit_file(self.__origin, "README.md", "their readme", "concurrent commit")
+
+            with pytest.raises(GitOpsException) as ex:
+                testee.push("master")
+            assert str(ex.value).startswith("Error rebasing branch 'master' onto origin")
+
+            self.assertEqual("new commit\n", util_repo.head.commit.message)
+            self.assertFalse(util_repo.is_dirty())
+        self.assertEqual("concurrent commit\n", self.__origin.head.commit.message)
+
+    @patch("gitopscli.git_api.git_repo.time")
+    @patch("gitopscli.git_api.git_repo.logging")
+    def test_push_recommits_on_new_head_when_rejected(self, logging_mock, time_mock):
+        with GitRepo(self.__mock_repo_api, self.__create_push_retries_config(3)) as testee:
+            testee.clone()
+            commit_hashes = []
+
+            def commit_readme():
+                # the same (conflicting) line is changed again on top of the concurrent commit
+                with open(testee.get_full_file_path("README.md"), "a") as readme:
+                    readme.write("\nour line")
+                commit_hashes.append(testee.commit("GIT_USER", "GIT_EMAIL", "new commit"))
+
+            def recommit_readme():
+                commit_hashes.clear()
+                commit_readme()
+
+            commit_readme()
+            self.__commit_file(self.__origin, "README.md", "their readme", "concurrent commit")
+            logging_mock.reset_mock()
+
+            testee.push("master", recommit=recommit_readme)
+
+            commits = list(self.__origin.iter_commits("master"))
+            self.assertEqual(["new commit\n", "concurrent commit\n", "initial commit\n"], [c.message for c in commits])
+            self.assertEqual([commits[0].hexsha], commit_hashes)
+            self.assertEqual("their readme\nour line", commits[0].tree["README.md"].data_stream.read().decode())
+        time_mock.sleep.assert_called_once()
+        logging_mock.info.assert_any_call("Resetting branch '%s' to origin and committing again", "master")
+
+    @patch("gitopscli.git_api.git_repo.time")
+    @patch("gitopscli.git_api.git_repo.logging")
+    def test_push_recommit_without_changes(self, logging_mock, time_mock):
+        with GitRepo(self.__mock_repo_api, self.__create_push_retries_config(3)) as testee:
+            testee.clone()
+            self.__commit_file(Repo(testee.get_full_file_path(".")), "README.md", "same readme", "new commit")
+            self.__commit_file(self.__origin, "README.md", "same readme", "concurrent commit")
+            logging_mock.reset_mock()
+
+            testee.push("master", recommit=lambda: testee.commit("GIT_USER", "GIT_EMAIL", "new commit"))
+
+            self.assertEqual("concurrent commit\n", self.__origin.head.commit.message)
+        logging_mock.info.assert_called_with("Branch '%s' is already up-to-date on origin", "master")
+
+    @patch("gitopscli.git_api.git_repo.time")
+    @patch("gitopscli.git_api.git_repo.logging")
+    def test_push_rejected_without_retries(self, logging_mock, time_mock):
+        with GitRepo(self.__mock_repo_api, self.__create_push_retries_config(0)) as testee:
+            testee.clone()
+            self.__commit_file(Repo(testee.get_full_file_path(".")), "foo.md", "new file", "new commit")
+            self.__commit_file(self.__origin, "bar.md", "concurrent file", "concurrent commit")
+
+            with pytest.raises(GitOpsException) as ex:
+                testee.push("master")
+            assert str(ex.value).startswith("Error pushing branch 'master' to origin")
+            assert "[rejected]" in str(ex.value)
+        time_mock.sleep.assert_not_called()
+
+    def test_reset_hard(self):
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone()
+            util_repo = Repo(testee.get_full_file_path("."))
+            self.__commit_file(util_repo, "foo.md", "new file", "new commit")
+            with open(testee.get_full_file_path("README.md"), "w") as readme:
+                readme.write("uncommitted change")
+
+            testee.reset_hard("HEAD~1")
+
+            self.assertEqual("initial commit\n", util_repo.head.commit.message)
+            self.assertFalse(util_repo.is_dirty(untracked_files=True))
+
+    def test_reset_hard_unknown_ref(self):
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone()
+
+            with pytest.raises(GitOpsException) as ex:
+                testee.reset_hard("unknown")
+            self.assertEqual("Error resetting to 'unknown'.", str(ex.value))
+
+    def test_get_commit_hash(self):
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone()
+            self.assertEqual(self.__origin.head.commit.hexsha, testee.get_commit_hash())
+
+    def test_get_blob_hashes(self):
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone()
+            util_repo = Repo(testee.get_full_file_path("."))
+            makedirs(testee.get_full_file_path("apps/nested"))
+            self.__commit_file(util_repo, "apps/team.yaml", "repository: team", "add team")
+            self.__commit_file(util_repo, "apps/nested/other.yaml", "repository: other", "add other")
+            with open(testee.get_full_file_path("apps/uncommitted.yaml"), "w") as stream:
+                stream.write("uncommitted")
+
+            self.assertEqual(
+                {
+                    "apps/team.yaml": util_repo.git.rev_parse("HEAD:apps/team.yaml"),
+                    "apps/nested/other.yaml": util_repo.git.rev_parse("HEAD:apps/nested/other.yaml"),
+                },
+                testee.get_blob_hashes("apps"),
+            )
+            self.assertEqual({}, testee.get_blob_hashes("unknown"))
+
     def test_get_author_from_last_commit(self):
         with GitRepo(self.__mock_repo_api) as testee:
             testee.clone()
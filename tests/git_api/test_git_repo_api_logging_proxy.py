@@ -28,6 +28,11 @@ class GitRepoApiLoggingProxyTest(unittest.TestCase):
         self.assertEqual(actual_return_value, expected_return_value)
         self.__mock_repo_api.get_password.assert_called_once_with()
 
+    def test_invalidate_cache(self):
+        self.__testee.invalidate_cache()
+
+        self.__mock_repo_api.invalidate_cache.assert_called_once_with()
+
     def test_get_clone_url(self):
         expected_return_value = "<clone url>"
         self.__mock_repo_api.get_clone_url.return_value = expected_return_value
@@ -97,6 +102,15 @@ class GitRepoApiLoggingProxyTest(unittest.TestCase):
         self.__mock_repo_api.delete_branch.assert_called_once_with("<branch>")
         logging_mock.info.assert_called_once_with("Deleting branch '%s'", "<branch>")
 
+    def test_get_default_branch(self):
+        expected_return_value = "<branch>"
+        self.__mock_repo_api.get_default_branch.return_value = expected_return_value
+
+        actual_return_value = self.__testee.get_default_branch()
+
+        self.assertEqual(actual_return_value, expected_return_value)
+        self.__mock_repo_api.get_default_branch.assert_called_once_with()
+
     def test_get_branch_head_hash(self):
         expected_return_value = "<hash>"
         self.__mock_repo_api.get_branch_head_hash.return_value = expected_return_value
@@ -114,3 +128,27 @@ class GitRepoApiLoggingProxyTest(unittest.TestCase):
 
         self.assertEqual(actual_return_value, expected_return_value)
         self.__mock_repo_api.get_pull_request_branch.assert_called_once_with(42)
+
+    def test_get_file_content(self):
+        expected_return_value = "<content>"
+        self.__mock_repo_api.get_file_content.return_value = expected_return_value
+
+        actual_return_value = self.__testee.get_file_content("<path>", "<ref>")
+
+        self.assertEqual(actual_return_value, expected_return_value)
+        self.__mock_repo_api.get_file_content.assert_called_once_with("<path>", "<ref>")
+
+    @patch("gitopscli.git_api.git_repo_api_logging_proxy.logging")
+    def test_commit_file(self, logging_mock):
+        expected_return_value = "<hash>"
+        self.__mock_repo_api.commit_file.return_value = expected_return_value
+
+        actual_return_value = self.__testee.commit_file(
+            "<branch>", "<source branch>", "<parent hash>", "<path>", "<content>", "<message>", "<user>", "<email>"
+        )
+
+        self.assertEqual(actual_return_value, expected_return_value)
+        self.__mock_repo_api.commit_file.assert_called_once_with(
+            "<branch>", "<source branch>", "<parent hash>", "<path>", "<content>", "<message>", "<user>", "<email>"
+        )
+        logging_mock.info.assert_called_once_with("Committing file '%s' to branch '%s' via API", "<path>", "<branch>")
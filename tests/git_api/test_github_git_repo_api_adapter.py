@@ -0,0 +1,168 @@
+import base64
+import unittest
+from unittest.mock import patch, MagicMock
+
+import pytest
+from github import BadCredentialsException, GithubException, InputGitAuthor, UnknownObjectException
+
+from gitopscli.gitops_exception import GitOpsException
+from gitopscli.git_api.github_git_repo_api_adapter import GithubGitRepoApiAdapter
+
+
+class GithubGitRepoApiAdapterTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("gitopscli.git_api.github_git_repo_api_adapter.Github")
+        self.addCleanup(patcher.stop)
+        self.github_constructor_mock = patcher.start()
+
+        self.repo_mock = MagicMock()
+        self.repo_mock.clone_url = "https://github.com/ORG/REPO.git"
+        self.repo_mock.default_branch = "main"
+        self.repo_mock.create_pull.return_value.number = 42
+        self.repo_mock.create_pull.return_value.html_url = "https://github.com/ORG/REPO/pull/42"
+
+        self.github_mock = self.github_constructor_mock.return_value
+        self.github_mock.get_repo.return_value = self.repo_mock
+
+        self.adapter = GithubGitRepoApiAdapter(
+            username="USER", password="PASS", organisation="ORG", repository_name="REPO"
+        )
+
+    def test_get_clone_url(self):
+        self.assertEqual(self.adapter.get_clone_url(), "https://github.com/ORG/REPO.git")
+        self.github_constructor_mock.assert_called_once_with("USER", "PASS")
+        self.github_mock.get_repo.assert_called_once_with("ORG/REPO")
+
+    def test_deploy_with_auto_merge_fetches_repository_once(self):
+        self.adapter.get_clone_url()
+        pr = self.adapter.create_pull_request_to_default_branch("BRANCH", "TITLE", "DESCRIPTION")
+        self.adapter.merge_pull_request(pr.pr_id, "squash")
+        self.adapter.delete_branch("BRANCH")
+
+        self.assertEqual(pr.pr_id, 42)
+        self.assertEqual(pr.url, "https://github.com/ORG/REPO/pull/42")
+        self.repo_mock.create_pull.assert_called_once_with(
+            title="TITLE", body="DESCRIPTION", head="BRANCH", base="main"
+        )
+        self.repo_mock.get_pull.return_value.merge.assert_called_once_with(merge_method="squash")
+        self.repo_mock.get_git_ref.assert_called_once_with("heads/BRANCH")
+        self.assertEqual(self.github_mock.get_repo.call_count, 1)
+
+    def test_invalidate_cache(self):
+        self.adapter.get_clone_url()
+        self.adapter.create_pull_request_to_default_branch("BRANCH", "TITLE", "DESCRIPTION")
+        self.assertEqual(self.github_mock.get_repo.call_count, 1)
+
+        self.repo_mock.default_branch = "develop"
+        self.adapter.invalidate_cache()
+        self.adapter.create_pull_request_to_default_branch("BRANCH", "TITLE", "DESCRIPTION")
+
+        self.assertEqual(self.github_mock.get_repo.call_count, 2)
+        self.repo_mock.create_pull.assert_called_with(title="TITLE", body="DESCRIPTION", head="BRANCH", base="develop")
+
+    def test_failed_lookup_is_not_cached(self):
+        self.github_mock.get_repo.side_effect = [UnknownObjectException(404, "not found"), self.repo_mock]
+
+        with pytest.raises(GitOpsException) as ex:
+            self.adapter.get_clone_url()
+        self.assertEqual(str(ex.value), "Repository 'ORG/REPO' does not exist.")
+
+        self.assertEqual(self.adapter.get_clone_url(), "https://github.com/ORG/REPO.git")
+        self.assertEqual(self.github_mock.get_repo.call_count, 2)
+
+    def test_bad_credentials(self):
+        self.github_mock.get_repo.side_effect = BadCredentialsException(401, "bad credentials")
+
+        with pytest.raises(GitOpsException) as ex:
+            self.adapter.get_clone_url()
+        self.assertEqual(str(ex.value), "Bad credentials")
+
+    def test_get_file_content(self):
+        self.repo_mock.get_contents.return_value.encoding = "base64"
+        self.repo_mock.get_contents.return_value.decoded_content = b"a: 1\n"
+
+        self.assertEqual(self.adapter.get_file_content("a/values.yaml"), "a: 1\n")
+        self.repo_mock.get_contents.assert_called_once_with("a/values.yaml")
+
+    def test_get_file_content_of_large_file(self):
+        # files larger than 1 MB are returned without content (encoding "none")
+        self.repo_mock.get_contents.return_value.encoding = "none"
+        self.repo_mock.get_contents.return_value.sha = "BLOB_SHA"
+        self.repo_mock.get_git_blob.return_value.content = base64.b64encode(b"a: 1\n").decode("ascii")
+
+        self.assertEqual(self.adapter.get_file_content("a/values.yaml"), "a: 1\n")
+        self.repo_mock.get_git_blob.assert_called_once_with("BLOB_SHA")
+
+    def test_get_file_content_of_directory(self):
+        self.repo_mock.get_contents.return_value = [MagicMock(), MagicMock()]
+
+        with pytest.raises(GitOpsException) as ex:
+            self.adapter.get_file_content("a")
+        self.assertEqual(str(ex.value), "Path 'a' is a directory.")
+
+    def test_get_file_content_not_found(self):
+        self.repo_mock.get_contents.side_effect = UnknownObjectException(404, "not found")
+
+        self.assertIsNone(self.adapter.get_file_content("a/values.yaml", ref="main"))
+        self.repo_mock.get_contents.assert_called_once_with("a/values.yaml", ref="main")
+
+    def test_get_file_content_error(self):
+        self.repo_mock.get_contents.side_effect = GithubException(502, "bad gateway")
+
+        with pytest.raises(GitOpsException) as ex:
+            self.adapter.get_file_content("a/values.yaml")
+        self.assertEqual(str(ex.value), "Error getting file 'a/values.yaml': HTTP 502")
+
+    def test_commit_file(self):
+        parent_mock = self.repo_mock.get_git_commit.return_value
+        self.repo_mock.create_git_commit.return_value.sha = "NEW_HASH"
+
+        commit_hash = self.adapter.commit_file(
+            "main", "main", "PARENT_HASH", "a/values.yaml", "a: 1\n", "MESSAGE", "GIT_USER", "GIT_EMAIL"
+        )
+
+        self.assertEqual(commit_hash, "NEW_HASH")
+        self.repo_mock.get_git_commit.assert_called_once_with("PARENT_HASH")
+        tree_elements, base_tree = self.repo_mock.create_git_tree.call_args.args
+        self.assertEqual(
+            tree_elements[0]._identity,
+            {"path": "a/values.yaml", "mode": "100644", "type": "blob", "content": "a: 1\n"},
+        )
+        self.assertEqual(base_tree, parent_mock.tree)
+        message, tree, parents = self.repo_mock.create_git_commit.call_args.args
+        self.assertEqual(
+            (message, tree, parents), ("MESSAGE", self.repo_mock.create_git_tree.return_value, [parent_mock])
+        )
+        author = self.repo_mock.create_git_commit.call_args.kwargs["author"]
+        self.assertIsInstance(author, InputGitAuthor)
+        self.assertEqual(author._identity, {"name": "GIT_USER", "email": "GIT_EMAIL"})
+        self.repo_mock.get_git_ref.assert_called_once_with("heads/main")
+        self.repo_mock.get_git_ref.return_value.edit.assert_called_once_with("NEW_HASH", force=False)
+        self.repo_mock.create_git_ref.assert_not_called()
+
+    def test_commit_file_to_new_branch(self):
+        self.repo_mock.create_git_commit.return_value.sha = "NEW_HASH"
+
+        commit_hash = self.adapter.commit_file(
+            "BRANCH", "main", "PARENT_HASH", "a/values.yaml", "a: 1\n", "MESSAGE", "GIT_USER", "GIT_EMAIL"
+        )
+
+        self.assertEqual(commit_hash, "NEW_HASH")
+        self.repo_mock.create_git_ref.assert_called_once_with("refs/heads/BRANCH", "NEW_HASH")
+        self.repo_mock.get_git_ref.assert_not_called()
+
+    def test_get_branch_head_hash_error(self):
+        self.repo_mock.get_git_ref.side_effect = GithubException(500, "server error")
+
+        with pytest.raises(GitOpsException) as ex:
+            self.adapter.get_branch_head_hash("main")
+        self.assertEqual(str(ex.value), "Error getting branch 'main': HTTP 500")
+
+    def test_commit_file_rejected(self):
+        self.repo_mock.get_git_ref.return_value.edit.side_effect = GithubException(422, "Update is not a fast forward")
+
+        with pytest.raises(GitOpsException) as ex:
+            self.adapter.commit_file(
+                "main", "main", "PARENT_HASH", "a/values.yaml", "a: 1\n", "MESSAGE", "GIT_USER", "GIT_EMAIL"
+            )
+        self.assertEqual(str(ex.value), "Error committing file 'a/values.yaml': HTTP 422")
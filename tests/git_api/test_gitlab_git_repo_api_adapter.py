@@ -0,0 +1,173 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+import gitlab
+import pytest
+import requests
+
+from gitopscli.gitops_exception import GitOpsException
+from gitopscli.git_api.gitlab_git_repo_api_adapter import GitlabGitRepoApiAdapter
+
+
+class GitlabGitRepoApiAdapterTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("gitopscli.git_api.gitlab_git_repo_api_adapter.gitlab.Gitlab")
+        self.addCleanup(patcher.stop)
+        self.gitlab_constructor_mock = patcher.start()
+
+        self.project_mock = MagicMock()
+        self.project_mock.default_branch = "main"
+        self.project_mock.mergerequests.create.return_value.iid = 42
+        self.project_mock.mergerequests.create.return_value.web_url = "https://gitlab.com/ORG/REPO/-/merge_requests/42"
+        self.gitlab_constructor_mock.return_value.projects.get.return_value = self.project_mock
+
+    def create_adapter(self):
+        return GitlabGitRepoApiAdapter(
+            git_provider_url="https://gitlab.com",
+            username="USER",
+            password="PASS",
+            organisation="ORG",
+            repository_name="REPO",
+        )
+
+    def test_create_pull_request_to_default_branch(self):
+        adapter = self.create_adapter()
+
+        pr = adapter.create_pull_request_to_default_branch("BRANCH", "TITLE", "DESCRIPTION")
+
+        self.assertEqual(pr.pr_id, 42)
+        self.assertEqual(pr.url, "https://gitlab.com/ORG/REPO/-/merge_requests/42")
+        self.project_mock.mergerequests.create.assert_called_once_with(
+            {"source_branch": "BRANCH", "target_branch": "main", "title": "TITLE", "description": "DESCRIPTION"}
+        )
+        self.project_mock.branches.list.assert_not_called()
+
+    def test_default_branch_fallback_for_older_servers(self):
+        self.project_mock.default_branch = None
+        feature_branch = MagicMock(default=False)
+        default_branch = MagicMock(default=True)
+        default_branch.name = "master"
+        self.project_mock.branches.list.return_value = iter([feature_branch, default_branch])
+        adapter = self.create_adapter()
+
+        adapter.create_pull_request_to_default_branch("BRANCH_1", "TITLE", "DESCRIPTION")
+        adapter.create_pull_request_to_default_branch("BRANCH_2", "TITLE", "DESCRIPTION")
+
+        self.project_mock.branches.list.assert_called_once_with(as_list=False)
+        self.project_mock.mergerequests.create.assert_called_with(
+            {"source_branch": "BRANCH_2", "target_branch": "master", "title": "TITLE", "description": "DESCRIPTION"}
+        )
+
+    def test_invalidate_cache(self):
+        adapter = self.create_adapter()
+        adapter.create_pull_request_to_default_branch("BRANCH", "TITLE", "DESCRIPTION")
+        self.project_mock.refresh.assert_not_called()
+
+        self.project_mock.default_branch = "develop"
+        adapter.invalidate_cache()
+        adapter.create_pull_request_to_default_branch("BRANCH", "TITLE", "DESCRIPTION")
+        adapter.create_pull_request_to_default_branch("BRANCH", "TITLE", "DESCRIPTION")
+
+        self.project_mock.refresh.assert_called_once_with()
+
+        self.project_mock.mergerequests.create.assert_called_with(
+            {"source_branch": "BRANCH", "target_branch": "develop", "title": "TITLE", "description": "DESCRIPTION"}
+        )
+
+    def test_default_branch_does_not_exist(self):
+        self.project_mock.default_branch = None
+        self.project_mock.branches.list.return_value = iter([MagicMock(default=False)])
+        adapter = self.create_adapter()
+
+        with pytest.raises(GitOpsException) as ex:
+            adapter.create_pull_request_to_default_branch("BRANCH", "TITLE", "DESCRIPTION")
+        self.assertEqual(str(ex.value), "Default branch does not exist")
+
+    def test_get_file_content(self):
+        self.project_mock.files.raw.return_value = b"a: 1\n"
+        adapter = self.create_adapter()
+
+        self.assertEqual(adapter.get_file_content("a/values.yaml"), "a: 1\n")
+        self.project_mock.files.raw.assert_called_once_with(file_path="a/values.yaml", ref="main")
+
+    def test_get_file_content_not_found(self):
+        self.project_mock.files.raw.side_effect = gitlab.exceptions.GitlabGetError("404 File Not Found", 404)
+        adapter = self.create_adapter()
+
+        self.assertIsNone(adapter.get_file_content("a/values.yaml", ref="BRANCH"))
+
+    def test_get_file_content_http_error(self):
+        self.project_mock.files.raw.side_effect = gitlab.exceptions.GitlabHttpError("Bad Gateway", 502)
+        adapter = self.create_adapter()
+
+        with pytest.raises(GitOpsException) as ex:
+            adapter.get_file_content("a/values.yaml")
+        self.assertEqual(str(ex.value), "Error getting file 'a/values.yaml': 'Bad Gateway'")
+
+    def test_get_file_content_connection_error(self):
+        self.project_mock.files.raw.side_effect = requests.exceptions.ConnectionError("Connection refused")
+        adapter = self.create_adapter()
+
+        with pytest.raises(GitOpsException) as ex:
+            adapter.get_file_content("a/values.yaml")
+        self.assertEqual(str(ex.value), "Error getting file 'a/values.yaml': Connection refused")
+
+    def test_get_file_content_not_utf8(self):
+        self.project_mock.files.raw.return_value = b"\xff\xfe"
+        adapter = self.create_adapter()
+
+        with pytest.raises(GitOpsException) as ex:
+            adapter.get_file_content("a/values.yaml")
+        self.assertEqual(str(ex.value), "File 'a/values.yaml' is not UTF-8 encoded.")
+
+    def test_commit_file(self):
+        self.project_mock.files.get.return_value.last_commit_id = "FILE_COMMIT_ID"
+        self.project_mock.commits.create.return_value.id = "NEW_HASH"
+        adapter = self.create_adapter()
+
+        commit_hash = adapter.commit_file(
+            "main", "main", "PARENT_HASH", "a/values.yaml", "a: 1\n", "MESSAGE", "GIT_USER", "GIT_EMAIL"
+        )
+
+        self.assertEqual(commit_hash, "NEW_HASH")
+        self.project_mock.files.get.assert_called_once_with(file_path="a/values.yaml", ref="PARENT_HASH")
+        self.project_mock.commits.create.assert_called_once_with(
+            {
+                "branch": "main",
+                "commit_message": "MESSAGE",
+                "author_name": "GIT_USER",
+                "author_email": "GIT_EMAIL",
+                "actions": [
+                    {
+                        "action": "update",
+                        "file_path": "a/values.yaml",
+                        "content": "a: 1\n",
+                        "last_commit_id": "FILE_COMMIT_ID",
+                    }
+                ],
+            }
+        )
+
+    def test_commit_file_to_new_branch(self):
+        self.project_mock.files.get.return_value.last_commit_id = "FILE_COMMIT_ID"
+        adapter = self.create_adapter()
+
+        adapter.commit_file(
+            "BRANCH", "main", "PARENT_HASH", "a/values.yaml", "a: 1\n", "MESSAGE", "GIT_USER", "GIT_EMAIL"
+        )
+
+        data = self.project_mock.commits.create.call_args.args[0]
+        self.assertEqual(data["branch"], "BRANCH")
+        self.assertEqual(data["start_sha"], "PARENT_HASH")
+
+    def test_commit_file_rejected(self):
+        self.project_mock.commits.create.side_effect = gitlab.exceptions.GitlabCreateError(
+            "A file with this name doesn't exist", 400
+        )
+        adapter = self.create_adapter()
+
+        with pytest.raises(GitOpsException) as ex:
+            adapter.commit_file(
+                "main", "main", "PARENT_HASH", "a/values.yaml", "a: 1\n", "MESSAGE", "GIT_USER", "GIT_EMAIL"
+            )
+        self.assertEqual(str(ex.value), "Error committing file 'a/values.yaml': 'A file with this name doesn't exist'")
@@ -7,7 +7,7 @@ from gitopscli.git_api import GitRepoApiFactory, GitApiConfig, GitProvider
 
 class GitRepoApiFactoryTest(unittest.TestCase):
     @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiLoggingProxy")
-    @patch("gitopscli.git_api.git_repo_api_factory.GithubGitRepoApiAdapter")
+    @patch("gitopscli.git_api.github_git_repo_api_adapter.GithubGitRepoApiAdapter")
     def test_create_github(self, mock_github_adapter_constructor, mock_logging_proxy_constructor):
         mock_github_adapter = MagicMock()
         mock_github_adapter_constructor.return_value = mock_github_adapter
@@ -31,7 +31,7 @@ class GitRepoApiFactoryTest(unittest.TestCase):
         mock_logging_proxy_constructor.assert_called_with(mock_github_adapter)
 
     @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiLoggingProxy")
-    @patch("gitopscli.git_api.git_repo_api_factory.BitbucketGitRepoApiAdapter")
+    @patch("gitopscli.git_api.bitbucket_git_repo_api_adapter.BitbucketGitRepoApiAdapter")
     def test_create_bitbucket(self, mock_bitbucket_adapter_constructor, mock_logging_proxy_constructor):
         mock_bitbucket_adapter = MagicMock()
         mock_bitbucket_adapter_constructor.return_value = mock_bitbucket_adapter
@@ -72,7 +72,7 @@ class GitRepoApiFactoryTest(unittest.TestCase):
             self.assertEqual("Please provide url for Bitbucket!", str(ex))
 
     @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiLoggingProxy")
-    @patch("gitopscli.git_api.git_repo_api_factory.GitlabGitRepoApiAdapter")
+    @patch("gitopscli.git_api.gitlab_git_repo_api_adapter.GitlabGitRepoApiAdapter")
     def test_create_gitlab(self, mock_gitlab_adapter_constructor, mock_logging_proxy_constructor):
         mock_gitlab_adapter = MagicMock()
         mock_gitlab_adapter_constructor.return_value = mock_gitlab_adapter
@@ -100,7 +100,7 @@ class GitRepoApiFactoryTest(unittest.TestCase):
         mock_logging_proxy_constructor.assert_called_with(mock_gitlab_adapter)
 
     @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiLoggingProxy")
-    @patch("gitopscli.git_api.git_repo_api_factory.GitlabGitRepoApiAdapter")
+    @patch("gitopscli.git_api.gitlab_git_repo_api_adapter.GitlabGitRepoApiAdapter")
     def test_create_gitlab_default_provider_url(self, mock_gitlab_adapter_constructor, mock_logging_proxy_constructor):
         mock_gitlab_adapter = MagicMock()
         mock_gitlab_adapter_constructor.return_value = mock_gitlab_adapter
@@ -0,0 +1,34 @@
+import os
+import shutil
+import unittest
+import uuid
+
+from gitopscli.io_api.file_lock import FileLock
+
+
+class FileLockTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = f"/tmp/gitopscli-test-{uuid.uuid4()}"
+        os.makedirs(self.tmp_dir)
+        self.lock_file_path = f"{self.tmp_dir}/test.lock"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_lock_is_exclusive(self):
+        with FileLock(self.lock_file_path) as locked:
+            self.assertTrue(locked)
+            self.assertTrue(os.path.isfile(self.lock_file_path))
+            with FileLock(self.lock_file_path, blocking=False) as locked_again:
+                self.assertFalse(locked_again)
+
+        with FileLock(self.lock_file_path, blocking=False) as locked:
+            self.assertTrue(locked)
+
+    def test_lock_is_released_on_exception(self):
+        with self.assertRaises(ValueError):
+            with FileLock(self.lock_file_path):
+                raise ValueError()
+
+        with FileLock(self.lock_file_path, blocking=False) as locked:
+            self.assertTrue(locked)
@@ -0,0 +1,41 @@
+import errno
+import os
+import shutil
+import unittest
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from gitopscli.io_api.reflink import reflink_tree
+
+
+class ReflinkTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = f"/tmp/gitopscli-test-{uuid.uuid4()}"
+        os.makedirs(f"{self.tmp_dir}/src/sub")
+        with open(f"{self.tmp_dir}/src/sub/values.yaml", "w") as stream:
+            stream.write("foo: bar")
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+
+    def test_reflink_tree(self):
+        # result depends on the file system of /tmp
+        if reflink_tree(f"{self.tmp_dir}/src", f"{self.tmp_dir}/dst"):
+            with open(f"{self.tmp_dir}/dst/sub/values.yaml", "r") as stream:
+                self.assertEqual("foo: bar", stream.read())
+        else:
+            self.assertFalse(os.path.exists(f"{self.tmp_dir}/dst"))
+
+    @patch("gitopscli.io_api.reflink.fcntl")
+    def test_reflink_tree_not_supported(self, fcntl_mock):
+        fcntl_mock.ioctl.side_effect = OSError(errno.EOPNOTSUPP, "Operation not supported")
+
+        self.assertFalse(reflink_tree(f"{self.tmp_dir}/src", f"{self.tmp_dir}/dst"))
+        self.assertFalse(os.path.exists(f"{self.tmp_dir}/dst"))
+
+    @patch("gitopscli.io_api.reflink.fcntl")
+    def test_reflink_tree_error(self, fcntl_mock):
+        fcntl_mock.ioctl.side_effect = OSError(errno.ENOSPC, "No space left on device")
+
+        with pytest.raises(shutil.Error):
+            reflink_tree(f"{self.tmp_dir}/src", f"{self.tmp_dir}/dst")
@@ -2,16 +2,23 @@ import os
 import shutil
 import unittest
 import uuid
+from unittest.mock import patch
 import pytest
 
 from gitopscli.io_api.yaml_util import (
     yaml_file_load,
+    yaml_file_load_safe,
+    yaml_files_load_safe,
     yaml_file_dump,
     yaml_load,
     yaml_dump,
     YAMLException,
     update_yaml_file,
+    update_yaml_file_values,
+    update_yaml_value,
     merge_yaml_element,
+    get_jsonpath_cache_info,
+    clear_jsonpath_cache,
 )
 
 
@@ -59,6 +66,47 @@ class YamlUtilTest(unittest.TestCase):
         except YAMLException as ex:
             self.assertEqual(f"Error parsing YAML file: {path}", str(ex))
 
+    def test_yaml_file_load_safe(self):
+        path = self._create_file("answer: #comment\n  is: '42'\n")
+        content = yaml_file_load_safe(path)
+        self.assertEqual(content, {"answer": {"is": "42"}})
+        self.assertIs(type(content), dict)
+
+    def test_yaml_file_load_safe_yaml_exception(self):
+        path = self._create_file("{ INVALID YAML")
+        with pytest.raises(YAMLException) as ex:
+            yaml_file_load_safe(path)
+        self.assertEqual(f"Error parsing YAML file: {path}", str(ex.value))
+
+    def test_yaml_files_load_safe(self):
+        paths = [self._create_file(f"answer: {i}\n") for i in range(3)]
+        self.assertEqual(list(yaml_files_load_safe(paths)), [{"answer": 0}, {"answer": 1}, {"answer": 2}])
+
+    @patch("gitopscli.io_api.yaml_util.os.cpu_count", return_value=2)
+    @patch("gitopscli.io_api.yaml_util.PARALLEL_LOAD_MIN_FILES", 1)
+    def test_yaml_files_load_safe_in_parallel(self, _):
+        invalid_path = self._create_file("{ INVALID YAML")
+        paths = [self._create_file(f"answer: {i}\n") for i in range(3)] + [invalid_path, "unknown"]
+
+        contents = yaml_files_load_safe(paths)
+
+        self.assertEqual([next(contents) for _ in range(3)], [{"answer": 0}, {"answer": 1}, {"answer": 2}])
+        with pytest.raises(YAMLException) as ex:
+            next(contents)
+        self.assertEqual(f"Error parsing YAML file: {invalid_path}", str(ex.value))
+
+    @patch("gitopscli.io_api.yaml_util.os.cpu_count", return_value=2)
+    @patch("gitopscli.io_api.yaml_util.PARALLEL_LOAD_MIN_FILES", 1)
+    def test_yaml_files_load_safe_in_parallel_raises_error_at_its_entry(self, _):
+        paths = [self._create_file(f"answer: {i}\n") for i in range(20)]  # loaded in chunks of 2 files
+        paths[5] = "unknown"
+
+        contents = yaml_files_load_safe(paths)
+
+        self.assertEqual([next(contents) for _ in range(5)], [{"answer": i} for i in range(5)])
+        with pytest.raises(FileNotFoundError):
+            next(contents)
+
     def test_yaml_file_dump(self):
         path = self._create_tmp_file_path()
         yaml_file_dump({"answer": {"is": "42"}}, path)
@@ -229,6 +277,96 @@ a: # comment 1
         except IsADirectoryError:
             pass
 
+    def test_update_yaml_file_values(self):
+        test_file = self._create_file(
+            """\
+a: # comment 1
+  b: 1 # comment 2
+  c: 2 # comment 3
+  d: 3 # comment 4
+"""
+        )
+        mtime_before = os.stat(test_file).st_mtime_ns
+
+        self.assertEqual([], update_yaml_file_values(test_file, [("a.b", 1), ("a.c", 2)]))
+        self.assertEqual(mtime_before, os.stat(test_file).st_mtime_ns)  # file not written
+
+        self.assertEqual(["a.b", "a.d"], update_yaml_file_values(test_file, [("a.b", 42), ("a.c", 2), ("a.d", "x")]))
+
+        expected = """\
+a: # comment 1
+  b: 42 # comment 2
+  c: 2 # comment 3
+  d: x # comment 4
+"""
+        self.assertEqual(expected, self._read_file(test_file))
+
+    def test_update_yaml_file_values_is_atomic(self):
+        content = "a:\n  b: 1\n"
+        test_file = self._create_file(content)
+
+        with pytest.raises(KeyError) as ex:
+            update_yaml_file_values(test_file, [("a.b", 2), ("a.x", "foo")])
+        self.assertEqual("\"Key 'a.x' not found in YAML!\"", str(ex.value))
+
+        with pytest.raises(KeyError) as ex:
+            update_yaml_file_values(test_file, [("a.b", 2), ("", "foo")])
+        self.assertEqual("'Empty key!'", str(ex.value))
+
+        self.assertEqual(content, self._read_file(test_file))
+
+    def test_update_yaml_file_values_with_callback(self):
+        test_file = self._create_file("a:\n  b: 1\n  c: 2\n  d: 3\n")
+        file_contents = []
+
+        def on_value_updated(key, value):
+            file_contents.append((key, value, self._read_file(test_file)))
+
+        self.assertEqual(
+            ["a.b", "a.d"], update_yaml_file_values(test_file, [("a.b", 42), ("a.c", 2), ("a.d", 43)], on_value_updated)
+        )
+        self.assertEqual(
+            file_contents,
+            [("a.b", 42, "a:\n  b: 42\n  c: 2\n  d: 3\n"), ("a.d", 43, "a:\n  b: 42\n  c: 2\n  d: 43\n")],
+        )
+
+    def test_update_yaml_value(self):
+        yaml = yaml_load("a:\n  b: 1\n")
+
+        self.assertTrue(update_yaml_value(yaml, "a.b", 2))
+        self.assertFalse(update_yaml_value(yaml, "a.b", 2))  # already updated
+        self.assertEqual({"a": {"b": 2}}, yaml)
+
+        with pytest.raises(KeyError) as ex:
+            update_yaml_value(yaml, "a.x", "foo")
+        self.assertEqual("\"Key 'a.x' not found in YAML!\"", str(ex.value))
+
+    def test_update_yaml_value_with_plain_and_complex_keys(self):
+        yaml = yaml_load("a:\n  b-c: 1\n  list:\n    - x: 1\n    - x: 2\n")
+
+        self.assertTrue(update_yaml_value(yaml, "a.b-c", 2))
+        self.assertTrue(update_yaml_value(yaml, "a.list[1].x", 3))
+        self.assertTrue(update_yaml_value(yaml, "a.list[?x=1].x", 4))
+        self.assertEqual({"a": {"b-c": 2, "list": [{"x": 4}, {"x": 3}]}}, yaml)
+
+        with pytest.raises(KeyError) as ex:
+            update_yaml_value(yaml, "a.where", "foo")
+        self.assertRegex(str(ex.value), r"^\"Key 'a.where' is invalid JSONPath expression: .*!\"$")
+
+    def test_jsonpath_cache(self):
+        clear_jsonpath_cache()
+        yaml = yaml_load("a:\n  b: 1\n")
+
+        update_yaml_value(yaml, "a.b", 2)
+        self.assertEqual((0, 1, 1), get_jsonpath_cache_info())
+
+        update_yaml_value(yaml, "a.b", 3)
+        update_yaml_value(yaml, "a.b", 4)
+        self.assertEqual((2, 1, 1), get_jsonpath_cache_info())
+
+        clear_jsonpath_cache()
+        self.assertEqual((0, 0, 0), get_jsonpath_cache_info())
+
     def test_merge_yaml_element(self):
         test_file = self._create_file(
             """\
@@ -236,18 +374,18 @@ a: # comment 1
 applications:
   app1: # Lost comment
   app2:
-    key: value # Lost comment
+    key: value # Kept comment
 """
         )
 
         value = {"app2": {"key2": "value"}, "app3": None}
-        merge_yaml_element(test_file, "applications", value)
+        self.assertTrue(merge_yaml_element(test_file, "applications", value))
 
         expected = """\
 # Kept comment
 applications:
   app2:
-    key: value
+    key: value # Kept comment
     key2: value
   app3:
 """
@@ -279,21 +417,57 @@ applications:
         test_file = self._create_file(
             """\
 applications:
-  app1: # Lost comment
-  app2: # Lost comment
+  app1: # Kept comment
+  app2: # Kept comment
     key: value # Lost comment
 """
         )
 
         value = {"applications": {"app2": {"key2": "value"}, "app3": None}}
-        merge_yaml_element(test_file, ".", value)
+        self.assertTrue(merge_yaml_element(test_file, ".", value))
 
         expected = """\
 applications:
-  app1:
-  app2:
+  app1: # Kept comment
+  app2: # Kept comment
     key2: value
   app3:
+"""
+        actual = self._read_file(test_file)
+        self.assertEqual(expected, actual)
+
+    def test_merge_yaml_element_unchanged(self):
+        content = """\
+applications:
+  app1:    # not written back, the formatting would be normalized otherwise
+  app2: {}
+  app3:
+    key:   value
+"""
+        test_file = self._create_file(content)
+
+        value = {"app1": {}, "app2": {}, "app3": {"key": "value"}}
+        self.assertFalse(merge_yaml_element(test_file, "applications", value))
+
+        self.assertEqual(content, self._read_file(test_file))
+
+    def test_merge_yaml_element_keeps_order_of_existing_entries(self):
+        test_file = self._create_file(
+            """\
+applications:
+  app3: # Kept comment
+  app1:
+  app2:
+"""
+        )
+
+        self.assertTrue(merge_yaml_element(test_file, "applications", {"app1": {}, "app3": {}, "app4": {}}))
+
+        expected = """\
+applications:
+  app3: # Kept comment
+  app1:
+  app4: {}
 """
         actual = self._read_file(test_file)
         self.assertEqual(expected, actual)
@@ -7,7 +7,9 @@ import pytest
 
 from gitopscli.commands import (
     DeployCommand,
+    DeployBatchCommand,
     SyncAppsCommand,
+    SyncAppsBatchCommand,
     AddPrCommentCommand,
     CreatePreviewCommand,
     CreatePrPreviewCommand,
@@ -20,7 +22,7 @@ from gitopscli.git_api import GitProvider
 
 EXPECTED_GITOPSCLI_HELP = """\
 usage: gitopscli [-h]
-                 {deploy,sync-apps,add-pr-comment,create-preview,create-pr-preview,delete-preview,delete-pr-preview,version}
+                 {deploy,deploy-batch,sync-apps,sync-apps-batch,add-pr-comment,create-preview,create-pr-preview,delete-preview,delete-pr-preview,version}
                  ...
 
 GitOps CLI
@@ -29,10 +31,14 @@ options:
   -h, --help            show this help message and exit
 
 commands:
-  {deploy,sync-apps,add-pr-comment,create-preview,create-pr-preview,delete-preview,delete-pr-preview,version}
+  {deploy,deploy-batch,sync-apps,sync-apps-batch,add-pr-comment,create-preview,create-pr-preview,delete-preview,delete-pr-preview,version}
     deploy              Trigger a new deployment by changing YAML values
+    deploy-batch        Trigger deployments in multiple repositories
+                        concurrently
     sync-apps           Synchronize applications (= every directory) from apps
                         config repository to apps root config
+    sync-apps-batch     Synchronize applications of multiple apps config
+                        repositories to apps root config at once
     add-pr-comment      Create a comment on the pull request
     create-preview      Create a preview environment
     create-pr-preview   Create a preview environment
@@ -47,7 +53,7 @@ usage: gitopscli add-pr-comment [-h] --username USERNAME --password PASSWORD
                                 REPOSITORY_NAME [--git-provider GIT_PROVIDER]
                                 [--git-provider-url GIT_PROVIDER_URL] --pr-id
                                 PR_ID [--parent-id PARENT_ID] [-v [VERBOSE]]
-                                --text TEXT
+                                [--timings TIMINGS] --text TEXT
 gitopscli add-pr-comment: error: the following arguments are required: --username, --password, --organisation, --repository-name, --pr-id, --text
 """
 
@@ -57,7 +63,7 @@ usage: gitopscli add-pr-comment [-h] --username USERNAME --password PASSWORD
                                 REPOSITORY_NAME [--git-provider GIT_PROVIDER]
                                 [--git-provider-url GIT_PROVIDER_URL] --pr-id
                                 PR_ID [--parent-id PARENT_ID] [-v [VERBOSE]]
-                                --text TEXT
+                                [--timings TIMINGS] --text TEXT
 
 options:
   -h, --help            show this help message and exit
@@ -79,6 +85,9 @@ options:
                         the id of the parent comment, in case of a reply
   -v [VERBOSE], --verbose [VERBOSE]
                         Verbose exception logging
+  --timings TIMINGS     Write a JSON report with the duration of each phase to
+                        this file (alternative: GITOPSCLI_TIMINGS env
+                        variable)
   --text TEXT           the text of the comment
 """
 
@@ -88,8 +97,16 @@ usage: gitopscli create-preview [-h] --username USERNAME --password PASSWORD
                                 --organisation ORGANISATION --repository-name
                                 REPOSITORY_NAME [--git-provider GIT_PROVIDER]
                                 [--git-provider-url GIT_PROVIDER_URL]
-                                --git-hash GIT_HASH --preview-id PREVIEW_ID
-                                [-v [VERBOSE]]
+                                [--clone-depth CLONE_DEPTH]
+                                [--clone-single-branch [CLONE_SINGLE_BRANCH]]
+                                [--clone-filter CLONE_FILTER]
+                                [--clone-sparse [CLONE_SPARSE]]
+                                [--clone-cache-dir CLONE_CACHE_DIR]
+                                [--clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB]
+                                [--clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS]
+                                [--push-retries PUSH_RETRIES] --git-hash
+                                GIT_HASH --preview-id PREVIEW_ID
+                                [-v [VERBOSE]] [--timings TIMINGS]
 gitopscli create-preview: error: the following arguments are required: --username, --password, --organisation, --repository-name, --git-hash, --preview-id
 """
 EXPECTED_CREATE_PR_PREVIEW_NO_ARGS_ERROR = """\
@@ -100,8 +117,16 @@ usage: gitopscli create-pr-preview [-h] --username USERNAME --password
                                    REPOSITORY_NAME
                                    [--git-provider GIT_PROVIDER]
                                    [--git-provider-url GIT_PROVIDER_URL]
-                                   --pr-id PR_ID [--parent-id PARENT_ID]
-                                   [-v [VERBOSE]]
+                                   [--clone-depth CLONE_DEPTH]
+                                   [--clone-single-branch [CLONE_SINGLE_BRANCH]]
+                                   [--clone-filter CLONE_FILTER]
+                                   [--clone-sparse [CLONE_SPARSE]]
+                                   [--clone-cache-dir CLONE_CACHE_DIR]
+                                   [--clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB]
+                                   [--clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS]
+                                   [--push-retries PUSH_RETRIES] --pr-id PR_ID
+                                   [--parent-id PARENT_ID] [-v [VERBOSE]]
+                                   [--timings TIMINGS]
 gitopscli create-pr-preview: error: the following arguments are required: --username, --password, --organisation, --repository-name, --pr-id
 """
 
@@ -111,8 +136,16 @@ usage: gitopscli create-preview [-h] --username USERNAME --password PASSWORD
                                 --organisation ORGANISATION --repository-name
                                 REPOSITORY_NAME [--git-provider GIT_PROVIDER]
                                 [--git-provider-url GIT_PROVIDER_URL]
-                                --git-hash GIT_HASH --preview-id PREVIEW_ID
-                                [-v [VERBOSE]]
+                                [--clone-depth CLONE_DEPTH]
+                                [--clone-single-branch [CLONE_SINGLE_BRANCH]]
+                                [--clone-filter CLONE_FILTER]
+                                [--clone-sparse [CLONE_SPARSE]]
+                                [--clone-cache-dir CLONE_CACHE_DIR]
+                                [--clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB]
+                                [--clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS]
+                                [--push-retries PUSH_RETRIES] --git-hash
+                                GIT_HASH --preview-id PREVIEW_ID
+                                [-v [VERBOSE]] [--timings TIMINGS]
 
 options:
   -h, --help            show this help message and exit
@@ -132,11 +165,38 @@ options:
   --git-provider-url GIT_PROVIDER_URL
                         Git provider base API URL (e.g.
                         https://bitbucket.example.tld)
+  --clone-depth CLONE_DEPTH
+                        Create shallow clones with a history truncated to the
+                        specified number of commits
+  --clone-single-branch [CLONE_SINGLE_BRANCH]
+                        Clone only the history of the checked out branch
+  --clone-filter CLONE_FILTER
+                        Partial clone filter (e.g. blob:none, requires server
+                        support)
+  --clone-sparse [CLONE_SPARSE]
+                        Only check out the directories a command needs (sparse
+                        checkout, requires git 2.35 or newer)
+  --clone-cache-dir CLONE_CACHE_DIR
+                        Directory for a persistent mirror cache of cloned
+                        repositories (alternative: GITOPSCLI_CLONE_CACHE_DIR
+                        env variable)
+  --clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB
+                        Evict least recently used mirrors when the cache
+                        exceeds this size (default: 2048)
+  --clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS
+                        Evict mirrors which have not been used for this number
+                        of days (default: 7)
+  --push-retries PUSH_RETRIES
+                        Rebase and retry a push which was rejected because the
+                        remote branch has changed (default: 3)
   --git-hash GIT_HASH   the git hash which should be deployed
   --preview-id PREVIEW_ID
                         The user-defined preview ID
   -v [VERBOSE], --verbose [VERBOSE]
                         Verbose exception logging
+  --timings TIMINGS     Write a JSON report with the duration of each phase to
+                        this file (alternative: GITOPSCLI_TIMINGS env
+                        variable)
 """
 
 EXPECTED_CREATE_PR_PREVIEW_HELP = """\
@@ -147,8 +207,16 @@ usage: gitopscli create-pr-preview [-h] --username USERNAME --password
                                    REPOSITORY_NAME
                                    [--git-provider GIT_PROVIDER]
                                    [--git-provider-url GIT_PROVIDER_URL]
-                                   --pr-id PR_ID [--parent-id PARENT_ID]
-                                   [-v [VERBOSE]]
+                                   [--clone-depth CLONE_DEPTH]
+                                   [--clone-single-branch [CLONE_SINGLE_BRANCH]]
+                                   [--clone-filter CLONE_FILTER]
+                                   [--clone-sparse [CLONE_SPARSE]]
+                                   [--clone-cache-dir CLONE_CACHE_DIR]
+                                   [--clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB]
+                                   [--clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS]
+                                   [--push-retries PUSH_RETRIES] --pr-id PR_ID
+                                   [--parent-id PARENT_ID] [-v [VERBOSE]]
+                                   [--timings TIMINGS]
 
 options:
   -h, --help            show this help message and exit
@@ -168,11 +236,38 @@ options:
   --git-provider-url GIT_PROVIDER_URL
                         Git provider base API URL (e.g.
                         https://bitbucket.example.tld)
+  --clone-depth CLONE_DEPTH
+                        Create shallow clones with a history truncated to the
+                        specified number of commits
+  --clone-single-branch [CLONE_SINGLE_BRANCH]
+                        Clone only the history of the checked out branch
+  --clone-filter CLONE_FILTER
+                        Partial clone filter (e.g. blob:none, requires server
+                        support)
+  --clone-sparse [CLONE_SPARSE]
+                        Only check out the directories a command needs (sparse
+                        checkout, requires git 2.35 or newer)
+  --clone-cache-dir CLONE_CACHE_DIR
+                        Directory for a persistent mirror cache of cloned
+                        repositories (alternative: GITOPSCLI_CLONE_CACHE_DIR
+                        env variable)
+  --clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB
+                        Evict least recently used mirrors when the cache
+                        exceeds this size (default: 2048)
+  --clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS
+                        Evict mirrors which have not been used for this number
+                        of days (default: 7)
+  --push-retries PUSH_RETRIES
+                        Rebase and retry a push which was rejected because the
+                        remote branch has changed (default: 3)
   --pr-id PR_ID         the id of the pull request
   --parent-id PARENT_ID
                         the id of the parent comment, in case of a reply
   -v [VERBOSE], --verbose [VERBOSE]
                         Verbose exception logging
+  --timings TIMINGS     Write a JSON report with the duration of each phase to
+                        this file (alternative: GITOPSCLI_TIMINGS env
+                        variable)
 """
 
 EXPECTED_DELETE_PREVIEW_NO_ARGS_ERROR = """\
@@ -181,9 +276,17 @@ usage: gitopscli delete-preview [-h] --username USERNAME --password PASSWORD
                                 --organisation ORGANISATION --repository-name
                                 REPOSITORY_NAME [--git-provider GIT_PROVIDER]
                                 [--git-provider-url GIT_PROVIDER_URL]
-                                --preview-id PREVIEW_ID
+                                [--clone-depth CLONE_DEPTH]
+                                [--clone-single-branch [CLONE_SINGLE_BRANCH]]
+                                [--clone-filter CLONE_FILTER]
+                                [--clone-sparse [CLONE_SPARSE]]
+                                [--clone-cache-dir CLONE_CACHE_DIR]
+                                [--clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB]
+                                [--clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS]
+                                [--push-retries PUSH_RETRIES] --preview-id
+                                PREVIEW_ID
                                 [--expect-preview-exists [EXPECT_PREVIEW_EXISTS]]
-                                [-v [VERBOSE]]
+                                [-v [VERBOSE]] [--timings TIMINGS]
 gitopscli delete-preview: error: the following arguments are required: --username, --password, --organisation, --repository-name, --preview-id
 """
 
@@ -195,9 +298,17 @@ usage: gitopscli delete-pr-preview [-h] --username USERNAME --password
                                    REPOSITORY_NAME
                                    [--git-provider GIT_PROVIDER]
                                    [--git-provider-url GIT_PROVIDER_URL]
-                                   --branch BRANCH
+                                   [--clone-depth CLONE_DEPTH]
+                                   [--clone-single-branch [CLONE_SINGLE_BRANCH]]
+                                   [--clone-filter CLONE_FILTER]
+                                   [--clone-sparse [CLONE_SPARSE]]
+                                   [--clone-cache-dir CLONE_CACHE_DIR]
+                                   [--clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB]
+                                   [--clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS]
+                                   [--push-retries PUSH_RETRIES] --branch
+                                   BRANCH
                                    [--expect-preview-exists [EXPECT_PREVIEW_EXISTS]]
-                                   [-v [VERBOSE]]
+                                   [-v [VERBOSE]] [--timings TIMINGS]
 gitopscli delete-pr-preview: error: the following arguments are required: --username, --password, --organisation, --repository-name, --branch
 """
 
@@ -207,9 +318,17 @@ usage: gitopscli delete-preview [-h] --username USERNAME --password PASSWORD
                                 --organisation ORGANISATION --repository-name
                                 REPOSITORY_NAME [--git-provider GIT_PROVIDER]
                                 [--git-provider-url GIT_PROVIDER_URL]
-                                --preview-id PREVIEW_ID
+                                [--clone-depth CLONE_DEPTH]
+                                [--clone-single-branch [CLONE_SINGLE_BRANCH]]
+                                [--clone-filter CLONE_FILTER]
+                                [--clone-sparse [CLONE_SPARSE]]
+                                [--clone-cache-dir CLONE_CACHE_DIR]
+                                [--clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB]
+                                [--clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS]
+                                [--push-retries PUSH_RETRIES] --preview-id
+                                PREVIEW_ID
                                 [--expect-preview-exists [EXPECT_PREVIEW_EXISTS]]
-                                [-v [VERBOSE]]
+                                [-v [VERBOSE]] [--timings TIMINGS]
 
 options:
   -h, --help            show this help message and exit
@@ -229,12 +348,39 @@ options:
   --git-provider-url GIT_PROVIDER_URL
                         Git provider base API URL (e.g.
                         https://bitbucket.example.tld)
+  --clone-depth CLONE_DEPTH
+                        Create shallow clones with a history truncated to the
+                        specified number of commits
+  --clone-single-branch [CLONE_SINGLE_BRANCH]
+                        Clone only the history of the checked out branch
+  --clone-filter CLONE_FILTER
+                        Partial clone filter (e.g. blob:none, requires server
+                        support)
+  --clone-sparse [CLONE_SPARSE]
+                        Only check out the directories a command needs (sparse
+                        checkout, requires git 2.35 or newer)
+  --clone-cache-dir CLONE_CACHE_DIR
+                        Directory for a persistent mirror cache of cloned
+                        repositories (alternative: GITOPSCLI_CLONE_CACHE_DIR
+                        env variable)
+  --clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB
+                        Evict least recently used mirrors when the cache
+                        exceeds this size (default: 2048)
+  --clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS
+                        Evict mirrors which have not been used for this number
+                        of days (default: 7)
+  --push-retries PUSH_RETRIES
+                        Rebase and retry a push which was rejected because the
+                        remote branch has changed (default: 3)
   --preview-id PREVIEW_ID
                         The user-defined preview ID
   --expect-preview-exists [EXPECT_PREVIEW_EXISTS]
                         Fail if preview does not exist
   -v [VERBOSE], --verbose [VERBOSE]
                         Verbose exception logging
+  --timings TIMINGS     Write a JSON report with the duration of each phase to
+                        this file (alternative: GITOPSCLI_TIMINGS env
+                        variable)
 """
 
 EXPECTED_DELETE_PR_PREVIEW_HELP = """\
@@ -245,9 +391,17 @@ usage: gitopscli delete-pr-preview [-h] --username USERNAME --password
                                    REPOSITORY_NAME
                                    [--git-provider GIT_PROVIDER]
                                    [--git-provider-url GIT_PROVIDER_URL]
-                                   --branch BRANCH
+                                   [--clone-depth CLONE_DEPTH]
+                                   [--clone-single-branch [CLONE_SINGLE_BRANCH]]
+                                   [--clone-filter CLONE_FILTER]
+                                   [--clone-sparse [CLONE_SPARSE]]
+                                   [--clone-cache-dir CLONE_CACHE_DIR]
+                                   [--clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB]
+                                   [--clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS]
+                                   [--push-retries PUSH_RETRIES] --branch
+                                   BRANCH
                                    [--expect-preview-exists [EXPECT_PREVIEW_EXISTS]]
-                                   [-v [VERBOSE]]
+                                   [-v [VERBOSE]] [--timings TIMINGS]
 
 options:
   -h, --help            show this help message and exit
@@ -267,11 +421,38 @@ options:
   --git-provider-url GIT_PROVIDER_URL
                         Git provider base API URL (e.g.
                         https://bitbucket.example.tld)
+  --clone-depth CLONE_DEPTH
+                        Create shallow clones with a history truncated to the
+                        specified number of commits
+  --clone-single-branch [CLONE_SINGLE_BRANCH]
+                        Clone only the history of the checked out branch
+  --clone-filter CLONE_FILTER
+                        Partial clone filter (e.g. blob:none, requires server
+                        support)
+  --clone-sparse [CLONE_SPARSE]
+                        Only check out the directories a command needs (sparse
+                        checkout, requires git 2.35 or newer)
+  --clone-cache-dir CLONE_CACHE_DIR
+                        Directory for a persistent mirror cache of cloned
+                        repositories (alternative: GITOPSCLI_CLONE_CACHE_DIR
+                        env variable)
+  --clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB
+                        Evict least recently used mirrors when the cache
+                        exceeds this size (default: 2048)
+  --clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS
+                        Evict mirrors which have not been used for this number
+                        of days (default: 7)
+  --push-retries PUSH_RETRIES
+                        Rebase and retry a push which was rejected because the
+                        remote branch has changed (default: 3)
   --branch BRANCH       The branch for which the preview was created for
   --expect-preview-exists [EXPECT_PREVIEW_EXISTS]
                         Fail if preview does not exist
   -v [VERBOSE], --verbose [VERBOSE]
                         Verbose exception logging
+  --timings TIMINGS     Write a JSON report with the duration of each phase to
+                        this file (alternative: GITOPSCLI_TIMINGS env
+                        variable)
 """
 
 EXPECTED_DEPLOY_NO_ARGS_ERROR = """\
@@ -283,9 +464,18 @@ usage: gitopscli deploy [-h] --file FILE --values VALUES
                         --repository-name REPOSITORY_NAME
                         [--git-provider GIT_PROVIDER]
                         [--git-provider-url GIT_PROVIDER_URL]
+                        [--clone-depth CLONE_DEPTH]
+                        [--clone-single-branch [CLONE_SINGLE_BRANCH]]
+                        [--clone-filter CLONE_FILTER]
+                        [--clone-sparse [CLONE_SPARSE]]
+                        [--clone-cache-dir CLONE_CACHE_DIR]
+                        [--clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB]
+                        [--clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS]
+                        [--push-retries PUSH_RETRIES]
                         [--create-pr [CREATE_PR]] [--auto-merge [AUTO_MERGE]]
-                        [--merge-method MERGE_METHOD] [--json [JSON]]
-                        [-v [VERBOSE]]
+                        [--merge-method MERGE_METHOD]
+                        [--api-commit [API_COMMIT]] [--spool-dir SPOOL_DIR]
+                        [--json [JSON]] [-v [VERBOSE]] [--timings TIMINGS]
 gitopscli deploy: error: the following arguments are required: --file, --values, --username, --password, --organisation, --repository-name
 """
 
@@ -298,9 +488,18 @@ usage: gitopscli deploy [-h] --file FILE --values VALUES
                         --repository-name REPOSITORY_NAME
                         [--git-provider GIT_PROVIDER]
                         [--git-provider-url GIT_PROVIDER_URL]
+                        [--clone-depth CLONE_DEPTH]
+                        [--clone-single-branch [CLONE_SINGLE_BRANCH]]
+                        [--clone-filter CLONE_FILTER]
+                        [--clone-sparse [CLONE_SPARSE]]
+                        [--clone-cache-dir CLONE_CACHE_DIR]
+                        [--clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB]
+                        [--clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS]
+                        [--push-retries PUSH_RETRIES]
                         [--create-pr [CREATE_PR]] [--auto-merge [AUTO_MERGE]]
-                        [--merge-method MERGE_METHOD] [--json [JSON]]
-                        [-v [VERBOSE]]
+                        [--merge-method MERGE_METHOD]
+                        [--api-commit [API_COMMIT]] [--spool-dir SPOOL_DIR]
+                        [--json [JSON]] [-v [VERBOSE]] [--timings TIMINGS]
 
 options:
   -h, --help            show this help message and exit
@@ -327,6 +526,30 @@ options:
   --git-provider-url GIT_PROVIDER_URL
                         Git provider base API URL (e.g.
                         https://bitbucket.example.tld)
+  --clone-depth CLONE_DEPTH
+                        Create shallow clones with a history truncated to the
+                        specified number of commits
+  --clone-single-branch [CLONE_SINGLE_BRANCH]
+                        Clone only the history of the checked out branch
+  --clone-filter CLONE_FILTER
+                        Partial clone filter (e.g. blob:none, requires server
+                        support)
+  --clone-sparse [CLONE_SPARSE]
+                        Only check out the directories a command needs (sparse
+                        checkout, requires git 2.35 or newer)
+  --clone-cache-dir CLONE_CACHE_DIR
+                        Directory for a persistent mirror cache of cloned
+                        repositories (alternative: GITOPSCLI_CLONE_CACHE_DIR
+                        env variable)
+  --clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB
+                        Evict least recently used mirrors when the cache
+                        exceeds this size (default: 2048)
+  --clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS
+                        Evict mirrors which have not been used for this number
+                        of days (default: 7)
+  --push-retries PUSH_RETRIES
+                        Rebase and retry a push which was rejected because the
+                        remote branch has changed (default: 3)
   --create-pr [CREATE_PR]
                         Creates a Pull Request
   --auto-merge [AUTO_MERGE]
@@ -335,9 +558,123 @@ options:
   --merge-method MERGE_METHOD
                         Merge Method (e.g., 'squash', 'rebase', 'merge')
                         (default: merge)
+  --api-commit [API_COMMIT]
+                        Commit via the git provider API instead of cloning the
+                        repository (falls back to cloning if needed)
+  --spool-dir SPOOL_DIR
+                        Queue the deployment in this directory, concurrent
+                        deployments to the same repository are pushed together
+                        (alternative: GITOPSCLI_SPOOL_DIR env variable)
   --json [JSON]         Print a JSON object containing deployment information
   -v [VERBOSE], --verbose [VERBOSE]
                         Verbose exception logging
+  --timings TIMINGS     Write a JSON report with the duration of each phase to
+                        this file (alternative: GITOPSCLI_TIMINGS env
+                        variable)
+"""
+
+EXPECTED_DEPLOY_BATCH_NO_ARGS_ERROR = """\
+usage: gitopscli deploy-batch [-h] --manifest MANIFEST
+                              [--max-workers MAX_WORKERS]
+                              [--single-commit [SINGLE_COMMIT]] --username
+                              USERNAME --password PASSWORD
+                              [--git-user GIT_USER] [--git-email GIT_EMAIL]
+                              [--git-provider GIT_PROVIDER]
+                              [--git-provider-url GIT_PROVIDER_URL]
+                              [--clone-depth CLONE_DEPTH]
+                              [--clone-single-branch [CLONE_SINGLE_BRANCH]]
+                              [--clone-filter CLONE_FILTER]
+                              [--clone-sparse [CLONE_SPARSE]]
+                              [--clone-cache-dir CLONE_CACHE_DIR]
+                              [--clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB]
+                              [--clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS]
+                              [--push-retries PUSH_RETRIES]
+                              [--create-pr [CREATE_PR]]
+                              [--auto-merge [AUTO_MERGE]]
+                              [--merge-method MERGE_METHOD] [-v [VERBOSE]]
+                              [--timings TIMINGS]
+gitopscli deploy-batch: error: the following arguments are required: --manifest, --username, --password
+"""
+
+EXPECTED_DEPLOY_BATCH_HELP = """\
+usage: gitopscli deploy-batch [-h] --manifest MANIFEST
+                              [--max-workers MAX_WORKERS]
+                              [--single-commit [SINGLE_COMMIT]] --username
+                              USERNAME --password PASSWORD
+                              [--git-user GIT_USER] [--git-email GIT_EMAIL]
+                              [--git-provider GIT_PROVIDER]
+                              [--git-provider-url GIT_PROVIDER_URL]
+                              [--clone-depth CLONE_DEPTH]
+                              [--clone-single-branch [CLONE_SINGLE_BRANCH]]
+                              [--clone-filter CLONE_FILTER]
+                              [--clone-sparse [CLONE_SPARSE]]
+                              [--clone-cache-dir CLONE_CACHE_DIR]
+                              [--clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB]
+                              [--clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS]
+                              [--push-retries PUSH_RETRIES]
+                              [--create-pr [CREATE_PR]]
+                              [--auto-merge [AUTO_MERGE]]
+                              [--merge-method MERGE_METHOD] [-v [VERBOSE]]
+                              [--timings TIMINGS]
+
+options:
+  -h, --help            show this help message and exit
+  --manifest MANIFEST   YAML file listing the deployments (organisation,
+                        repository, file, values)
+  --max-workers MAX_WORKERS
+                        Maximum number of concurrent deployments (default: 4)
+  --single-commit [SINGLE_COMMIT]
+                        Create only single commit for all updates of a
+                        deployment
+  --username USERNAME   Git username (alternative: GITOPSCLI_USERNAME env
+                        variable)
+  --password PASSWORD   Git password or token (alternative: GITOPSCLI_PASSWORD
+                        env variable)
+  --git-user GIT_USER   Git Username
+  --git-email GIT_EMAIL
+                        Git User Email
+  --git-provider GIT_PROVIDER
+                        Git server provider
+  --git-provider-url GIT_PROVIDER_URL
+                        Git provider base API URL (e.g.
+                        https://bitbucket.example.tld)
+  --clone-depth CLONE_DEPTH
+                        Create shallow clones with a history truncated to the
+                        specified number of commits
+  --clone-single-branch [CLONE_SINGLE_BRANCH]
+                        Clone only the history of the checked out branch
+  --clone-filter CLONE_FILTER
+                        Partial clone filter (e.g. blob:none, requires server
+                        support)
+  --clone-sparse [CLONE_SPARSE]
+                        Only check out the directories a command needs (sparse
+                        checkout, requires git 2.35 or newer)
+  --clone-cache-dir CLONE_CACHE_DIR
+                        Directory for a persistent mirror cache of cloned
+                        repositories (alternative: GITOPSCLI_CLONE_CACHE_DIR
+                        env variable)
+  --clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB
+                        Evict least recently used mirrors when the cache
+                        exceeds this size (default: 2048)
+  --clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS
+                        Evict mirrors which have not been used for this number
+                        of days (default: 7)
+  --push-retries PUSH_RETRIES
+                        Rebase and retry a push which was rejected because the
+                        remote branch has changed (default: 3)
+  --create-pr [CREATE_PR]
+                        Creates a Pull Request
+  --auto-merge [AUTO_MERGE]
+                        Automatically merge the created PR (only valid with
+                        --create-pr)
+  --merge-method MERGE_METHOD
+                        Merge Method (e.g., 'squash', 'rebase', 'merge')
+                        (default: merge)
+  -v [VERBOSE], --verbose [VERBOSE]
+                        Verbose exception logging
+  --timings TIMINGS     Write a JSON report with the duration of each phase to
+                        this file (alternative: GITOPSCLI_TIMINGS env
+                        variable)
 """
 
 EXPECTED_SYNC_APPS_NO_ARGS_ERROR = """\
@@ -346,9 +683,18 @@ usage: gitopscli sync-apps [-h] --username USERNAME --password PASSWORD
                            --organisation ORGANISATION --repository-name
                            REPOSITORY_NAME [--git-provider GIT_PROVIDER]
                            [--git-provider-url GIT_PROVIDER_URL]
-                           [-v [VERBOSE]] --root-organisation
+                           [--clone-depth CLONE_DEPTH]
+                           [--clone-single-branch [CLONE_SINGLE_BRANCH]]
+                           [--clone-filter CLONE_FILTER]
+                           [--clone-sparse [CLONE_SPARSE]]
+                           [--clone-cache-dir CLONE_CACHE_DIR]
+                           [--clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB]
+                           [--clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS]
+                           [--push-retries PUSH_RETRIES] [-v [VERBOSE]]
+                           [--timings TIMINGS] --root-organisation
                            ROOT_ORGANISATION --root-repository-name
                            ROOT_REPOSITORY_NAME
+                           [--apps-index-dir APPS_INDEX_DIR]
 gitopscli sync-apps: error: the following arguments are required: --username, --password, --organisation, --repository-name, --root-organisation, --root-repository-name
 """
 
@@ -358,9 +704,18 @@ usage: gitopscli sync-apps [-h] --username USERNAME --password PASSWORD
                            --organisation ORGANISATION --repository-name
                            REPOSITORY_NAME [--git-provider GIT_PROVIDER]
                            [--git-provider-url GIT_PROVIDER_URL]
-                           [-v [VERBOSE]] --root-organisation
+                           [--clone-depth CLONE_DEPTH]
+                           [--clone-single-branch [CLONE_SINGLE_BRANCH]]
+                           [--clone-filter CLONE_FILTER]
+                           [--clone-sparse [CLONE_SPARSE]]
+                           [--clone-cache-dir CLONE_CACHE_DIR]
+                           [--clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB]
+                           [--clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS]
+                           [--push-retries PUSH_RETRIES] [-v [VERBOSE]]
+                           [--timings TIMINGS] --root-organisation
                            ROOT_ORGANISATION --root-repository-name
                            ROOT_REPOSITORY_NAME
+                           [--apps-index-dir APPS_INDEX_DIR]
 
 options:
   -h, --help            show this help message and exit
@@ -380,12 +735,150 @@ options:
   --git-provider-url GIT_PROVIDER_URL
                         Git provider base API URL (e.g.
                         https://bitbucket.example.tld)
+  --clone-depth CLONE_DEPTH
+                        Create shallow clones with a history truncated to the
+                        specified number of commits
+  --clone-single-branch [CLONE_SINGLE_BRANCH]
+                        Clone only the history of the checked out branch
+  --clone-filter CLONE_FILTER
+                        Partial clone filter (e.g. blob:none, requires server
+                        support)
+  --clone-sparse [CLONE_SPARSE]
+                        Only check out the directories a command needs (sparse
+                        checkout, requires git 2.35 or newer)
+  --clone-cache-dir CLONE_CACHE_DIR
+                        Directory for a persistent mirror cache of cloned
+                        repositories (alternative: GITOPSCLI_CLONE_CACHE_DIR
+                        env variable)
+  --clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB
+                        Evict least recently used mirrors when the cache
+                        exceeds this size (default: 2048)
+  --clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS
+                        Evict mirrors which have not been used for this number
+                        of days (default: 7)
+  --push-retries PUSH_RETRIES
+                        Rebase and retry a push which was rejected because the
+                        remote branch has changed (default: 3)
+  -v [VERBOSE], --verbose [VERBOSE]
+                        Verbose exception logging
+  --timings TIMINGS     Write a JSON report with the duration of each phase to
+                        this file (alternative: GITOPSCLI_TIMINGS env
+                        variable)
+  --root-organisation ROOT_ORGANISATION
+                        Root config repository organisation
+  --root-repository-name ROOT_REPOSITORY_NAME
+                        Root config repository name
+  --apps-index-dir APPS_INDEX_DIR
+                        Persist the application index of the root repository
+                        in this directory, later runs only parse changed
+                        apps/*.yaml files (alternative:
+                        GITOPSCLI_APPS_INDEX_DIR env variable)
+"""
+
+EXPECTED_SYNC_APPS_BATCH_NO_ARGS_ERROR = """\
+usage: gitopscli sync-apps-batch [-h] --manifest MANIFEST
+                                 [--max-workers MAX_WORKERS]
+                                 [--single-commit [SINGLE_COMMIT]] --username
+                                 USERNAME --password PASSWORD
+                                 [--git-user GIT_USER] [--git-email GIT_EMAIL]
+                                 [--git-provider GIT_PROVIDER]
+                                 [--git-provider-url GIT_PROVIDER_URL]
+                                 [--clone-depth CLONE_DEPTH]
+                                 [--clone-single-branch [CLONE_SINGLE_BRANCH]]
+                                 [--clone-filter CLONE_FILTER]
+                                 [--clone-sparse [CLONE_SPARSE]]
+                                 [--clone-cache-dir CLONE_CACHE_DIR]
+                                 [--clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB]
+                                 [--clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS]
+                                 [--push-retries PUSH_RETRIES] [-v [VERBOSE]]
+                                 [--timings TIMINGS] --root-organisation
+                                 ROOT_ORGANISATION --root-repository-name
+                                 ROOT_REPOSITORY_NAME
+                                 [--apps-index-dir APPS_INDEX_DIR]
+gitopscli sync-apps-batch: error: the following arguments are required: --manifest, --username, --password, --root-organisation, --root-repository-name
+"""
+
+EXPECTED_SYNC_APPS_BATCH_HELP = """\
+usage: gitopscli sync-apps-batch [-h] --manifest MANIFEST
+                                 [--max-workers MAX_WORKERS]
+                                 [--single-commit [SINGLE_COMMIT]] --username
+                                 USERNAME --password PASSWORD
+                                 [--git-user GIT_USER] [--git-email GIT_EMAIL]
+                                 [--git-provider GIT_PROVIDER]
+                                 [--git-provider-url GIT_PROVIDER_URL]
+                                 [--clone-depth CLONE_DEPTH]
+                                 [--clone-single-branch [CLONE_SINGLE_BRANCH]]
+                                 [--clone-filter CLONE_FILTER]
+                                 [--clone-sparse [CLONE_SPARSE]]
+                                 [--clone-cache-dir CLONE_CACHE_DIR]
+                                 [--clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB]
+                                 [--clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS]
+                                 [--push-retries PUSH_RETRIES] [-v [VERBOSE]]
+                                 [--timings TIMINGS] --root-organisation
+                                 ROOT_ORGANISATION --root-repository-name
+                                 ROOT_REPOSITORY_NAME
+                                 [--apps-index-dir APPS_INDEX_DIR]
+
+options:
+  -h, --help            show this help message and exit
+  --manifest MANIFEST   YAML file listing the apps config repositories
+                        (organisation, repository)
+  --max-workers MAX_WORKERS
+                        Maximum number of apps config repositories which are
+                        listed concurrently (default: 4)
+  --single-commit [SINGLE_COMMIT]
+                        Create only single commit for the updates of all apps
+                        config repositories
+  --username USERNAME   Git username (alternative: GITOPSCLI_USERNAME env
+                        variable)
+  --password PASSWORD   Git password or token (alternative: GITOPSCLI_PASSWORD
+                        env variable)
+  --git-user GIT_USER   Git Username
+  --git-email GIT_EMAIL
+                        Git User Email
+  --git-provider GIT_PROVIDER
+                        Git server provider
+  --git-provider-url GIT_PROVIDER_URL
+                        Git provider base API URL (e.g.
+                        https://bitbucket.example.tld)
+  --clone-depth CLONE_DEPTH
+                        Create shallow clones with a history truncated to the
+                        specified number of commits
+  --clone-single-branch [CLONE_SINGLE_BRANCH]
+                        Clone only the history of the checked out branch
+  --clone-filter CLONE_FILTER
+                        Partial clone filter (e.g. blob:none, requires server
+                        support)
+  --clone-sparse [CLONE_SPARSE]
+                        Only check out the directories a command needs (sparse
+                        checkout, requires git 2.35 or newer)
+  --clone-cache-dir CLONE_CACHE_DIR
+                        Directory for a persistent mirror cache of cloned
+                        repositories (alternative: GITOPSCLI_CLONE_CACHE_DIR
+                        env variable)
+  --clone-cache-max-size-mb CLONE_CACHE_MAX_SIZE_MB
+                        Evict least recently used mirrors when the cache
+                        exceeds this size (default: 2048)
+  --clone-cache-max-age-days CLONE_CACHE_MAX_AGE_DAYS
+                        Evict mirrors which have not been used for this number
+                        of days (default: 7)
+  --push-retries PUSH_RETRIES
+                        Rebase and retry a push which was rejected because the
+                        remote branch has changed (default: 3)
   -v [VERBOSE], --verbose [VERBOSE]
                         Verbose exception logging
+  --timings TIMINGS     Write a JSON report with the duration of each phase to
+                        this file (alternative: GITOPSCLI_TIMINGS env
+                        variable)
   --root-organisation ROOT_ORGANISATION
                         Root config repository organisation
   --root-repository-name ROOT_REPOSITORY_NAME
                         Root config repository name
+  --apps-index-dir APPS_INDEX_DIR
+                        Persist the application index of the root repository
+                        in this directory, later runs only parse changed
+                        apps/*.yaml files (alternative:
+                        GITOPSCLI_APPS_INDEX_DIR env variable)
 """
 
 EXPECTED_VERSION_HELP = """\
@@ -473,7 +966,7 @@ class CliParserTest(unittest.TestCase):
         self.assertEqual("", stderr)
 
     def test_add_pr_comment_required_args(self):
-        verbose, args = parse_args(
+        verbose, timings_file, args = parse_args(
             [
                 "add-pr-comment",
                 "--username",
@@ -509,7 +1002,7 @@ class CliParserTest(unittest.TestCase):
     def test_add_pr_comment_required_args_and_credentials_env_vars(self):
         os.environ["GITOPSCLI_USERNAME"] = "ENV_USER"
         os.environ["GITOPSCLI_PASSWORD"] = "ENV_PASS"
-        verbose, args = parse_args(
+        verbose, timings_file, args = parse_args(
             [
                 "add-pr-comment",
                 "--git-provider",
@@ -539,7 +1032,7 @@ class CliParserTest(unittest.TestCase):
         self.assertFalse(verbose)
 
     def test_add_pr_comment_all_args(self):
-        verbose, args = parse_args(
+        verbose, timings_file, args = parse_args(
             [
                 "add-pr-comment",
                 "--username",
@@ -595,7 +1088,7 @@ class CliParserTest(unittest.TestCase):
         self.assertEqual("", stderr)
 
     def test_create_preview_required_args(self):
-        verbose, args = parse_args(
+        verbose, timings_file, args = parse_args(
             [
                 "create-preview",
                 "--username",
@@ -634,7 +1127,7 @@ class CliParserTest(unittest.TestCase):
         self.assertFalse(verbose)
 
     def test_create_preview_all_args(self):
-        verbose, args = parse_args(
+        verbose, timings_file, args = parse_args(
             [
                 "create-preview",
                 "--username",
@@ -694,7 +1187,7 @@ class CliParserTest(unittest.TestCase):
         self.assertEqual("", stderr)
 
     def test_create_pr_preview_required_args(self):
-        verbose, args = parse_args(
+        verbose, timings_file, args = parse_args(
             [
                 "create-pr-preview",
                 "--username",
@@ -731,7 +1224,7 @@ class CliParserTest(unittest.TestCase):
         self.assertFalse(verbose)
 
     def test_create_pr_preview_all_args(self):
-        verbose, args = parse_args(
+        verbose, timings_file, args = parse_args(
             [
                 "create-pr-preview",
                 "--username",
@@ -791,7 +1284,7 @@ class CliParserTest(unittest.TestCase):
         self.assertEqual("", stderr)
 
     def test_delete_preview_required_args(self):
-        verbose, args = parse_args(
+        verbose, timings_file, args = parse_args(
             [
                 "delete-preview",
                 "--username",
@@ -828,7 +1321,7 @@ class CliParserTest(unittest.TestCase):
         self.assertFalse(verbose)
 
     def test_delete_preview_all_args(self):
-        verbose, args = parse_args(
+        verbose, timings_file, args = parse_args(
             [
                 "delete-preview",
                 "--username",
@@ -888,7 +1381,7 @@ class CliParserTest(unittest.TestCase):
         self.assertEqual("", stderr)
 
     def test_delete_pr_preview_required_args(self):
-        verbose, args = parse_args(
+        verbose, timings_file, args = parse_args(
             [
                 "delete-pr-preview",
                 "--username",
@@ -925,7 +1418,7 @@ class CliParserTest(unittest.TestCase):
         self.assertFalse(verbose)
 
     def test_delete_pr_preview_all_args(self):
-        verbose, args = parse_args(
+        verbose, timings_file, args = parse_args(
             [
                 "delete-pr-preview",
                 "--username",
@@ -985,7 +1478,7 @@ class CliParserTest(unittest.TestCase):
         self.assertEqual("", stderr)
 
     def test_deploy_required_args(self):
-        verbose, args = parse_args(
+        verbose, timings_file, args = parse_args(
             [
                 "deploy",
                 "--username",
@@ -1021,13 +1514,24 @@ class CliParserTest(unittest.TestCase):
         self.assertEqual(args.values, {"a.b": 42})
 
         self.assertIsNone(args.git_provider_url)
+        self.assertIsNone(args.clone_depth)
+        self.assertFalse(args.clone_single_branch)
+        self.assertIsNone(args.clone_filter)
+        self.assertIsNone(args.clone_cache_dir)
+        self.assertEqual(args.clone_cache_max_size_mb, 2048)
+        self.assertEqual(args.clone_cache_max_age_days, 7)
         self.assertFalse(args.create_pr)
         self.assertFalse(args.auto_merge)
         self.assertFalse(args.single_commit)
+        self.assertFalse(args.clone_sparse)
+        self.assertEqual(args.push_retries, 3)
+        self.assertFalse(args.api_commit)
+        self.assertIsNone(args.spool_dir)
         self.assertFalse(verbose)
+        self.assertIsNone(timings_file)
 
     def test_deploy_all_args(self):
-        verbose, args = parse_args(
+        verbose, timings_file, args = parse_args(
             [
                 "deploy",
                 "--username",
@@ -1050,11 +1554,30 @@ class CliParserTest(unittest.TestCase):
                 "FILE",
                 "--values",
                 "{a.b: 42}",  # yaml
+                "--clone-depth",
+                "1",
+                "--clone-single-branch",
+                "--clone-filter",
+                "blob:none",
+                "--clone-sparse",
+                "--clone-cache-dir",
+                "/cache",
+                "--clone-cache-max-size-mb",
+                "100",
+                "--clone-cache-max-age-days",
+                "2",
+                "--push-retries",
+                "5",
                 "--create-pr",
                 "--auto-merge",
                 "--single-commit",
+                "--api-commit",
+                "--spool-dir",
+                "/spool",
                 "--verbose",
                 "yes",
+                "--timings",
+                "timings.json",
             ]
         )
         self.assertType(args, DeployCommand.Args)
@@ -1070,9 +1593,107 @@ class CliParserTest(unittest.TestCase):
 
         self.assertEqual(args.git_provider, GitProvider.BITBUCKET)
         self.assertEqual(args.git_provider_url, "GIT_PROVIDER_URL")
+        self.assertEqual(args.clone_depth, 1)
+        self.assertTrue(args.clone_single_branch)
+        self.assertEqual(args.clone_filter, "blob:none")
+        self.assertEqual(args.clone_cache_dir, "/cache")
+        self.assertEqual(args.clone_cache_max_size_mb, 100)
+        self.assertEqual(args.clone_cache_max_age_days, 2)
+        self.assertEqual(args.push_retries, 5)
+        self.assertTrue(args.clone_sparse)
         self.assertTrue(args.create_pr)
         self.assertTrue(args.auto_merge)
         self.assertTrue(args.single_commit)
+        self.assertTrue(args.api_commit)
+        self.assertEqual(args.spool_dir, "/spool")
+        self.assertTrue(verbose)
+        self.assertEqual(timings_file, "timings.json")
+
+    def test_deploy_batch_no_args(self):
+        exit_code, stdout, stderr = self._capture_parse_args(["deploy-batch"])
+        self.assertEqual(exit_code, 2)
+        self.assertEqual("", stdout)
+        self.assertEqual(EXPECTED_DEPLOY_BATCH_NO_ARGS_ERROR, stderr)
+
+    def test_deploy_batch_help(self):
+        exit_code, stdout, stderr = self._capture_parse_args(["deploy-batch", "--help"])
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(EXPECTED_DEPLOY_BATCH_HELP, stdout)
+        self.assertEqual("", stderr)
+
+    def test_deploy_batch_required_args(self):
+        verbose, timings_file, args = parse_args(
+            [
+                "deploy-batch",
+                "--username",
+                "USER",
+                "--password",
+                "PASS",
+                "--git-provider",
+                "gitlab",
+                "--manifest",
+                "MANIFEST",
+            ]
+        )
+        self.assertType(args, DeployBatchCommand.Args)
+
+        self.assertEqual(args.username, "USER")
+        self.assertEqual(args.password, "PASS")
+        self.assertEqual(args.git_user, "GitOpsCLI")
+        self.assertEqual(args.git_email, "gitopscli@baloise.dev")
+        self.assertEqual(args.git_provider, GitProvider.GITLAB)
+        self.assertEqual(args.manifest, "MANIFEST")
+
+        self.assertIsNone(args.git_provider_url)
+        self.assertEqual(args.max_workers, 4)
+        self.assertFalse(args.single_commit)
+        self.assertFalse(args.create_pr)
+        self.assertFalse(args.auto_merge)
+        self.assertEqual(args.merge_method, "merge")
+        self.assertFalse(verbose)
+
+    def test_deploy_batch_all_args(self):
+        verbose, timings_file, args = parse_args(
+            [
+                "deploy-batch",
+                "--username",
+                "USER",
+                "--password",
+                "PASS",
+                "--git-user",
+                "GIT_USER",
+                "--git-email",
+                "GIT_EMAIL",
+                "--git-provider",
+                "github",
+                "--git-provider-url",
+                "GIT_PROVIDER_URL",
+                "--manifest",
+                "MANIFEST",
+                "--max-workers",
+                "16",
+                "--single-commit",
+                "--create-pr",
+                "--auto-merge",
+                "--merge-method",
+                "squash",
+                "--verbose",
+            ]
+        )
+        self.assertType(args, DeployBatchCommand.Args)
+
+        self.assertEqual(args.username, "USER")
+        self.assertEqual(args.password, "PASS")
+        self.assertEqual(args.git_user, "GIT_USER")
+        self.assertEqual(args.git_email, "GIT_EMAIL")
+        self.assertEqual(args.git_provider, GitProvider.GITHUB)
+        self.assertEqual(args.git_provider_url, "GIT_PROVIDER_URL")
+        self.assertEqual(args.manifest, "MANIFEST")
+        self.assertEqual(args.max_workers, 16)
+        self.assertTrue(args.single_commit)
+        self.assertTrue(args.create_pr)
+        self.assertTrue(args.auto_merge)
+        self.assertEqual(args.merge_method, "squash")
         self.assertTrue(verbose)
 
     def test_sync_apps_no_args(self):
@@ -1094,7 +1715,7 @@ class CliParserTest(unittest.TestCase):
         self.assertEqual("", stderr)
 
     def test_sync_apps_required_args(self):
-        verbose, args = parse_args(
+        verbose, timings_file, args = parse_args(
             [
                 "sync-apps",
                 "--username",
@@ -1127,13 +1748,14 @@ class CliParserTest(unittest.TestCase):
         self.assertEqual(args.repository_name, "REPO")
         self.assertEqual(args.root_organisation, "ROOT_ORGA")
         self.assertEqual(args.root_repository_name, "ROOT_REPO")
+        self.assertIsNone(args.apps_index_dir)
 
         self.assertEqual(args.git_provider, GitProvider.GITLAB)
         self.assertEqual(args.git_provider_url, "https://www.gitlab.com/")
         self.assertFalse(verbose)
 
     def test_sync_apps_all_args(self):
-        verbose, args = parse_args(
+        verbose, timings_file, args = parse_args(
             [
                 "sync-apps",
                 "--username",
@@ -1156,6 +1778,8 @@ class CliParserTest(unittest.TestCase):
                 "ROOT_ORGA",
                 "--root-repository-name",
                 "ROOT_REPO",
+                "--apps-index-dir",
+                "/apps-index",
                 "--verbose",
                 "false",
             ]
@@ -1170,13 +1794,106 @@ class CliParserTest(unittest.TestCase):
         self.assertEqual(args.repository_name, "REPO")
         self.assertEqual(args.root_organisation, "ROOT_ORGA")
         self.assertEqual(args.root_repository_name, "ROOT_REPO")
+        self.assertEqual(args.apps_index_dir, "/apps-index")
 
         self.assertEqual(args.git_provider, GitProvider.GITHUB)
         self.assertEqual(args.git_provider_url, "GIT_PROVIDER_URL")
         self.assertFalse(verbose)
 
+    def test_sync_apps_batch_no_args(self):
+        exit_code, stdout, stderr = self._capture_parse_args(["sync-apps-batch"])
+        self.assertEqual(exit_code, 2)
+        self.assertEqual("", stdout)
+        self.assertEqual(EXPECTED_SYNC_APPS_BATCH_NO_ARGS_ERROR, stderr)
+
+    def test_sync_apps_batch_help(self):
+        exit_code, stdout, stderr = self._capture_parse_args(["sync-apps-batch", "--help"])
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(EXPECTED_SYNC_APPS_BATCH_HELP, stdout)
+        self.assertEqual("", stderr)
+
+    def test_sync_apps_batch_required_args(self):
+        verbose, timings_file, args = parse_args(
+            [
+                "sync-apps-batch",
+                "--username",
+                "USER",
+                "--password",
+                "PASS",
+                "--git-provider-url",
+                "https://www.gitlab.com/",
+                "--manifest",
+                "MANIFEST",
+                "--root-organisation",
+                "ROOT_ORGA",
+                "--root-repository-name",
+                "ROOT_REPO",
+            ]
+        )
+        self.assertType(args, SyncAppsBatchCommand.Args)
+
+        self.assertEqual(args.username, "USER")
+        self.assertEqual(args.password, "PASS")
+        self.assertEqual(args.git_user, "GitOpsCLI")
+        self.assertEqual(args.git_email, "gitopscli@baloise.dev")
+        self.assertEqual(args.git_provider, GitProvider.GITLAB)
+        self.assertEqual(args.git_provider_url, "https://www.gitlab.com/")
+        self.assertEqual(args.manifest, "MANIFEST")
+        self.assertEqual(args.max_workers, 4)
+        self.assertFalse(args.single_commit)
+        self.assertEqual(args.root_organisation, "ROOT_ORGA")
+        self.assertEqual(args.root_repository_name, "ROOT_REPO")
+        self.assertIsNone(args.apps_index_dir)
+        self.assertFalse(verbose)
+
+    def test_sync_apps_batch_all_args(self):
+        verbose, timings_file, args = parse_args(
+            [
+                "sync-apps-batch",
+                "--username",
+                "USER",
+                "--password",
+                "PASS",
+                "--git-user",
+                "GIT_USER",
+                "--git-email",
+                "GIT_EMAIL",
+                "--git-provider",
+                "GitHub",
+                "--git-provider-url",
+                "GIT_PROVIDER_URL",
+                "--manifest",
+                "MANIFEST",
+                "--max-workers",
+                "16",
+                "--single-commit",
+                "--root-organisation",
+                "ROOT_ORGA",
+                "--root-repository-name",
+                "ROOT_REPO",
+                "--apps-index-dir",
+                "/apps-index",
+                "--verbose",
+            ]
+        )
+        self.assertType(args, SyncAppsBatchCommand.Args)
+
+        self.assertEqual(args.username, "USER")
+        self.assertEqual(args.password, "PASS")
+        self.assertEqual(args.git_user, "GIT_USER")
+        self.assertEqual(args.git_email, "GIT_EMAIL")
+        self.assertEqual(args.git_provider, GitProvider.GITHUB)
+        self.assertEqual(args.git_provider_url, "GIT_PROVIDER_URL")
+        self.assertEqual(args.manifest, "MANIFEST")
+        self.assertEqual(args.max_workers, 16)
+        self.assertTrue(args.single_commit)
+        self.assertEqual(args.root_organisation, "ROOT_ORGA")
+        self.assertEqual(args.root_repository_name, "ROOT_REPO")
+        self.assertEqual(args.apps_index_dir, "/apps-index")
+        self.assertTrue(verbose)
+
     def test_version_args(self):
-        _, args = parse_args(["version"])
+        _, _, args = parse_args(["version"])
         self.assertType(args, VersionCommand.Args)
 
     def test_version_help(self):
@@ -1244,6 +1961,146 @@ class CliParserTest(unittest.TestCase):
             "gitopscli add-pr-comment: error: argument --pr-id: invalid int value: 'INVALID_INT'", last_stderr_line
         )
 
+    def test_invalid_clone_depth(self):
+        exit_code, stdout, stderr = self._capture_parse_args(
+            [
+                "sync-apps",
+                "--git-provider",
+                "github",
+                "--username",
+                "x",
+                "--password",
+                "x",
+                "--organisation",
+                "x",
+                "--repository-name",
+                "x",
+                "--root-organisation",
+                "x",
+                "--root-repository-name",
+                "x",
+                "--clone-depth",
+                "0",
+            ]
+        )
+        self.assertEqual(exit_code, 2)
+        self.assertEqual("", stdout)
+        last_stderr_line = stderr.splitlines()[-1]
+        self.assertEqual(
+            "gitopscli sync-apps: error: argument --clone-depth: invalid positive int value: '0'", last_stderr_line
+        )
+
+    def test_invalid_deploy_batch_max_workers(self):
+        exit_code, stdout, stderr = self._capture_parse_args(
+            [
+                "deploy-batch",
+                "--username",
+                "x",
+                "--password",
+                "x",
+                "--git-provider",
+                "github",
+                "--manifest",
+                "x",
+                "--max-workers",
+                "0",
+            ]
+        )
+        self.assertEqual(exit_code, 2)
+        self.assertEqual("", stdout)
+        last_stderr_line = stderr.splitlines()[-1]
+        self.assertEqual(
+            "gitopscli deploy-batch: error: argument --max-workers: invalid positive int value: '0'", last_stderr_line
+        )
+
+    def test_invalid_sync_apps_batch_max_workers(self):
+        exit_code, stdout, stderr = self._capture_parse_args(
+            [
+                "sync-apps-batch",
+                "--username",
+                "x",
+                "--password",
+                "x",
+                "--git-provider",
+                "github",
+                "--manifest",
+                "x",
+                "--root-organisation",
+                "x",
+                "--root-repository-name",
+                "x",
+                "--max-workers",
+                "-1",
+            ]
+        )
+        self.assertEqual(exit_code, 2)
+        self.assertEqual("", stdout)
+        last_stderr_line = stderr.splitlines()[-1]
+        self.assertEqual(
+            "gitopscli sync-apps-batch: error: argument --max-workers: invalid positive int value: '-1'",
+            last_stderr_line,
+        )
+
+    def test_invalid_push_retries(self):
+        exit_code, stdout, stderr = self._capture_parse_args(
+            [
+                "sync-apps",
+                "--git-provider",
+                "github",
+                "--username",
+                "x",
+                "--password",
+                "x",
+                "--organisation",
+                "x",
+                "--repository-name",
+                "x",
+                "--root-organisation",
+                "x",
+                "--root-repository-name",
+                "x",
+                "--push-retries",
+                "-1",
+            ]
+        )
+        self.assertEqual(exit_code, 2)
+        self.assertEqual("", stdout)
+        last_stderr_line = stderr.splitlines()[-1]
+        self.assertEqual(
+            "gitopscli sync-apps: error: argument --push-retries: invalid non-negative int value: '-1'",
+            last_stderr_line,
+        )
+
+    def test_invalid_clone_cache_limits(self):
+        for option in ("--clone-cache-max-size-mb", "--clone-cache-max-age-days"):
+            exit_code, stdout, stderr = self._capture_parse_args(
+                [
+                    "sync-apps",
+                    "--git-provider",
+                    "github",
+                    "--username",
+                    "x",
+                    "--password",
+                    "x",
+                    "--organisation",
+                    "x",
+                    "--repository-name",
+                    "x",
+                    "--root-organisation",
+                    "x",
+                    "--root-repository-name",
+                    "x",
+                    option,
+                    "0",
+                ]
+            )
+            self.assertEqual(exit_code, 2)
+            self.assertEqual("", stdout)
+            last_stderr_line = stderr.splitlines()[-1]
+            self.assertEqual(
+                f"gitopscli sync-apps: error: argument {option}: invalid positive int value: '0'", last_stderr_line
+            )
+
     def test_invalid_yaml(self):
         exit_code, stdout, stderr = self._capture_parse_args(
             [
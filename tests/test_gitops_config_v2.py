@@ -74,6 +74,24 @@ class GitOpsConfigV2Test(unittest.TestCase):
             "my-preview-id-with-odd-chars-cd2cb125-host-template",
         )
 
+    def test_preview_identity(self):
+        config = self.load()
+        preview_identity = config.get_preview_identity("PREVIEW_ID/with_odd_chars__")
+        self.assertEqual(
+            preview_identity,
+            GitOpsConfig.PreviewIdentity(
+                preview_id="PREVIEW_ID/with_odd_chars__",
+                preview_id_hash="cd2cb125",
+                preview_id_hash_short="cd2",
+                sanitized_preview_id="preview-id-with-odd-chars",
+                namespace="my-app-cd2cb125-dev",
+                host="my-preview-id-with-odd-chars-cd2cb125-host-template",
+            ),
+        )
+        self.assertIs(preview_identity, config.get_preview_identity("PREVIEW_ID/with_odd_chars__"))
+        self.assertEqual(preview_identity.host, config.get_preview_host("PREVIEW_ID/with_odd_chars__"))
+        self.assertEqual(preview_identity.namespace, config.get_preview_namespace("PREVIEW_ID/with_odd_chars__"))
+
     def test_preview_host_missing(self):
         del self.yaml["previewConfig"]["host"]
         self.assert_load_error("Key 'previewConfig.host' not found in GitOps config!")
@@ -200,6 +218,22 @@ class GitOpsConfigV2Test(unittest.TestCase):
             config = self.load()
             self.assertTrue(config.is_preview_template_equal_target(), x)
 
+    def test_is_preview_template_repository_equal_target(self):
+        for x in {"organisation", "repository", "branch"}:
+            self.yaml["previewConfig"]["template"][x] = self.yaml["previewConfig"]["target"][x]
+
+        self.yaml["previewConfig"]["template"]["branch"] = "custom-template-value"
+        config = self.load()
+        self.assertFalse(config.is_preview_template_equal_target())
+        self.assertTrue(config.is_preview_template_repository_equal_target())
+
+        for x in {"organisation", "repository"}:
+            self.yaml["previewConfig"]["template"][x] = "custom-template-value"
+            config = self.load()
+            self.assertFalse(config.is_preview_template_repository_equal_target(), x)
+
+            self.yaml["previewConfig"]["template"][x] = self.yaml["previewConfig"]["target"][x]
+
     def test_preview_target_namespace(self):
         config = self.load()
         self.assertEqual(config.preview_target_namespace_template, "${APPLICATION_NAME}-${PREVIEW_ID_HASH}-dev")
@@ -0,0 +1,36 @@
+import re
+import subprocess
+import sys
+import unittest
+from typing import Dict
+
+PROVIDER_SDK_MODULES = ["github", "gitlab", "atlassian"]
+
+MAX_CUMULATIVE_IMPORT_TIME_US = 2_000_000
+
+
+def import_times_of_version_command() -> Dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "gitopscli", "version"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"^import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)$", line)
+        if match:
+            import_times[match.group(2)] = int(match.group(1))
+    return import_times
+
+
+class StartupTimeTest(unittest.TestCase):
+    def test_version_command_does_not_import_provider_sdks(self):
+        import_times = import_times_of_version_command()
+        self.assertIn("gitopscli.cliparser", import_times)
+        for module in PROVIDER_SDK_MODULES:
+            self.assertNotIn(module, import_times)
+
+    def test_version_command_cumulative_import_time(self):
+        import_times = import_times_of_version_command()
+        self.assertLess(import_times["gitopscli.cliparser"], MAX_CUMULATIVE_IMPORT_TIME_US)
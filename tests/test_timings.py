@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from gitopscli.timings import disable_timings, enable_timings, get_timings_report, timed, write_timings_report
+
+
+@timed("decorated")
+def decorated_function(value):
+    with timed("nested"):
+        return value * 2
+
+
+class TimingsTest(unittest.TestCase):
+    def tearDown(self):
+        disable_timings()
+
+    def test_disabled_by_default(self):
+        self.assertEqual(decorated_function(21), 42)
+        report = get_timings_report()
+        self.assertEqual(report["spans"], [])
+        self.assertEqual(report["phases"], {})
+
+    def test_nested_spans(self):
+        enable_timings()
+        self.assertEqual(decorated_function(21), 42)
+        decorated_function(1)
+
+        report = get_timings_report()
+        self.assertEqual(report["version"], 1)
+        self.assertEqual([s["path"] for s in report["spans"]], ["decorated", "decorated/nested"] * 2)
+        self.assertEqual(report["phases"]["decorated"]["count"], 2)
+        self.assertEqual(report["phases"]["nested"]["count"], 2)
+        self.assertGreaterEqual(report["phases"]["decorated"]["total"], report["phases"]["nested"]["total"])
+        self.assertGreaterEqual(report["total"], report["phases"]["decorated"]["max"])
+
+    def test_exception_closes_span(self):
+        enable_timings()
+        with self.assertRaises(ValueError):
+            with timed("failing"):
+                raise ValueError()
+        decorated_function(1)
+
+        self.assertEqual(
+            [s["path"] for s in get_timings_report()["spans"]], ["failing", "decorated", "decorated/nested"]
+        )
+
+    def test_spans_of_threads_are_recorded_separately(self):
+        enable_timings()
+        threads = [threading.Thread(target=decorated_function, args=(i,), name=f"worker-{i}") for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        spans = get_timings_report()["spans"]
+        self.assertEqual(len(spans), 6)
+        self.assertEqual({s["path"] for s in spans}, {"decorated", "decorated/nested"})
+        self.assertEqual({s["thread"] for s in spans}, {"worker-0", "worker-1", "worker-2"})
+
+    def test_write_timings_report(self):
+        enable_timings()
+        decorated_function(1)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "timings.json")
+            write_timings_report(file_path)
+            with open(file_path, "r") as stream:
+                self.assertEqual(json.load(stream), get_timings_report())